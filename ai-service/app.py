@@ -3,9 +3,13 @@ from flask_cors import CORS
 import requests
 import logging
 import os
+import hmac
+import atexit
 from datetime import datetime
 from dotenv import load_dotenv
 from src.services.narad_ai import NaradAI
+from src.config.settings import AI_CONFIG
+from src.utils.session_locks import SessionBusyError
 
 # Load environment variables
 load_dotenv()
@@ -18,6 +22,10 @@ logger = logging.getLogger(__name__)
 # Initialize Narad AI
 narad_ai = NaradAI()
 
+# Flush the durable conversation log on shutdown
+atexit.register(narad_ai.conversation_memory.close)
+atexit.register(narad_ai.user_memory.close)
+
 # =====================
 # CONFIG
 # =====================
@@ -39,7 +47,7 @@ logger.info(f"Narad AI is ready: {narad_ai.is_ready()}")
 # =====================
 # GENERATE RESPONSE
 # =====================
-def generate_response(user_message, session_id="default_session", context=None):
+def generate_response(user_message, session_id="default_session", context=None, user_id=None):
     """Generate response using Narad AI service"""
     try:
         logger.info(f"Processing message with Narad AI: {user_message}")
@@ -74,12 +82,16 @@ def generate_response(user_message, session_id="default_session", context=None):
         response = narad_ai.process_message(
             message=user_message,
             session_id=session_id,
-            context=context
+            context=context,
+            user_id=user_id
         )
         
         logger.info(f"Narad AI response: {response}")
         logger.info(f"Response type: {type(response)}")
         return response
+    except SessionBusyError:
+        # Reported to the client as 409 by the chat endpoint
+        raise
     except Exception as e:
         logger.error(f"Error in Narad AI processing: {str(e)}", exc_info=True)
         return {
@@ -129,7 +141,16 @@ def chat():
         logger.info(f"Context: {context}")
         logger.info(f"User ID: {user_id}")
         
-        ai_response = generate_response(user_message, session_id, context)
+        try:
+            ai_response = generate_response(user_message, session_id, context, user_id)
+        except SessionBusyError as e:
+            logger.warning(f"Rejected concurrent request for session {session_id}: {e}")
+            return jsonify({
+                'error': 'Session busy',
+                'message': 'A previous message in this conversation is still being answered. Please retry shortly.',
+                'session_id': session_id,
+                'queue_position': e.queue_position
+            }), 409
         
         logger.info(f"AI Response: {ai_response}")
         logger.info(f"AI Response Type: {type(ai_response)}")
@@ -155,6 +176,242 @@ def chat():
         logger.error(f"Error in chat endpoint: {e}", exc_info=True)
         return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
 
+@app.route('/api/ai/memory/stats', methods=['GET'])
+def memory_stats():
+    """Conversation memory statistics; served from running counters, cheap to poll"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'memory': narad_ai.conversation_memory.get_memory_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error getting memory stats: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/ai/memory/export', methods=['POST'])
+def memory_export():
+    """Start a background columnar export of all conversations"""
+    try:
+        data = request.get_json(silent=True) or {}
+        export_format = data.get('format', 'parquet')
+        if export_format not in ('parquet', 'arrow'):
+            return jsonify({'error': f"Unsupported export format: {export_format}"}), 400
+        
+        output_dir = os.path.join(
+            AI_CONFIG['memory_export_path'],
+            datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+        )
+        future = narad_ai.conversation_memory.export_all(
+            output_dir,
+            export_format=export_format,
+            start=data.get('start'),
+            end=data.get('end'),
+            batch_size=AI_CONFIG['memory_export_batch_size']
+        )
+        future.add_done_callback(
+            lambda f: f.exception() and logger.error(f"Conversation export failed: {f.exception()}")
+        )
+        
+        return jsonify({
+            'status': 'accepted',
+            'output_dir': output_dir,
+            'format': export_format
+        }), 202
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error starting conversation export: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/ai/monuments/related', methods=['GET'])
+def related_monuments():
+    """Precomputed related monuments for every monument, for clients that prefetch the graph"""
+    try:
+        limit = min(max(request.args.get('limit', 5, type=int), 1), narad_ai.knowledge_base.related_graph.k)
+        return jsonify({
+            'status': 'success',
+            'related': narad_ai.knowledge_base.export_related_monuments(limit)
+        })
+    except Exception as e:
+        logger.error(f"Error exporting related monuments: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/ai/monuments/nearby', methods=['GET'])
+def nearby_monuments():
+    """Monuments within radius_km of lat/lon, or the limit nearest when no radius is given"""
+    try:
+        latitude = request.args.get('lat', type=float)
+        longitude = request.args.get('lon', type=float)
+        if latitude is None or longitude is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'lat and lon are required'
+            }), 400
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        radius_km = request.args.get('radius_km', type=float)
+        knowledge_base = narad_ai.knowledge_base
+        if radius_km is None:
+            monuments = knowledge_base.find_nearest_monuments(latitude, longitude, k=limit)
+        else:
+            monuments = knowledge_base.find_nearby_monuments(latitude, longitude, radius_km=radius_km, limit=limit)
+        return jsonify({
+            'status': 'success',
+            'monuments': monuments
+        })
+    except Exception as e:
+        logger.error(f"Error finding nearby monuments: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/ai/stories/connected', methods=['GET'])
+def connected_stories():
+    """Stories linked to every given figure, monument, state and period, e.g. ?figure=Hanuman&state=Karnataka"""
+    try:
+        constraints = {key: request.args.get(key) for key in ('figure', 'monument', 'state', 'period')}
+        if not any(constraints.values()):
+            return jsonify({
+                'status': 'error',
+                'message': 'At least one of figure, monument, state or period is required'
+            }), 400
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        return jsonify({
+            'status': 'success',
+            'stories': narad_ai.knowledge_base.find_connected_stories(limit=limit, **constraints)
+        })
+    except Exception as e:
+        logger.error(f"Error finding connected stories: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+def _admin_denied():
+    """503 while no admin token is configured, 403 unless the request carries it"""
+    token = AI_CONFIG.get('admin_token')
+    if not token:
+        return jsonify({'status': 'error', 'message': 'Admin endpoints are disabled: ADMIN_TOKEN is not set'}), 503
+    supplied = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        return jsonify({'status': 'error', 'message': 'Admin token required'}), 403
+    return None
+
+@app.route('/api/ai/admin/knowledge/reload', methods=['POST'])
+def reload_knowledge():
+    """Rebuild the knowledge base in the background and swap it in when ready"""
+    denied = _admin_denied()
+    if denied:
+        return denied
+    try:
+        data = request.get_json(silent=True) or {}
+        knowledge_base = narad_ai.knowledge_base
+        if data.get('file'):
+            directory = AI_CONFIG.get('knowledge_base_dir')
+            if not directory:
+                return jsonify({'status': 'error', 'message': 'KNOWLEDGE_BASE_DIR is not configured'}), 400
+            directory = os.path.realpath(directory)
+            path = os.path.realpath(os.path.join(directory, data['file']))
+            if os.path.dirname(path) != directory or not os.path.isfile(path):
+                return jsonify({'status': 'error', 'message': f"No knowledge file {data['file']!r} in KNOWLEDGE_BASE_DIR"}), 400
+            started = knowledge_base.reload(path)
+        else:
+            started = knowledge_base.reload()
+        if not started:
+            return jsonify({'status': 'error', 'message': 'A reload is already in progress'}), 409
+        return jsonify({
+            'status': 'accepted',
+            'reload': knowledge_base.get_reload_stats()
+        }), 202
+    except Exception as e:
+        logger.error(f"Error starting knowledge base reload: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/ai/admin/knowledge/ingest', methods=['POST'])
+def ingest_knowledge():
+    """Validate and add a batch of monuments and stories; invalid records are reported by position"""
+    denied = _admin_denied()
+    if denied:
+        return denied
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not (data.get('monuments') or data.get('stories')):
+            return jsonify({
+                'status': 'error',
+                'message': 'JSON body with monuments and/or stories lists is required'
+            }), 400
+        report = narad_ai.knowledge_base.ingest(
+            monuments=data.get('monuments'),
+            stories=data.get('stories'),
+            on_conflict=data.get('on_conflict', 'error')
+        )
+        return jsonify({
+            'status': 'partial' if report['errors'] else 'success',
+            'report': report
+        })
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error ingesting knowledge: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/ai/admin/knowledge/status', methods=['GET'])
+def knowledge_status():
+    """Version and source of the knowledge base being served, and reload counters"""
+    denied = _admin_denied()
+    if denied:
+        return denied
+    try:
+        return jsonify({
+            'status': 'success',
+            'reload': narad_ai.knowledge_base.get_reload_stats(),
+            'summary': narad_ai.knowledge_base.get_knowledge_summary()
+        })
+    except Exception as e:
+        logger.error(f"Error getting knowledge base status: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/ai/admin/knowledge/dangling', methods=['GET'])
+def dangling_references():
+    """References in the knowledge base to stories or monuments that do not exist"""
+    denied = _admin_denied()
+    if denied:
+        return denied
+    try:
+        references = narad_ai.knowledge_base.get_dangling_references()
+        return jsonify({
+            'status': 'success',
+            'count': len(references),
+            'references': references
+        })
+    except Exception as e:
+        logger.error(f"Error listing dangling references: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @app.route('/api/test', methods=['GET'])
 def test():
     return jsonify({
@@ -163,7 +420,9 @@ def test():
         'endpoints': {
             'chat': '/api/ai/chat (POST)',
             'health': '/health (GET)',
-            'test': '/api/test (GET)'
+            'test': '/api/test (GET)',
+            'memory_stats': '/api/ai/memory/stats (GET)',
+            'memory_export': '/api/ai/memory/export (POST)'
         }
     })
 
@@ -0,0 +1,93 @@
+"""
+Entity graph benchmark: build time for a synthetic catalog, neighbour lookups,
+and "stories about <figure> at sites in <state>" answered by graph traversal
+against filtering every story and monument per query, plus incremental adds.
+
+Usage: python benchmark_entity_graph.py [monuments] [stories] [queries]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+
+import numpy as np
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from synthetic_knowledge import generate, STATES, FIGURES
+
+
+def _scan_stories(knowledge_base, figure, state):
+    """What answering the query took without the graph: one pass over every story and its monument."""
+    found = []
+    for story_id, story in knowledge_base.stories_db.items():
+        monument = knowledge_base.monuments_db.get(story.get('monument'))
+        if monument and monument['location'].endswith(state) and figure in monument['related_figures']:
+            found.append(story_id)
+    return found
+
+
+def _graph_stories(graph, figure, state):
+    """The same query as two traversals meeting at the monuments."""
+    sites = graph.traverse([graph.node_id('figure', figure)], [('figure', 'monument')])
+    in_state = graph.traverse([graph.node_id('state', state)], [('state', 'monument')])
+    return graph.expand(np.intersect1d(sites, in_state, assume_unique=True), 'story', 'site')
+
+
+def run_benchmark(n_monuments: int = 100000, n_stories: int = 100000, queries: int = 200):
+    knowledge_base = CulturalKnowledgeBase()
+    data = generate(n_monuments=n_monuments, n_stories=n_stories)
+    knowledge_base.monuments_db = data['monuments_db']
+    knowledge_base.stories_db = data['stories_db']
+
+    start = time.perf_counter()
+    knowledge_base._build_entity_graph()
+    graph = knowledge_base.get_entity_graph()
+    print(f"{n_monuments} monuments, {n_stories} stories: entity graph built in {time.perf_counter() - start:.2f} s "
+          f"({graph.get_graph_stats()})")
+
+    rng = random.Random(5)
+    pairs = [(rng.choice(FIGURES), rng.choice(STATES)) for _ in range(queries)]
+    scans = 5
+    start = time.perf_counter()
+    for figure, state in pairs[:scans]:
+        _scan_stories(knowledge_base, figure, state)
+    scan_ms = (time.perf_counter() - start) / scans * 1e3
+
+    start = time.perf_counter()
+    found = 0
+    for figure, state in pairs:
+        found += len(_graph_stories(graph, figure, state))
+    graph_ms = (time.perf_counter() - start) / queries * 1e3
+    print(f"stories about <figure> at sites in <state>: scan {scan_ms:.1f} ms; graph {graph_ms:.2f} ms "
+          f"({scan_ms / graph_ms:.0f}x, {found / queries:.0f} stories/query)")
+
+    nodes = rng.sample(range(len(graph)), min(10000, len(graph)))
+    start = time.perf_counter()
+    for node in nodes:
+        graph.neighbours(node)
+    print(f"neighbours: {(time.perf_counter() - start) / len(nodes) * 1e6:.1f} us/call")
+
+    start = time.perf_counter()
+    for i in range(200):
+        knowledge_base.find_connected_stories(figure=pairs[i % queries][0], monument=f'site_{i}')
+    print(f"find_connected_stories(figure, monument): {(time.perf_counter() - start) / 200 * 1e3:.3f} ms/call")
+
+    start = time.perf_counter()
+    for i in range(5000):
+        knowledge_base.add_story({
+            'title': f'Benchmark Tale {i} of Hanuman', 'type': 'folklore',
+            'monument': f'site_{i % n_monuments}', 'content': 'Told by local guides', 'themes': ['devotion']
+        })
+    print(f"add_story with graph update: {(time.perf_counter() - start) / 5000 * 1e3:.3f} ms/call "
+          f"({graph.get_graph_stats()['delta_edges']} delta edges)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:4]]
+    run_benchmark(*args)
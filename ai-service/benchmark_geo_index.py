@@ -0,0 +1,92 @@
+"""
+Geospatial benchmark: KD-tree radius and k-nearest queries against a linear
+haversine scan over the catalog, with build, incremental add and
+get_location_culture costs.
+
+Usage: python benchmark_geo_index.py [monuments] [queries]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.geo_index import haversine_km, monument_coordinates
+from synthetic_knowledge import generate
+
+
+def _scan_nearby(monuments, latitude, longitude, radius_km):
+    """The per-query scan a catalog without a spatial index needs."""
+    found = []
+    for monument_id, monument in monuments.items():
+        coordinates = monument_coordinates(monument)
+        if coordinates is not None:
+            distance = haversine_km(latitude, longitude, coordinates[0], coordinates[1])
+            if distance <= radius_km:
+                found.append((distance, monument_id))
+    return sorted(found)
+
+
+def run_benchmark(n_monuments: int = 100000, queries: int = 2000):
+    knowledge_base = CulturalKnowledgeBase()
+    sections = generate(n_monuments=n_monuments, n_stories=n_monuments)
+    knowledge_base.monuments_db = sections['monuments_db']
+    knowledge_base.stories_db = sections['stories_db']
+
+    start = time.perf_counter()
+    knowledge_base._build_geo_index()
+    print(f"{n_monuments} monuments: geo index built in {time.perf_counter() - start:.2f} s "
+          f"({knowledge_base.geo_index.get_index_stats()})")
+
+    rng = random.Random(3)
+    points = [(rng.uniform(10, 31), rng.uniform(72, 88)) for _ in range(queries)]
+
+    scans = 10
+    start = time.perf_counter()
+    for latitude, longitude in points[:scans]:
+        _scan_nearby(knowledge_base.monuments_db, latitude, longitude, 25.0)
+    scan_ms = (time.perf_counter() - start) / scans * 1e3
+
+    start = time.perf_counter()
+    found = 0
+    for latitude, longitude in points:
+        found += len(knowledge_base.find_nearby_monuments(latitude, longitude, radius_km=25.0))
+    within_ms = (time.perf_counter() - start) / queries * 1e3
+    print(f"within 25 km: linear scan {scan_ms:.1f} ms/query; index {within_ms:.3f} ms/query "
+          f"({scan_ms / within_ms:.0f}x, {found / queries:.1f} monuments/query)")
+
+    start = time.perf_counter()
+    for latitude, longitude in points:
+        knowledge_base.find_nearest_monuments(latitude, longitude, k=5)
+    print(f"5 nearest: {(time.perf_counter() - start) / queries * 1e3:.3f} ms/query")
+
+    start = time.perf_counter()
+    for i in range(1000):
+        latitude, longitude = points[i % queries]
+        knowledge_base.add_monument({'name': f'Benchmark Site {i}', 'location': 'Town 1, Delhi',
+                                     'latitude': latitude, 'longitude': longitude})
+    print(f"add_monument with geo update: {(time.perf_counter() - start) / 1000 * 1e3:.3f} ms "
+          f"({knowledge_base.geo_index.get_index_stats()})")
+
+    # Monument names resolve through the lookup index, rebuilt for the synthetic catalog
+    knowledge_base._build_monument_lookup()
+    places = ('Town 5', 'Karnataka', 'Site 42 Fort')
+    for place in places:
+        knowledge_base.get_location_culture(place)
+    rounds = 20
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for place in places:
+            knowledge_base.get_location_culture(place)
+    print(f"get_location_culture: {(time.perf_counter() - start) / (rounds * len(places)) * 1e3:.2f} ms/call")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run_benchmark(*args)
@@ -0,0 +1,51 @@
+"""
+Benchmark for relevance-ranked history selection: per-call latency against
+the microsecond budget, cold (first call) and warm (token sets cached).
+
+Usage: python benchmark_history_selector.py [turns] [iterations]
+"""
+
+import os
+import sys
+import time
+import logging
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.history_selector import HistorySelector
+
+ANSWER = (
+    "The monument was commissioned during the Mughal period and blends Persian, Islamic "
+    "and Indian architectural styles, with gardens, minarets and inlaid marble. "
+) * 8
+
+
+def run_benchmark(turns: int = 25, iterations: int = 2000):
+    messages = []
+    for i in range(turns):
+        messages.append({'role': 'user', 'content': f"Question {i} about monument {i} and its history", 'timestamp': f"t{i}u"})
+        messages.append({'role': 'ai', 'content': f"{i} {ANSWER}", 'timestamp': f"t{i}a"})
+
+    selector = HistorySelector(time_budget_us=10 ** 6)
+    start = time.perf_counter()
+    selector.select(messages, "Tell me more about monument 3 and its gardens")
+    print(f"Cold selection over {turns} turns: {(time.perf_counter() - start) * 1e6:.1f} us")
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        selector.select(messages, f"Tell me more about monument {i % turns} and its gardens")
+    warm_us = (time.perf_counter() - start) * 1e6 / iterations
+    print(f"Warm selection over {turns} turns: {warm_us:.1f} us/call")
+
+    budgeted = HistorySelector()
+    for i in range(iterations):
+        budgeted.select(messages, f"Tell me more about monument {i % turns}")
+    stats = budgeted.get_selector_stats()
+    print(f"Budget {budgeted.time_budget_us} us exceeded in {stats['budget_exceeded']}/{stats['selections']} selections")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run_benchmark(*args)
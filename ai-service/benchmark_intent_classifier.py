@@ -0,0 +1,62 @@
+"""
+Accuracy and latency benchmark for intent classification: the trained
+linear model (single and batched scoring) against the legacy keyword rules,
+on the held-out split of data/intent_dataset.jsonl.
+
+Usage: python benchmark_intent_classifier.py [iterations]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.intent_classifier import IntentClassifier, classify_by_keywords
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), 'data', 'intent_dataset.jsonl')
+
+
+def run_benchmark(iterations: int = 200):
+    with open(DATASET_PATH, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    test_rows = [row for row in rows if row['split'] == 'test']
+    messages = [row['text'] for row in test_rows]
+    expected = [row['intent'] for row in test_rows]
+
+    start = time.perf_counter()
+    classifier = IntentClassifier.load()
+    print(f"Model load: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    keyword_accuracy = sum(classify_by_keywords(m) == e for m, e in zip(messages, expected)) / len(messages)
+    model_accuracy = sum(p == e for (p, _), e in zip(classifier.classify_batch(messages), expected)) / len(messages)
+    print(f"Held-out accuracy ({len(messages)} messages): keyword rules {keyword_accuracy:.3f}, model {model_accuracy:.3f}")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for message in messages:
+            classify_by_keywords(message)
+    keyword_us = (time.perf_counter() - start) * 1e6 / (iterations * len(messages))
+
+    start = time.perf_counter()
+    for _ in range(iterations // 10 or 1):
+        for message in messages:
+            classifier.classify(message)
+    single_us = (time.perf_counter() - start) * 1e6 / ((iterations // 10 or 1) * len(messages))
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        classifier.classify_batch(messages)
+    batch_us = (time.perf_counter() - start) * 1e6 / (iterations * len(messages))
+
+    print(f"Latency: keyword rules {keyword_us:.2f} us/message, model single {single_us:.1f} us/message, "
+          f"model batch of {len(messages)} {batch_us:.1f} us/message")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:2]]
+    run_benchmark(*args)
@@ -0,0 +1,82 @@
+"""
+Ingestion benchmark: one validated batch of stories (and of monuments) into a
+loaded catalog against the same records added one add_story call at a time.
+
+Usage: python benchmark_kb_ingest.py [catalog monuments] [stories] [monuments]
+"""
+
+import os
+import sys
+import time
+import logging
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from synthetic_knowledge import generate
+
+
+def _catalog(n_monuments):
+    """Knowledge base with a synthetic catalog and every index built, as after a load."""
+    knowledge_base = CulturalKnowledgeBase()
+    knowledge_base.monuments_db.update(generate(n_monuments=n_monuments, n_stories=0)['monuments_db'])
+    knowledge_base._build_geo_index()
+    knowledge_base._build_period_index()
+    knowledge_base._build_indexes()
+    knowledge_base.find_monuments('warm up')
+    return knowledge_base
+
+
+def run_benchmark(n_monuments: int = 50000, n_stories: int = 50000, n_new_monuments: int = 5000):
+    data = generate(n_monuments=n_monuments, n_stories=n_stories)
+    stories = [dict(story, id=f'ingested_{story_id}') for story_id, story in data['stories_db'].items()]
+
+    knowledge_base = _catalog(n_monuments)
+    start = time.perf_counter()
+    report = knowledge_base.ingest(stories=stories)
+    batch_seconds = time.perf_counter() - start
+    print(f"ingest {n_stories} stories into {n_monuments} monuments: {batch_seconds:.2f} s "
+          f"({report['added']['story']} added, {len(report['errors'])} rejected)")
+
+    singles = min(n_stories, 2000)
+    knowledge_base = _catalog(n_monuments)
+    start = time.perf_counter()
+    for story in stories[:singles]:
+        knowledge_base.add_story(story)
+    single_seconds = (time.perf_counter() - start) / singles * n_stories
+    print(f"add_story x {singles}: extrapolated to {single_seconds:.1f} s for {n_stories} "
+          f"({single_seconds / batch_seconds:.1f}x slower)")
+
+    monuments = [
+        dict(monument, id=f'new_{monument_id}')
+        for monument_id, monument in generate(n_monuments=n_new_monuments, n_stories=0, seed=11)['monuments_db'].items()
+    ]
+    knowledge_base = _catalog(n_monuments)
+    start = time.perf_counter()
+    report = knowledge_base.ingest(monuments=monuments)
+    print(f"ingest {n_new_monuments} monuments: {time.perf_counter() - start:.2f} s "
+          f"({report['added']['monument']} added); related graph rebuilt in the background")
+    start = time.perf_counter()
+    while knowledge_base._pending_monuments is not None:
+        time.sleep(0.05)
+    print(f"background related-graph rebuild finished {time.perf_counter() - start:.2f} s later")
+
+    singles = min(n_new_monuments, 200)
+    single_base = _catalog(n_monuments)
+    start = time.perf_counter()
+    for monument in monuments[:singles]:
+        single_base.add_monument(dict(monument, name=monument['id']))
+    print(f"add_monument x {singles}: extrapolated to {(time.perf_counter() - start) / singles * n_new_monuments:.1f} s "
+          f"for {n_new_monuments}")
+
+    start = time.perf_counter()
+    report = knowledge_base.ingest(monuments=monuments[:1000] + [{'name': 'Broken'}], stories=stories[:1000])
+    print(f"1000 duplicate monuments + 1000 duplicate stories + 1 invalid rejected in "
+          f"{time.perf_counter() - start:.3f} s ({len(report['errors'])} errors)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:4]]
+    run_benchmark(*args)
@@ -0,0 +1,49 @@
+"""
+Knowledge base load benchmark: startup time and memory for a synthetic
+catalog in JSON Lines and SQLite form, with story bodies loaded lazily.
+
+Usage: python benchmark_kb_loader.py [monuments] [stories]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.kb_loader import save_knowledge_file
+from synthetic_knowledge import generate
+
+
+def run_benchmark(n_monuments: int = 50000, n_stories: int = 50000):
+    sections = generate(n_monuments, n_stories)
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ('catalog.jsonl', 'catalog.sqlite'):
+            path = os.path.join(directory, name)
+            save_knowledge_file(path, sections, version='benchmark')
+            size_mb = os.path.getsize(path) / 1e6
+
+            knowledge_base = CulturalKnowledgeBase(path)
+            stats = knowledge_base.get_load_stats()
+
+            start = time.perf_counter()
+            content = knowledge_base.stories_db['story_123']['content']
+            fetch_us = (time.perf_counter() - start) * 1e6
+
+            print(f"{name}: {size_mb:.1f} MB on disk, {stats['records']} records loaded in "
+                  f"{stats['load_seconds'] * 1e3:.0f} ms, RSS +{stats['rss_growth_bytes'] / 1e6:.0f} MB, "
+                  f"first body fetch {fetch_us:.0f} us ({len(content)} chars)")
+            # Let background indexing finish so it does not compete with the next load
+            knowledge_base.wait_for_indexes()
+            knowledge_base._content_store.close()
+            del knowledge_base
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run_benchmark(*args)
@@ -0,0 +1,143 @@
+"""
+Knowledge base memory benchmark: a synthetic catalog loaded as one dict per
+record against compact column storage with interned strings. Reports
+allocated bytes of the loaded sections, resident memory of a fully indexed
+knowledge base in a fresh process, field read speed, and the private memory a
+forked worker dirties by reading every record (reference counting copies the
+pages of dict records; column arrays stay shared).
+
+Usage: python benchmark_kb_memory.py [monuments] [stories]
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import logging
+import tempfile
+import subprocess
+import tracemalloc
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.kb_loader import load_knowledge_file, save_knowledge_file
+from synthetic_knowledge import generate
+
+MB = 1024 * 1024
+
+
+def _traced_load(path, compact):
+    """Bytes held by the loaded monument and story sections."""
+    gc.collect()
+    tracemalloc.start()
+    data = load_knowledge_file(path, compact=compact)
+    sections = {attribute: data['sections'][attribute] for attribute in ('monuments_db', 'stories_db')}
+    del data
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return sections, allocated
+
+
+def _read_all(monuments_db):
+    """The fields the indexes and suggestion pools read from every monument."""
+    found = 0
+    for monument in monuments_db.values():
+        found += len(monument['location']) + len(monument.get('related_figures', []))
+        monument.get('period')
+        monument.get('latitude')
+    return found
+
+
+def _private_dirty_bytes():
+    """Pages of this process no longer shared with its parent, or 0 where /proc is unavailable."""
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Private_Dirty:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _forked_read_bytes(monuments_db):
+    """Private memory a forked worker gains by reading every record once."""
+    if not hasattr(os, 'fork'):
+        return 0
+    gc.collect()
+    gc.freeze()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        before = _private_dirty_bytes()
+        _read_all(monuments_db)
+        os.write(write_fd, str(_private_dirty_bytes() - before).encode())
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as reader:
+        grown = int(reader.read() or 0)
+    os.waitpid(pid, 0)
+    gc.unfreeze()
+    return grown
+
+
+def _knowledge_base_rss(path, compact):
+    """Resident memory of a loaded and fully indexed knowledge base, measured in a fresh process."""
+    code = (
+        "import sys, json, logging; sys.path.insert(0, sys.argv[1]); logging.disable(logging.CRITICAL)\n"
+        "from src.utils.cultural_knowledge import CulturalKnowledgeBase\n"
+        "from src.utils.kb_loader import current_rss_bytes\n"
+        "before = current_rss_bytes()\n"
+        "kb = CulturalKnowledgeBase(sys.argv[2], compact=sys.argv[3] == '1')\n"
+        "kb.wait_for_indexes(600)\n"
+        "print(json.dumps({'seconds': kb.load_stats['load_seconds'], 'loaded': kb.load_stats['rss_growth_bytes'],\n"
+        "                  'indexed': current_rss_bytes() - before}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code, os.path.dirname(os.path.abspath(__file__)), path, '1' if compact else '0'],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmark(n_monuments: int = 100000, n_stories: int = 100000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'catalog.jsonl')
+        save_knowledge_file(path, generate(n_monuments=n_monuments, n_stories=n_stories), version='benchmark')
+        print(f"{n_monuments} monuments, {n_stories} stories")
+
+        results = {}
+        for compact in (False, True):
+            label = 'compact' if compact else 'dicts'
+            sections, allocated = _traced_load(path, compact)
+            monuments_db = sections['monuments_db']
+
+            start = time.perf_counter()
+            _read_all(monuments_db)
+            read_ms = (time.perf_counter() - start) * 1e3
+            forked = _forked_read_bytes(monuments_db)
+            results[label] = allocated
+            print(f"{label:>7}: sections {allocated / MB:.1f} MB; "
+                  f"read 4 fields of every monument {read_ms:.0f} ms; "
+                  f"forked worker dirtied {forked / MB:.1f} MB reading them")
+            if compact:
+                print(f"         string table: {len(monuments_db.strings)} strings; "
+                      f"{monuments_db.get_storage_stats()}")
+            del sections, monuments_db
+            gc.collect()
+        print(f"sections {results['dicts'] / results['compact']:.1f}x smaller when compact")
+
+        for compact in (False, True):
+            rss = _knowledge_base_rss(path, compact)
+            print(f"{'compact' if compact else 'dicts':>7}: knowledge base loaded in {rss['seconds']:.2f} s, "
+                  f"RSS after load {rss['loaded'] / MB:.0f} MB, with every index built {rss['indexed'] / MB:.0f} MB")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run_benchmark(*args)
@@ -0,0 +1,73 @@
+"""
+Reload benchmark: time to rebuild a file-backed knowledge base with its
+indexes in the background, and reader latency while the rebuild and the
+swap happen.
+
+Usage: python benchmark_kb_reload.py [monuments] [stories]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+import logging
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.kb_loader import save_knowledge_file
+from src.utils.kb_reload import ReloadableKnowledgeBase
+from synthetic_knowledge import generate
+
+
+def _read_latencies(knowledge_base, ids, stop):
+    """get_monument_info latencies in microseconds until stopped."""
+    latencies = []
+    i = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        knowledge_base.get_monument_info(ids[i % len(ids)])
+        latencies.append((time.perf_counter() - start) * 1e6)
+        i += 1
+        time.sleep(0)
+    return latencies
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+
+def run_benchmark(n_monuments: int = 50000, n_stories: int = 50000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'kb.jsonl')
+        save_knowledge_file(path, generate(n_monuments=n_monuments, n_stories=n_stories), version='synthetic')
+        knowledge_base = ReloadableKnowledgeBase(path)
+        knowledge_base.wait_for_indexes(600)
+        ids = list(knowledge_base.monuments_db)
+
+        for label, reload in (('idle', False), ('during reload', True)):
+            stop = threading.Event()
+            result = {}
+            reader = threading.Thread(target=lambda: result.update(latencies=_read_latencies(knowledge_base, ids, stop)))
+            reader.start()
+            start = time.perf_counter()
+            if reload:
+                knowledge_base.reload(wait=True)
+            else:
+                time.sleep(2)
+            elapsed = time.perf_counter() - start
+            stop.set()
+            reader.join()
+            latencies = result['latencies']
+            print(f"{label}: {len(latencies)} reads over {elapsed:.2f} s, p50 {_percentile(latencies, 0.5):.1f} us, "
+                  f"p99 {_percentile(latencies, 0.99):.1f} us, max {max(latencies) / 1e3:.1f} ms")
+        print(f"reload stats: {knowledge_base.get_reload_stats()}")
+        knowledge_base.snapshot()._content_store.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run_benchmark(*args)
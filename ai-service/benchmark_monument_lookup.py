@@ -0,0 +1,69 @@
+"""
+Monument lookup benchmark: the trigram/alias index behind get_monument_info
+against the linear name scan it replaced, on a synthetic catalog.
+
+Usage: python benchmark_monument_lookup.py [monuments] [queries]
+"""
+
+import os
+import sys
+import time
+import logging
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from synthetic_knowledge import generate
+
+QUERIES = ['ताज महल', 'Lal Qila', 'taj mahel', 'Kedarnath', 'no such place']
+
+
+def _linear_lookup(monuments_db, monument_id):
+    """The original fallback: substring match over every monument name"""
+    monument = monuments_db.get(monument_id)
+    if not monument:
+        for mid, mdata in monuments_db.items():
+            if monument_id.lower() in mdata['name'].lower():
+                return mdata
+    return monument
+
+
+def run_benchmark(n_monuments: int = 100000, queries: int = 700):
+    knowledge_base = CulturalKnowledgeBase()
+    samples = knowledge_base.monuments_db
+    monuments = generate(n_monuments=n_monuments, n_stories=0)['monuments_db']
+    monuments.update(samples)
+    knowledge_base.monuments_db = monuments
+    # A synthetic name as written and with a dropped letter
+    exact = monuments['site_4242']['name']
+    typo = monuments['site_777']['name'].lower()[:-2] + monuments['site_777']['name'][-1]
+    queries_used = [exact, typo] + QUERIES
+
+    start = time.perf_counter()
+    knowledge_base._build_monument_lookup()
+    lookup = knowledge_base.get_monument_lookup()
+    print(f"{len(monuments)} monuments: lookup index built in {time.perf_counter() - start:.2f} s "
+          f"({lookup.get_lookup_stats()})")
+
+    scan_queries = len(queries_used) * 3
+    start = time.perf_counter()
+    for i in range(scan_queries):
+        _linear_lookup(monuments, queries_used[i % len(queries_used)])
+    scan_ms = (time.perf_counter() - start) / scan_queries * 1e3
+
+    start = time.perf_counter()
+    for i in range(queries):
+        knowledge_base.get_monument_info(queries_used[i % len(queries_used)])
+    index_ms = (time.perf_counter() - start) / queries * 1e3
+    print(f"linear scan: {scan_ms:.2f} ms/lookup; index: {index_ms:.3f} ms/lookup ({scan_ms / index_ms:.0f}x)")
+
+    for query in queries_used:
+        legacy = _linear_lookup(monuments, query)
+        print(f"  {query!r}: scan -> {legacy and legacy['name']!r}, index -> {knowledge_base.find_monuments(query, 3)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run_benchmark(*args)
@@ -0,0 +1,85 @@
+"""
+Period benchmark: year and year-range queries over parsed timeframes against
+re-parsing every timeframe and scanning every monument per query, plus
+timeline and incremental add costs.
+
+Usage: python benchmark_period_index.py [monuments] [dynasties] [queries]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.period_index import parse_timeframe
+from synthetic_knowledge import generate
+
+
+def _scan_year(knowledge_base, year):
+    """What answering "what was happening in <year>" took before timeframes were indexed."""
+    found = []
+    for records in (knowledge_base.historical_periods, knowledge_base.cultural_contexts):
+        for record_id, record in records.items():
+            span = parse_timeframe(record.get('timeframe'))
+            if span and (span[0] is None or span[0] <= year) and (span[1] is None or span[1] >= year):
+                found.append(record_id)
+    for monument_id, monument in knowledge_base.monuments_db.items():
+        if monument.get('built_year') == year:
+            found.append(monument_id)
+    return found
+
+
+def run_benchmark(n_monuments: int = 100000, n_dynasties: int = 2000, queries: int = 5000):
+    knowledge_base = CulturalKnowledgeBase()
+    knowledge_base.monuments_db = generate(n_monuments=n_monuments, n_stories=0)['monuments_db']
+    rng = random.Random(5)
+    for i in range(n_dynasties):
+        start = rng.randint(1, 1850)
+        knowledge_base.cultural_contexts[f'dynasty_{i}_period'] = {'timeframe': f'{start}-{start + rng.randint(20, 400)} CE'}
+
+    start = time.perf_counter()
+    knowledge_base._build_period_index()
+    print(f"{n_monuments} monuments, {n_dynasties} dynasties: period index built in {time.perf_counter() - start:.2f} s "
+          f"({knowledge_base.period_index.get_index_stats()})")
+
+    years = [rng.randint(300, 1900) for _ in range(queries)]
+    scans = 10
+    start = time.perf_counter()
+    for year in years[:scans]:
+        _scan_year(knowledge_base, year)
+    scan_ms = (time.perf_counter() - start) / scans * 1e3
+
+    start = time.perf_counter()
+    found = 0
+    for year in years:
+        found += len(knowledge_base.period_index.at(year))
+    point_ms = (time.perf_counter() - start) / queries * 1e3
+    print(f"year query: scan {scan_ms:.1f} ms; index {point_ms:.3f} ms ({scan_ms / point_ms:.0f}x, "
+          f"{found / queries:.0f} entries/query)")
+
+    start = time.perf_counter()
+    for year in years:
+        knowledge_base.period_index.overlapping(year, year + 10, ['monument'])
+    print(f"10-year monument range: {(time.perf_counter() - start) / queries * 1e3:.3f} ms/query")
+
+    ids = list(knowledge_base.monuments_db)
+    start = time.perf_counter()
+    for i in range(1000):
+        knowledge_base.get_cultural_timeline(ids[(i * 97) % len(ids)])
+    print(f"get_cultural_timeline: {(time.perf_counter() - start):.3f} ms/call")
+
+    start = time.perf_counter()
+    for i in range(1000):
+        knowledge_base.add_monument({'name': f'Benchmark Site {i}', 'location': 'Delhi', 'built_year': years[i]})
+    print(f"add_monument with period update: {(time.perf_counter() - start):.3f} ms/call")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:4]]
+    run_benchmark(*args)
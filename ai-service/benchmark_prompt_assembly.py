@@ -0,0 +1,118 @@
+"""
+Prompt assembly cost against history size: the previous per-request
+f-string rendering against precompiled per-language templates with
+segment joins. Both use the last turns of the history; the relevance
+selection that runs in front of either is timed separately.
+
+Usage: python benchmark_prompt_assembly.py [iterations]
+"""
+
+import os
+import sys
+import time
+import logging
+from datetime import datetime, timedelta
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.services.narad_ai import NaradAI
+from src.utils.history_selector import pair_turns
+
+logger = logging.getLogger('src.services.narad_ai')
+
+
+def legacy_prompt(narad, history, summary, message, language, profile):
+    """The system_prompt and full_prompt f-strings this replaced"""
+    summary_block = f"Summary of earlier conversation: {summary}\n" if summary else ""
+    logger.info(f"Formatting conversation history with {len(history)} messages")
+    turns = pair_turns(history)[-narad.history_selector.max_turns:]
+    formatted_messages = []
+    for user_message, ai_message in turns:
+        lines = []
+        if user_message is not None:
+            lines.append(f"User: {user_message.get('content', '')}")
+        lines.append(f"Narad: {ai_message.get('content', '') if ai_message is not None else '[awaiting response]'}")
+        formatted_messages.append("\n".join(lines))
+    formatted_history = summary_block + "\n".join(formatted_messages)
+    logger.info(f"Formatted conversation history: {formatted_history}")
+
+    system_prompt = f"""
+{narad.context_templates['greeting']}
+
+Current conversation context:
+- Language: {narad._get_language_context(language)}
+- User Language Preference: {language}{profile}
+
+IMPORTANT INSTRUCTIONS:
+1. Respond in the same language as the user's input when possible, maintaining Indian cultural context
+2. For example, if the user writes in Hindi script, respond in Hindi script
+3. If the user writes in English but with Indian context, respond in English with Indian cultural references
+4. CRITICAL: If the user writes entirely in English, respond entirely in English without mixing Hindi words
+5. NEVER use informal terms like "beta", "bro", "dude", "yaar", etc.
+6. Maintain a professional, respectful, and educational tone at all times
+7. Use appropriate honorifics when referring to deities and cultural figures
+8. Avoid slang, colloquialisms, and casual expressions
+
+Conversation History:
+{formatted_history}
+"""
+    return f"""
+{system_prompt}
+
+User Message: "{message}"
+
+Narad's Response:
+"""
+
+
+def template_prompt(narad, history, summary, message, language, profile):
+    return narad.prompt_templates.get(language).render(
+        profile, narad._history_segments(history, summary), message
+    )
+
+
+def _history(size):
+    start = datetime(2024, 1, 1)
+    topics = ['Taj Mahal', 'Red Fort', 'Hampi', 'Kedarnath', 'Badrinath']
+    history = []
+    for i in range(size):
+        role = 'user' if i % 2 == 0 else 'ai'
+        topic = topics[(i // 2) % len(topics)]
+        content = f"Tell me more about the {topic} and its builders" if role == 'user' else f"The {topic} is a remarkable monument. " * 12
+        history.append({'role': role, 'content': content, 'timestamp': (start + timedelta(seconds=i)).isoformat()})
+    return history
+
+
+def run_benchmark(iterations: int = 2000):
+    narad = NaradAI()
+    message = "Who built the Red Fort?"
+    summary = "The visitor asked about Mughal monuments in Agra and Delhi."
+    profile = "\n- Returning visitor, previously explored: Taj Mahal"
+
+    history = _history(6)
+    assert legacy_prompt(narad, history, summary, message, 'en-IN', profile) == template_prompt(narad, history, summary, message, 'en-IN', profile)
+
+    print(f"{'messages':>8} {'legacy us':>10} {'template us':>12} {'speedup':>8} {'selection us':>13}")
+    for size in (2, 6, 20, 60, 200):
+        history = _history(size)
+        results = []
+        for build in (legacy_prompt, template_prompt):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                build(narad, history, summary, message, 'ta-IN', profile)
+            results.append((time.perf_counter() - start) * 1e6 / iterations)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            narad.history_selector.select(history, message)
+        selection_us = (time.perf_counter() - start) * 1e6 / iterations
+        print(f"{size:>8} {results[0]:>10.2f} {results[1]:>12.2f} {results[0] / results[1]:>7.2f}x {selection_us:>13.1f}")
+
+    narad.conversation_memory.close()
+    narad.user_memory.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:2]]
+    run_benchmark(*args)
@@ -0,0 +1,60 @@
+"""
+Related-monument benchmark: precomputed kNN graph against the per-call
+linear scan, with bulk build, incremental add and full export costs.
+
+Usage: python benchmark_related_monuments.py [monuments] [lookups]
+"""
+
+import os
+import sys
+import time
+import json
+import logging
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from synthetic_knowledge import generate
+
+
+def run_benchmark(n_monuments: int = 100000, lookups: int = 10000):
+    knowledge_base = CulturalKnowledgeBase()
+    sections = generate(n_monuments=n_monuments, n_stories=n_monuments)
+    knowledge_base.monuments_db = sections['monuments_db']
+    knowledge_base.stories_db = sections['stories_db']
+
+    start = time.perf_counter()
+    knowledge_base._build_related_graph()
+    print(f"{n_monuments} monuments: graph built in {time.perf_counter() - start:.2f} s "
+          f"({knowledge_base.related_graph.get_graph_stats()})")
+
+    ids = list(knowledge_base.monuments_db)
+    scans = 20
+    start = time.perf_counter()
+    for i in range(scans):
+        knowledge_base._scan_related_monuments(ids[i * 7])
+    scan_ms = (time.perf_counter() - start) / scans * 1e3
+
+    start = time.perf_counter()
+    for i in range(lookups):
+        knowledge_base.get_related_monuments(ids[(i * 7) % len(ids)])
+    graph_us = (time.perf_counter() - start) / lookups * 1e6
+    print(f"linear scan: {scan_ms:.1f} ms/call; graph: {graph_us:.1f} us/call ({scan_ms * 1e3 / graph_us:.0f}x)")
+
+    start = time.perf_counter()
+    for i in range(100):
+        monument = dict(knowledge_base.monuments_db[ids[i]], name=f'Benchmark Site {i}')
+        knowledge_base.add_monument(monument)
+    print(f"add_monument with graph update: {(time.perf_counter() - start) * 10:.2f} ms")
+
+    start = time.perf_counter()
+    exported = knowledge_base.export_related_monuments()
+    payload = json.dumps(exported)
+    print(f"export of {len(exported)} lists: {time.perf_counter() - start:.2f} s, {len(payload) / 1e6:.1f} MB JSON")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run_benchmark(*args)
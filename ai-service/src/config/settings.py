@@ -26,7 +26,47 @@ AI_CONFIG: Dict[str, Any] = {
     'max_conversation_history': int(os.getenv('MAX_CONVERSATION_HISTORY', '20')),
     'session_timeout': int(os.getenv('SESSION_TIMEOUT', '3600')),  # 1 hour
     
+    # Global conversation memory budget (0 disables a limit)
+    'memory_max_total_messages': int(os.getenv('MEMORY_MAX_TOTAL_MESSAGES', '200000')),
+    'memory_max_total_bytes': int(os.getenv('MEMORY_MAX_TOTAL_BYTES', str(256 * 1024 * 1024))),  # 256 MB
+    'memory_spill_path': os.getenv('MEMORY_SPILL_PATH'),  # Spill evicted sessions to disk when set
+    
+    # Rolling summarization of older conversation turns (0 disables)
+    'summary_turn_threshold': int(os.getenv('SUMMARY_TURN_THRESHOLD', '10')),
+    'summary_keep_recent_turns': int(os.getenv('SUMMARY_KEEP_RECENT_TURNS', '3')),
+    'conversation_summary_max_length': int(os.getenv('CONVERSATION_SUMMARY_MAX_LENGTH', '600')),
+    
+    # Durable session persistence (append-only log + snapshots); disabled when unset
+    'memory_store_path': os.getenv('MEMORY_STORE_PATH'),
+    'memory_fsync_interval': float(os.getenv('MEMORY_FSYNC_INTERVAL', '1.0')),  # seconds
+    'memory_snapshot_interval': int(os.getenv('MEMORY_SNAPSHOT_INTERVAL', '100000')),  # events
+    'user_memory_path': os.getenv('USER_MEMORY_PATH'),  # Persist long-term user profiles when set
+    'user_memory_cache_size': int(os.getenv('USER_MEMORY_CACHE_SIZE', '10000')),  # profiles kept in memory
+    'memory_export_path': os.getenv('MEMORY_EXPORT_PATH', 'exports/conversations'),
+    'memory_export_batch_size': int(os.getenv('MEMORY_EXPORT_BATCH_SIZE', '10000')),  # rows per batch
+    
+    # Cold-turn compression: messages outside the prompt window or in idle sessions (0 disables)
+    'memory_hot_window_messages': int(os.getenv('MEMORY_HOT_WINDOW_MESSAGES', '20')),
+    'memory_cold_after_seconds': int(os.getenv('MEMORY_COLD_AFTER_SECONDS', '600')),
+    'memory_maintenance_interval': float(os.getenv('MEMORY_MAINTENANCE_INTERVAL', '60')),  # seconds; expiry and idle compression
+    
+    # Relevance-ranked history selection for the prompt
+    'history_max_turns': int(os.getenv('HISTORY_MAX_TURNS', '3')),
+    'history_selection_budget_us': int(os.getenv('HISTORY_SELECTION_BUDGET_US', '500')),  # microseconds
+    
+    # Trained intent model (defaults to models/intent_classifier.npz)
+    'intent_model_path': os.getenv('INTENT_MODEL_PATH'),
+    
+    # Per-session request serialization
+    'session_lock_timeout': float(os.getenv('SESSION_LOCK_TIMEOUT', '10.0')),  # seconds
+    'session_max_queue_depth': int(os.getenv('SESSION_MAX_QUEUE_DEPTH', '2')),
+    
     # Cultural knowledge settings
+    'knowledge_base_path': os.getenv('KNOWLEDGE_BASE_PATH'),  # .jsonl or .sqlite file; built-in samples when unset
+    'knowledge_base_dir': os.getenv('KNOWLEDGE_BASE_DIR'),  # Reload from the newest file here when it changes
+    'knowledge_base_watch_interval': float(os.getenv('KNOWLEDGE_BASE_WATCH_INTERVAL', '5.0')),  # seconds
+    'knowledge_base_compact': os.getenv('KNOWLEDGE_BASE_COMPACT', '0') != '0',  # Column storage with interned strings for file catalogs; slower startup
+    'admin_token': os.getenv('ADMIN_TOKEN'),  # Required in X-Admin-Token; admin endpoints are disabled when unset
     'cultural_context_limit': int(os.getenv('CULTURAL_CONTEXT_LIMIT', '5')),
     'story_search_limit': int(os.getenv('STORY_SEARCH_LIMIT', '3')),
     
@@ -8,6 +8,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 import random
 from ..config.settings import RECOMMENDATION_CONFIG
+from ..utils.message_analysis import AnalyzedMessage
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +39,8 @@ class ContentRecommender:
         context: Dict[str, Any],
         user_id: Optional[str] = None,
         recommendation_types: List[str] = None,
-        limit: int = 5
+        limit: int = 5,
+        analyzed: Optional[AnalyzedMessage] = None
     ) -> List[Dict[str, Any]]:
         """
         Get content recommendations based on user message and context
@@ -49,13 +51,14 @@ class ContentRecommender:
             user_id: Optional user identifier for personalization
             recommendation_types: Types of content to recommend
             limit: Maximum number of recommendations
+            analyzed: Optional AnalyzedMessage of the user message
             
         Returns:
             List of recommended content items
         """
         try:
             # Extract intent and interests from message
-            user_interests = self._extract_interests_from_message(user_message)
+            user_interests = self._extract_interests_from_message(user_message, analyzed)
             
             # Get user profile for personalization
             user_profile = self._get_user_profile(user_id) if user_id else {}
@@ -264,10 +267,14 @@ class ContentRecommender:
             {'content_id': 'hunt_1', 'content_type': 'treasure_hunt', 'trend_score': 0.8}
         ]
     
-    def _extract_interests_from_message(self, message: str) -> Dict[str, float]:
-        """Extract user interests from their message"""
+    def _extract_interests_from_message(
+        self,
+        message: str,
+        analyzed: Optional[AnalyzedMessage] = None
+    ) -> Dict[str, float]:
+        """Extract user interests from their message, reusing the analyzed lowercase form if given"""
         interests = defaultdict(float)
-        message_lower = message.lower()
+        message_lower = analyzed.lower if analyzed is not None else message.lower()
         
         # Theme detection
         theme_keywords = {
@@ -6,7 +6,7 @@ Main AI service for processing user conversations and providing cultural insight
 import os
 import json
 import logging
-import re
+import functools
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 import google.generativeai as genai
@@ -25,7 +25,19 @@ except ImportError:
     }
 
 from ..utils.cultural_knowledge import CulturalKnowledgeBase
+from ..utils.kb_reload import ReloadableKnowledgeBase
 from ..utils.conversation_memory import ConversationMemory
+from ..utils.session_store import SessionStore
+from ..utils.session_locks import SessionLockManager
+from ..utils.user_memory import UserMemoryIndex
+from ..utils.history_selector import HistorySelector, pair_turns
+from ..utils.language_detector import LanguageDetector
+from ..utils.intent_classifier import load_intent_classifier, classify_by_keywords
+from ..utils.message_analysis import AnalyzedMessage
+from ..utils.prompt_templates import PromptTemplates
+from .story_summarizer import StorySummarizer
+from .content_recommender import ContentRecommender
+from .suggestion_engine import SuggestionEngine
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +50,42 @@ class NaradAI:
     def __init__(self):
         """Initialize Narad AI with necessary configurations"""
         # Initialize knowledge base and memory
-        self.knowledge_base = CulturalKnowledgeBase()
-        self.conversation_memory = ConversationMemory()
+        # Reloadable in place, so the services below keep their reference across reloads
+        self.knowledge_base = ReloadableKnowledgeBase(
+            AI_CONFIG.get('knowledge_base_path'),
+            factory=functools.partial(CulturalKnowledgeBase, compact=AI_CONFIG.get('knowledge_base_compact', False))
+        )
+        if AI_CONFIG.get('knowledge_base_dir'):
+            self.knowledge_base.watch(AI_CONFIG['knowledge_base_dir'], AI_CONFIG.get('knowledge_base_watch_interval', 5.0))
+        self.story_summarizer = StorySummarizer()
+        self.conversation_memory = ConversationMemory(
+            max_total_messages=AI_CONFIG.get('memory_max_total_messages'),
+            max_total_bytes=AI_CONFIG.get('memory_max_total_bytes'),
+            spill_path=AI_CONFIG.get('memory_spill_path'),
+            summary_turn_threshold=AI_CONFIG.get('summary_turn_threshold'),
+            summary_keep_recent_turns=AI_CONFIG.get('summary_keep_recent_turns', 3),
+            summarizer=self._summarize_conversation,
+            store=self._create_session_store(),
+            knowledge_base=self.knowledge_base,
+            hot_window_messages=AI_CONFIG.get('memory_hot_window_messages'),
+            cold_after_seconds=AI_CONFIG.get('memory_cold_after_seconds'),
+            maintenance_interval=AI_CONFIG.get('memory_maintenance_interval')
+        )
+        self.user_memory = UserMemoryIndex(
+            knowledge_base=self.knowledge_base,
+            path=AI_CONFIG.get('user_memory_path'),
+            max_cached_profiles=AI_CONFIG.get('user_memory_cache_size', 10000)
+        )
+        self.language_detector = LanguageDetector()
+        self.intent_classifier = load_intent_classifier(AI_CONFIG.get('intent_model_path'))
+        self.history_selector = HistorySelector(
+            max_turns=AI_CONFIG.get('history_max_turns', 3),
+            time_budget_us=AI_CONFIG.get('history_selection_budget_us', 500)
+        )
+        self.session_locks = SessionLockManager(
+            timeout=AI_CONFIG.get('session_lock_timeout', 10.0),
+            max_queue_depth=AI_CONFIG.get('session_max_queue_depth', 2)
+        )
         
         # AI personality and behavior settings
         self.personality = {
@@ -68,8 +114,18 @@ class NaradAI:
             'or-IN': 'Odia'
         }
         
-        # Conversation context templates
+        # Conversation context templates, and the prompt compiled from them per language
         self.context_templates = self._load_context_templates()
+        self.prompt_templates = PromptTemplates(self.context_templates['greeting'], self.language_mapping)
+        
+        # Follow-up suggestions from the knowledge base and recommender catalog
+        self.content_recommender = ContentRecommender()
+        self.suggestion_engine = SuggestionEngine(
+            self.knowledge_base,
+            recommender=self.content_recommender,
+            languages=self.language_mapping
+        )
+        self.suggestion_engine.precompute()
         
         # Configure Gemini API
         self._configure_gemini()
@@ -110,6 +166,26 @@ class NaradAI:
             logger.error(f"Error type: {type(e)}")
             self.model = None
     
+    def _create_session_store(self) -> Optional[SessionStore]:
+        """Create the durable session store if a store path is configured"""
+        store_path = AI_CONFIG.get('memory_store_path')
+        if not store_path:
+            return None
+        return SessionStore(
+            store_path,
+            fsync_interval=AI_CONFIG.get('memory_fsync_interval', 1.0),
+            snapshot_interval=AI_CONFIG.get('memory_snapshot_interval', 100000)
+        )
+    
+    def _summarize_conversation(self, text: str) -> str:
+        """Condense older conversation turns for the rolling session summary"""
+        return self.story_summarizer.summarize(
+            text,
+            max_length=AI_CONFIG.get('conversation_summary_max_length', 600),
+            story_type='general',
+            preserve_cultural_elements=False
+        )
+    
     def is_ready(self) -> bool:
         """Check if Narad AI is ready to process requests"""
         logger.info(f"Checking if Narad AI is ready. Model is: {self.model}")
@@ -168,43 +244,30 @@ Guidelines:
 - Use appropriate cultural references and examples"""
         }
     
-    def _detect_language_from_text(self, text: str) -> str:
+    def _detect_language_from_text(self, text: str, analyzed: Optional[AnalyzedMessage] = None) -> str:
         """
-        Detect the language of the input text based on character ranges
+        Detect the language of the input text from its script histogram,
+        including romanized Hindi and Tamil
         """
-        # Hindi characters range
-        if re.search(r'[\u0900-\u097F]', text):
-            return 'hi-IN'
-        # Bengali characters range
-        elif re.search(r'[\u0980-\u09FF]', text):
-            return 'bn-IN'
-        # Tamil characters range
-        elif re.search(r'[\u0B80-\u0BFF]', text):
-            return 'ta-IN'
-        # Telugu characters range
-        elif re.search(r'[\u0C00-\u0C7F]', text):
-            return 'te-IN'
-        # Kannada characters range
-        elif re.search(r'[\u0C80-\u0CFF]', text):
-            return 'kn-IN'
-        # Malayalam characters range
-        elif re.search(r'[\u0D00-\u0D7F]', text):
-            return 'ml-IN'
-        # Punjabi characters range
-        elif re.search(r'[\u0A00-\u0A7F]', text):
-            return 'pa-IN'
-        # Gujarati characters range
-        elif re.search(r'[\u0A80-\u0AFF]', text):
-            return 'gu-IN'
-        # Marathi uses Devanagari script like Hindi
-        elif re.search(r'[\u0900-\u097F]', text) and any(word in text.lower() for word in ['marathi', 'maharashtra']):
-            return 'mr-IN'
-        # Odia characters range
-        elif re.search(r'[\u0B00-\u0B7F]', text):
-            return 'or-IN'
-        # Default to English
-        else:
-            return 'en-IN'
+        if analyzed is not None:
+            return self.language_detector.detect_message(analyzed)[0]
+        return self.language_detector.detect_language(text)
+    
+    def _format_user_profile(self, user_profile: Optional[Dict[str, Any]]) -> str:
+        """Render a returning visitor's long-term interests as extra context lines"""
+        if not user_profile or not (user_profile['monuments'] or user_profile['story_types']):
+            return ""
+        
+        lines = []
+        if user_profile['monuments']:
+            names = []
+            for monument_id in user_profile['monuments'][:5]:
+                monument = self.knowledge_base.monuments_db.get(monument_id)
+                names.append(monument['name'] if monument else monument_id.replace('_', ' ').title())
+            lines.append(f"- Returning visitor, previously explored: {', '.join(names)}")
+        if user_profile['story_types']:
+            lines.append(f"- Enjoys stories about: {', '.join(user_profile['story_types'][:3])}")
+        return "\n" + "\n".join(lines)
     
     def _get_language_context(self, language_code: str) -> str:
         """
@@ -212,25 +275,56 @@ Guidelines:
         """
         return self.language_mapping.get(language_code, 'English with Indian cultural context')
     
-    def process_message(self, message: str, session_id: str, context: Optional[Dict] = None) -> Dict[str, Any]:
+    def process_message(
+        self,
+        message: str,
+        session_id: str,
+        context: Optional[Dict] = None,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Process a user message and generate an appropriate AI response
         
+        Turns of one session run one at a time, in arrival order, so concurrent
+        requests cannot interleave their history reads and writes.
+        
         Args:
             message (str): The user's message
             session_id (str): Unique session identifier
             context (Dict, optional): Additional context information
-            
+            user_id (str, optional): Visitor identifier linking sessions to a long-term profile
+        
         Returns:
             Dict: AI response with content, intent, and suggestions
+        
+        Raises:
+            SessionBusyError: If the session's turn did not come within the lock timeout
         """
+        with self.session_locks.hold(session_id):
+            return self._process_message(message, session_id, context, user_id)
+    
+    def _process_message(
+        self,
+        message: str,
+        session_id: str,
+        context: Optional[Dict] = None,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Process one turn; the caller holds the session lock"""
         try:
             logger.info(f"Processing message: {message}")
             logger.info(f"Session ID: {session_id}")
             logger.info(f"Context: {context}")
             
-            # Get user preferences from context
-            user_language = context.get('preferences', {}).get('language', 'en') if context else 'en'
+            # Long-term interests of a returning visitor
+            user_profile = self.user_memory.get_profile(user_id) if user_id else None
+            if user_id and not self.conversation_memory.get_session(session_id):
+                self.conversation_memory.create_session(session_id, user_id)
+            
+            # Get user preferences from context, falling back to the visitor's last language
+            default_language = (user_profile or {}).get('language') or 'en'
+            preferred_language = context.get('preferences', {}).get('language') if context else None
+            user_language = preferred_language or default_language
             
             # Convert short language codes to full codes
             language_mapping = {
@@ -247,11 +341,16 @@ Guidelines:
             elif user_language not in language_mapping.values():
                 user_language = 'en-IN'  # Default to English if unknown
             
+            # Normalize, tokenize and script-count the message once for every consumer
+            analyzed = AnalyzedMessage(message)
+            
             # Detect language from the message content as well
-            detected_language = self._detect_language_from_text(message)
+            detected_language = self._detect_language_from_text(message, analyzed)
             
-            # Prefer detected language if it's a regional language
-            if detected_language != 'en-IN':
+            # Prefer detected language if it's a regional language; a guess from
+            # romanized text never overrides a language the user chose
+            romanized = self.language_detector.is_romanized(analyzed.script_histogram)
+            if detected_language != 'en-IN' and not (romanized and preferred_language):
                 user_language = detected_language
             
             # Get language context
@@ -259,14 +358,18 @@ Guidelines:
             
             logger.info(f"User language: {user_language}, Detected: {detected_language}, Language context: {language_context}")
             
-            # Retrieve conversation history
-            conversation_history = self.conversation_memory.get_history(session_id)
+            # Retrieve conversation history and the summary of older turns
+            conversation_history = self.conversation_memory.get_history(
+                session_id,
+                limit=AI_CONFIG.get('memory_hot_window_messages')
+            )
+            conversation_summary = self.conversation_memory.get_summary(session_id)
             
             # Check if this is the first message in the conversation
             is_first_message = len(conversation_history) == 0
             
             # If this is the first message and it's a greeting, provide a special greeting response
-            if is_first_message and message.lower() in ['hello', 'hi', 'namaste', 'namaskar', 'hey']:
+            if is_first_message and analyzed.lower in ['hello', 'hi', 'namaste', 'namaskar', 'hey']:
                 # Get appropriate greeting based on language
                 greeting_responses = {
                     'en-IN': "Namaste! 🙏 I'm Narad, your AI Cultural Guide. I'm here to share the rich heritage, fascinating stories, and timeless wisdom of India with you. Whether you're curious about ancient monuments, mythological tales, or cultural traditions, just ask and I'll guide you through India's incredible journey through time!",
@@ -281,45 +384,19 @@ Guidelines:
                 return {
                     'response': greeting_response,
                     'intent': 'greeting',
-                    'suggestions': [
-                        "Tell me about a historical monument",
-                        "Share a mythological story",
-                        "Recommend cultural experiences"
-                    ],
+                    'suggestions': self._generate_suggestions(
+                        message, 'greeting', user_language, user_profile=user_profile
+                    ),
                     'confidence': 0.9,
                     'timestamp': datetime.now().isoformat()
                 }
             
-            # Build context-aware prompt
-            system_prompt = f"""
-{self.context_templates['greeting']}
-
-Current conversation context:
-- Language: {language_context}
-- User Language Preference: {user_language}
-
-IMPORTANT INSTRUCTIONS:
-1. Respond in the same language as the user's input when possible, maintaining Indian cultural context
-2. For example, if the user writes in Hindi script, respond in Hindi script
-3. If the user writes in English but with Indian context, respond in English with Indian cultural references
-4. CRITICAL: If the user writes entirely in English, respond entirely in English without mixing Hindi words
-5. NEVER use informal terms like "beta", "bro", "dude", "yaar", etc.
-6. Maintain a professional, respectful, and educational tone at all times
-7. Use appropriate honorifics when referring to deities and cultural figures
-8. Avoid slang, colloquialisms, and casual expressions
-
-Conversation History:
-{self._format_conversation_history(conversation_history)}
-"""
-            
-            # Create the full prompt
-            full_prompt = f"""
-{system_prompt}
-
-User Message: "{message}"
-
-Narad's Response:
-"""
+            # Splice the dynamic parts into the language's precompiled prompt
+            full_prompt = self.prompt_templates.get(user_language).render(
+                self._format_user_profile(user_profile),
+                self._history_segments(conversation_history, conversation_summary, message, analyzed),
+                message
+            )
             
             logger.info(f"Full prompt: {full_prompt}")
             logger.info(f"Model ready: {self.model is not None}")
@@ -349,13 +426,26 @@ Narad's Response:
             
             logger.info(f"AI response: {ai_response}")
             
+            # Determine intent first so it is recorded with the message
+            intent = self._classify_intent(message, analyzed)
+            
             # Store conversation in memory
-            self.conversation_memory.add_message(session_id, 'user', message)
+            self.conversation_memory.add_message(
+                session_id, 'user', message, metadata={'intent': intent}, analyzed=analyzed
+            )
             self.conversation_memory.add_message(session_id, 'ai', ai_response)
+            if user_id:
+                self.user_memory.record_turn(user_id, message, user_language, analyzed=analyzed)
             
-            # Determine intent and suggestions
-            intent = self._classify_intent(message)
-            suggestions = self._generate_suggestions(message, intent, user_language)
+            # Determine suggestions
+            suggestions = self._generate_suggestions(
+                message,
+                intent,
+                user_language,
+                context=self.conversation_memory.get_context(session_id),
+                analyzed=analyzed,
+                user_profile=user_profile
+            )
             
             result = {
                 'response': ai_response,
@@ -367,7 +457,7 @@ Narad's Response:
             
             logger.info(f"Final result: {result}")
             return result
-            
+        
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}", exc_info=True)
             # Provide a more specific error message
@@ -392,103 +482,91 @@ Narad's Response:
                 'timestamp': datetime.now().isoformat()
             }
     
-    def _classify_intent(self, message: str) -> str:
-        """Classify the user's intent"""
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ['hello', 'hi', 'namaste', 'hey']):
-            return 'greeting'
-        elif any(word in message_lower for word in ['story', 'tell', 'myth', 'legend']):
-            return 'story_request'
-        elif any(word in message_lower for word in ['monument', 'place', 'location', 'visit']):
-            return 'location_inquiry'
-        elif any(word in message_lower for word in ['culture', 'tradition', 'festival', 'custom']):
-            return 'cultural_inquiry'
-        elif any(word in message_lower for word in ['how', 'what', 'when', 'where', 'why']):
-            return 'informational'
-        else:
-            return 'general_inquiry'
+    def _classify_intent(self, message: str, analyzed: Optional[AnalyzedMessage] = None) -> str:
+        """Classify the user's intent with the trained model, or keyword rules if it is unavailable"""
+        if self.intent_classifier is None:
+            return classify_by_keywords(analyzed.lower if analyzed is not None else message)
+        tokens = analyzed.tokens if analyzed is not None else None
+        return self.intent_classifier.classify(message, tokens)[0]
     
-    def _generate_suggestions(self, message: str, intent: str, language: str) -> List[str]:
-        """Generate follow-up suggestions based on intent and language"""
-        # Base suggestions in English
-        suggestion_templates = {
-            'greeting': [
-                "Tell me about Indian mythology",
-                "Share a story about Lord Shiva",
-                "What are some famous Indian festivals?"
-            ],
-            'story_request': [
-                "Tell me about Ramayana",
-                "Share a story about Krishna",
-                "What myths are famous in South India?"
-            ],
-            'location_inquiry': [
-                "Tell me about Taj Mahal",
-                "What's special about Hampi?",
-                "Describe the temples of Khajuraho"
-            ],
-            'cultural_inquiry': [
-                "Explain Diwali celebrations",
-                "What are Holi traditions?",
-                "Tell me about Bharatanatyam dance"
-            ],
-            'informational': [
-                "How old is the Indus Valley Civilization?",
-                "Who built the Ajanta Caves?",
-                "What is the significance of the Ganges?"
-            ],
-            'general_inquiry': [
-                "Plan a cultural journey for me",
-                "Show me AR experiences",
-                "Start a treasure hunt"
-            ]
-        }
+    def _generate_suggestions(
+        self,
+        message: str,
+        intent: str,
+        language: str,
+        context: Optional[Dict[str, Any]] = None,
+        analyzed: Optional[AnalyzedMessage] = None,
+        user_profile: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """Generate follow-up suggestions for the monument under discussion and the visitor's interests"""
+        context = context or {}
+        
+        # A monument named in this message takes precedence over the session's current one
+        monument_id = None
+        if analyzed is not None:
+            monuments = analyzed.entities_for(self.knowledge_base.get_entity_matcher()).get('monument')
+            if monuments:
+                monument_id = min(monuments)
+        monument_id = monument_id or context.get('current_monument')
         
-        suggestions = suggestion_templates.get(intent, suggestion_templates['general_inquiry'])
+        interests = set()
+        for key in ('topics', 'story_types_requested', 'figures_discussed', 'monuments_discussed'):
+            interests.update(context.get(key, ()))
+        if user_profile:
+            interests.update(user_profile.get('monuments', ()))
+            interests.update(user_profile.get('story_types', ()))
         
-        # Translate suggestions based on language if needed
-        # For now, we'll keep them in English as the AI can respond in the appropriate language
-        return suggestions[:3]  # Return top 3 suggestions
+        return self.suggestion_engine.suggest(intent, monument_id, language, interests)
     
-    def _format_conversation_history(self, conversation_history):
-        """Format conversation history safely"""
+    def _format_conversation_history(
+        self,
+        conversation_history,
+        conversation_summary: str = '',
+        current_message: Optional[str] = None
+    ):
+        """
+        Format conversation history safely, prefixed by the summary of older turns
+        
+        With the current message, the turns most relevant to it are chosen
+        (always including the previous turn); otherwise the last turns are used.
+        """
+        return ''.join(self._history_segments(conversation_history, conversation_summary, current_message))
+    
+    def _history_segments(
+        self,
+        conversation_history,
+        conversation_summary: str = '',
+        current_message: Optional[str] = None,
+        analyzed: Optional[AnalyzedMessage] = None
+    ) -> List[str]:
+        """
+        Conversation history as string segments, so the prompt joins message
+        contents directly instead of copying them into intermediate strings
+        """
+        summary = ["Summary of earlier conversation: ", conversation_summary, "\n"] if conversation_summary else []
         if not conversation_history:
-            return "No previous conversation"
+            return summary + ["No recent messages"] if summary else ["No previous conversation"]
         
         try:
             logger.info(f"Formatting conversation history with {len(conversation_history)} messages")
-            formatted_messages = []
-            # Group messages by user/ai pairs
-            user_messages = []
-            ai_messages = []
-            
-            # Separate user and AI messages
-            for msg in conversation_history:
-                logger.info(f"Processing message: {msg}")
-                if msg.get('role') == 'user':
-                    user_messages.append(msg.get('content', ''))
-                elif msg.get('role') == 'ai':
-                    ai_messages.append(msg.get('content', ''))
-            
-            logger.info(f"User messages: {user_messages}")
-            logger.info(f"AI messages: {ai_messages}")
-            
-            # Create pairs of user and AI messages
-            for i in range(min(len(user_messages), len(ai_messages))):
-                formatted_messages.append(f"User: {user_messages[i]}\nNarad: {ai_messages[i]}")
-            
-            # If we have an odd number of messages, there might be a user message without a response
-            if len(user_messages) > len(ai_messages) and user_messages:
-                formatted_messages.append(f"User: {user_messages[-1]}\nNarad: [awaiting response]")
+            if current_message:
+                tokens = analyzed.tokens if analyzed is not None else None
+                turns = self.history_selector.select(conversation_history, current_message, tokens)
+            else:
+                turns = pair_turns(conversation_history)[-self.history_selector.max_turns:]
+            if not turns:
+                return summary + ["No previous conversation"]
             
-            # Return last 3 message pairs
-            result = "\n".join(formatted_messages[-3:]) if formatted_messages else "No previous conversation"
-            logger.info(f"Formatted conversation history: {result}")
-            return result
+            segments = summary
+            for user_message, ai_message in turns:
+                if user_message is not None:
+                    segments += ("User: ", user_message.get('content', ''), "\n")
+                segments += ("Narad: ", ai_message.get('content', '') if ai_message is not None else '[awaiting response]', "\n")
+            segments.pop()
+            return segments
         except Exception as e:
             logger.error(f"Error formatting conversation history: {e}")
-            return "No previous conversation"
+            return ["No previous conversation"]
     
     def _get_fallback_response(self, message: str, language: str) -> str:
         """Generate a fallback response when AI is not available"""
@@ -0,0 +1,371 @@
+"""
+Suggestion Engine for Narad AI
+Follow-up suggestions built from the knowledge base and recommender catalog, cached per intent, monument and language
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Iterable, FrozenSet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANGUAGE = 'en-IN'
+
+# Phrase templates per suggestion kind for every reply language; others use English
+SUGGESTION_PHRASES = {
+    'en-IN': {
+        'story': 'Tell me the story "{name}"',
+        'monument': 'Tell me about {name}',
+        'figure': 'Who was {name}?',
+        'experience': 'Try the {name}',
+        'hunt': 'Start the "{name}" treasure hunt',
+        'timeline': 'When was {name} built?'
+    },
+    'hi-IN': {
+        'story': '"{name}" की कहानी सुनाइए',
+        'monument': '{name} के बारे में बताइए',
+        'figure': '{name} कौन थे?',
+        'experience': '{name} का अनुभव कराइए',
+        'hunt': '"{name}" ट्रेज़र हंट शुरू करें',
+        'timeline': '{name} कब बना था?'
+    },
+    'bn-IN': {
+        'story': '"{name}" গল্পটি বলুন',
+        'monument': '{name} সম্পর্কে বলুন',
+        'figure': '{name} কে ছিলেন?',
+        'experience': '{name} অভিজ্ঞতাটি শুরু করুন',
+        'hunt': '"{name}" ট্রেজার হান্ট শুরু করুন',
+        'timeline': '{name} কবে তৈরি হয়েছিল?'
+    },
+    'ta-IN': {
+        'story': '"{name}" கதையைச் சொல்லுங்கள்',
+        'monument': '{name} பற்றி சொல்லுங்கள்',
+        'figure': '{name} யார்?',
+        'experience': '{name} அனுபவத்தைத் தொடங்குங்கள்',
+        'hunt': '"{name}" புதையல் வேட்டையைத் தொடங்குங்கள்',
+        'timeline': '{name} எப்போது கட்டப்பட்டது?'
+    },
+    'te-IN': {
+        'story': '"{name}" కథ చెప్పండి',
+        'monument': '{name} గురించి చెప్పండి',
+        'figure': '{name} ఎవరు?',
+        'experience': '{name} అనుభవాన్ని ప్రారంభించండి',
+        'hunt': '"{name}" నిధి వేట ప్రారంభించండి',
+        'timeline': '{name} ఎప్పుడు నిర్మించబడింది?'
+    },
+    'pa-IN': {
+        'story': '"{name}" ਦੀ ਕਹਾਣੀ ਸੁਣਾਓ',
+        'monument': '{name} ਬਾਰੇ ਦੱਸੋ',
+        'figure': '{name} ਕੌਣ ਸਨ?',
+        'experience': '{name} ਦਾ ਅਨੁਭਵ ਸ਼ੁਰੂ ਕਰੋ',
+        'hunt': '"{name}" ਖ਼ਜ਼ਾਨੇ ਦੀ ਖੋਜ ਸ਼ੁਰੂ ਕਰੋ',
+        'timeline': '{name} ਕਦੋਂ ਬਣਿਆ ਸੀ?'
+    },
+    'mr-IN': {
+        'story': '"{name}" ही कथा सांगा',
+        'monument': '{name} बद्दल सांगा',
+        'figure': '{name} कोण होते?',
+        'experience': '{name} हा अनुभव सुरू करा',
+        'hunt': '"{name}" खजिना शोध सुरू करा',
+        'timeline': '{name} कधी बांधले गेले?'
+    },
+    'gu-IN': {
+        'story': '"{name}" વાર્તા કહો',
+        'monument': '{name} વિશે કહો',
+        'figure': '{name} કોણ હતા?',
+        'experience': '{name} અનુભવ શરૂ કરો',
+        'hunt': '"{name}" ખજાનાની શોધ શરૂ કરો',
+        'timeline': '{name} ક્યારે બંધાયું હતું?'
+    },
+    'kn-IN': {
+        'story': '"{name}" ಕಥೆಯನ್ನು ಹೇಳಿ',
+        'monument': '{name} ಬಗ್ಗೆ ಹೇಳಿ',
+        'figure': '{name} ಯಾರು?',
+        'experience': '{name} ಅನುಭವವನ್ನು ಪ್ರಾರಂಭಿಸಿ',
+        'hunt': '"{name}" ನಿಧಿ ಬೇಟೆಯನ್ನು ಪ್ರಾರಂಭಿಸಿ',
+        'timeline': '{name} ಯಾವಾಗ ನಿರ್ಮಿಸಲಾಯಿತು?'
+    },
+    'ml-IN': {
+        'story': '"{name}" എന്ന കഥ പറയൂ',
+        'monument': '{name} നെക്കുറിച്ച് പറയൂ',
+        'figure': '{name} ആരായിരുന്നു?',
+        'experience': '{name} അനുഭവം ആരംഭിക്കൂ',
+        'hunt': '"{name}" നിധി വേട്ട ആരംഭിക്കൂ',
+        'timeline': '{name} എപ്പോഴാണ് നിർമ്മിച്ചത്?'
+    },
+    'or-IN': {
+        'story': '"{name}" କାହାଣୀ କୁହନ୍ତୁ',
+        'monument': '{name} ବିଷୟରେ କୁହନ୍ତୁ',
+        'figure': '{name} କିଏ ଥିଲେ?',
+        'experience': '{name} ଅନୁଭୂତି ଆରମ୍ଭ କରନ୍ତୁ',
+        'hunt': '"{name}" ଗୁପ୍ତଧନ ସନ୍ଧାନ ଆରମ୍ଭ କରନ୍ତୁ',
+        'timeline': '{name} କେବେ ନିର୍ମାଣ ହୋଇଥିଲା?'
+    }
+}
+
+# Suggestion kinds in order of preference for each intent
+INTENT_KINDS = {
+    'greeting': ['story', 'monument', 'experience', 'figure', 'hunt', 'timeline'],
+    'story_request': ['story', 'figure', 'hunt', 'monument', 'experience', 'timeline'],
+    'location_inquiry': ['monument', 'experience', 'timeline', 'story', 'hunt', 'figure'],
+    'cultural_inquiry': ['experience', 'story', 'figure', 'monument', 'hunt', 'timeline'],
+    'informational': ['timeline', 'figure', 'monument', 'story', 'experience', 'hunt'],
+    'general_inquiry': ['experience', 'hunt', 'story', 'monument', 'figure', 'timeline']
+}
+
+# English suggestions used only when the knowledge base and catalog yield too few;
+# they are not translated, so a sparse pool can mix in English in any language
+FALLBACK_SUGGESTIONS = {
+    'greeting': [
+        "Tell me about Indian mythology",
+        "Share a story about Lord Shiva",
+        "What are some famous Indian festivals?"
+    ],
+    'story_request': [
+        "Tell me about Ramayana",
+        "Share a story about Krishna",
+        "What myths are famous in South India?"
+    ],
+    'location_inquiry': [
+        "Tell me about Taj Mahal",
+        "What's special about Hampi?",
+        "Describe the temples of Khajuraho"
+    ],
+    'cultural_inquiry': [
+        "Explain Diwali celebrations",
+        "What are Holi traditions?",
+        "Tell me about Bharatanatyam dance"
+    ],
+    'informational': [
+        "How old is the Indus Valley Civilization?",
+        "Who built the Ajanta Caves?",
+        "What is the significance of the Ganges?"
+    ],
+    'general_inquiry': [
+        "Plan a cultural journey for me",
+        "Show me AR experiences",
+        "Start a treasure hunt"
+    ]
+}
+
+# Story type words that correspond to a session story-type category
+STORY_TYPE_TAGS = {'historical': 'history', 'mystery': 'horror'}
+
+# A candidate is (suggestion text, tags matched against the visitor's interests)
+Candidate = Tuple[str, FrozenSet[str]]
+
+class SuggestionEngine:
+    """
+    Follow-up suggestions for a turn.
+    
+    For each (intent, monument, language) a ranked pool of candidates is
+    built once from the knowledge base (stories, related monuments, figures)
+    and the recommender catalog (stories, experiences, treasure hunts), then
+    cached. Per request the cached pool is only reordered by overlap with
+    the visitor's interests, so generation costs a dict lookup and a short
+    sort. The cache is dropped whenever the knowledge base version changes.
+    """
+    
+    def __init__(
+        self,
+        knowledge_base: Any,
+        recommender: Optional[Any] = None,
+        languages: Optional[Iterable[str]] = None,
+        pool_size: int = 8,
+        cache_size: int = 10000
+    ):
+        """
+        Initialize the suggestion engine
+        
+        Args:
+            knowledge_base: CulturalKnowledgeBase providing stories and monuments
+            recommender: Optional ContentRecommender whose catalog is included
+            languages: Supported language codes (e.g. NaradAI.language_mapping);
+                others are answered in English
+            pool_size: Candidates cached per key
+            cache_size: Keys kept in the cache
+        """
+        self.knowledge_base = knowledge_base
+        self.recommender = recommender
+        self.languages = set(languages) if languages else set(SUGGESTION_PHRASES)
+        self.pool_size = pool_size
+        self.cache_size = cache_size
+        
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, Optional[str], str], List[Candidate]]" = OrderedDict()
+        self._version = knowledge_base.version
+        
+        self.stats = {
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'invalidations': 0
+        }
+    
+    def suggest(
+        self,
+        intent: str,
+        monument_id: Optional[str] = None,
+        language: str = DEFAULT_LANGUAGE,
+        interests: Optional[Iterable[str]] = None,
+        limit: int = 3
+    ) -> List[str]:
+        """
+        Get follow-up suggestions
+        
+        Args:
+            intent: Classified intent of the turn
+            monument_id: Monument the conversation is about, if any
+            language: Language code of the reply
+            interests: Topics, story types, figures and monuments the visitor cares about
+            limit: Number of suggestions
+        
+        Returns:
+            Suggestion strings, most relevant first
+        """
+        pool = self._get_pool(intent, monument_id, language)
+        if interests:
+            interests = set(interests)
+            # Stable sort keeps the cached order among equally relevant candidates
+            pool = sorted(pool, key=lambda candidate: -len(candidate[1] & interests))
+        return [text for text, _ in pool[:limit]]
+    
+    def precompute(self, monument_ids: Optional[Iterable[str]] = None, languages: Optional[Iterable[str]] = None):
+        """
+        Build and cache pools ahead of requests
+        
+        Args:
+            monument_ids: Monuments to cover (defaults to every monument in the knowledge
+                base when all their pools fit in the cache, else none)
+            languages: Language codes to cover (defaults to the supported languages)
+        """
+        languages = list(languages or self.languages)
+        if monument_ids is None:
+            monuments = self.knowledge_base.monuments_db
+            fits = (len(monuments) + 1) * len(INTENT_KINDS) * len(languages) <= self.cache_size
+            monument_ids = list(monuments) if fits else []
+        for monument_id in [None] + monument_ids:
+            for intent in INTENT_KINDS:
+                for language in languages:
+                    if len(self._cache) >= self.cache_size:
+                        return
+                    self._get_pool(intent, monument_id, language)
+        logger.info(f"Precomputed {len(self._cache)} suggestion pools")
+    
+    def get_engine_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return dict(self.stats, cached_pools=len(self._cache), version=self._version)
+    
+    def _get_pool(self, intent: str, monument_id: Optional[str], language: str) -> List[Candidate]:
+        """Cached candidate pool for a key, rebuilt after a knowledge base change"""
+        if intent not in INTENT_KINDS:
+            intent = 'general_inquiry'
+        if language not in self.languages:
+            language = DEFAULT_LANGUAGE
+        if monument_id not in self.knowledge_base.monuments_db:
+            monument_id = None
+        key = (intent, monument_id, language)
+        
+        with self._lock:
+            if self._version != self.knowledge_base.version:
+                self._cache.clear()
+                self._version = self.knowledge_base.version
+                self.stats['invalidations'] += 1
+            pool = self._cache.get(key)
+            if pool is not None:
+                self.stats['cache_hits'] += 1
+                self._cache.move_to_end(key)
+                return pool
+        
+        self.stats['cache_misses'] += 1
+        pool = self._build_pool(intent, monument_id, language)
+        with self._lock:
+            self._cache[key] = pool
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return pool
+    
+    def _build_pool(self, intent: str, monument_id: Optional[str], language: str) -> List[Candidate]:
+        """Interleave candidates of each kind in the intent's order of preference"""
+        phrases = SUGGESTION_PHRASES.get(language, SUGGESTION_PHRASES[DEFAULT_LANGUAGE])
+        sources = self._collect_sources(monument_id)
+        
+        pool: List[Candidate] = []
+        seen = set()
+        queues = [list(sources.get(kind, ())) for kind in INTENT_KINDS[intent]]
+        kinds = INTENT_KINDS[intent]
+        while len(pool) < self.pool_size and any(queues):
+            for kind, queue in zip(kinds, queues):
+                if queue and len(pool) < self.pool_size:
+                    name, tags = queue.pop(0)
+                    text = phrases[kind].format(name=name)
+                    if text not in seen:
+                        seen.add(text)
+                        pool.append((text, tags))
+        
+        for text in FALLBACK_SUGGESTIONS[intent]:
+            if len(pool) >= self.pool_size:
+                break
+            if text not in seen:
+                seen.add(text)
+                pool.append((text, frozenset()))
+        return pool
+    
+    def _collect_sources(self, monument_id: Optional[str]) -> Dict[str, List[Tuple[str, FrozenSet[str]]]]:
+        """Names and interest tags per suggestion kind, scoped to a monument when given"""
+        kb = self.knowledge_base
+        sources: Dict[str, List[Tuple[str, FrozenSet[str]]]] = {kind: [] for kind in SUGGESTION_PHRASES[DEFAULT_LANGUAGE]}
+        
+        if monument_id is None:
+            for story in kb.stories_db.values():
+                sources['story'].append((story['title'], self._story_tags(story)))
+                if len(sources['story']) >= self.pool_size:
+                    break
+        elif kb.wait_for_indexes(0):
+            # Stories naming the monument or listed by it, from the entity graph
+            for linked in kb.find_connected_stories(monument=monument_id, limit=self.pool_size):
+                story = kb.stories_db[linked['id']]
+                sources['story'].append((story['title'], self._story_tags(story)))
+        else:
+            # The graph is still being built: the stories the monument lists, without
+            # waiting; publishing the indexes changes the version and drops this pool
+            for story_id in kb.monuments_db[monument_id].get('stories', [])[:self.pool_size]:
+                story = kb.stories_db.get(story_id)
+                if story is not None:
+                    sources['story'].append((story['title'], self._story_tags(story)))
+        
+        if monument_id is not None:
+            monument = kb.monuments_db[monument_id]
+            for related in kb.get_related_monuments(monument_id):
+                sources['monument'].append((related['name'], frozenset([related['id']])))
+            for figure in monument.get('related_figures', []):
+                sources['figure'].append((figure, frozenset([figure, monument_id])))
+            sources['timeline'].append((monument['name'], frozenset([monument_id, 'history'])))
+        else:
+            for mid, monument in kb.monuments_db.items():
+                sources['monument'].append((monument['name'], frozenset([mid])))
+                if len(sources['monument']) >= self.pool_size:
+                    break
+            for figure_id in kb.mythological_figures:
+                name = figure_id.replace('_', ' ').title()
+                sources['figure'].append((name, frozenset([name, 'mythology'])))
+        
+        if self.recommender is not None:
+            catalog = self.recommender.content_database
+            for kind, section in (('story', 'stories'), ('experience', 'experiences'), ('hunt', 'treasure_hunts')):
+                for item in catalog.get(section, []):
+                    if monument_id is None or item.get('monument') == monument_id:
+                        tags = frozenset(item.get('themes', [])) | {item.get('monument'), item.get('type')}
+                        sources[kind].append((item['title'], tags))
+        
+        return sources
+    
+    @staticmethod
+    def _story_tags(story: Dict[str, Any]) -> FrozenSet[str]:
+        """Monument, themes and story-type categories of a knowledge base story"""
+        tags = set(story.get('themes', []))
+        tags.add(story.get('monument'))
+        for word in story.get('type', '').split('_'):
+            tags.add(STORY_TYPE_TAGS.get(word, word))
+        return frozenset(tags)
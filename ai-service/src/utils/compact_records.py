@@ -0,0 +1,419 @@
+"""
+Compact Records for Narad AI
+Column storage for knowledge base sections with interned categorical values and read-only dict-like record views
+"""
+
+import math
+import logging
+from array import array
+from functools import partial
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, List, Any, Optional, Iterator, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+# Record fields by storage kind; fields not listed, or values of another
+# type than their kind expects, are kept in a per-record dict. Free-text
+# descriptions are 'text': interning values that rarely repeat only grows
+# the string table.
+RECORD_LAYOUTS = {
+    'monuments_db': {
+        'text': ('name', 'significance', 'cultural_importance'),
+        'categorical': ('location', 'period', 'architecture'),
+        'list': ('related_figures', 'stories', 'myths', 'aliases'),
+        'float': ('latitude', 'longitude'),
+        'int': ('built_year',)
+    },
+    'stories_db': {
+        'text': ('title', 'content', 'cultural_significance'),
+        'categorical': ('type', 'monument', 'historical_accuracy'),
+        'list': ('themes',),
+        'float': (),
+        'int': ()
+    }
+}
+
+# Story field whose value may stay in a content store (see kb_loader)
+LAZY_FIELD = 'content'
+
+_ABSENT_CODE = -1
+_ABSENT_INT = -(2 ** 63)
+_NOT_LAZY = -1
+_LAZY_BY_ID = -2
+_ABSENT = object()
+
+# Unreferenced list codes tolerated before the flat code array is compacted
+_COMPACT_MIN_DEAD = 4096
+
+def _append(column, value):
+    column.append(value)
+
+def _assign(row: int, column, value):
+    column[row] = value
+
+class StringTable:
+    """
+    Distinct strings with dense integer codes, shared by the sections of a
+    knowledge base so each repeated value ("Mughal", "devotion", a state)
+    is stored once
+    """
+    
+    __slots__ = ('_strings', '_codes')
+    
+    def __init__(self):
+        self._strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+    
+    def code(self, value: str) -> int:
+        """Code of a string, adding it on first use"""
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._codes[value] = code
+        return code
+    
+    def __getitem__(self, code: int) -> str:
+        return self._strings[code]
+    
+    def __len__(self) -> int:
+        return len(self._strings)
+
+class RecordView(Mapping):
+    """
+    Read-only dictionary view of one stored record.
+    
+    Supports everything code reads records with (indexing, get, in, items,
+    iteration, dict(view), equality with dicts); values are decoded from the
+    columns on access, so a view follows its record when the section
+    replaces it. Records are replaced through the section, never edited
+    through a view.
+    """
+    
+    __slots__ = ('_records', '_row')
+    
+    def __init__(self, records: 'CompactRecords', row: int):
+        self._records = records
+        self._row = row
+    
+    def __getitem__(self, field: str) -> Any:
+        getter = self._records._getters.get(field)
+        value = _ABSENT if getter is None else getter(self._row)
+        if value is _ABSENT:
+            value = self._records._extra(self._row, field)
+            if value is _ABSENT:
+                raise KeyError(field)
+        return value
+    
+    def get(self, field: str, default: Any = None) -> Any:
+        getter = self._records._getters.get(field)
+        value = _ABSENT if getter is None else getter(self._row)
+        if value is _ABSENT:
+            value = self._records._extra(self._row, field)
+        return default if value is _ABSENT else value
+    
+    def __contains__(self, field: object) -> bool:
+        return isinstance(field, str) and self._records._has(self._row, field)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records._fields(self._row))
+    
+    def __len__(self) -> int:
+        return len(self._records._fields(self._row))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary of the record, including a lazily stored body"""
+        return {field: self[field] for field in self._records._fields(self._row)}
+    
+    def __repr__(self) -> str:
+        return f"RecordView({self.to_dict()!r})"
+
+class CompactRecords(MutableMapping):
+    """
+    Knowledge base section (record id -> record) stored by column.
+    
+    Each field of the section's layout is a typed array: categorical strings
+    and string lists as codes into a shared StringTable (lists as offsets
+    into one flat code array), coordinates and years as numbers, and unique
+    text such as names in a plain list. A record costs a few dozen bytes of
+    arrays instead of a dict, its lists and their string objects, and the
+    arrays hold no Python objects, so forked workers keep sharing their
+    pages. Records come back as RecordView mappings. Replacing a record
+    rewrites its row in place; deleting one frees its row for the next new
+    record, and list codes no row refers to any more are compacted away
+    once they make up half the code array.
+    """
+    
+    def __init__(self, layout: Dict[str, Tuple[str, ...]], strings: Optional[StringTable] = None, content_store: Any = None):
+        """
+        Initialize an empty section
+        
+        Args:
+            layout: Fields by storage kind (see RECORD_LAYOUTS)
+            strings: String table shared with the other sections
+            content_store: Store holding story bodies kept out of memory
+        """
+        self.strings = strings if strings is not None else StringTable()
+        self.content_store = content_store
+        self._field_order = [field for fields in layout.values() for field in fields]
+        self._rows: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._text: Dict[str, List[Any]] = {field: [] for field in layout.get('text', ())}
+        self._categorical: Dict[str, array] = {field: array('i') for field in layout.get('categorical', ())}
+        self._list_starts: Dict[str, array] = {field: array('i') for field in layout.get('list', ())}
+        self._list_lengths: Dict[str, array] = {field: array('i') for field in layout.get('list', ())}
+        self._list_codes = array('i')
+        self._float: Dict[str, array] = {field: array('d') for field in layout.get('float', ())}
+        self._int: Dict[str, array] = {field: array('q') for field in layout.get('int', ())}
+        self._rest: List[Optional[Dict[str, Any]]] = []
+        self._lazy = array('q')
+        self._free: List[int] = []
+        self._dead_list_codes = 0
+        # Field -> function decoding it from a row, _ABSENT when the column has no value
+        self._getters: Dict[str, Callable[[int], Any]] = {}
+        self._bind_getters()
+    
+    def add(self, record_id: str, record: Mapping, content_key: Any = _ABSENT):
+        """
+        Store a record, replacing any earlier one with the id
+        
+        Args:
+            record_id: Record identifier
+            record: Record fields
+            content_key: Content store key of a body kept out of memory
+                (None to look it up by record id)
+        """
+        row = self._rows.get(record_id)
+        if row is None and self._free:
+            row = self._free.pop()
+        if row is None:
+            row = len(self._ids)
+            put = _append
+        else:
+            put = partial(_assign, row)
+        # Ids are interned too: they recur in other records' reference fields
+        strings = self.strings
+        record_id = strings[strings.code(record_id)]
+        values = dict(record.items())
+        for field, column in self._text.items():
+            put(column, values.pop(field, _ABSENT))
+        for field, column in self._categorical.items():
+            value = values.get(field, _ABSENT)
+            if isinstance(value, str):
+                put(column, strings.code(value))
+                del values[field]
+            else:
+                put(column, _ABSENT_CODE)
+        for field in self._list_starts:
+            value = values.get(field, _ABSENT)
+            if isinstance(value, list) and all(isinstance(item, str) for item in value):
+                start = self._store_list(field, row, [strings.code(item) for item in value], put is _append)
+                put(self._list_starts[field], start)
+                put(self._list_lengths[field], len(value))
+                del values[field]
+            else:
+                if put is not _append:
+                    self._drop_list(field, row)
+                put(self._list_starts[field], 0)
+                put(self._list_lengths[field], _ABSENT_CODE)
+        for field, column in self._float.items():
+            value = values.get(field, _ABSENT)
+            if type(value) is float and not math.isnan(value):
+                put(column, value)
+                del values[field]
+            else:
+                put(column, math.nan)
+        for field, column in self._int.items():
+            value = values.get(field, _ABSENT)
+            if type(value) is int and value != _ABSENT_INT:
+                put(column, value)
+                del values[field]
+            else:
+                put(column, _ABSENT_INT)
+        # Whatever did not fit a column
+        put(self._rest, values or None)
+        if content_key is _ABSENT:
+            put(self._lazy, _NOT_LAZY)
+        else:
+            put(self._lazy, _LAZY_BY_ID if content_key is None else int(content_key))
+        put(self._ids, record_id)
+        self._rows[record_id] = row
+        self._maybe_compact_lists()
+    
+    def __setitem__(self, record_id: str, record: Mapping):
+        if hasattr(record, 'to_dict'):
+            record = record.to_dict()
+        self.add(record_id, record)
+    
+    def __getitem__(self, record_id: str) -> RecordView:
+        return RecordView(self, self._rows[record_id])
+    
+    def get(self, record_id: str, default: Any = None) -> Any:
+        row = self._rows.get(record_id)
+        return default if row is None else RecordView(self, row)
+    
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._rows
+    
+    def __delitem__(self, record_id: str):
+        row = self._rows.pop(record_id)
+        for column in self._text.values():
+            column[row] = _ABSENT
+        for column in self._categorical.values():
+            column[row] = _ABSENT_CODE
+        for field, lengths in self._list_lengths.items():
+            self._drop_list(field, row)
+            lengths[row] = _ABSENT_CODE
+        self._rest[row] = None
+        self._lazy[row] = _NOT_LAZY
+        self._ids[row] = None
+        self._free.append(row)
+        self._maybe_compact_lists()
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def items(self) -> Iterator[Tuple[str, RecordView]]:
+        """(record id, view) pairs, without a lookup per record"""
+        return ((record_id, RecordView(self, row)) for record_id, row in self._rows.items())
+    
+    def values(self) -> Iterator[RecordView]:
+        return (RecordView(self, row) for row in self._rows.values())
+    
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """Get row and string table counts"""
+        return {
+            'records': len(self._rows),
+            'rows': len(self._ids),
+            'free_rows': len(self._free),
+            'list_codes': len(self._list_codes),
+            'dead_list_codes': self._dead_list_codes,
+            'records_with_extra_fields': sum(1 for rest in self._rest if rest),
+            'strings': len(self.strings)
+        }
+    
+    def _store_list(self, field: str, row: int, codes: List[int], new_row: bool) -> int:
+        """Write a list's codes, over the row's old list when it fits; returns the start"""
+        if not new_row:
+            length = self._list_lengths[field][row]
+            if length >= len(codes):
+                start = self._list_starts[field][row]
+                self._list_codes[start:start + len(codes)] = array('i', codes)
+                self._dead_list_codes += length - len(codes)
+                return start
+            self._drop_list(field, row)
+        start = len(self._list_codes)
+        self._list_codes.extend(codes)
+        return start
+    
+    def _drop_list(self, field: str, row: int):
+        """Count a row's list codes as unreferenced"""
+        length = self._list_lengths[field][row]
+        if length > 0:
+            self._dead_list_codes += length
+    
+    def _maybe_compact_lists(self):
+        """Rewrite the flat list code array without unreferenced codes once they dominate it"""
+        dead = self._dead_list_codes
+        if dead < _COMPACT_MIN_DEAD or dead * 2 < len(self._list_codes):
+            return
+        codes = self._list_codes
+        compacted = array('i')
+        for field, starts in self._list_starts.items():
+            lengths = self._list_lengths[field]
+            for row, length in enumerate(lengths):
+                if length > 0:
+                    start = starts[row]
+                    starts[row] = len(compacted)
+                    compacted.extend(codes[start:start + length])
+        # In place: the list getters hold this array
+        codes[:] = compacted
+        self._dead_list_codes = 0
+    
+    def _bind_getters(self):
+        """One closure per layout field over its columns, so a read is a dict lookup and a call"""
+        strings = self.strings._strings
+        codes = self._list_codes
+        
+        def text_getter(column: List[Any]) -> Callable[[int], Any]:
+            return column.__getitem__
+        
+        def lazy_getter(column: List[Any]) -> Callable[[int], Any]:
+            def get(row: int) -> Any:
+                value = column[row]
+                if value is _ABSENT and self._lazy[row] != _NOT_LAZY:
+                    return self._lazy_content(row)
+                return value
+            return get
+        
+        def categorical_getter(column: array) -> Callable[[int], Any]:
+            def get(row: int) -> Any:
+                code = column[row]
+                return _ABSENT if code == _ABSENT_CODE else strings[code]
+            return get
+        
+        def list_getter(starts: array, lengths: array) -> Callable[[int], Any]:
+            def get(row: int) -> Any:
+                length = lengths[row]
+                if length == _ABSENT_CODE:
+                    return _ABSENT
+                start = starts[row]
+                return [strings[code] for code in codes[start:start + length]]
+            return get
+        
+        def float_getter(column: array) -> Callable[[int], Any]:
+            def get(row: int) -> Any:
+                value = column[row]
+                return _ABSENT if value != value else value
+            return get
+        
+        def int_getter(column: array) -> Callable[[int], Any]:
+            def get(row: int) -> Any:
+                value = column[row]
+                return _ABSENT if value == _ABSENT_INT else value
+            return get
+        
+        for field, column in self._text.items():
+            self._getters[field] = lazy_getter(column) if field == LAZY_FIELD else text_getter(column)
+        for field, column in self._categorical.items():
+            self._getters[field] = categorical_getter(column)
+        for field in self._list_starts:
+            self._getters[field] = list_getter(self._list_starts[field], self._list_lengths[field])
+        for field, column in self._float.items():
+            self._getters[field] = float_getter(column)
+        for field, column in self._int.items():
+            self._getters[field] = int_getter(column)
+    
+    def _extra(self, row: int, field: str) -> Any:
+        """Value kept outside the columns, or _ABSENT"""
+        rest = self._rest[row]
+        return _ABSENT if rest is None else rest.get(field, _ABSENT)
+    
+    def _value(self, row: int, field: str) -> Any:
+        """Decoded value of a field, or _ABSENT"""
+        getter = self._getters.get(field)
+        value = _ABSENT if getter is None else getter(row)
+        return self._extra(row, field) if value is _ABSENT else value
+    
+    def _has(self, row: int, field: str) -> bool:
+        """Whether a record has a field, without fetching a lazily stored body"""
+        if field == LAZY_FIELD and field in self._text and self._lazy[row] != _NOT_LAZY:
+            return True
+        return self._value(row, field) is not _ABSENT
+    
+    def _fields(self, row: int) -> List[str]:
+        """Fields present in a record, layout fields first"""
+        fields = [field for field in self._field_order if self._has(row, field)]
+        rest = self._rest[row]
+        if rest:
+            fields.extend(field for field in rest if field not in self._getters)
+        return fields
+    
+    def _lazy_content(self, row: int) -> str:
+        """Body of a story kept in the content store"""
+        key = self._lazy[row]
+        content = self.content_store.get(self._ids[row] if key == _LAZY_BY_ID else key)
+        return content or ''
@@ -0,0 +1,238 @@
+"""
+Conversation Export for Narad AI
+Streams sessions and messages from ConversationMemory into columnar files (Parquet or Arrow IPC)
+"""
+
+import os
+import json
+import time
+import logging
+from typing import Dict, List, Any, Optional, Union, Iterator, Tuple
+from datetime import datetime, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for analytics exports
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+def _session_schema():
+    return pa.schema([
+        ('session_id', pa.string()),
+        ('user_id', pa.string()),
+        ('created_at', pa.timestamp('us')),
+        ('last_activity', pa.timestamp('us')),
+        ('message_count', pa.int64()),
+        ('summary', pa.string()),
+        ('current_monument', pa.string()),
+        ('monuments_discussed', pa.list_(pa.string())),
+        ('topics', pa.list_(pa.string())),
+        ('intent_distribution', pa.string())  # JSON object
+    ])
+
+def _message_schema():
+    return pa.schema([
+        ('session_id', pa.string()),
+        ('user_id', pa.string()),
+        ('position', pa.int32()),
+        ('role', pa.string()),
+        ('content', pa.string()),
+        ('timestamp', pa.timestamp('us')),
+        ('intent', pa.string()),
+        ('metadata', pa.string())  # JSON object
+    ])
+
+def parse_time_bound(value: Optional[Union[str, datetime]]) -> Optional[str]:
+    """
+    Normalize a range bound to the naive UTC ISO format used for stored timestamps
+    
+    Args:
+        value: ISO 8601 string or datetime; a UTC offset is converted, and a
+            bound without one is taken as UTC
+    
+    Returns:
+        The bound as a naive UTC ISO string, or None
+    
+    Raises:
+        ValueError: If the value is not an ISO 8601 date or datetime
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            raise ValueError(f"Invalid ISO 8601 time bound: {value!r}")
+    elif not isinstance(value, datetime):
+        raise ValueError(f"Time bound must be an ISO 8601 string or datetime, not {type(value).__name__}")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+class _BatchWriter:
+    """Buffers rows column-wise and writes a record batch every `batch_size` rows"""
+    
+    def __init__(self, path: str, schema, export_format: str, batch_size: int):
+        self.path = path
+        self.schema = schema
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self.batches_written = 0
+        self._columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+        self._buffered = 0
+        
+        if export_format == 'parquet':
+            self._writer = pq.ParquetWriter(path, schema)
+        else:
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = pa.ipc.new_file(self._sink, schema)
+    
+    def append(self, row: Dict[str, Any]):
+        for name, column in self._columns.items():
+            column.append(row.get(name))
+        self._buffered += 1
+        if self._buffered >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        if not self._buffered:
+            return
+        arrays = []
+        for field in self.schema:
+            values = self._columns[field.name]
+            if pa.types.is_timestamp(field.type):
+                arrays.append(pa.array(values, pa.string()).cast(field.type))
+            else:
+                arrays.append(pa.array(values, field.type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.rows_written += self._buffered
+        self.batches_written += 1
+        for column in self._columns.values():
+            column.clear()
+        self._buffered = 0
+    
+    def close(self):
+        self.flush()
+        self._writer.close()
+        if hasattr(self, '_sink'):
+            self._sink.close()
+
+class ConversationExporter:
+    """
+    Bulk export of every session held by a ConversationMemory.
+    
+    Sessions are read one at a time through ConversationMemory.iter_sessions
+    and converted to rows outside the memory lock, so peak memory is one
+    session plus one batch per file, independent of the total number of
+    messages exported.
+    """
+    
+    def __init__(self, memory: Any, batch_size: int = 10000):
+        """
+        Initialize the exporter
+        
+        Args:
+            memory: ConversationMemory instance to read from
+            batch_size: Rows buffered per record batch
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for conversation exports")
+        self.memory = memory
+        self.batch_size = batch_size
+    
+    def export(
+        self,
+        output_dir: str,
+        export_format: str = 'parquet',
+        start: Optional[Union[str, datetime]] = None,
+        end: Optional[Union[str, datetime]] = None
+    ) -> Dict[str, Any]:
+        """
+        Write sessions and messages files into a directory
+        
+        Args:
+            output_dir: Directory for sessions.<ext> and messages.<ext>
+            export_format: 'parquet' or 'arrow' (Arrow IPC file)
+            start: Optional inclusive lower bound on message timestamps (UTC)
+            end: Optional exclusive upper bound on message timestamps (UTC)
+        
+        Returns:
+            Export summary with file paths, row counts and elapsed time
+        
+        Raises:
+            ValueError: If the format is unknown or a bound is not ISO 8601
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        
+        start_iso, end_iso = parse_time_bound(start), parse_time_bound(end)
+        extension = EXPORT_FORMATS[export_format]
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {
+            'sessions': os.path.join(output_dir, 'sessions' + extension),
+            'messages': os.path.join(output_dir, 'messages' + extension)
+        }
+        
+        started = time.perf_counter()
+        sessions_writer = _BatchWriter(paths['sessions'] + '.tmp', _session_schema(), export_format, self.batch_size)
+        messages_writer = _BatchWriter(paths['messages'] + '.tmp', _message_schema(), export_format, self.batch_size)
+        
+        try:
+            for session, messages in self.memory.iter_sessions():
+                exported = 0
+                for position, message in enumerate(messages):
+                    timestamp = message['timestamp']
+                    if (start_iso and timestamp < start_iso) or (end_iso and timestamp >= end_iso):
+                        continue
+                    metadata = message.get('metadata') or {}
+                    messages_writer.append({
+                        'session_id': session['session_id'],
+                        'user_id': session['user_id'],
+                        'position': position,
+                        'role': message['role'],
+                        'content': message['content'],
+                        'timestamp': timestamp,
+                        'intent': metadata.get('intent'),
+                        'metadata': json.dumps(metadata, default=str) if metadata else None
+                    })
+                    exported += 1
+                
+                if exported or (start_iso is None and end_iso is None):
+                    context = session['context']
+                    sessions_writer.append({
+                        'session_id': session['session_id'],
+                        'user_id': session['user_id'],
+                        'created_at': session['created_at'],
+                        'last_activity': session['last_activity'],
+                        'message_count': session['session_stats']['message_count'],
+                        'summary': session.get('summary') or None,
+                        'current_monument': context.get('current_monument'),
+                        'monuments_discussed': sorted(context.get('monuments_discussed', [])),
+                        'topics': sorted(context.get('topics', [])),
+                        'intent_distribution': json.dumps(dict(session['session_stats']['intent_distribution']))
+                    })
+        finally:
+            sessions_writer.close()
+            messages_writer.close()
+        
+        for path in paths.values():
+            os.replace(path + '.tmp', path)
+        
+        result = {
+            'format': export_format,
+            'files': paths,
+            'sessions_exported': sessions_writer.rows_written,
+            'messages_exported': messages_writer.rows_written,
+            'batches_written': sessions_writer.batches_written + messages_writer.batches_written,
+            'elapsed_seconds': round(time.perf_counter() - started, 3)
+        }
+        logger.info(
+            f"Exported {result['sessions_exported']} sessions and {result['messages_exported']} messages "
+            f"to {output_dir} in {result['elapsed_seconds']}s"
+        )
+        return result
@@ -3,40 +3,184 @@ Conversation Memory Management for Narad AI
 Handles session storage, conversation history, and context management
 """
 
+import gc
 import json
 import time
+import zlib
+import heapq
+import shelve
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict, deque
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from typing import Dict, List, Any, Optional, Callable, Union, Tuple, Iterator
+from datetime import datetime, timezone
+from collections import defaultdict, deque, OrderedDict
+
+from .session_store import SessionStore
+from .entity_matcher import EntityMatcher, Matcher, build_lexicon_entries
+from .message_analysis import AnalyzedMessage
+from .conversation_export import ConversationExporter, parse_time_bound
 
 logger = logging.getLogger(__name__)
 
+def _iso_to_epoch(timestamp: str) -> float:
+    """Convert a naive UTC ISO timestamp, as stored in sessions, to epoch seconds"""
+    return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+
+def _epoch_to_iso(epoch: float) -> str:
+    """Convert epoch seconds to the naive UTC ISO format stored in sessions"""
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None).isoformat()
+
+# Rough per-message overhead (dict, timestamp, metadata) added to the
+# UTF-8 size of the content when accounting against the byte budget
+MESSAGE_OVERHEAD_BYTES = 256
+
+# Length cap for the built-in extractive summary when no summarizer is injected
+DEFAULT_SUMMARY_MAX_LENGTH = 600
+
+# Messages shorter than this are never compressed; zlib gains nothing on them
+COMPRESS_MIN_BYTES = 256
+
+# Cultural categories that count as story type requests; the rest are topics
+STORY_TYPE_CATEGORIES = {'history', 'mythology', 'folklore', 'horror'}
+
 class ConversationMemory:
     """
     Manages conversation history and context for AI sessions
     """
     
-    def __init__(self, max_history_per_session: int = 50, session_timeout: int = 3600):
+    def __init__(
+        self,
+        max_history_per_session: int = 50,
+        session_timeout: int = 3600,
+        max_total_messages: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        summary_turn_threshold: Optional[int] = None,
+        summary_keep_recent_turns: int = 3,
+        summarizer: Optional[Callable[[str], str]] = None,
+        store: Optional[SessionStore] = None,
+        knowledge_base: Optional[Any] = None,
+        hot_window_messages: Optional[int] = None,
+        cold_after_seconds: Optional[int] = None,
+        compression_level: int = 6,
+        maintenance_interval: Optional[float] = None
+    ):
         """
         Initialize conversation memory
         
         Args:
             max_history_per_session: Maximum messages to keep per session
             session_timeout: Session timeout in seconds (default: 1 hour)
+            max_total_messages: Global cap on messages held across all sessions
+            max_total_bytes: Global cap on approximate message bytes across all sessions
+            spill_path: Optional shelve file; evicted sessions are spilled there
+                instead of being dropped
+            summary_turn_threshold: Turns (user/ai pairs) after which older turns
+                are condensed into a rolling summary; None disables summarization
+            summary_keep_recent_turns: Turns kept verbatim when summarizing
+            summarizer: Callable condensing text into a summary; defaults to a
+                lightweight extractive summary
+            store: Optional durable store; sessions are restored from it on startup
+                and every mutation is appended to its log
+            knowledge_base: Optional CulturalKnowledgeBase whose entity matcher is used
+                to extract monuments, figures and categories from user messages
+            hot_window_messages: Most recent messages per session kept uncompressed
+                (the prompt window); older ones are zlib-compressed. None disables
+            cold_after_seconds: Idle time after which all of a session's messages
+                are compressed; None disables
+            compression_level: zlib compression level for cold messages
+            maintenance_interval: Seconds between background passes expiring
+                sessions and compressing idle ones; None leaves them to
+                explicit run_maintenance calls
         """
-        self.sessions: Dict[str, Dict] = {}
+        # Ordered by last activity: least recently active session first
+        self.sessions: "OrderedDict[str, Dict]" = OrderedDict()
         self.max_history = max_history_per_session
         self.session_timeout = session_timeout
+        self.max_total_messages = max_total_messages or None
+        self.max_total_bytes = max_total_bytes or None
+        
+        self._lock = threading.RLock()
+        self._messages_in_memory = 0
+        self._bytes_in_memory = 0
+        self._spill_store = shelve.open(spill_path) if spill_path else None
+        # Last activity of every spilled session, and a heap of (last activity,
+        # id) so expired spills are found without reading the shelve; heap
+        # entries whose session was restored or respilled are skipped lazily
+        self._spilled: Dict[str, float] = {}
+        self._spill_expiry: List[Tuple[float, str]] = []
+        if self._spill_store is not None:
+            for session_id in list(self._spill_store.keys()):
+                self._index_spilled(session_id, self._spill_store[session_id]['_last_activity_ts'])
+        
+        # Rolling summarization runs on a single background worker, never on the request path
+        self.summary_turn_threshold = summary_turn_threshold or None
+        self.summary_keep_recent_turns = summary_keep_recent_turns
+        self._summarizer = summarizer or self._default_summarize
+        self._summary_executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix='memory-summarizer')
+            if self.summary_turn_threshold else None
+        )
+        self._pending_summaries: Dict[str, Future] = {}
+        
+        # Bulk exports run on their own worker so request threads never wait on them
+        self._export_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Cold turns are kept zlib-compressed and inflated lazily on read
+        self.hot_window_messages = hot_window_messages or None
+        self.cold_after_seconds = cold_after_seconds or None
+        self.compression_level = compression_level
+        # Sessions not compressed as idle, in activity order, so a pass over
+        # idle sessions touches only the ones that became idle since the last
+        self._warm: "OrderedDict[str, None]" = OrderedDict()
+        self.compression_stats = {
+            'messages_compressed': 0,
+            'raw_bytes': 0,
+            'compressed_bytes': 0,
+            'decompressions': 0,
+            'decompression_seconds': 0.0
+        }
         
         # Statistics tracking
         self.stats = {
             'total_sessions': 0,
             'total_messages': 0,
-            'active_sessions': 0
+            'active_sessions': 0,
+            'evicted_sessions': 0,
+            'spilled_sessions': 0,
+            'restored_sessions': 0,
+            'summaries_generated': 0
         }
         
-        logger.info(f"Conversation Memory initialized with timeout: {session_timeout}s")
+        # Running aggregates, updated on every mutation so stats reads are O(1)
+        self._intent_totals: Dict[str, int] = defaultdict(int)
+        self._rating_count = 0
+        self._rating_sum = 0.0
+        
+        # Entity extraction for session context; follows knowledge base changes
+        self.knowledge_base = knowledge_base
+        self._fallback_matcher: Optional[EntityMatcher] = None
+        
+        # Durable persistence: mutations are logged, replay suppresses logging
+        self._store = store
+        self._replaying = False
+        if self._store is not None:
+            self._restore_from_store()
+            self._store.set_compaction_callback(self.snapshot)
+        
+        self._maintenance_stop = threading.Event()
+        self._maintenance_thread: Optional[threading.Thread] = None
+        if maintenance_interval:
+            self._maintenance_thread = threading.Thread(
+                target=self._maintenance_loop, args=(maintenance_interval,), name='memory-maintenance', daemon=True
+            )
+            self._maintenance_thread.start()
+        
+        logger.info(
+            f"Conversation Memory initialized with timeout: {session_timeout}s, "
+            f"message budget: {self.max_total_messages}, byte budget: {self.max_total_bytes}"
+        )
     
     def is_active(self) -> bool:
         """Check if conversation memory is active"""
@@ -49,20 +193,24 @@ class ConversationMemory:
         Args:
             session_id: Unique session identifier
             user_id: Optional user identifier
-            
+        
         Returns:
             Session metadata
         """
+        now = time.time()
         session_data = {
             'session_id': session_id,
             'user_id': user_id,
-            'created_at': datetime.utcnow().isoformat(),
-            'last_activity': datetime.utcnow().isoformat(),
+            'created_at': _epoch_to_iso(now),
+            'last_activity': _epoch_to_iso(now),
             'message_history': deque(maxlen=self.max_history),
+            'summary': '',
+            'summarized_messages': 0,
             'context': {
                 'topics': set(),
                 'monuments_discussed': set(),
                 'story_types_requested': set(),
+                'figures_discussed': set(),
                 'user_preferences': {},
                 'current_location': None,
                 'current_monument': None
@@ -72,12 +220,24 @@ class ConversationMemory:
                 'intent_distribution': defaultdict(int),
                 'response_ratings': [],
                 'topics_covered': 0
-            }
+            },
+            '_memory_bytes': 0,
+            '_created_ts': now,
+            '_last_activity_ts': now
         }
         
-        self.sessions[session_id] = session_data
-        self.stats['total_sessions'] += 1
-        self.stats['active_sessions'] += 1
+        with self._lock:
+            if session_id in self.sessions:
+                self._release_session(self.sessions.pop(session_id))
+                self.stats['active_sessions'] -= 1
+            if self._spilled.pop(session_id, None) is not None:
+                del self._spill_store[session_id]
+            
+            self.sessions[session_id] = session_data
+            self._mark_warm(session_id)
+            self.stats['total_sessions'] += 1
+            self.stats['active_sessions'] += 1
+            self._log_event(('create', session_id, user_id, session_data['created_at']))
         
         logger.info(f"Created new session: {session_id}")
         return session_data
@@ -88,29 +248,31 @@ class ConversationMemory:
         
         Args:
             session_id: Session identifier
-            
+        
         Returns:
             Session data or None if not found/expired
         """
-        if session_id not in self.sessions:
-            return None
-        
-        session = self.sessions[session_id]
-        
-        # Check if session has expired
-        last_activity = datetime.fromisoformat(session['last_activity'])
-        if datetime.utcnow() - last_activity > timedelta(seconds=self.session_timeout):
-            self._expire_session(session_id)
-            return None
-        
-        return session
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = self._restore_spilled_session(session_id)
+                if session is None:
+                    return None
+            
+            # Check if session has expired
+            if time.time() - session['_last_activity_ts'] > self.session_timeout:
+                self._expire_session(session_id)
+                return None
+            
+            return session
     
     def add_message(
         self,
         session_id: str,
         role: str,
         content: str,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        analyzed: Optional[AnalyzedMessage] = None
     ) -> bool:
         """
         Add a message to session history
@@ -120,40 +282,35 @@ class ConversationMemory:
             role: Message role ('user' or 'ai')
             content: Message content
             metadata: Optional message metadata
-            
+            analyzed: Optional AnalyzedMessage of the content, reused for entity extraction
+        
         Returns:
             Success status
         """
         try:
-            session = self.get_session(session_id)
-            if not session:
-                # Create session if it doesn't exist
-                session = self.create_session(session_id)
-            
-            # Create message object
-            message = {
-                'role': role,
-                'content': content,
-                'timestamp': datetime.utcnow().isoformat(),
-                'metadata': metadata or {}
-            }
-            
-            # Add to history
-            session['message_history'].append(message)
-            
-            # Update session metadata
-            session['last_activity'] = datetime.utcnow().isoformat()
-            session['session_stats']['message_count'] += 1
-            
-            # Update context based on message
-            self._update_session_context(session, role, content, metadata)
-            
-            # Update global stats
-            self.stats['total_messages'] += 1
+            with self._lock:
+                session = self.get_session(session_id)
+                if not session:
+                    # Create session if it doesn't exist
+                    session = self.create_session(session_id)
+                
+                # Create message object
+                message = {
+                    'role': role,
+                    'content': content,
+                    'timestamp': datetime.utcnow().isoformat(),
+                    'metadata': metadata or {}
+                }
+                
+                self._log_event(('message', session_id, message))
+                self._append_message(session, message, analyzed)
+                
+                # Condense older turns once the session grows past the threshold
+                self._maybe_schedule_summary(session)
             
             logger.debug(f"Added message to session {session_id}: {role}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error adding message to session {session_id}: {e}")
             return False
@@ -165,20 +322,108 @@ class ConversationMemory:
         Args:
             session_id: Session identifier
             limit: Optional limit on number of messages
-            
+        
         Returns:
             List of messages
         """
-        session = self.get_session(session_id)
-        if not session:
-            return []
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return []
+            
+            history = list(session['message_history'])
+            
+            if limit:
+                history = history[-limit:]
+            
+            return [self._materialize(message) for message in history]
+    
+    def get_summary(self, session_id: str) -> str:
+        """
+        Get the rolling summary of turns that were condensed out of the history
         
-        history = list(session['message_history'])
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            Summary text, empty if nothing has been summarized yet
+        """
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return ''
+            return session.get('summary', '')
+    
+    def summarize_session(self, session_id: str) -> bool:
+        """
+        Condense all but the most recent turns of a session into its rolling summary
         
-        if limit:
-            history = history[-limit:]
+        Runs on the background summarizer worker; the summarizer itself is
+        called without holding the memory lock.
+        
+        Args:
+            session_id: Session identifier
         
-        return history
+        Returns:
+            True if older turns were folded into the summary
+        """
+        try:
+            keep = self.summary_keep_recent_turns * 2
+            with self._lock:
+                session = self.sessions.get(session_id)
+                if not session:
+                    return False
+                history = session['message_history']
+                older = [history[i] for i in range(len(history) - keep)]
+                older_turns = [self._materialize(message) for message in older]
+                previous_summary = session.get('summary', '')
+            
+            if not older:
+                return False
+            
+            summary = self._summarizer(self._format_turns_for_summary(previous_summary, older_turns))
+            
+            with self._lock:
+                # The session may have been evicted or replaced while summarizing
+                session = self.sessions.get(session_id)
+                if not session:
+                    return False
+                history = session['message_history']
+                # Compression replaces message objects, so match on content-independent keys
+                older_keys = {self._message_key(message) for message in older}
+                removed = 0
+                while history and self._message_key(history[0]) in older_keys:
+                    self._release_message(session, history.popleft())
+                    removed += 1
+                if not removed:
+                    return False
+                
+                session['summary'] = summary
+                session['summarized_messages'] += removed
+                self.stats['summaries_generated'] += 1
+                self._log_event(('summary', session_id, summary, removed))
+            
+            logger.debug(f"Summarized {removed} messages for session {session_id}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error summarizing session {session_id}: {e}")
+            return False
+        finally:
+            with self._lock:
+                self._pending_summaries.pop(session_id, None)
+    
+    def wait_for_summaries(self, timeout: Optional[float] = None):
+        """
+        Block until all scheduled summarization jobs have finished
+        
+        Args:
+            timeout: Optional maximum wait in seconds
+        """
+        with self._lock:
+            pending = list(self._pending_summaries.values())
+        if pending:
+            wait(pending, timeout=timeout)
     
     def get_context(self, session_id: str) -> Dict[str, Any]:
         """
@@ -186,22 +431,26 @@ class ConversationMemory:
         
         Args:
             session_id: Session identifier
-            
+        
         Returns:
             Context dictionary
         """
-        session = self.get_session(session_id)
-        if not session:
-            return {}
-        
-        context = session['context'].copy()
-        
-        # Convert sets to lists for JSON serialization
-        context['topics'] = list(context['topics'])
-        context['monuments_discussed'] = list(context['monuments_discussed'])
-        context['story_types_requested'] = list(context['story_types_requested'])
-        
-        return context
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return {}
+            
+            context = session['context'].copy()
+            
+            # Convert sets to lists for JSON serialization; containers are copied
+            # so callers never share state that writers mutate
+            for key, value in context.items():
+                if isinstance(value, (set, list)):
+                    context[key] = list(value)
+                elif isinstance(value, dict):
+                    context[key] = dict(value)
+            
+            return context
     
     def update_context(
         self,
@@ -214,31 +463,23 @@ class ConversationMemory:
         Args:
             session_id: Session identifier
             context_updates: Dictionary of context updates
-            
+        
         Returns:
             Success status
         """
         try:
-            session = self.get_session(session_id)
-            if not session:
-                return False
-            
-            # Update context fields
-            for key, value in context_updates.items():
-                if key in session['context']:
-                    if isinstance(session['context'][key], set):
-                        if isinstance(value, (list, set)):
-                            session['context'][key].update(value)
-                        else:
-                            session['context'][key].add(value)
-                    else:
-                        session['context'][key] = value
-            
-            session['last_activity'] = datetime.utcnow().isoformat()
+            with self._lock:
+                session = self.get_session(session_id)
+                if not session:
+                    return False
+                
+                timestamp = datetime.utcnow().isoformat()
+                self._log_event(('context', session_id, context_updates, timestamp))
+                self._apply_context_update(session, context_updates, timestamp)
             
             logger.debug(f"Updated context for session {session_id}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error updating context for session {session_id}: {e}")
             return False
@@ -249,19 +490,17 @@ class ConversationMemory:
         
         Args:
             session_id: Session identifier
-            
+        
         Returns:
             Duration in minutes or None if session not found
         """
-        session = self.get_session(session_id)
-        if not session:
-            return None
-        
-        created_at = datetime.fromisoformat(session['created_at'])
-        last_activity = datetime.fromisoformat(session['last_activity'])
-        
-        duration = (last_activity - created_at).total_seconds() / 60  # Convert to minutes
-        return round(duration, 2)
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return None
+            
+            duration = (session['_last_activity_ts'] - session['_created_ts']) / 60  # Convert to minutes
+            return round(duration, 2)
     
     def get_session_stats(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -269,27 +508,33 @@ class ConversationMemory:
         
         Args:
             session_id: Session identifier
-            
+        
         Returns:
             Session statistics or None if session not found
         """
-        session = self.get_session(session_id)
-        if not session:
-            return None
-        
-        stats = session['session_stats'].copy()
-        stats['duration_minutes'] = self.get_session_duration(session_id)
-        stats['context_topics'] = len(session['context']['topics'])
-        stats['monuments_discussed'] = len(session['context']['monuments_discussed'])
-        
-        return stats
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return None
+            
+            session_stats = session['session_stats']
+            return {
+                'message_count': session_stats['message_count'],
+                'intent_distribution': dict(session_stats['intent_distribution']),
+                'response_ratings': list(session_stats['response_ratings']),
+                'topics_covered': session_stats['topics_covered'],
+                'duration_minutes': round((session['_last_activity_ts'] - session['_created_ts']) / 60, 2),
+                'context_topics': len(session['context']['topics']),
+                'monuments_discussed': len(session['context']['monuments_discussed'])
+            }
     
     def _update_session_context(
         self,
         session: Dict[str, Any],
         role: str,
         content: str,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        analyzed: Optional[AnalyzedMessage] = None
     ):
         """
         Update session context based on message content
@@ -299,36 +544,30 @@ class ConversationMemory:
             role: Message role
             content: Message content
             metadata: Message metadata
+            analyzed: Optional AnalyzedMessage of the content
         """
         try:
             context = session['context']
             
             if role == 'user':
-                # Extract topics from user messages
-                content_lower = content.lower()
-                
-                # Detect monument mentions
-                monuments = ['taj mahal', 'red fort', 'hampi', 'qutub minar', 'gateway of india']
-                for monument in monuments:
-                    if monument in content_lower:
-                        context['monuments_discussed'].add(monument)
-                
-                # Detect story type requests
-                story_types = ['history', 'mythology', 'folklore', 'horror', 'legend', 'ghost']
-                for story_type in story_types:
-                    if story_type in content_lower:
-                        context['story_types_requested'].add(story_type)
+                # Extract monuments, figures, story types and topics in a single pass
+                matcher = self._get_entity_matcher()
+                entities = analyzed.entities_for(matcher) if analyzed is not None else matcher.extract(content)
                 
-                # Extract general topics
-                topics = ['architecture', 'culture', 'tradition', 'festival', 'religion', 'art']
-                for topic in topics:
-                    if topic in content_lower:
-                        context['topics'].add(topic)
+                context['monuments_discussed'].update(entities.get('monument', ()))
+                context['figures_discussed'].update(entities.get('figure', ()))
+                context['topics'].update(entities.get('topic', ()))
+                for category in entities.get('category', ()):
+                    if category in STORY_TYPE_CATEGORIES:
+                        context['story_types_requested'].add(category)
+                    else:
+                        context['topics'].add(category)
             
             # Update from metadata
             if metadata:
                 if 'intent' in metadata:
                     session['session_stats']['intent_distribution'][metadata['intent']] += 1
+                    self._intent_totals[metadata['intent']] += 1
                 
                 if 'monument_id' in metadata:
                     context['current_monument'] = metadata['monument_id']
@@ -338,10 +577,20 @@ class ConversationMemory:
                 
                 if 'user_rating' in metadata:
                     session['session_stats']['response_ratings'].append(metadata['user_rating'])
+                    self._rating_count += 1
+                    self._rating_sum += float(metadata['user_rating'])
         
         except Exception as e:
             logger.error(f"Error updating session context: {e}")
     
+    def _get_entity_matcher(self) -> Matcher:
+        """Entity matcher from the knowledge base, or one built from cultural categories only"""
+        if self.knowledge_base is not None:
+            return self.knowledge_base.get_entity_matcher()
+        if self._fallback_matcher is None:
+            self._fallback_matcher = EntityMatcher(build_lexicon_entries())
+        return self._fallback_matcher
+    
     def _expire_session(self, session_id: str):
         """
         Expire and remove a session
@@ -349,28 +598,86 @@ class ConversationMemory:
         Args:
             session_id: Session identifier
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            self.stats['active_sessions'] -= 1
-            logger.info(f"Expired session: {session_id}")
+        with self._lock:
+            if session_id in self.sessions:
+                self._release_session(self.sessions.pop(session_id))
+                self.stats['active_sessions'] -= 1
+                self._log_event(('expire', session_id))
+                logger.info(f"Expired session: {session_id}")
     
     def cleanup_expired_sessions(self):
         """
         Clean up expired sessions
+        
+        Sessions are kept in last-activity order, so the scan stops at the first
+        session that is still live; cost is proportional to the number expired.
         """
-        current_time = datetime.utcnow()
-        expired_sessions = []
+        cutoff = time.time() - self.session_timeout
+        expired_count = 0
         
-        for session_id, session in self.sessions.items():
-            last_activity = datetime.fromisoformat(session['last_activity'])
-            if current_time - last_activity > timedelta(seconds=self.session_timeout):
-                expired_sessions.append(session_id)
+        with self._lock:
+            while self.sessions:
+                session_id, session = next(iter(self.sessions.items()))
+                if session['_last_activity_ts'] >= cutoff:
+                    break
+                self._expire_session(session_id)
+                expired_count += 1
+            
+            expired_count += self._expire_spilled_sessions(cutoff)
         
-        for session_id in expired_sessions:
-            self._expire_session(session_id)
+        if expired_count:
+            logger.info(f"Cleaned up {expired_count} expired sessions")
+    
+    def compress_idle_sessions(self) -> int:
+        """
+        Compress every message of sessions idle longer than cold_after_seconds
+        
+        Walks the sessions not yet compressed in activity order and stops at
+        the first one that is not idle, so a pass costs the number of newly
+        idle sessions. The lock is taken per session.
+        
+        Returns:
+            Number of sessions compressed
+        """
+        if not self.cold_after_seconds:
+            return 0
+        
+        cutoff = time.time() - self.cold_after_seconds
+        compressed = 0
+        
+        while True:
+            with self._lock:
+                if not self._warm:
+                    break
+                session_id = next(iter(self._warm))
+                session = self.sessions.get(session_id)
+                # Entries of sessions since expired, evicted or compressed are dropped as they come up
+                if session is not None and not session.get('_cold'):
+                    if session['_last_activity_ts'] >= cutoff:
+                        break
+                    history = session['message_history']
+                    for index in range(len(history)):
+                        self._compress_at(session, index)
+                    session['_cold'] = True
+                    compressed += 1
+                del self._warm[session_id]
         
-        if expired_sessions:
-            logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
+        if compressed:
+            logger.debug(f"Compressed {compressed} idle sessions")
+        return compressed
+    
+    def run_maintenance(self):
+        """Expire timed-out sessions (in memory and spilled) and compress idle ones"""
+        self.cleanup_expired_sessions()
+        self.compress_idle_sessions()
+    
+    def _maintenance_loop(self, interval: float):
+        """Background maintenance passes until close()"""
+        while not self._maintenance_stop.wait(interval):
+            try:
+                self.run_maintenance()
+            except Exception as e:
+                logger.error(f"Error in conversation memory maintenance: {e}")
     
     def get_memory_stats(self) -> Dict[str, Any]:
         """
@@ -379,25 +686,38 @@ class ConversationMemory:
         Returns:
             Memory statistics
         """
-        # Clean up expired sessions first
+        # Clean up expired sessions first (only touches the expired ones)
         self.cleanup_expired_sessions()
         
-        total_messages_in_memory = sum(
-            len(session['message_history']) 
-            for session in self.sessions.values()
-        )
-        
-        return {
-            'total_sessions_created': self.stats['total_sessions'],
-            'active_sessions': len(self.sessions),
-            'total_messages_processed': self.stats['total_messages'],
-            'messages_in_memory': total_messages_in_memory,
-            'average_messages_per_session': (
-                total_messages_in_memory / len(self.sessions) 
-                if self.sessions else 0
-            ),
-            'memory_efficiency': f"{total_messages_in_memory}/{self.max_history * len(self.sessions)}"
-        }
+        with self._lock:
+            active_sessions = len(self.sessions)
+            messages_in_memory = self._messages_in_memory
+            
+            return {
+                'total_sessions_created': self.stats['total_sessions'],
+                'active_sessions': active_sessions,
+                'total_messages_processed': self.stats['total_messages'],
+                'messages_in_memory': messages_in_memory,
+                'average_messages_per_session': (
+                    messages_in_memory / active_sessions
+                    if active_sessions else 0
+                ),
+                'memory_efficiency': f"{messages_in_memory}/{self.max_history * active_sessions}",
+                'intent_totals': dict(self._intent_totals),
+                'compression': self.get_compression_stats(),
+                'ratings_count': self._rating_count,
+                'average_rating': (
+                    round(self._rating_sum / self._rating_count, 3)
+                    if self._rating_count else None
+                ),
+                'bytes_in_memory': self._bytes_in_memory,
+                'max_total_messages': self.max_total_messages,
+                'max_total_bytes': self.max_total_bytes,
+                'evicted_sessions': self.stats['evicted_sessions'],
+                'spilled_sessions': self.stats['spilled_sessions'],
+                'restored_sessions': self.stats['restored_sessions'],
+                'summaries_generated': self.stats['summaries_generated']
+            }
     
     def export_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -405,27 +725,137 @@ class ConversationMemory:
         
         Args:
             session_id: Session identifier
-            
+        
         Returns:
             Exportable session data
         """
-        session = self.get_session(session_id)
-        if not session:
-            return None
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return None
+            
+            # Convert to serializable format
+            export_data = {
+                'session_id': session['session_id'],
+                'user_id': session['user_id'],
+                'created_at': session['created_at'],
+                'last_activity': session['last_activity'],
+                'duration_minutes': self.get_session_duration(session_id),
+                'message_history': [self._materialize(message) for message in session['message_history']],
+                'summary': session.get('summary', ''),
+                'context': self.get_context(session_id),
+                'stats': self.get_session_stats(session_id)
+            }
+            
+            return export_data
+    
+    def get_compression_stats(self) -> Dict[str, Any]:
+        """
+        Get cold-turn compression statistics
         
-        # Convert to serializable format
-        export_data = {
+        Returns:
+            Compressed message count, ratio of raw to compressed bytes and
+            the average cost of inflating a message on read
+        """
+        with self._lock:
+            stats = self.compression_stats
+            return {
+                'messages_compressed': stats['messages_compressed'],
+                'raw_bytes': stats['raw_bytes'],
+                'compressed_bytes': stats['compressed_bytes'],
+                'compression_ratio': (
+                    round(stats['raw_bytes'] / stats['compressed_bytes'], 2)
+                    if stats['compressed_bytes'] else None
+                ),
+                'decompressions': stats['decompressions'],
+                'avg_decompression_us': (
+                    round(stats['decompression_seconds'] / stats['decompressions'] * 1e6, 2)
+                    if stats['decompressions'] else None
+                )
+            }
+    
+    def export_all(
+        self,
+        output_dir: str,
+        export_format: str = 'parquet',
+        start: Optional[Union[str, datetime]] = None,
+        end: Optional[Union[str, datetime]] = None,
+        batch_size: int = 10000
+    ) -> Future:
+        """
+        Stream every session and message to columnar files in the background
+        
+        Args:
+            output_dir: Directory for sessions.<ext> and messages.<ext>
+            export_format: 'parquet' or 'arrow' (Arrow IPC file)
+            start: Optional inclusive lower bound on message timestamps (UTC)
+            end: Optional exclusive upper bound on message timestamps (UTC)
+            batch_size: Rows buffered per record batch
+        
+        Returns:
+            Future resolving to the export summary
+        
+        Raises:
+            ValueError: If a bound is not an ISO 8601 date or datetime
+        """
+        # Bounds are checked now so bad input fails the request, not the background job
+        start, end = parse_time_bound(start), parse_time_bound(end)
+        exporter = ConversationExporter(self, batch_size=batch_size)
+        with self._lock:
+            if self._export_executor is None:
+                self._export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='memory-export')
+            return self._export_executor.submit(exporter.export, output_dir, export_format, start, end)
+    
+    def iter_sessions(self) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Read-only pass over every session, in memory or spilled, without restoring or touching any
+        
+        The lock is held only while copying one session; cold messages are
+        inflated into the copies without counting toward compression stats.
+        
+        Yields:
+            (session copy with ids, timestamps, summary, context and stats; its messages)
+        """
+        with self._lock:
+            session_ids = list(self.sessions.keys())
+            spilled_ids = list(self._spilled)
+        
+        for session_id in session_ids:
+            with self._lock:
+                session = self.sessions.get(session_id)
+                copied = self._copy_session(session) if session is not None else None
+            if copied is not None:
+                yield copied
+        
+        # Spilled sessions are read from disk without bringing them back into memory
+        for session_id in spilled_ids:
+            with self._lock:
+                if session_id not in self._spilled:
+                    continue
+                copied = self._copy_session(self._spill_store[session_id])
+            yield copied
+    
+    def _copy_session(self, session: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Detached copy of a session's exportable fields and messages; caller holds the lock"""
+        context = session['context']
+        copy = {
             'session_id': session['session_id'],
             'user_id': session['user_id'],
             'created_at': session['created_at'],
             'last_activity': session['last_activity'],
-            'duration_minutes': self.get_session_duration(session_id),
-            'message_history': list(session['message_history']),
-            'context': self.get_context(session_id),
-            'stats': self.get_session_stats(session_id)
+            'summary': session.get('summary', ''),
+            'context': {
+                'current_monument': context.get('current_monument'),
+                'monuments_discussed': list(context.get('monuments_discussed', [])),
+                'topics': list(context.get('topics', []))
+            },
+            'session_stats': {
+                'message_count': session['session_stats']['message_count'],
+                'intent_distribution': dict(session['session_stats']['intent_distribution'])
+            }
         }
-        
-        return export_data
+        # Cold messages are inflated here; the memory keeps its compressed copies
+        return copy, [self._materialize(message, record_stats=False) for message in session['message_history']]
     
     def clear_session(self, session_id: str) -> bool:
         """
@@ -433,7 +863,7 @@ class ConversationMemory:
         
         Args:
             session_id: Session identifier
-            
+        
         Returns:
             Success status
         """
@@ -449,9 +879,497 @@ class ConversationMemory:
         Returns:
             Number of sessions cleared
         """
-        count = len(self.sessions)
+        with self._lock:
+            count = len(self.sessions)
+            self._reset_state()
+            self._log_event(('clear_all',))
+        
+        logger.info(f"Cleared all {count} sessions")
+        return count
+    
+    def _reset_state(self):
+        """Drop every session, spilled or resident, and zero the running counters; caller holds the lock"""
         self.sessions.clear()
+        self._warm.clear()
         self.stats['active_sessions'] = 0
+        self._messages_in_memory = 0
+        self._bytes_in_memory = 0
+        self._intent_totals.clear()
+        self._rating_count = 0
+        self._rating_sum = 0.0
+        if self._spill_store is not None:
+            self._spill_store.clear()
+        self._spilled.clear()
+        self._spill_expiry.clear()
+    
+    def close(self):
+        """Stop background work, flush the durable log and release the spill store"""
+        self._maintenance_stop.set()
+        if self._maintenance_thread is not None:
+            self._maintenance_thread.join()
+            self._maintenance_thread = None
+        if self._summary_executor is not None:
+            self._summary_executor.shutdown(wait=True)
+            self._summary_executor = None
+        if self._export_executor is not None:
+            self._export_executor.shutdown(wait=True)
+            self._export_executor = None
+        with self._lock:
+            if self._spill_store is not None:
+                self._spill_store.close()
+                self._spill_store = None
+                self._spilled.clear()
+                self._spill_expiry.clear()
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+    
+    def snapshot(self) -> bool:
+        """
+        Write a compacted snapshot of all sessions and drop the log segments it covers
         
-        logger.info(f"Cleared all {count} sessions")
-        return count
\ No newline at end of file
+        Only the segment rotation and a shallow copy of session state happen under
+        the memory lock; pickling and fsync run outside it.
+        
+        Returns:
+            True if a snapshot was written
+        """
+        if self._store is None:
+            return False
+        
+        try:
+            with self._lock:
+                segment, rotated = self._store.rotate()
+                state = {
+                    'sessions': [self._serialize_session(session) for session in self.sessions.values()],
+                    'stats': dict(self.stats),
+                    'intent_totals': dict(self._intent_totals),
+                    'ratings': (self._rating_count, self._rating_sum)
+                }
+            
+            rotated.wait()
+            self._store.write_snapshot(state, segment)
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error writing conversation memory snapshot: {e}")
+            return False
+    
+    def _append_message(
+        self,
+        session: Dict[str, Any],
+        message: Dict[str, Any],
+        analyzed: Optional[AnalyzedMessage] = None
+    ):
+        """
+        Append a message to a session and update accounting, context and budget
+        
+        Args:
+            session: Session data
+            message: Message object
+            analyzed: Optional AnalyzedMessage of the message content
+        """
+        # Add to history, releasing the message the deque is about to drop
+        history = session['message_history']
+        if history.maxlen is not None and len(history) == history.maxlen:
+            self._release_message(session, history[0])
+        history.append(message)
+        self._account_message(session, message)
+        
+        # The message leaving the prompt window becomes cold
+        if self.hot_window_messages and len(history) > self.hot_window_messages:
+            self._compress_at(session, len(history) - self.hot_window_messages - 1)
+        
+        # Update session metadata
+        self._touch(session, message['timestamp'])
+        session['_cold'] = False
+        session['session_stats']['message_count'] += 1
+        
+        # Update context based on message
+        self._update_session_context(session, message['role'], message['content'], message['metadata'], analyzed)
+        
+        # Update global stats
+        self.stats['total_messages'] += 1
+        
+        # Keep the process inside the global budget
+        self._enforce_budget(keep_session_id=session['session_id'])
+    
+    def _apply_context_update(self, session: Dict[str, Any], context_updates: Dict[str, Any], timestamp: str):
+        """
+        Merge context updates into a session
+        
+        Args:
+            session: Session data
+            context_updates: Dictionary of context updates
+            timestamp: Activity timestamp
+        """
+        for key, value in context_updates.items():
+            if key in session['context']:
+                if isinstance(session['context'][key], set):
+                    if isinstance(value, (list, set)):
+                        session['context'][key].update(value)
+                    else:
+                        session['context'][key].add(value)
+                else:
+                    session['context'][key] = value
+        
+        self._touch(session, timestamp)
+    
+    def _log_event(self, event: tuple):
+        """Append an event to the durable log unless replaying it"""
+        if self._store is not None and not self._replaying:
+            self._store.append(event)
+    
+    def _serialize_session(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a session into plain containers that are safe to pickle outside the lock"""
+        context = {
+            key: set(value) if isinstance(value, set) else value
+            for key, value in session['context'].items()
+        }
+        session_stats = dict(session['session_stats'])
+        session_stats['intent_distribution'] = dict(session_stats['intent_distribution'])
+        session_stats['response_ratings'] = list(session_stats['response_ratings'])
+        
+        data = {key: value for key, value in session.items() if key not in ('message_history', 'context', 'session_stats')}
+        data['message_history'] = list(session['message_history'])
+        data['context'] = context
+        data['session_stats'] = session_stats
+        return data
+    
+    def _deserialize_session(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild a live session from its serialized form"""
+        session = dict(data)
+        session['message_history'] = deque(data['message_history'], maxlen=self.max_history)
+        session['session_stats'] = dict(data['session_stats'])
+        session['session_stats']['intent_distribution'] = defaultdict(
+            int, data['session_stats']['intent_distribution']
+        )
+        session.setdefault('_created_ts', _iso_to_epoch(session['created_at']))
+        session.setdefault('_last_activity_ts', _iso_to_epoch(session['last_activity']))
+        return session
+    
+    def _install_session(self, session: Dict[str, Any]):
+        """Place a rebuilt session into memory at the most-recent end"""
+        session_id = session['session_id']
+        if session_id in self.sessions:
+            self._release_session(self.sessions.pop(session_id))
+            self.stats['active_sessions'] -= 1
+        self.sessions[session_id] = session
+        self._mark_warm(session_id)
+        self._messages_in_memory += len(session['message_history'])
+        self._bytes_in_memory += session['_memory_bytes']
+        self.stats['active_sessions'] += 1
+    
+    def _restore_from_store(self):
+        """Load the latest snapshot and replay newer log events"""
+        start_time = time.perf_counter()
+        
+        # Restore allocates millions of long-lived objects; cyclic GC passes only slow it down
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        self._replaying = True
+        try:
+            snapshot, events = self._store.load()
+            with self._lock:
+                if snapshot:
+                    for data in snapshot.get('sessions', []):
+                        self._install_session(self._deserialize_session(data))
+                    for key, value in snapshot.get('stats', {}).items():
+                        if key in self.stats and key != 'active_sessions':
+                            self.stats[key] = value
+                    self._intent_totals.update(snapshot.get('intent_totals', {}))
+                    self._rating_count, self._rating_sum = snapshot.get('ratings', (0, 0.0))
+                
+                replayed = 0
+                for event in events:
+                    self._replay_event(event)
+                    replayed += 1
+                
+                self._enforce_budget()
+        finally:
+            self._replaying = False
+            if gc_was_enabled:
+                gc.enable()
+        
+        logger.info(
+            f"Restored {len(self.sessions)} sessions ({replayed} log events) "
+            f"in {time.perf_counter() - start_time:.3f}s"
+        )
+    
+    def _replay_event(self, event: tuple):
+        """
+        Re-apply a logged event without logging it again
+        
+        Args:
+            event: Event tuple as written by _log_event
+        """
+        kind, session_id = event[0], event[1] if len(event) > 1 else None
+        
+        if kind == 'create':
+            session = self.create_session(session_id, event[2])
+            session['created_at'] = session['last_activity'] = event[3]
+            session['_created_ts'] = session['_last_activity_ts'] = _iso_to_epoch(event[3])
+        elif kind == 'message':
+            session = self.sessions.get(session_id) or self.create_session(session_id)
+            self._append_message(session, event[2])
+        elif kind == 'context':
+            session = self.sessions.get(session_id)
+            if session:
+                self._apply_context_update(session, event[2], event[3])
+        elif kind == 'summary':
+            session = self.sessions.get(session_id)
+            if session:
+                history = session['message_history']
+                for _ in range(min(event[3], len(history))):
+                    self._release_message(session, history.popleft())
+                session['summary'] = event[2]
+                session['summarized_messages'] += event[3]
+        elif kind == 'restore':
+            self._install_session(self._deserialize_session(event[2]))
+        elif kind == 'expire':
+            if session_id in self.sessions:
+                self._release_session(self.sessions.pop(session_id))
+                self.stats['active_sessions'] -= 1
+        elif kind == 'clear_all':
+            self._reset_state()
+        else:
+            logger.warning(f"Unknown conversation memory event: {kind}")
+    
+    def _maybe_schedule_summary(self, session: Dict[str, Any]):
+        """
+        Queue a background summarization job when a session crosses the turn threshold
+        
+        Args:
+            session: Session data
+        """
+        if self._summary_executor is None:
+            return
+        session_id = session['session_id']
+        if session_id in self._pending_summaries:
+            return
+        if len(session['message_history']) < self.summary_turn_threshold * 2:
+            return
+        self._pending_summaries[session_id] = self._summary_executor.submit(
+            self.summarize_session, session_id
+        )
+    
+    @staticmethod
+    def _format_turns_for_summary(previous_summary: str, messages: List[Dict[str, Any]]) -> str:
+        """Render the previous summary and older turns as summarizer input"""
+        lines = [previous_summary] if previous_summary else []
+        for message in messages:
+            speaker = 'User' if message.get('role') == 'user' else 'Narad'
+            lines.append(f"{speaker}: {message.get('content', '')}")
+        return '\n'.join(lines)
+    
+    @staticmethod
+    def _default_summarize(text: str) -> str:
+        """
+        Lightweight extractive summary: first sentence of every line, newest kept
+        
+        Args:
+            text: Previous summary followed by formatted turns
+        
+        Returns:
+            Summary no longer than DEFAULT_SUMMARY_MAX_LENGTH
+        """
+        sentences = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            end = min((i for i in (line.find('. '), line.find('? '), line.find('! ')) if i != -1), default=-1)
+            sentences.append(line[:end + 1] if end != -1 else line)
+        
+        summary = ' '.join(sentences)
+        if len(summary) > DEFAULT_SUMMARY_MAX_LENGTH:
+            summary = '...' + summary[-(DEFAULT_SUMMARY_MAX_LENGTH - 3):]
+        return summary
+    
+    def _touch(self, session: Dict[str, Any], timestamp: Optional[str] = None):
+        """
+        Record activity on a session and move it to the most-recent end of the LRU order
+        
+        Args:
+            session: Session data
+            timestamp: Activity time in ISO format (defaults to now)
+        """
+        if timestamp:
+            session['last_activity'] = timestamp
+            session['_last_activity_ts'] = _iso_to_epoch(timestamp)
+        else:
+            now = time.time()
+            session['last_activity'] = _epoch_to_iso(now)
+            session['_last_activity_ts'] = now
+        if session['session_id'] in self.sessions:
+            self.sessions.move_to_end(session['session_id'])
+            self._mark_warm(session['session_id'])
+    
+    def _mark_warm(self, session_id: str):
+        """Queue a session, at the most-recent end, for the next idle compression passes"""
+        if self.cold_after_seconds:
+            self._warm[session_id] = None
+            self._warm.move_to_end(session_id)
+    
+    @staticmethod
+    def _message_size(message: Dict[str, Any]) -> int:
+        """Approximate memory footprint of a message in bytes"""
+        if '_zcontent' in message:
+            return len(message['_zcontent']) + MESSAGE_OVERHEAD_BYTES
+        return len(message.get('content', '').encode('utf-8')) + MESSAGE_OVERHEAD_BYTES
+    
+    @staticmethod
+    def _message_key(message: Dict[str, Any]) -> tuple:
+        """Identify a message independently of whether its content is compressed"""
+        return (message['timestamp'], message['role'])
+    
+    def _compress_at(self, session: Dict[str, Any], index: int):
+        """
+        Replace the message at `index` with a zlib-compressed copy
+        
+        The message object is replaced rather than mutated because it may still
+        be referenced by a caller or by the pending durable-log write.
+        """
+        history = session['message_history']
+        message = history[index]
+        if '_zcontent' in message:
+            return
+        raw = message.get('content', '').encode('utf-8')
+        if len(raw) < COMPRESS_MIN_BYTES:
+            return
+        packed = zlib.compress(raw, self.compression_level)
+        if len(packed) >= len(raw):
+            return
+        
+        cold = {key: value for key, value in message.items() if key != 'content'}
+        cold['_zcontent'] = packed
+        history[index] = cold
+        
+        saved = len(raw) - len(packed)
+        session['_memory_bytes'] -= saved
+        self._bytes_in_memory -= saved
+        self.compression_stats['messages_compressed'] += 1
+        self.compression_stats['raw_bytes'] += len(raw)
+        self.compression_stats['compressed_bytes'] += len(packed)
+    
+    def _materialize(self, message: Dict[str, Any], record_stats: bool = True) -> Dict[str, Any]:
+        """
+        Return the message with its content inflated if it is stored compressed
+        
+        Args:
+            message: Stored message
+            record_stats: Count the inflation in the read-path decompression stats
+        """
+        if '_zcontent' not in message:
+            return message
+        started = time.perf_counter()
+        content = zlib.decompress(message['_zcontent']).decode('utf-8')
+        if record_stats:
+            self.compression_stats['decompressions'] += 1
+            self.compression_stats['decompression_seconds'] += time.perf_counter() - started
+        warm = {key: value for key, value in message.items() if key != '_zcontent'}
+        warm['content'] = content
+        return warm
+    
+    def _account_message(self, session: Dict[str, Any], message: Dict[str, Any]):
+        """Add a message to the global and per-session budget counters"""
+        size = self._message_size(message)
+        session['_memory_bytes'] += size
+        self._messages_in_memory += 1
+        self._bytes_in_memory += size
+    
+    def _release_message(self, session: Dict[str, Any], message: Dict[str, Any]):
+        """Remove a message from the global and per-session budget counters"""
+        size = self._message_size(message)
+        session['_memory_bytes'] -= size
+        self._messages_in_memory -= 1
+        self._bytes_in_memory -= size
+    
+    def _release_session(self, session: Dict[str, Any]):
+        """Remove a whole session from the global budget counters"""
+        self._messages_in_memory -= len(session['message_history'])
+        self._bytes_in_memory -= session['_memory_bytes']
+    
+    def _over_budget(self) -> bool:
+        """Check whether the global message or byte budget is exceeded"""
+        return bool(
+            (self.max_total_messages and self._messages_in_memory > self.max_total_messages) or
+            (self.max_total_bytes and self._bytes_in_memory > self.max_total_bytes)
+        )
+    
+    def _enforce_budget(self, keep_session_id: Optional[str] = None):
+        """
+        Evict least recently active sessions until memory fits the global budget
+        
+        Args:
+            keep_session_id: Session that must not be evicted (the one being written)
+        """
+        while self._over_budget() and self.sessions:
+            session_id = next(iter(self.sessions))
+            if session_id == keep_session_id:
+                break
+            
+            session = self.sessions.pop(session_id)
+            self._release_session(session)
+            self.stats['active_sessions'] -= 1
+            self.stats['evicted_sessions'] += 1
+            self._log_event(('expire', session_id))
+            
+            if self._spill_store is not None:
+                self._spill_store[session_id] = session
+                self._index_spilled(session_id, session['_last_activity_ts'])
+                self.stats['spilled_sessions'] += 1
+                logger.debug(f"Spilled session to disk: {session_id}")
+            else:
+                logger.debug(f"Evicted session: {session_id}")
+    
+    def _restore_spilled_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Bring a spilled session back into memory
+        
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            Session data or None if the session was never spilled
+        """
+        if self._spilled.pop(session_id, None) is None:
+            return None
+        
+        session = self._spill_store.pop(session_id)
+        self._install_session(session)
+        self.stats['restored_sessions'] += 1
+        self._log_event(('restore', session_id, self._serialize_session(session)))
+        
+        self._enforce_budget(keep_session_id=session_id)
+        logger.debug(f"Restored spilled session: {session_id}")
+        return session
+    
+    def _index_spilled(self, session_id: str, last_activity: float):
+        """Track a spilled session for expiry"""
+        self._spilled[session_id] = last_activity
+        heapq.heappush(self._spill_expiry, (last_activity, session_id))
+    
+    def _expire_spilled_sessions(self, cutoff: float) -> int:
+        """
+        Delete spilled sessions idle since before the cutoff
+        
+        Cost is proportional to the number expired (plus stale heap entries),
+        not to the size of the spill store.
+        
+        Args:
+            cutoff: Epoch seconds; sessions last active before it are expired
+        
+        Returns:
+            Number of spilled sessions deleted
+        """
+        expired = 0
+        while self._spill_expiry and self._spill_expiry[0][0] < cutoff:
+            last_activity, session_id = heapq.heappop(self._spill_expiry)
+            if self._spilled.get(session_id) != last_activity:
+                continue
+            del self._spilled[session_id]
+            # The durable log already recorded the session as gone when it was spilled
+            del self._spill_store[session_id]
+            expired += 1
+        return expired
@@ -5,18 +5,79 @@ Manages cultural information, stories, and contextual knowledge
 
 import json
 import os
-from typing import Dict, List, Any, Optional
+import copy
+import time
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+import numpy as np
+
+from .entity_matcher import EntityMatcher, LayeredEntityMatcher, Matcher, build_lexicon_entries, monument_lexicon_entries
+from .kb_loader import SECTIONS, load_knowledge_file, save_knowledge_file, current_rss_bytes
+from .compact_records import CompactRecords, RecordView
+from .story_index import StoryIndex
+from .monument_lookup import MonumentLookup
+from .related_monuments import RelatedMonumentGraph, monument_state
+from .geo_index import GeoIndex, haversine_km, monument_coordinates
+from .period_index import PeriodIndex, parse_timeframe
+from .entity_graph import EntityGraph
+from .kb_ingest import prepare_batch
+
 logger = logging.getLogger(__name__)
 
+# Lowest lookup score at which get_monument_info accepts a name match
+MONUMENT_MATCH_THRESHOLD = 0.62
+
+# Nearest sites get_location_culture aggregates over
+LOCATION_SITE_LIMIT = 50
+
+# Years either side of a monument's construction in which other constructions count as contemporary,
+# searched outwards so dense catalogs stop at the first window with enough monuments
+CONTEMPORARY_WINDOWS = (0, 5, 25)
+CONTEMPORARY_LIMIT = 3
+
+# Enclosing periods and dynasties shown in a timeline, narrowest first
+TIMELINE_PERIOD_LIMIT = 4
+
+# Seconds a graph query waits for the entity graph while it is still being built
+ENTITY_GRAPH_WAIT_SECONDS = 5.0
+
+# Relations linking a monument to its stories, in either direction
+STORY_RELATIONS = ('story', 'myth', 'site')
+
+# Dangling references quoted in the load-time warning
+DANGLING_LOG_EXAMPLES = 5
+
+# Monuments in one ingested batch above which the related-monument graph is
+# rebuilt in the background instead of updated monument by monument
+INGEST_RELATED_REBUILD = 256
+
+# Phrases added since the entity matcher was compiled before it is rebuilt in the background
+MATCHER_REBUILD_PHRASES = 2048
+
 class CulturalKnowledgeBase:
     """
     Knowledge base containing cultural information about Indian heritage
     """
     
-    def __init__(self):
-        """Initialize the cultural knowledge base"""
+    def __init__(self, data_path: Optional[str] = None, compact: bool = False):
+        """
+        Initialize the cultural knowledge base
+        
+        Args:
+            data_path: Optional versioned .jsonl or .sqlite knowledge file; the
+                built-in sample data is used when not given
+            compact: Keep a knowledge file's monuments and stories in column
+                storage with interned strings (records are read as views)
+        """
+        self.data_path = data_path
+        self.compact = compact
+        self.dataset_version: Optional[str] = None
+        self.load_stats: Dict[str, Any] = {}
+        self._content_store = None
+        
         self.monuments_db = {}
         self.stories_db = {}
         self.cultural_contexts = {}
@@ -24,6 +85,47 @@ class CulturalKnowledgeBase:
         self.mythological_figures = {}
         self.historical_periods = {}
         
+        # Bumped on every change so derived indexes and caches can detect staleness
+        self.version = 0
+        # Published entity matcher; recognises cultural categories only until
+        # the lexicon is compiled with the other indexes. Monuments added later
+        # are matched by a small layer of added phrases until a background
+        # rebuild folds them in, so a request never compiles the lexicon
+        self._entity_matcher: Matcher = EntityMatcher(build_lexicon_entries(), version=0)
+        self._matcher_base = self._entity_matcher
+        self._matcher_additions: List[Tuple[str, str, str]] = []
+        self._matcher_rebuilding = False
+        # Monument name lookup; built with the background indexes, until then
+        # it only knows the monuments added since loading (also queued in
+        # the pending list for the full lookup)
+        self._monument_lookup = MonumentLookup()
+        self._pending_lookup: Optional[List[str]] = None
+        
+        # Story search index and related-monument graph; built in the
+        # background for knowledge files, with records added meanwhile queued
+        # in the pending lists
+        self.story_index = StoryIndex()
+        self.related_graph = RelatedMonumentGraph()
+        self._index_lock = threading.Lock()
+        self._pending_stories: Optional[List[str]] = None
+        self._pending_monuments: Optional[List[str]] = None
+        self._indexes_ready = threading.Event()
+        
+        # Monument coordinates and the monuments named by each place (town or
+        # state); cheap enough to build while loading
+        self.geo_index = GeoIndex()
+        self._place_monuments: Dict[str, List[str]] = {}
+        self._place_centres: Dict[str, Tuple[int, Optional[Tuple[float, float]]]] = {}
+        
+        # Year ranges of periods, dynasties, monument construction and recorded events
+        self.period_index = PeriodIndex()
+        
+        # Typed graph of the cross-references between monuments, stories,
+        # figures, periods and places; built with the background indexes
+        self.entity_graph = EntityGraph()
+        self._pending_graph: Optional[List[Tuple[str, str]]] = None
+        self._entity_graph_ready = threading.Event()
+        
         # Load knowledge from files/database
         self._load_knowledge_base()
         
@@ -40,25 +142,320 @@ class CulturalKnowledgeBase:
     def _load_knowledge_base(self):
         """Load cultural knowledge from various sources"""
         try:
-            # In a real implementation, this would load from:
-            # - Database
-            # - JSON files
-            # - External APIs
-            # - Curated cultural datasets
+            start = time.perf_counter()
+            rss_before = current_rss_bytes()
             
-            # For now, we'll populate with sample data
-            self._load_sample_monuments()
-            self._load_sample_stories()
-            self._load_cultural_contexts()
-            self._load_mythological_figures()
-            self._load_historical_periods()
+            if self.data_path:
+                self._load_from_file(self.data_path)
+            else:
+                # Built-in sample data
+                self._load_sample_monuments()
+                self._load_sample_stories()
+                self._load_cultural_contexts()
+                self._load_mythological_figures()
+                self._load_historical_periods()
+            self.version += 1
             
-            logger.info("Knowledge base loaded successfully")
+            self.load_stats = {
+                'source': self.data_path or 'built-in samples',
+                'dataset_version': self.dataset_version,
+                'load_seconds': round(time.perf_counter() - start, 4),
+                'rss_growth_bytes': max(current_rss_bytes() - rss_before, 0),
+                'records': sum(len(getattr(self, attribute)) for attribute in SECTIONS.values()),
+                'compact': isinstance(self.monuments_db, CompactRecords)
+            }
+            if self.load_stats['compact']:
+                self.load_stats['interned_strings'] = len(self.monuments_db.strings)
+            self._build_geo_index()
+            self._build_period_index()
+            logger.info(f"Knowledge base loaded successfully: {self.load_stats}")
             
+            if self.data_path:
+                # Indexing reads every story body, so it stays off the startup path
+                self._pending_stories = []
+                self._pending_monuments = []
+                self._pending_graph = []
+                self._pending_lookup = []
+                threading.Thread(target=self._build_indexes, name='kb-indexes', daemon=True).start()
+            else:
+                self._build_indexes()
+        
         except Exception as e:
             logger.error(f"Error loading knowledge base: {e}")
             # Initialize with empty databases for graceful degradation
             self._initialize_empty_databases()
+            self._indexes_ready.set()
+            self._entity_graph_ready.set()
+    
+    def _load_from_file(self, path: str):
+        """Load every section from a knowledge file; story bodies stay on disk until read"""
+        data = load_knowledge_file(path, compact=self.compact)
+        for attribute, records in data['sections'].items():
+            setattr(self, attribute, records)
+        self.dataset_version = data['version']
+        self._content_store = data['content_store']
+    
+    def _build_geo_index(self):
+        """Index monument coordinates and the places named in monument locations"""
+        start = time.perf_counter()
+        points = []
+        places: Dict[str, List[str]] = {}
+        for monument_id, monument in self.monuments_db.items():
+            coordinates = monument_coordinates(monument)
+            if coordinates is not None:
+                points.append((monument_id, coordinates[0], coordinates[1]))
+            for place in self._place_keys(monument.get('location', '')):
+                places.setdefault(place, []).append(monument_id)
+        geo_index = GeoIndex()
+        geo_index.build(points)
+        self.geo_index = geo_index
+        self._place_monuments = places
+        self._place_centres = {}
+        self.load_stats['geo_index_seconds'] = round(time.perf_counter() - start, 4)
+    
+    def _build_period_index(self):
+        """Parse every timeframe, construction year and event year into the period index"""
+        start = time.perf_counter()
+        intervals = []
+        unparsed = 0
+        for kind, records in (('historical_period', self.historical_periods), ('cultural_context', self.cultural_contexts)):
+            for record_id, record in records.items():
+                if 'timeframe' not in record:
+                    continue
+                span = parse_timeframe(record['timeframe'])
+                if span is None:
+                    unparsed += 1
+                    logger.warning(f"Unrecognized timeframe for {kind} {record_id}: {record['timeframe']!r}")
+                else:
+                    intervals.append((kind, record_id, span[0], span[1]))
+        for monument_id, monument in self.monuments_db.items():
+            intervals.extend(self._monument_intervals(monument_id, monument))
+        period_index = PeriodIndex()
+        period_index.build(intervals)
+        self.period_index = period_index
+        self.load_stats['period_index_seconds'] = round(time.perf_counter() - start, 4)
+        self.load_stats['unparsed_timeframes'] = unparsed
+    
+    @staticmethod
+    def _monument_intervals(monument_id: str, monument: Dict[str, Any]) -> List[Tuple[str, str, Optional[int], Optional[int]]]:
+        """Period index entries for a monument's construction and recorded events"""
+        intervals = []
+        span = parse_timeframe(monument.get('built_year'))
+        if span is not None:
+            intervals.append(('monument', monument_id, span[0], span[1]))
+        for position, event in enumerate(monument.get('events', [])):
+            span = parse_timeframe(event.get('year'))
+            if span is not None:
+                intervals.append(('event', f"{monument_id}#{position}", span[0], span[1]))
+        return intervals
+    
+    @staticmethod
+    def _place_keys(location: str) -> List[str]:
+        """Normalized names of a location and of each of its parts ("Agra, Uttar Pradesh" -> agra, uttar pradesh)"""
+        parts = [' '.join(part.lower().split()) for part in location.split(',')]
+        keys = [', '.join(part for part in parts if part)] + parts
+        return list(dict.fromkeys(key for key in keys if key))
+    
+    def _build_indexes(self):
+        """Build the entity graph, the related-monument graph and the story index"""
+        try:
+            self._build_entity_graph()
+            self._build_monument_lookup()
+            self._build_entity_matcher()
+            self._build_related_graph()
+            self._build_story_index()
+        finally:
+            # A new version drops anything cached from answers given before the indexes existed
+            with self._index_lock:
+                self.version += 1
+            self._indexes_ready.set()
+    
+    def _build_entity_graph(self):
+        """Compile every cross-reference into the entity graph, then publish it and apply records added meanwhile"""
+        try:
+            start = time.perf_counter()
+            graph = EntityGraph()
+            graph.build(self._graph_records())
+            with self._index_lock:
+                for record_type, record_id in self._pending_graph or []:
+                    record = self._graph_sections()[record_type].get(record_id)
+                    if record is not None:
+                        graph.add(record_type, record_id, record)
+                self.entity_graph = graph
+                self._pending_graph = None
+            dangling = graph.dangling_references()
+            self.load_stats['entity_graph_seconds'] = round(time.perf_counter() - start, 4)
+            self.load_stats['dangling_references'] = len(dangling)
+            if dangling:
+                examples = ', '.join(
+                    f"{entry['source_type']} {entry['source_id']} -> {entry['missing_type']} {entry['missing_id']}"
+                    for entry in dangling[:DANGLING_LOG_EXAMPLES]
+                )
+                logger.warning(f"{len(dangling)} references point at records that do not exist, e.g. {examples}")
+            logger.info(f"Entity graph built with {len(graph)} nodes in {self.load_stats['entity_graph_seconds']}s")
+        except Exception as e:
+            logger.error(f"Error building entity graph: {e}")
+        finally:
+            self._entity_graph_ready.set()
+    
+    def _build_monument_lookup(self):
+        """Index every monument name and alias, then publish the lookup and apply monuments added meanwhile"""
+        try:
+            start = time.perf_counter()
+            lookup = MonumentLookup()
+            lookup.add_many(list(self.monuments_db.items()))
+            with self._index_lock:
+                for monument_id in self._pending_lookup or []:
+                    monument = self.monuments_db.get(monument_id)
+                    if monument is not None:
+                        lookup.add(monument_id, monument)
+                self._monument_lookup = lookup
+                self._pending_lookup = None
+            self.load_stats['monument_lookup_seconds'] = round(time.perf_counter() - start, 4)
+            logger.info(f"Monument lookup built for {len(lookup)} monuments in {self.load_stats['monument_lookup_seconds']}s")
+        except Exception as e:
+            logger.error(f"Error building monument lookup: {e}")
+    
+    def _build_entity_matcher(self):
+        """Compile the whole lexicon, then publish it with the phrases added meanwhile layered on top"""
+        try:
+            start = time.perf_counter()
+            with self._index_lock:
+                self._matcher_rebuilding = True
+                covered = len(self._matcher_additions)
+            matcher = EntityMatcher(build_lexicon_entries(self), version=self.version)
+            with self._index_lock:
+                # Phrases added before the build started are in the new lexicon
+                self._matcher_additions = self._matcher_additions[covered:]
+                self._matcher_base = matcher
+                self._publish_entity_matcher()
+            self.load_stats['entity_matcher_seconds'] = round(time.perf_counter() - start, 4)
+            logger.info(f"Entity matcher compiled in {self.load_stats['entity_matcher_seconds']}s: {matcher.get_matcher_stats()}")
+        except Exception as e:
+            logger.error(f"Error compiling entity matcher, the previous one stays in use: {e}")
+        finally:
+            with self._index_lock:
+                self._matcher_rebuilding = False
+    
+    def _index_matcher_monuments(self, monuments: List[Tuple[str, Dict[str, Any]]]):
+        """Make added monuments recognisable in messages; caller holds the index lock"""
+        entries = []
+        for monument_id, monument in monuments:
+            entries.extend(monument_lexicon_entries(monument_id, monument))
+        self._matcher_additions.extend(entries)
+        if isinstance(self._entity_matcher, LayeredEntityMatcher):
+            # Extends the published layer in place; nothing is recompiled
+            self._entity_matcher.add(entries, version=self.version)
+        else:
+            self._publish_entity_matcher()
+        if len(self._matcher_additions) > MATCHER_REBUILD_PHRASES and not self._matcher_rebuilding:
+            self._matcher_rebuilding = True
+            threading.Thread(target=self._build_entity_matcher, name='kb-matcher-rebuild', daemon=True).start()
+    
+    def _publish_entity_matcher(self):
+        """Swap in the base matcher, layered with the added phrases if any; caller holds the index lock"""
+        if self._matcher_additions:
+            self._entity_matcher = LayeredEntityMatcher(self._matcher_base, self._matcher_additions, version=self.version)
+        else:
+            self._entity_matcher = self._matcher_base
+    
+    def _graph_sections(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Entity graph record type -> the section holding those records"""
+        return {
+            'monument': self.monuments_db,
+            'story': self.stories_db,
+            'mythological_figure': self.mythological_figures,
+            'cultural_context': self.cultural_contexts,
+            'historical_period': self.historical_periods
+        }
+    
+    def _graph_records(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Every record the entity graph is compiled from; only cultural contexts with a timeframe are periods"""
+        records = []
+        for record_type, section in self._graph_sections().items():
+            for record_id, record in list(section.items()):
+                if record_type != 'cultural_context' or 'timeframe' in record:
+                    records.append((record_type, record_id, record))
+        return records
+    
+    def _build_related_graph(self):
+        """Compute every monument's neighbours, then publish the graph and apply monuments added meanwhile"""
+        try:
+            start = time.perf_counter()
+            graph = RelatedMonumentGraph()
+            graph.build(list(self.monuments_db.items()), self._monument_themes())
+            with self._index_lock:
+                for monument_id in self._pending_monuments or []:
+                    if monument_id in self.monuments_db:
+                        monument = self.monuments_db[monument_id]
+                        graph.add(monument_id, monument, self._story_themes(monument))
+                self.related_graph = graph
+                self._pending_monuments = None
+            self.load_stats['related_graph_seconds'] = round(time.perf_counter() - start, 4)
+            logger.info(f"Related-monument graph built for {len(graph)} monuments in {self.load_stats['related_graph_seconds']}s")
+        except Exception as e:
+            logger.error(f"Error building related-monument graph, related monuments stay on the linear scan: {e}")
+    
+    def _monument_themes(self) -> Dict[str, set]:
+        """Themes of the stories linked to each monument, in one pass over the stories"""
+        themes: Dict[str, set] = {}
+        for story_id, story in self.stories_db.items():
+            if story.get('monument'):
+                themes.setdefault(story['monument'], set()).update(story.get('themes', []))
+        for monument_id, monument in self.monuments_db.items():
+            linked = self._story_themes(monument)
+            if linked:
+                themes.setdefault(monument_id, set()).update(linked)
+        return themes
+    
+    def _story_themes(self, monument: Dict[str, Any]) -> set:
+        """Themes of the stories a monument lists"""
+        themes = set()
+        for story_id in monument.get('stories', []):
+            story = self.stories_db.get(story_id)
+            if story:
+                themes.update(story.get('themes', []))
+        return themes
+    
+    def _build_story_index(self):
+        """Index every story, then publish the index and apply stories added meanwhile"""
+        try:
+            start = time.perf_counter()
+            index = StoryIndex()
+            index.add_many(list(self.stories_db.items()))
+            with self._index_lock:
+                for story_id in self._pending_stories or []:
+                    if story_id in self.stories_db:
+                        index.add(story_id, self.stories_db[story_id])
+                self.story_index = index
+                self._pending_stories = None
+            self.load_stats['story_index_seconds'] = round(time.perf_counter() - start, 4)
+            logger.info(f"Indexed {len(index)} stories in {self.load_stats['story_index_seconds']}s")
+        except Exception as e:
+            logger.error(f"Error building story index, story search stays on the linear scan: {e}")
+    
+    def wait_for_indexes(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for background index builds to finish
+        
+        Args:
+            timeout: Seconds to wait (waits indefinitely when None)
+        
+        Returns:
+            True if the indexes are ready
+        """
+        return self._indexes_ready.wait(timeout)
+    
+    def save(self, path: str, version: Optional[str] = None):
+        """
+        Write the knowledge base to a versioned knowledge file
+        
+        Args:
+            path: Destination .jsonl or .sqlite/.db path
+            version: Dataset version to record (defaults to the loaded version)
+        """
+        sections = {attribute: getattr(self, attribute) for attribute in SECTIONS.values()}
+        save_knowledge_file(path, sections, version or self.dataset_version or str(self.version))
     
     def _load_sample_monuments(self):
         """Load sample monument data"""
@@ -66,6 +463,8 @@ class CulturalKnowledgeBase:
             'taj_mahal': {
                 'name': 'Taj Mahal',
                 'location': 'Agra, Uttar Pradesh',
+                'latitude': 27.1751,
+                'longitude': 78.0421,
                 'period': 'Mughal',
                 'built_year': 1653,
                 'significance': 'Symbol of eternal love, UNESCO World Heritage Site',
@@ -73,11 +472,18 @@ class CulturalKnowledgeBase:
                 'stories': ['shah_jahan_love', 'mumtaz_mahal_story', 'taj_mysteries'],
                 'myths': ['black_taj_legend', 'architect_curse'],
                 'cultural_importance': 'Symbol of Mughal grandeur and artistic achievement',
-                'related_figures': ['Shah Jahan', 'Mumtaz Mahal', 'Ustad Ahmad Lahori']
+                'related_figures': ['Shah Jahan', 'Mumtaz Mahal', 'Ustad Ahmad Lahori'],
+                'events': [
+                    {'year': 1632, 'event': 'Construction begins after the death of Mumtaz Mahal', 'significance': 'Start of a two-decade imperial commission'},
+                    {'year': 1983, 'event': 'Inscribed as a UNESCO World Heritage Site', 'significance': 'International recognition'}
+                ]
             },
             'red_fort': {
                 'name': 'Red Fort',
+                'aliases': ['Lal Qila', 'Lal Quila'],
                 'location': 'Delhi',
+                'latitude': 28.6562,
+                'longitude': 77.241,
                 'period': 'Mughal',
                 'built_year': 1648,
                 'significance': 'Seat of Mughal power, Independence Day venue',
@@ -85,11 +491,19 @@ class CulturalKnowledgeBase:
                 'stories': ['mughal_court_life', 'british_capture', 'independence_flag'],
                 'myths': ['hidden_treasures', 'secret_passages'],
                 'cultural_importance': 'Symbol of Indian independence and Mughal heritage',
-                'related_figures': ['Shah Jahan', 'Aurangzeb', 'Bahadur Shah Zafar']
+                'related_figures': ['Shah Jahan', 'Aurangzeb', 'Bahadur Shah Zafar'],
+                'events': [
+                    {'year': 1639, 'event': 'Construction begins as Shah Jahan moves the capital to Shahjahanabad', 'significance': 'New Mughal capital'},
+                    {'year': 1857, 'event': 'Captured by the British after the revolt of 1857', 'significance': 'End of Mughal rule'},
+                    {'year': 1947, 'event': 'Flag of independent India raised on the ramparts', 'significance': 'Independence Day tradition begins'},
+                    {'year': 2007, 'event': 'Inscribed as a UNESCO World Heritage Site', 'significance': 'International recognition'}
+                ]
             },
             'hampi': {
                 'name': 'Hampi',
                 'location': 'Karnataka',
+                'latitude': 15.335,
+                'longitude': 76.46,
                 'period': 'Vijayanagara Empire',
                 'built_year': 1336,
                 'significance': 'Capital of Vijayanagara Empire, ruins of ancient city',
@@ -97,11 +511,18 @@ class CulturalKnowledgeBase:
                 'stories': ['krishnadevaraya_reign', 'vijayanagara_glory', 'battle_talikota'],
                 'myths': ['hanuman_birthplace', 'rama_vali_fight', 'magical_boulders'],
                 'cultural_importance': 'Testament to South Indian architectural brilliance',
-                'related_figures': ['Krishnadevaraya', 'Harihar Bukka', 'Tenali Rama']
+                'related_figures': ['Krishnadevaraya', 'Harihar Bukka', 'Tenali Rama'],
+                'events': [
+                    {'year': 1509, 'event': 'Krishnadevaraya ascends the throne', 'significance': 'Height of Vijayanagara power'},
+                    {'year': 1565, 'event': 'City sacked after the Battle of Talikota', 'significance': 'Fall of the Vijayanagara capital'},
+                    {'year': 1986, 'event': 'Inscribed as a UNESCO World Heritage Site', 'significance': 'International recognition'}
+                ]
             },
             'kedarnath': {
                 'name': 'Kedarnath Temple',
                 'location': 'Uttarakhand',
+                'latitude': 30.7352,
+                'longitude': 79.0669,
                 'period': 'Ancient',
                 'built_year': 800,  # Traditionally attributed to Adi Shankaracharya
                 'significance': 'One of the twelve Jyotirlingas of Lord Shiva, part of Char Dham',
@@ -109,11 +530,16 @@ class CulturalKnowledgeBase:
                 'stories': ['kedarnath_pandavas', 'shiva_lingam_origin', 'kedarnath_floods'],
                 'myths': ['shiva_bull_transformation', 'divine_protection'],
                 'cultural_importance': 'Sacred pilgrimage site for Hindus, symbol of faith and devotion',
-                'related_figures': ['Adi Shankaracharya', 'Pandavas', 'Lord Shiva']
+                'related_figures': ['Adi Shankaracharya', 'Pandavas', 'Lord Shiva'],
+                'events': [
+                    {'year': 2013, 'event': 'Temple survives the Kedarnath floods', 'significance': 'Seen by pilgrims as divine protection'}
+                ]
             },
             'badrinath': {
                 'name': 'Badrinath Temple',
                 'location': 'Uttarakhand',
+                'latitude': 30.7433,
+                'longitude': 79.4938,
                 'period': 'Ancient',
                 'built_year': 800,  # Traditionally attributed to Adi Shankaracharya
                 'significance': 'One of the four Char Dham pilgrimage sites, dedicated to Lord Vishnu',
@@ -268,26 +694,225 @@ class CulturalKnowledgeBase:
         self.historical_periods = {}
     
     def get_monument_info(self, monument_id: str) -> Optional[Dict[str, Any]]:
-        """Get detailed information about a monument"""
+        """
+        Get detailed information about a monument
+        
+        Args:
+            monument_id: Monument id, or a name or alias in any spelling or script
+        
+        Returns:
+            Deep copy of the monument record, so callers may change it freely,
+            or None if nothing matches closely enough
+        """
         monument = self.monuments_db.get(monument_id)
         if not monument:
-            # Try to find by name (fuzzy matching could be added)
-            for mid, mdata in self.monuments_db.items():
-                if monument_id.lower() in mdata['name'].lower():
-                    return mdata
-        return monument
-    
-    def get_location_culture(self, location: str) -> Dict[str, Any]:
-        """Get cultural information for a specific location"""
-        # This would typically query regional knowledge
-        # For now, return general cultural context
+            candidates = self.find_monuments(monument_id, limit=1, min_score=MONUMENT_MATCH_THRESHOLD)
+            if not candidates:
+                return None
+            monument = self.monuments_db.get(candidates[0]['id'])
+        # Compact storage hands out read-only views
+        record = monument.to_dict() if isinstance(monument, RecordView) else monument
+        return copy.deepcopy(record)
+    
+    def find_monuments(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Dict[str, Any]]:
+        """
+        Rank monuments whose id, name or alias resembles a query
+        
+        Handles typos ("taj mahel"), aliases ("Lal Qila") and Indic scripts ("ताज महल").
+        
+        Args:
+            query: Text naming a monument
+            limit: Maximum candidates
+            min_score: Lowest similarity returned (1.0 is an exact match)
+        
+        Returns:
+            Candidates with id, name and score, best first
+        """
+        candidates = []
+        for monument_id, score in self.get_monument_lookup().lookup(query, limit, min_score):
+            monument = self.monuments_db.get(monument_id)
+            if monument is not None:
+                candidates.append({'id': monument_id, 'name': monument.get('name'), 'score': score})
+        return candidates
+    
+    def get_monument_lookup(self) -> MonumentLookup:
+        """
+        Get the monument name lookup index
+        
+        Built with the background indexes and updated in place by
+        add_monument; never built on the request path.
+        """
+        return self._monument_lookup
+    
+    def find_nearby_monuments(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float = 25.0,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Monuments within a distance of a point
+        
+        Args:
+            latitude: Degrees north
+            longitude: Degrees east
+            radius_km: Search radius in kilometres
+            limit: Maximum monuments
+        
+        Returns:
+            Monuments with id, name, location and distance_km, nearest first
+        """
+        return self._describe_sites(self.geo_index.within(latitude, longitude, radius_km, limit))
+    
+    def find_nearest_monuments(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 5,
+        max_km: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The k monuments nearest to a point
+        
+        Args:
+            latitude: Degrees north
+            longitude: Degrees east
+            k: Number of monuments
+            max_km: Optional distance cap in kilometres
+        
+        Returns:
+            Monuments with id, name, location and distance_km, nearest first
+        """
+        return self._describe_sites(self.geo_index.nearest(latitude, longitude, k, max_km))
+    
+    def _describe_sites(self, sites: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+        """Summaries of (monument_id, distance_km) pairs"""
+        described = []
+        for monument_id, distance in sites:
+            monument = self.monuments_db.get(monument_id)
+            if monument is not None:
+                described.append({
+                    'id': monument_id,
+                    'name': monument.get('name'),
+                    'location': monument.get('location'),
+                    'distance_km': distance
+                })
+        return described
+    
+    def get_location_culture(
+        self,
+        location: str,
+        radius_km: float = 50.0,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Get cultural information for a location, aggregated from the monuments around it
+        
+        Args:
+            location: Town, state or monument name
+            radius_km: Radius around the location whose monuments are included
+            latitude: Optional latitude of the location; overrides name resolution
+            longitude: Optional longitude of the location
+        
+        Returns:
+            Region summary with nearby sites, their periods, architecture,
+            figures and story themes; lists are empty when the location is unknown
+        """
+        centre, site_ids = self._resolve_location(location, latitude, longitude)
+        sites: Dict[str, float] = {}
+        if centre is not None:
+            for monument_id in site_ids:
+                coordinates = self.geo_index.location(monument_id)
+                sites[monument_id] = (
+                    round(haversine_km(centre[0], centre[1], coordinates[0], coordinates[1]), 3)
+                    if coordinates is not None else float('inf')
+                )
+            for monument_id, distance in self.geo_index.within(centre[0], centre[1], radius_km, LOCATION_SITE_LIMIT):
+                sites[monument_id] = distance
+        ranked = sorted(sites.items(), key=lambda item: (item[1], item[0]))[:LOCATION_SITE_LIMIT]
+        monuments = [(monument_id, self.monuments_db[monument_id]) for monument_id, _ in ranked if monument_id in self.monuments_db]
+        
+        periods: Counter = Counter(monument.get('period') for _, monument in monuments if monument.get('period'))
+        styles: Counter = Counter(monument.get('architecture') for _, monument in monuments if monument.get('architecture'))
+        figures: Counter = Counter(figure for _, monument in monuments for figure in monument.get('related_figures', []))
+        themes: Counter = Counter(theme for _, monument in monuments for theme in self._story_themes(monument))
+        
+        cultural_aspects: List[str] = []
+        cultural_practices: List[str] = []
+        for state in dict.fromkeys(monument_state(monument) for _, monument in monuments):
+            regional = self.regional_knowledge.get(state.lower().replace(' ', '_')) or {}
+            cultural_aspects.extend(regional.get('cultural_aspects', []))
+            cultural_practices.extend(regional.get('cultural_practices', []))
+        for period, _ in periods.most_common(3):
+            cultural_aspects.extend(self._period_context(period).get('cultural_aspects', []))
+        cultural_aspects.extend(f"{style} architecture" for style, _ in styles.most_common(3))
+        story_themes = [theme for theme, _ in themes.most_common(5)]
+        
         return {
             'region': location,
-            'cultural_aspects': ['local traditions', 'historical significance', 'architectural styles'],
-            'famous_sites': ['monument1', 'monument2'],
-            'cultural_practices': ['festivals', 'customs', 'arts']
+            'centre': {'latitude': centre[0], 'longitude': centre[1]} if centre is not None else None,
+            'radius_km': radius_km,
+            'cultural_aspects': list(dict.fromkeys(cultural_aspects)),
+            'famous_sites': [monument.get('name') for _, monument in monuments[:5]],
+            # Without regional records, what local stories dwell on is the best available signal
+            'cultural_practices': list(dict.fromkeys(cultural_practices)) or story_themes,
+            'story_themes': story_themes,
+            'historical_periods': [period for period, _ in periods.most_common()],
+            'related_figures': [figure for figure, _ in figures.most_common(5)],
+            'nearby_monuments': self._describe_sites(ranked[:10])
         }
     
+    def _resolve_location(
+        self,
+        location: str,
+        latitude: Optional[float],
+        longitude: Optional[float]
+    ) -> Tuple[Optional[Tuple[float, float]], List[str]]:
+        """
+        Centre of a location and the monuments it names
+        
+        Explicit coordinates win; otherwise a town or state named in monument
+        locations resolves to the centroid of its monuments, and a monument
+        name to the monument's coordinates.
+        
+        Returns:
+            ((latitude, longitude) or None, monument ids in the named place)
+        """
+        if latitude is not None and longitude is not None:
+            return (float(latitude), float(longitude)), []
+        
+        for place in self._place_keys(location or ''):
+            site_ids = self._place_monuments.get(place)
+            if site_ids:
+                cached = self._place_centres.get(place)
+                if cached is None or cached[0] != self.version:
+                    located = [self.geo_index.location(monument_id) for monument_id in site_ids]
+                    located = [coordinates for coordinates in located if coordinates is not None]
+                    centre = (
+                        sum(coordinates[0] for coordinates in located) / len(located),
+                        sum(coordinates[1] for coordinates in located) / len(located)
+                    ) if located else None
+                    cached = self._place_centres[place] = (self.version, centre)
+                if cached[1] is None:
+                    return None, []
+                return cached[1], site_ids[:LOCATION_SITE_LIMIT]
+        
+        candidates = self.find_monuments(location or '', limit=1, min_score=MONUMENT_MATCH_THRESHOLD)
+        if candidates:
+            centre = self.geo_index.location(candidates[0]['id'])
+            if centre is not None:
+                return centre, [candidates[0]['id']]
+        return None, []
+    
+    def _period_context(self, period: str) -> Dict[str, Any]:
+        """Cultural context for a monument period ("Vijayanagara Empire" -> vijayanagara_period)"""
+        words = period.lower().split()
+        if not words:
+            return {}
+        return self.cultural_contexts.get(f"{words[0]}_period") or {}
+    
     def get_intent_knowledge(self, intent: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get knowledge relevant to user intent"""
         intent_knowledge = {
@@ -319,8 +944,39 @@ class CulturalKnowledgeBase:
             'style': 'informative and engaging'
         })
     
-    def search_stories(self, query: str, intent: str) -> List[Dict[str, Any]]:
-        """Search for relevant stories based on query and intent"""
+    def search_stories(self, query: str, intent: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Search for relevant stories based on query and intent
+        
+        Stories are ranked by BM25 over titles, themes and content, and
+        stories of the type the intent asks for are boosted. Until the
+        background index build finishes the linear scan answers instead.
+        
+        Args:
+            query: Free-text query
+            intent: Intent of the turn (e.g. 'mythology_inquiry')
+            limit: Maximum number of stories
+        
+        Returns:
+            Stories with id, title, type and relevance_score, best first
+        """
+        if self._pending_stories is not None:
+            return self._scan_stories(query, intent, limit)
+        
+        results = []
+        for story_id, score in self.story_index.search(query, intent, limit):
+            story = self.stories_db.get(story_id)
+            if story is not None:
+                results.append({
+                    'id': story_id,
+                    'title': story['title'],
+                    'type': story['type'],
+                    'relevance_score': round(score, 4)
+                })
+        return results
+    
+    def _scan_stories(self, query: str, intent: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """Substring match over every story, used while the story index is being built"""
         relevant_stories = []
         query_lower = query.lower()
         
@@ -350,10 +1006,59 @@ class CulturalKnowledgeBase:
         
         # Sort by relevance and return top results
         relevant_stories.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return relevant_stories[:3]  # Return top 3 stories
+        return relevant_stories[:limit]
+    
+    def get_related_monuments(self, monument_id: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Get monuments related to the given monument
+        
+        Read from the precomputed related-monument graph; until its background
+        build finishes the linear scan answers instead.
+        
+        Args:
+            monument_id: Monument id (or a name resolved with get_monument_info)
+            limit: Maximum number of monuments
+        
+        Returns:
+            Related monuments with id, name, location and relatedness_score, most related first
+        """
+        if self._pending_monuments is not None:
+            return self._scan_related_monuments(monument_id, limit)
+        if monument_id not in self.monuments_db:
+            candidates = self.find_monuments(monument_id, limit=1, min_score=MONUMENT_MATCH_THRESHOLD)
+            if not candidates:
+                return []
+            monument_id = candidates[0]['id']
+        
+        related = []
+        for related_id, score in self.related_graph.related(monument_id, limit):
+            monument = self.monuments_db.get(related_id)
+            if monument is not None:
+                related.append({
+                    'id': related_id,
+                    'name': monument['name'],
+                    'location': monument['location'],
+                    'relatedness_score': score
+                })
+        return related
     
-    def get_related_monuments(self, monument_id: str) -> List[Dict[str, Any]]:
-        """Get monuments related to the given monument"""
+    def export_related_monuments(self, limit: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Related monuments of every monument, for clients that prefetch the whole graph
+        
+        Args:
+            limit: Maximum related monuments per monument
+        
+        Returns:
+            Monument id -> related monuments with id and relatedness_score
+        """
+        return {
+            monument_id: [{'id': related_id, 'relatedness_score': score} for related_id, score in related]
+            for monument_id, related in self.related_graph.export(limit).items()
+        }
+    
+    def _scan_related_monuments(self, monument_id: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Score every monument against the given one, used while the graph is being built"""
         current_monument = self.get_monument_info(monument_id)
         if not current_monument:
             return []
@@ -385,50 +1090,426 @@ class CulturalKnowledgeBase:
         
         # Sort by relatedness and return top results
         related.sort(key=lambda x: x['relatedness_score'], reverse=True)
-        return related[:5]
+        return related[:limit]
     
-    def get_cultural_timeline(self, monument_id: str) -> List[Dict[str, Any]]:
-        """Get historical timeline for a monument"""
-        monument = self.get_monument_info(monument_id)
-        if not monument:
-            return []
+    def find_by_year(
+        self,
+        year: int,
+        end_year: Optional[int] = None,
+        kinds: Optional[List[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Periods, dynasties, monument constructions and events in a year or year range
+        
+        Args:
+            year: Year, or first year of the range (negative for BCE)
+            end_year: Last year of the range; defaults to year
+            kinds: Restrict to 'historical_period', 'cultural_context', 'monument' or 'event'
+            limit: Maximum results
         
-        # This would typically build a comprehensive timeline
-        # For now, return a sample timeline
+        Returns:
+            Entries with kind, id, name, start and end (None when open), earliest first
+        """
+        end_year = year if end_year is None else end_year
         return [
-            {
-                'year': monument.get('built_year', 'Unknown'),
-                'event': f"Construction of {monument['name']} began",
-                'significance': 'Architectural milestone'
-            },
-            {
-                'year': monument.get('built_year', 0) + 10,
-                'event': f"Completion of {monument['name']}",
-                'significance': 'Cultural landmark established'
-            }
+            self._describe_interval(kind, record_id, start, end)
+            for kind, record_id, start, end in self.period_index.overlapping(year, end_year, kinds, limit)
         ]
     
-    def add_monument(self, monument_data: Dict[str, Any]) -> bool:
-        """Add new monument to the knowledge base"""
-        try:
-            monument_id = monument_data['name'].lower().replace(' ', '_')
-            self.monuments_db[monument_id] = monument_data
-            logger.info(f"Added monument: {monument_data['name']}")
-            return True
-        except Exception as e:
-            logger.error(f"Error adding monument: {e}")
-            return False
+    def _describe_interval(self, kind: str, record_id: str, start: Optional[int], end: Optional[int]) -> Dict[str, Any]:
+        """Readable summary of a period index entry"""
+        if kind == 'monument':
+            name = self.monuments_db.get(record_id, {}).get('name', record_id)
+        elif kind == 'event':
+            monument_id, _, position = record_id.rpartition('#')
+            events = self.monuments_db.get(monument_id, {}).get('events', [])
+            name = events[int(position)].get('event') if int(position) < len(events) else record_id
+        else:
+            name = record_id.replace('_', ' ').title()
+        return {'kind': kind, 'id': record_id, 'name': name, 'start': start, 'end': end}
+    
+    def get_cultural_timeline(self, monument_id: str) -> List[Dict[str, Any]]:
+        """
+        Get historical timeline for a monument
+        
+        Combines the monument's construction and recorded events with the
+        narrowest periods and dynasties it was built in and the monuments
+        built closest to it in time (at most CONTEMPORARY_WINDOWS[-1] years apart).
+        
+        Args:
+            monument_id: Monument id, or a name or alias
+        
+        Returns:
+            Entries with year, event, significance and type, earliest first
+        """
+        if monument_id not in self.monuments_db:
+            candidates = self.find_monuments(monument_id, limit=1, min_score=MONUMENT_MATCH_THRESHOLD)
+            if not candidates:
+                return []
+            monument_id = candidates[0]['id']
+        monument = self.monuments_db[monument_id]
+        
+        timeline = []
+        for event in monument.get('events', []):
+            span = parse_timeframe(event.get('year'))
+            if span is not None:
+                timeline.append({
+                    'year': span[0],
+                    'event': event.get('event', ''),
+                    'significance': event.get('significance', ''),
+                    'type': 'event'
+                })
+        
+        built = self.period_index.get('monument', monument_id)
+        if built is not None:
+            built_year = built[0]
+            timeline.append({
+                'year': built_year,
+                'event': f"{monument['name']} built",
+                'significance': monument.get('significance', 'Architectural milestone'),
+                'type': 'construction'
+            })
+            enclosing = sorted(
+                self.period_index.at(built_year, ['cultural_context', 'historical_period']),
+                key=lambda entry: float('inf') if None in entry[2:] else entry[3] - entry[2]
+            )
+            for kind, record_id, start, end in enclosing[:TIMELINE_PERIOD_LIMIT]:
+                record = (self.cultural_contexts if kind == 'cultural_context' else self.historical_periods).get(record_id, {})
+                label = record_id.replace('_', ' ').title()
+                characteristics = ', '.join(record.get('characteristics', [])[:2])
+                if start is not None:
+                    timeline.append({'year': start, 'event': f"{label} begins", 'significance': characteristics, 'type': kind})
+                if end is not None:
+                    timeline.append({'year': end, 'event': f"{label} ends", 'significance': characteristics, 'type': kind})
+            for window in CONTEMPORARY_WINDOWS:
+                contemporaries = [
+                    (abs(start - built_year), start, record_id)
+                    for _, record_id, start, _ in self.period_index.overlapping(
+                        built_year - window, built_year + window, ['monument']
+                    )
+                    if record_id != monument_id
+                ]
+                if len(contemporaries) >= CONTEMPORARY_LIMIT:
+                    break
+            for _, start, record_id in sorted(contemporaries)[:CONTEMPORARY_LIMIT]:
+                timeline.append({
+                    'year': start,
+                    'event': f"{self.monuments_db[record_id]['name']} built",
+                    'significance': 'Contemporary construction',
+                    'type': 'contemporary'
+                })
+        
+        # Stable sort keeps the monument's own entries ahead of context in the same year
+        timeline.sort(key=lambda entry: entry['year'])
+        return timeline
     
-    def add_story(self, story_data: Dict[str, Any]) -> bool:
-        """Add new story to the knowledge base"""
+    def add_monument(self, monument_data: Dict[str, Any], on_conflict: str = 'error') -> bool:
+        """
+        Add new monument to the knowledge base
+        
+        Validated, assigned an id and indexed exactly as ingest() does.
+        
+        Args:
+            monument_data: Monument record
+            on_conflict: For an id already present: 'error' rejects the
+                monument, 'skip' keeps the existing one, 'replace' overwrites it
+        
+        Returns:
+            Whether the monument was added or replaced
+        """
+        return self._add_one('monument', monument_data, on_conflict)
+    
+    def _index_monument_place(
+        self,
+        monument_id: str,
+        monument: Dict[str, Any],
+        previous: Optional[Dict[str, Any]] = None
+    ):
+        """Update the coordinate index and place names for an added or replaced monument"""
+        coordinates = monument_coordinates(monument)
+        if coordinates is not None:
+            self.geo_index.add(monument_id, coordinates[0], coordinates[1])
+        else:
+            self.geo_index.remove(monument_id)
+        if previous is not None:
+            for place in self._place_keys(previous.get('location', '')):
+                site_ids = self._place_monuments.get(place, [])
+                if monument_id in site_ids:
+                    site_ids.remove(monument_id)
+        for place in self._place_keys(monument.get('location', '')):
+            self._place_monuments.setdefault(place, []).append(monument_id)
+    
+    def _index_monument_years(
+        self,
+        monument_id: str,
+        monument: Dict[str, Any],
+        previous: Optional[Dict[str, Any]] = None
+    ):
+        """Update the period index for an added or replaced monument"""
+        if previous is not None:
+            self.period_index.remove('monument', monument_id)
+            for position in range(len(previous.get('events', []))):
+                self.period_index.remove('event', f"{monument_id}#{position}")
+        for interval in self._monument_intervals(monument_id, monument):
+            self.period_index.add(*interval)
+    
+    def add_story(self, story_data: Dict[str, Any], on_conflict: str = 'error') -> bool:
+        """
+        Add new story to the knowledge base
+        
+        Validated, assigned an id and indexed exactly as ingest() does.
+        
+        Args:
+            story_data: Story record
+            on_conflict: For an id already present: 'error' rejects the
+                story, 'skip' keeps the existing one, 'replace' overwrites it
+        
+        Returns:
+            Whether the story was added or replaced
+        """
+        return self._add_one('story', story_data, on_conflict)
+    
+    def _add_one(self, record_type: str, record: Dict[str, Any], on_conflict: str) -> bool:
+        """Ingest a single record, logging why it was rejected"""
+        key = 'monuments' if record_type == 'monument' else 'stories'
         try:
-            story_id = story_data['title'].lower().replace(' ', '_')
-            self.stories_db[story_id] = story_data
-            logger.info(f"Added story: {story_data['title']}")
-            return True
+            report = self.ingest(**{key: [record]}, on_conflict=on_conflict)
         except Exception as e:
-            logger.error(f"Error adding story: {e}")
+            logger.error(f"Error adding {record_type}: {e}")
+            return False
+        for error in report['errors']:
+            logger.error(f"Rejected {record_type}: {error}")
+        record_id = report['ids'][key][0]
+        if record_id is None or report['skipped'][record_type]:
             return False
+        logger.info(f"Added {record_type}: {record_id}")
+        return True
+    
+    def ingest(
+        self,
+        monuments: Optional[List[Dict[str, Any]]] = None,
+        stories: Optional[List[Dict[str, Any]]] = None,
+        on_conflict: str = 'error'
+    ) -> Dict[str, Any]:
+        """
+        Validate and add a batch of monuments and stories
+        
+        Every record is checked against its schema and given a stable id (its
+        'id', else one derived from its name or title); invalid records are
+        reported by position and the rest are added. Each derived index is
+        updated once for the whole batch, and a large batch of monuments
+        rebuilds the related-monument graph in the background, with related
+        monuments answered by the linear scan meanwhile.
+        
+        Args:
+            monuments: Monument records
+            stories: Story records; their 'monument' must exist or be in the batch
+            on_conflict: For ids already present: 'error' rejects the record,
+                'skip' keeps the existing one, 'replace' overwrites it
+        
+        Returns:
+            Report with ids (per input position, None where rejected), added,
+            replaced and skipped counts, errors, version and seconds
+        
+        Raises:
+            ValueError: If the batch itself is malformed or the policy unknown
+        """
+        start = time.perf_counter()
+        accepted, report = prepare_batch(
+            {'monuments': monuments, 'stories': stories},
+            {'monument': self.monuments_db, 'story': self.stories_db},
+            on_conflict
+        )
+        new_monuments, new_stories = accepted['monument'], accepted['story']
+        if new_monuments or new_stories:
+            with self._index_lock:
+                for monument_id, monument in new_monuments:
+                    previous = self.monuments_db.get(monument_id)
+                    self.monuments_db[monument_id] = monument
+                    self._index_monument_place(monument_id, monument, previous)
+                    self._index_monument_years(monument_id, monument, previous)
+                    self._monument_lookup.add(monument_id, monument)
+                    if self._pending_lookup is not None:
+                        self._pending_lookup.append(monument_id)
+                self.stories_db.update(new_stories)
+                
+                self._ingest_related_monuments(new_monuments)
+                if new_monuments:
+                    self._index_matcher_monuments(new_monuments)
+                if self._pending_stories is not None:
+                    self._pending_stories.extend(story_id for story_id, _ in new_stories)
+                else:
+                    self.story_index.add_many(new_stories)
+                graph_records = [('monument', record_id, record) for record_id, record in new_monuments]
+                graph_records += [('story', record_id, record) for record_id, record in new_stories]
+                if self._pending_graph is not None:
+                    self._pending_graph.extend((record_type, record_id) for record_type, record_id, _ in graph_records)
+                else:
+                    self.entity_graph.add_many(graph_records)
+            self.version += 1
+        
+        report['version'] = self.version
+        report['seconds'] = round(time.perf_counter() - start, 4)
+        logger.info(
+            f"Ingested {len(new_monuments)} monuments and {len(new_stories)} stories "
+            f"({len(report['errors'])} rejected) in {report['seconds']}s"
+        )
+        return report
+    
+    def _ingest_related_monuments(self, monuments: List[Tuple[str, Dict[str, Any]]]):
+        """Bring the related-monument graph up to date with ingested monuments; caller holds the index lock"""
+        if self._pending_monuments is not None:
+            self._pending_monuments.extend(monument_id for monument_id, _ in monuments)
+        elif len(monuments) > INGEST_RELATED_REBUILD:
+            self._pending_monuments = []
+            threading.Thread(target=self._build_related_graph, name='kb-related-rebuild', daemon=True).start()
+        else:
+            for monument_id, monument in monuments:
+                self.related_graph.add(monument_id, monument, self._story_themes(monument))
+    
+    def _index_graph_record(self, record_type: str, record_id: str, record: Dict[str, Any]):
+        """Add a record to the entity graph, or queue it while the graph is being built; caller holds the index lock"""
+        if self._pending_graph is not None:
+            self._pending_graph.append((record_type, record_id))
+        else:
+            self.entity_graph.add(record_type, record_id, record)
+    
+    def get_entity_graph(self, timeout: float = ENTITY_GRAPH_WAIT_SECONDS) -> EntityGraph:
+        """
+        Get the entity graph, waiting for a build in progress
+        
+        Args:
+            timeout: Seconds to wait for the build; an empty graph is returned if it is not ready by then
+        
+        Returns:
+            The entity graph
+        """
+        if not self._entity_graph_ready.wait(timeout):
+            logger.warning("Entity graph is still being built; answering from an empty graph")
+        return self.entity_graph
+    
+    def _graph_node(self, graph: EntityGraph, entity_type: str, name: str) -> Optional[int]:
+        """Graph node for an entity; monuments are also resolved by name, alias or typo"""
+        node = graph.node_id(entity_type, name)
+        if node is None and entity_type == 'monument':
+            candidates = self.find_monuments(name, limit=1, min_score=MONUMENT_MATCH_THRESHOLD)
+            if candidates:
+                node = graph.node_id('monument', candidates[0]['id'])
+        return node
+    
+    def get_connected_entities(
+        self,
+        entity_type: str,
+        name: str,
+        node_type: Optional[str] = None,
+        relation: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Entities one reference away from an entity
+        
+        Args:
+            entity_type: 'monument', 'story', 'figure', 'period', 'state' or 'place'
+            name: Id or name of the entity ("Lord Shiva", "Karnataka", "hampi")
+            node_type: Only return entities of this type
+            relation: Only follow references of this kind (see entity_graph.RELATIONS)
+            limit: Maximum entities
+        
+        Returns:
+            Entities with type, id and name, in the order they entered the knowledge base
+        """
+        graph = self.get_entity_graph()
+        node = self._graph_node(graph, entity_type, name)
+        if node is None:
+            return []
+        return [graph.describe(int(neighbour)) for neighbour in graph.neighbours(node, node_type, relation)[:limit]]
+    
+    def find_connected_stories(
+        self,
+        figure: Optional[str] = None,
+        monument: Optional[str] = None,
+        state: Optional[str] = None,
+        period: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Stories satisfying every given constraint, e.g. stories about Hanuman at sites in Karnataka
+        
+        A story is about a figure when the figure lists it or its title or
+        themes name the figure; it is at a monument when either one names
+        the other; states and periods reach stories through their monuments.
+        
+        Args:
+            figure: Figure name ("Hanuman", "Lord Shiva")
+            monument: Monument id or name
+            state: State name
+            period: Period name ("Mughal", "Vijayanagara Empire")
+            limit: Maximum stories
+        
+        Returns:
+            Stories with id, title, type and monument, in the order they entered the knowledge base
+        """
+        graph = self.get_entity_graph()
+        paths = []
+        if figure:
+            paths.append(('figure', figure, [(('story', 'mentions'), 'story')]))
+        if monument:
+            paths.append(('monument', monument, [(STORY_RELATIONS, 'story')]))
+        if state:
+            paths.append(('state', state, [('state', 'monument'), (STORY_RELATIONS, 'story')]))
+        if period:
+            paths.append(('period', period, [('period', 'monument'), (STORY_RELATIONS, 'story')]))
+        if not paths:
+            return []
+        
+        stories = None
+        for entity_type, name, steps in paths:
+            node = self._graph_node(graph, entity_type, name)
+            if node is None:
+                return []
+            reached = graph.traverse([node], steps)
+            stories = reached if stories is None else np.intersect1d(stories, reached, assume_unique=True)
+            if not len(stories):
+                return []
+        
+        results = []
+        for node in stories:
+            story_id = graph.describe(int(node))['id']
+            story = self.stories_db.get(story_id)
+            if story is not None:
+                results.append({
+                    'id': story_id,
+                    'title': story.get('title'),
+                    'type': story.get('type'),
+                    'monument': story.get('monument')
+                })
+                if len(results) >= limit:
+                    break
+        return results
+    
+    def get_dangling_references(self) -> List[Dict[str, str]]:
+        """
+        References to stories or monuments that are not in the knowledge base
+        
+        Returns:
+            Entries with source_type, source_id, field, missing_type and missing_id
+        """
+        return self.get_entity_graph().dangling_references()
+    
+    def get_entity_matcher(self) -> Matcher:
+        """
+        Get the compiled entity matcher for monuments, figures and cultural keywords
+        
+        Never compiles on the caller's thread: the lexicon is compiled with the
+        other indexes and swapped in when ready, and monuments added since are
+        matched through a small added-phrase layer.
+        """
+        return self._entity_matcher
+    
+    def get_load_stats(self) -> Dict[str, Any]:
+        """Get load time, memory growth and source of the last load"""
+        return dict(self.load_stats)
     
     def get_knowledge_summary(self) -> Dict[str, int]:
         """Get summary of knowledge base contents"""
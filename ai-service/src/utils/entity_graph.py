@@ -0,0 +1,557 @@
+"""
+Entity Graph for Narad AI
+Typed graph of monuments, stories, figures, periods and places with CSR adjacency and multi-hop traversal
+"""
+
+import re
+import logging
+import threading
+from array import array
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Sequence, Set
+
+import numpy as np
+
+from .entity_matcher import FIGURE_PREFIXES
+
+logger = logging.getLogger(__name__)
+
+NODE_TYPES = ('monument', 'story', 'figure', 'period', 'state', 'place')
+
+# Edge labels; every edge is stored in both directions under the same label
+RELATIONS = (
+    'story',          # monument or figure lists the story under 'stories'
+    'myth',           # monument lists the story under 'myths'
+    'site',           # story names its monument
+    'figure',         # monument lists the figure under 'related_figures'
+    'mentions',       # story title or themes name the figure
+    'worship_place',  # figure lists the monument or place under 'worship_places'
+    'key_figure',     # period lists the figure under 'key_figures'
+    'period',         # monument was built in the period
+    'state',          # monument location is in the state
+    'place'           # monument location is in the town
+)
+
+# Records the graph is compiled from: (record type, node type)
+RECORD_NODE_TYPES = {
+    'monument': 'monument',
+    'story': 'story',
+    'mythological_figure': 'figure',
+    'cultural_context': 'period',
+    'historical_period': 'period'
+}
+
+# Relations each record type writes from its own node
+OWNED_RELATIONS = {
+    'monument': ('story', 'myth', 'figure', 'period', 'state', 'place'),
+    'story': ('site', 'mentions'),
+    'mythological_figure': ('story', 'worship_place'),
+    'cultural_context': ('key_figure',),
+    'historical_period': ('key_figure',)
+}
+
+_TYPE_CODES = {node_type: code for code, node_type in enumerate(NODE_TYPES)}
+_RELATION_CODES = {relation: code for code, relation in enumerate(RELATIONS)}
+_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+# Longest figure name, in words, looked for in story titles
+MAX_MENTION_WORDS = 3
+
+def figure_key(name: str) -> str:
+    """Canonical key of a figure name ("Lord Shiva" and "shiva" -> "shiva")"""
+    key = ' '.join(_WORD_PATTERN.findall(name.lower()))
+    for prefix in FIGURE_PREFIXES:
+        if key.startswith(prefix) and len(key) > len(prefix):
+            return key[len(prefix):]
+    return key
+
+def period_key(name: str) -> str:
+    """Canonical key of a period ("Vijayanagara Empire" and "vijayanagara_period" -> "vijayanagara")"""
+    words = _WORD_PATTERN.findall(name.lower())
+    return words[0] if words else ''
+
+def place_key(name: str) -> str:
+    """Canonical key of a town or state"""
+    return ' '.join(_WORD_PATTERN.findall(name.lower()))
+
+def node_key(node_type: str, name: str) -> str:
+    """Canonical key of a node from a record id or a name"""
+    if node_type == 'figure':
+        return figure_key(name)
+    if node_type == 'period':
+        return period_key(name)
+    if node_type in ('state', 'place'):
+        return place_key(name)
+    return name
+
+class EntityGraph:
+    """
+    Typed graph compiled from the knowledge base's cross-references.
+    
+    Nodes get dense integer ids; edges live in CSR arrays (an offsets array
+    plus neighbour and relation arrays), so neighbours of a node are one
+    slice and a hop from a whole frontier is a handful of vectorized
+    operations. References to stories or monuments that do not exist are
+    kept as dangling and become edges if the record is added later.
+    Records added after a build go to a small delta adjacency and replaced
+    records mask their old edges; both fold into the arrays on rebuild.
+    """
+    
+    def __init__(self, rebuild_fraction: float = 0.05, min_rebuild: int = 4096):
+        """
+        Initialize an empty graph
+        
+        Args:
+            rebuild_fraction: Delta edges, relative to the graph, that trigger a rebuild
+            min_rebuild: Delta edges always tolerated before a rebuild
+        """
+        self.rebuild_fraction = rebuild_fraction
+        self.min_rebuild = min_rebuild
+        self._lock = threading.RLock()
+        
+        self._node_keys: List[Tuple[str, str]] = []
+        self._node_names: List[str] = []
+        self._node_ids: Dict[Tuple[str, str], int] = {}
+        # (node type, name as written) -> node, to skip key normalization for repeated names
+        self._named: Dict[Tuple[str, str], int] = {}
+        self._node_types = np.zeros(0, dtype=np.int8)
+        # Record node -> (record type, record) it was compiled from
+        self._records: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+        
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._relations = np.zeros(0, dtype=np.int8)
+        self._delta: Dict[int, List[Tuple[int, int]]] = {}
+        self._delta_edges = 0
+        self._removed: Set[Tuple[int, int, int]] = set()
+        self._masked_nodes: Set[int] = set()
+        
+        # Missing (node type, key) -> [(source node, relation, field)]
+        self._waiting: Dict[Tuple[str, str], List[Tuple[int, int, str]]] = {}
+        # Figure keys, and the first word of each, for spotting mentions in story titles
+        self._figure_keys: Set[str] = set()
+        self._figure_first_words: Set[str] = set()
+    
+    def build(self, records: Iterable[Tuple[str, str, Dict[str, Any]]]):
+        """
+        Compile many records at once
+        
+        Figures are registered before stories are scanned for mentions, so
+        pass records in any order.
+        
+        Args:
+            records: (record type, record id, record) with record types from RECORD_NODE_TYPES
+        """
+        records = list(records)
+        with self._lock:
+            for record_type, record_id, record in records:
+                self._record_node(record_type, record_id, record)
+            for record_type, record_id, record in records:
+                for figure in self._figure_names(record_type, record):
+                    self._node('figure', figure)
+            sources, targets, relations = array('i'), array('i'), array('b')
+            for record_type, record_id, record in records:
+                source = self._node_ids[(RECORD_NODE_TYPES[record_type], node_key(RECORD_NODE_TYPES[record_type], record_id))]
+                for relation, target in self._resolve_edges(source, record_type, record_id, record):
+                    sources.append(source)
+                    targets.append(target)
+                    relations.append(relation)
+            self._rebuild(
+                np.frombuffer(sources, dtype=np.int32).astype(np.int64),
+                np.frombuffer(targets, dtype=np.int32).astype(np.int64),
+                np.frombuffer(relations, dtype=np.int8).copy()
+            )
+    
+    def add_many(self, records: Iterable[Tuple[str, str, Dict[str, Any]]]):
+        """
+        Add or replace many records, rebuilding the arrays at most once
+        
+        Args:
+            records: (record type, record id, record) with record types from RECORD_NODE_TYPES
+        """
+        with self._lock:
+            for record_type, record_id, record in records:
+                self._add(record_type, record_id, record)
+            self._maybe_rebuild()
+    
+    def add(self, record_type: str, record_id: str, record: Dict[str, Any]):
+        """
+        Add or replace one record
+        
+        Args:
+            record_type: One of RECORD_NODE_TYPES
+            record_id: Record identifier
+            record: The record; the references of a record it replaces are dropped
+        """
+        with self._lock:
+            self._add(record_type, record_id, record)
+            self._maybe_rebuild()
+    
+    def _add(self, record_type: str, record_id: str, record: Dict[str, Any]):
+        """Compile one record into the delta; caller holds the lock"""
+        node_type = RECORD_NODE_TYPES[record_type]
+        previous = self._records.get(self._node_ids.get((node_type, node_key(node_type, record_id))))
+        source = self._record_node(record_type, record_id, record)
+        if previous is not None:
+            self._drop_references(source, previous[0], record_id, previous[1])
+        for figure in self._figure_names(record_type, record):
+            self._node('figure', figure)
+        for relation, target in self._resolve_edges(source, record_type, record_id, record):
+            self._add_edge(source, target, relation)
+    
+    def _maybe_rebuild(self):
+        """Fold the delta into the arrays once it outgrows its share; caller holds the lock"""
+        if self._delta_edges > max(self.min_rebuild, self.rebuild_fraction * len(self._indices)):
+            self._rebuild(*self._all_edges())
+    
+    def node_id(self, node_type: str, name: str) -> Optional[int]:
+        """
+        Node of an entity
+        
+        Args:
+            node_type: One of NODE_TYPES
+            name: Record id or name; figures, periods and places are matched on their canonical key
+        
+        Returns:
+            Node id, or None if the graph has no such node
+        """
+        return self._node_ids.get((node_type, node_key(node_type, name)))
+    
+    def describe(self, node: int) -> Dict[str, Any]:
+        """Type, key and display name of a node"""
+        node_type, key = self._node_keys[node]
+        return {'type': node_type, 'id': key, 'name': self._node_names[node]}
+    
+    def neighbours(
+        self,
+        node: int,
+        node_type: Optional[str] = None,
+        relation: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Nodes one edge away
+        
+        Args:
+            node: Node id
+            node_type: Only neighbours of this type
+            relation: Only edges with this label
+        
+        Returns:
+            Sorted unique node ids
+        """
+        with self._lock:
+            if node in self._masked_nodes or node in self._delta or node >= len(self._indptr) - 1:
+                return self.expand([node], node_type, relation)
+            start, end = self._indptr[node], self._indptr[node + 1]
+            targets = self._indices[start:end]
+            if relation is not None:
+                targets = targets[self._relations[start:end] == _RELATION_CODES[relation]]
+            if node_type is not None:
+                targets = targets[self._node_types[targets] == _TYPE_CODES[node_type]]
+            # Rebuilt rows are sorted by target and free of duplicates
+            return targets.astype(np.int64)
+    
+    def expand(
+        self,
+        nodes: Iterable[int],
+        node_type: Optional[str] = None,
+        relation: Optional[Any] = None
+    ) -> np.ndarray:
+        """
+        Nodes one edge away from any node of a frontier
+        
+        Args:
+            nodes: Frontier node ids
+            node_type: Only neighbours of this type
+            relation: Only edges with this label, or any of a sequence of labels
+        
+        Returns:
+            Sorted unique node ids
+        """
+        nodes = np.unique(np.asarray(list(nodes) if not isinstance(nodes, np.ndarray) else nodes, dtype=np.int64))
+        with self._lock:
+            base = nodes[nodes < len(self._indptr) - 1]
+            starts, ends = self._indptr[base], self._indptr[base + 1]
+            counts = ends - starts
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            targets = self._indices[positions].astype(np.int64)
+            relations = self._relations[positions]
+            if self._removed:
+                masked = [node for node in base if node in self._masked_nodes]
+                if masked:
+                    sources = np.repeat(base, counts)
+                    keep = np.ones(len(targets), dtype=bool)
+                    candidates = np.flatnonzero(np.isin(sources, masked))
+                    for position in candidates:
+                        if (int(sources[position]), int(targets[position]), int(relations[position])) in self._removed:
+                            keep[position] = False
+                    targets, relations = targets[keep], relations[keep]
+            if self._delta:
+                extra = [edge for node in nodes for edge in self._delta.get(int(node), ())]
+                if extra:
+                    targets = np.concatenate([targets, np.array([target for target, _ in extra], dtype=np.int64)])
+                    relations = np.concatenate([relations, np.array([code for _, code in extra], dtype=np.int8)])
+            if relation is not None:
+                labels = [relation] if isinstance(relation, str) else list(relation)
+                targets = targets[np.isin(relations, [_RELATION_CODES[label] for label in labels])]
+            if node_type is not None:
+                targets = targets[self._node_types[targets] == _TYPE_CODES[node_type]]
+            return np.unique(targets)
+    
+    def traverse(
+        self,
+        start: Iterable[int],
+        steps: Sequence[Tuple[Optional[Any], Optional[str]]]
+    ) -> np.ndarray:
+        """
+        Follow a path pattern from a set of nodes
+        
+        Args:
+            start: Starting node ids
+            steps: (relation or relations or None, node type or None) per hop
+        
+        Returns:
+            Sorted unique node ids reached by the last hop
+        """
+        frontier = np.unique(np.asarray(list(start), dtype=np.int64))
+        for relation, node_type in steps:
+            if not len(frontier):
+                break
+            frontier = self.expand(frontier, node_type, relation)
+        return frontier
+    
+    def dangling_references(self) -> List[Dict[str, str]]:
+        """
+        References to stories or monuments that are not in the knowledge base
+        
+        Returns:
+            Entries with source_type, source_id, field, missing_type and missing_id
+        """
+        with self._lock:
+            report = []
+            for (missing_type, missing_id), sources in self._waiting.items():
+                for source, _, field in sources:
+                    source_type, source_id = self._node_keys[source]
+                    report.append({
+                        'source_type': source_type,
+                        'source_id': source_id,
+                        'field': field,
+                        'missing_type': missing_type,
+                        'missing_id': missing_id
+                    })
+            return sorted(report, key=lambda entry: (entry['source_type'], entry['source_id'], entry['field'], entry['missing_id']))
+    
+    def __len__(self) -> int:
+        return len(self._node_keys)
+    
+    def get_graph_stats(self) -> Dict[str, Any]:
+        """Get graph size statistics"""
+        with self._lock:
+            types = np.bincount(self._node_types[:len(self._node_keys)], minlength=len(NODE_TYPES))
+            return {
+                'nodes': len(self._node_keys),
+                'nodes_by_type': {node_type: int(count) for node_type, count in zip(NODE_TYPES, types)},
+                'edges': (len(self._indices) + self._delta_edges - len(self._removed)) // 2,
+                'delta_edges': self._delta_edges // 2,
+                'dangling_references': sum(len(sources) for sources in self._waiting.values())
+            }
+    
+    def _node(self, node_type: str, name: str, display: Optional[str] = None) -> int:
+        """Node id for an entity, created on first use; caller holds the lock"""
+        node = self._named.get((node_type, name))
+        if node is not None and not display:
+            return node
+        key = (node_type, node_key(node_type, name))
+        node = self._node_ids.get(key)
+        if node is None:
+            node = len(self._node_keys)
+            self._node_keys.append(key)
+            self._node_names.append(display or name)
+            self._node_ids[key] = node
+            if node >= len(self._node_types):
+                self._node_types = np.concatenate([self._node_types, np.zeros(max(64, len(self._node_types)), dtype=np.int8)])
+            self._node_types[node] = _TYPE_CODES[node_type]
+            if node_type == 'figure' and key[1]:
+                self._figure_keys.add(key[1])
+                self._figure_first_words.add(key[1].split()[0])
+        elif display:
+            self._node_names[node] = display
+        self._named[(node_type, name)] = node
+        return node
+    
+    def _record_node(self, record_type: str, record_id: str, record: Dict[str, Any]) -> int:
+        """Node for a record, resolving references that were waiting for it; caller holds the lock"""
+        node_type = RECORD_NODE_TYPES[record_type]
+        if record_type == 'monument':
+            display = record.get('name') or record_id
+        elif record_type == 'story':
+            display = record.get('title') or record_id
+        else:
+            display = record_id.replace('_', ' ').title()
+        node = self._node(node_type, record_id, display)
+        self._records[node] = (record_type, record)
+        for source, relation, _ in self._waiting.pop((node_type, node_key(node_type, record_id)), []):
+            self._add_edge(source, node, relation)
+        return node
+    
+    @staticmethod
+    def _figure_names(record_type: str, record: Dict[str, Any]) -> List[str]:
+        """Figures a record names directly"""
+        if record_type == 'monument':
+            return list(record.get('related_figures', []))
+        if record_type == 'cultural_context':
+            return list(record.get('key_figures', []))
+        return []
+    
+    def _references(self, record_type: str, record_id: str, record: Dict[str, Any]) -> List[Tuple[str, str, str, str]]:
+        """(relation, target node type, target name, field) for every reference in a record; caller holds the lock"""
+        references = []
+        if record_type == 'monument':
+            for story_id in record.get('stories', []):
+                references.append(('story', 'story', story_id, 'stories'))
+            for story_id in record.get('myths', []):
+                references.append(('myth', 'story', story_id, 'myths'))
+            for figure in record.get('related_figures', []):
+                references.append(('figure', 'figure', figure, 'related_figures'))
+            if record.get('period'):
+                references.append(('period', 'period', record['period'], 'period'))
+            parts = [part.strip() for part in record.get('location', '').split(',') if part.strip()]
+            if parts:
+                references.append(('state', 'state', parts[-1], 'location'))
+                for town in parts[:-1]:
+                    references.append(('place', 'place', town, 'location'))
+        elif record_type == 'story':
+            if record.get('monument'):
+                references.append(('site', 'monument', record['monument'], 'monument'))
+            for figure in self._mentions(record):
+                references.append(('mentions', 'figure', figure, 'title'))
+        elif record_type == 'mythological_figure':
+            for story_id in record.get('stories', []):
+                references.append(('story', 'story', story_id, 'stories'))
+            for place in record.get('worship_places', []):
+                references.append(('worship_place', 'place', place, 'worship_places'))
+        elif record_type == 'cultural_context':
+            for figure in record.get('key_figures', []):
+                references.append(('key_figure', 'figure', figure, 'key_figures'))
+        return references
+    
+    def _mentions(self, story: Dict[str, Any]) -> Set[str]:
+        """Known figures named in a story's title or themes; caller holds the lock"""
+        words = _WORD_PATTERN.findall(' '.join([story.get('title') or ''] + list(story.get('themes', []))).lower())
+        found = set()
+        for i, word in enumerate(words):
+            if word not in self._figure_first_words:
+                continue
+            for size in range(1, min(MAX_MENTION_WORDS, len(words) - i) + 1):
+                phrase = ' '.join(words[i:i + size])
+                if phrase in self._figure_keys:
+                    found.add(phrase)
+        return found
+    
+    def _resolve_edges(self, source: int, record_type: str, record_id: str, record: Dict[str, Any]) -> List[Tuple[int, int]]:
+        """(relation code, target node) of a record's references; missing stories and monuments wait; caller holds the lock"""
+        edges = []
+        for relation, target_type, target_name, field in self._references(record_type, record_id, record):
+            code = _RELATION_CODES[relation]
+            if relation == 'worship_place':
+                # A worship place that is a monument links to it, otherwise to a place
+                monument = self._node_ids.get(('monument', target_name.lower().replace(' ', '_')))
+                target = monument if monument is not None and monument in self._records else self._node('place', target_name)
+            elif target_type in ('story', 'monument'):
+                target = self._node_ids.get((target_type, target_name))
+                if target is None or target not in self._records:
+                    self._waiting.setdefault((target_type, target_name), []).append((source, code, field))
+                    continue
+            else:
+                target = self._node(target_type, target_name)
+            edges.append((code, target))
+        return edges
+    
+    def _drop_references(self, source: int, record_type: str, record_id: str, record: Dict[str, Any]):
+        """Remove the edges and dangling entries of a replaced record; caller holds the lock"""
+        for relation, target_type, target_name, _ in self._references(record_type, record_id, record):
+            waiting = self._waiting.get((target_type, target_name))
+            if waiting:
+                code = _RELATION_CODES[relation]
+                waiting[:] = [entry for entry in waiting if not (entry[0] == source and entry[1] == code)]
+                if not waiting:
+                    del self._waiting[(target_type, target_name)]
+        # The relations a record type writes never reach its node from other
+        # records, so its current edges under them are exactly its own
+        owned = [_RELATION_CODES[relation] for relation in OWNED_RELATIONS[record_type]]
+        for target, code in self._edges(source):
+            if code in owned:
+                self._remove_edge(source, target, code)
+    
+    def _edges(self, node: int) -> List[Tuple[int, int]]:
+        """Live (neighbour, relation code) pairs of one node; caller holds the lock"""
+        edges = []
+        if node < len(self._indptr) - 1:
+            start, end = self._indptr[node], self._indptr[node + 1]
+            for target, code in zip(self._indices[start:end].tolist(), self._relations[start:end].tolist()):
+                if (node, target, code) not in self._removed:
+                    edges.append((target, code))
+        return edges + list(self._delta.get(node, ()))
+    
+    def _add_edge(self, source: int, target: int, code: int):
+        """Add an edge in both directions; caller holds the lock"""
+        for a, b in ((source, target), (target, source)):
+            if (a, b, code) in self._removed:
+                self._removed.discard((a, b, code))
+            else:
+                self._delta.setdefault(a, []).append((b, code))
+                self._delta_edges += 1
+    
+    def _remove_edge(self, source: int, target: int, code: int):
+        """Remove an edge in both directions if present; caller holds the lock"""
+        for a, b in ((source, target), (target, source)):
+            pending = self._delta.get(a)
+            if pending and (b, code) in pending:
+                pending.remove((b, code))
+                self._delta_edges -= 1
+            elif a < len(self._indptr) - 1:
+                start, end = self._indptr[a], self._indptr[a + 1]
+                if np.any((self._indices[start:end] == b) & (self._relations[start:end] == code)):
+                    self._removed.add((a, b, code))
+                    self._masked_nodes.add(a)
+    
+    def _all_edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Every live directed edge as (sources, targets, relations), halved to one direction; caller holds the lock"""
+        sources = np.repeat(np.arange(len(self._indptr) - 1, dtype=np.int64), np.diff(self._indptr))
+        targets = self._indices.astype(np.int64)
+        relations = self._relations.copy()
+        if self._removed:
+            keep = np.ones(len(targets), dtype=bool)
+            for position in np.flatnonzero(np.isin(sources, list(self._masked_nodes))):
+                if (int(sources[position]), int(targets[position]), int(relations[position])) in self._removed:
+                    keep[position] = False
+            sources, targets, relations = sources[keep], targets[keep], relations[keep]
+        extra = [(source, target, code) for source, edges in self._delta.items() for target, code in edges]
+        if extra:
+            added = np.array(extra, dtype=np.int64)
+            sources = np.concatenate([sources, added[:, 0]])
+            targets = np.concatenate([targets, added[:, 1]])
+            relations = np.concatenate([relations, added[:, 2].astype(np.int8)])
+        # _rebuild mirrors each edge, so keep one direction of every pair
+        forward = sources <= targets
+        return sources[forward], targets[forward], relations[forward]
+    
+    def _rebuild(self, sources: np.ndarray, targets: np.ndarray, relations: np.ndarray):
+        """Lay out edges, mirrored and deduplicated, as CSR arrays; caller holds the lock"""
+        all_sources = np.concatenate([sources, targets])
+        all_targets = np.concatenate([targets, sources])
+        all_relations = np.concatenate([relations, relations]).astype(np.int64)
+        # One sortable key per edge orders by source, then target, and drops
+        # duplicates (self-loops were mirrored onto themselves)
+        n_nodes = len(self._node_keys)
+        keys = np.sort((all_sources * n_nodes + all_targets) * len(RELATIONS) + all_relations)
+        keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])] if len(keys) else keys
+        all_relations = (keys % len(RELATIONS)).astype(np.int8)
+        keys //= len(RELATIONS)
+        all_sources, all_targets = keys // n_nodes, keys % n_nodes
+        self._indptr = np.concatenate([[0], np.cumsum(np.bincount(all_sources, minlength=n_nodes))]).astype(np.int64)
+        self._indices = all_targets.astype(np.int32)
+        self._relations = all_relations
+        self._delta = {}
+        self._delta_edges = 0
+        self._removed = set()
+        self._masked_nodes = set()
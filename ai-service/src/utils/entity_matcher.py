@@ -0,0 +1,424 @@
+"""
+Entity Matcher for Narad AI
+Single-pass, word-boundary-aware multi-pattern matching (Aho-Corasick) over the cultural lexicon
+"""
+
+import re
+import logging
+import unicodedata
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Set, Union
+from collections import deque, defaultdict
+
+from ..config.settings import CULTURAL_CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+# General conversation topics tracked in session context
+GENERAL_TOPICS = ['architecture', 'culture', 'tradition', 'festival', 'religion', 'art']
+
+# Honorifics stripped to derive a short alias for a figure ("Lord Shiva" -> "shiva")
+FIGURE_PREFIXES = ('lord ', 'goddess ', 'god ', 'emperor ', 'king ', 'queen ', 'ustad ')
+
+def is_word_char(ch: str) -> bool:
+    """Letters, digits and combining marks (Indic vowel signs) are part of a word"""
+    return ch.isalnum() or unicodedata.category(ch).startswith('M')
+
+def _word_pattern() -> 're.Pattern[str]':
+    """Runs of word characters as is_word_char defines them; Python's \\w leaves out vowel signs"""
+    marks = ''.join(chr(code) for code in range(0x10000) if unicodedata.category(chr(code)).startswith('M'))
+    return re.compile(f"(?:[^\\W_]|[{re.escape(marks)}])+")
+
+# Marks are collected from the Basic Multilingual Plane, which holds every script we answer in
+WORD_PATTERN = _word_pattern()
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens, split where normalize_text puts spaces
+    
+    Indic vowel signs and viramas stay inside their words ("बताइए" is one
+    token), unlike with a plain \\w+ pattern.
+    
+    Args:
+        text: Raw text
+    
+    Returns:
+        Tokens in order
+    """
+    return WORD_PATTERN.findall(text.lower())
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase text and collapse every run of non-word characters into one space
+    
+    Args:
+        text: Raw text
+    
+    Returns:
+        Normalized text, padded with a single space on both sides
+    """
+    chars = [' ']
+    for ch in text.lower():
+        if is_word_char(ch):
+            chars.append(ch)
+        elif chars[-1] != ' ':
+            chars.append(' ')
+    if chars[-1] != ' ':
+        chars.append(' ')
+    return ''.join(chars)
+
+class EntityMatcher:
+    """
+    Aho-Corasick automaton over normalized phrases.
+    
+    Phrases and input are normalized the same way, so a match is on word
+    boundaries exactly when the characters around it are spaces. Matching
+    cost is linear in the message length plus the number of matches,
+    regardless of vocabulary size.
+    """
+    
+    def __init__(self, entries: Iterable[Tuple[str, str, str]], version: Any = None):
+        """
+        Compile the automaton
+        
+        Args:
+            entries: (phrase, kind, value) triples, e.g. ('lal qila', 'monument', 'red_fort')
+            version: Version of the source data the matcher was built from
+        """
+        self.version = version
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        self._patterns: List[Tuple[int, List[Tuple[str, str]]]] = []
+        
+        pattern_index: Dict[str, int] = {}
+        for phrase, kind, value in entries:
+            normalized = normalize_text(phrase).strip()
+            if not normalized:
+                continue
+            if normalized not in pattern_index:
+                pattern_index[normalized] = len(self._patterns)
+                self._patterns.append((len(normalized), []))
+                self._insert(normalized, pattern_index[normalized])
+            labels = self._patterns[pattern_index[normalized]][1]
+            if (kind, value) not in labels:
+                labels.append((kind, value))
+        
+        self._build_failure_links()
+        logger.debug(f"Entity matcher compiled with {len(self._patterns)} phrases, {len(self._goto)} states")
+    
+    def _insert(self, phrase: str, index: int):
+        """Add a phrase to the trie"""
+        state = 0
+        for ch in phrase:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(index)
+    
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+    
+    def find(self, text: str, normalized: bool = False) -> List[Dict[str, Any]]:
+        """
+        Find all lexicon phrases occurring as whole words in the text
+        
+        Args:
+            text: Text to scan
+            normalized: Whether the text is already normalized with normalize_text
+        
+        Returns:
+            List of matches with kind, value, phrase and position in the normalized text
+        """
+        text = text if normalized else normalize_text(text)
+        goto, fail, outputs, patterns = self._goto, self._fail, self._outputs, self._patterns
+        matches = []
+        state = 0
+        
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            
+            for index in outputs[state]:
+                length, labels = patterns[index]
+                start = i - length + 1
+                # Word boundary: the normalized text has a space around every word
+                if text[start - 1] == ' ' and i + 1 < len(text) and text[i + 1] == ' ':
+                    for kind, value in labels:
+                        matches.append({
+                            'kind': kind,
+                            'value': value,
+                            'phrase': text[start:i + 1],
+                            'start': start,
+                            'end': i + 1
+                        })
+        
+        return matches
+    
+    def extract(self, text: str, normalized: bool = False) -> Dict[str, Set[str]]:
+        """
+        Group matched entity values by kind
+        
+        Args:
+            text: Text to scan
+            normalized: Whether the text is already normalized with normalize_text
+        
+        Returns:
+            Dictionary of kind -> set of values
+        """
+        return group_matches(self.find(text, normalized=normalized))
+    
+    def get_matcher_stats(self) -> Dict[str, Any]:
+        """Get automaton size statistics"""
+        return {
+            'phrases': len(self._patterns),
+            'states': len(self._goto),
+            'version': self.version
+        }
+
+class PhraseTrie:
+    """
+    Trie of normalized phrases, walked from every word start of the text.
+    
+    Unlike EntityMatcher there are no failure links, so a phrase is added in
+    O(its length) without recompiling anything; matching costs the text
+    length times the longest partial match, which stays small for the few
+    phrases added between lexicon builds. Phrases are linked in only after
+    their states exist, so concurrent readers see each phrase whole or not
+    at all.
+    """
+    
+    def __init__(self, entries: Iterable[Tuple[str, str, str]] = ()):
+        """
+        Build the trie
+        
+        Args:
+            entries: (phrase, kind, value) triples
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._labels: List[Optional[List[Tuple[str, str]]]] = [None]
+        self._phrases = 0
+        for phrase, kind, value in entries:
+            self.add(phrase, kind, value)
+    
+    def add(self, phrase: str, kind: str, value: str):
+        """
+        Add one phrase
+        
+        Args:
+            phrase: Phrase text
+            kind: Entity kind
+            value: Entity value
+        """
+        normalized = normalize_text(phrase).strip()
+        if not normalized:
+            return
+        state = 0
+        for ch in normalized:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._labels.append(None)
+                self._goto[state][ch] = next_state
+            state = next_state
+        labels = self._labels[state]
+        if labels is None:
+            labels = self._labels[state] = []
+            self._phrases += 1
+        if (kind, value) not in labels:
+            labels.append((kind, value))
+    
+    def find(self, text: str, normalized: bool = False) -> List[Dict[str, Any]]:
+        """
+        Find all phrases occurring as whole words in the text
+        
+        Args:
+            text: Text to scan
+            normalized: Whether the text is already normalized with normalize_text
+        
+        Returns:
+            Matches as EntityMatcher.find returns them
+        """
+        text = text if normalized else normalize_text(text)
+        goto, all_labels = self._goto, self._labels
+        end_of_text = len(text) - 1
+        matches = []
+        
+        for start in range(1, end_of_text):
+            if text[start - 1] != ' ':
+                continue
+            state = 0
+            for i in range(start, end_of_text):
+                state = goto[state].get(text[i])
+                if state is None:
+                    break
+                labels = all_labels[state]
+                if labels and text[i + 1] == ' ':
+                    for kind, value in labels:
+                        matches.append({
+                            'kind': kind,
+                            'value': value,
+                            'phrase': text[start:i + 1],
+                            'start': start,
+                            'end': i + 1
+                        })
+        
+        return matches
+    
+    def __len__(self) -> int:
+        return self._phrases
+
+class LayeredEntityMatcher:
+    """
+    A compiled matcher plus a trie of phrases added since it was built.
+    
+    Lets monuments added at runtime be recognised at once without recompiling
+    anything: each add extends the trie in place. The knowledge base folds
+    the additions into a fresh base matcher in the background.
+    """
+    
+    def __init__(self, base: EntityMatcher, additions: Iterable[Tuple[str, str, str]] = (), version: Any = None):
+        """
+        Layer added phrases over a compiled matcher
+        
+        Args:
+            base: Matcher over the full lexicon as of its build
+            additions: (phrase, kind, value) triples added since
+            version: Version of the source data
+        """
+        self.version = version
+        self.base = base
+        self.additions = PhraseTrie(additions)
+    
+    def add(self, entries: Iterable[Tuple[str, str, str]], version: Any = None):
+        """
+        Make more phrases matchable
+        
+        Args:
+            entries: (phrase, kind, value) triples
+            version: Version of the source data after the addition
+        """
+        for phrase, kind, value in entries:
+            self.additions.add(phrase, kind, value)
+        if version is not None:
+            self.version = version
+    
+    def find(self, text: str, normalized: bool = False) -> List[Dict[str, Any]]:
+        """Matches of the base and the added phrases"""
+        text = text if normalized else normalize_text(text)
+        return self.base.find(text, normalized=True) + self.additions.find(text, normalized=True)
+    
+    def extract(self, text: str, normalized: bool = False) -> Dict[str, Set[str]]:
+        """Group matched entity values of the base and the added phrases by kind"""
+        return group_matches(self.find(text, normalized=normalized))
+    
+    def get_matcher_stats(self) -> Dict[str, Any]:
+        """Get automaton size statistics of the base and the additions"""
+        stats = self.base.get_matcher_stats()
+        stats['version'] = self.version
+        stats['added_phrases'] = len(self.additions)
+        return stats
+
+# Either matcher the knowledge base publishes
+Matcher = Union[EntityMatcher, LayeredEntityMatcher]
+
+def group_matches(matches: Iterable[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    """
+    Group matched entity values by kind
+    
+    Args:
+        matches: Matches from a matcher's find()
+    
+    Returns:
+        Dictionary of kind -> set of values
+    """
+    entities: Dict[str, Set[str]] = defaultdict(set)
+    for match in matches:
+        entities[match['kind']].add(match['value'])
+    return dict(entities)
+
+def _figure_entries(name: str) -> List[Tuple[str, str, str]]:
+    """A figure under its full name and without an honorific"""
+    entries = [(name, 'figure', name)]
+    lowered = name.lower()
+    for prefix in FIGURE_PREFIXES:
+        if lowered.startswith(prefix):
+            entries.append((name[len(prefix):], 'figure', name))
+    return entries
+
+def monument_lexicon_entries(monument_id: str, monument: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """
+    Lexicon entries contributed by one monument: its id, name, aliases and related figures
+    
+    Args:
+        monument_id: Monument id
+        monument: Monument record
+    
+    Returns:
+        (phrase, kind, value) entries
+    """
+    entries = [
+        (monument_id.replace('_', ' '), 'monument', monument_id),
+        (monument.get('name', ''), 'monument', monument_id)
+    ]
+    for alias in monument.get('aliases', []):
+        entries.append((alias, 'monument', monument_id))
+    for figure in monument.get('related_figures', []):
+        entries.extend(_figure_entries(figure))
+    return entries
+
+def build_lexicon_entries(knowledge_base: Optional[Any] = None) -> List[Tuple[str, str, str]]:
+    """
+    Collect (phrase, kind, value) entries from the knowledge base and cultural categories
+    
+    Kinds produced: 'monument' (value: monument id), 'figure' (value: figure name),
+    'category' (value: CULTURAL_CATEGORIES key) and 'topic' (value: general topic).
+    
+    Args:
+        knowledge_base: Optional CulturalKnowledgeBase instance
+    
+    Returns:
+        Lexicon entries
+    """
+    entries: List[Tuple[str, str, str]] = []
+    
+    if knowledge_base is not None:
+        # Copied first: monuments may be added while a background build reads them
+        for monument_id, monument in list(knowledge_base.monuments_db.items()):
+            entries.extend(monument_lexicon_entries(monument_id, monument))
+        
+        for figure_id in knowledge_base.mythological_figures:
+            entries.extend(_figure_entries(figure_id.replace('_', ' ').title()))
+        
+        for period in knowledge_base.cultural_contexts.values():
+            for figure in period.get('key_figures', []):
+                entries.extend(_figure_entries(figure))
+    
+    # Keywords also match their simple plural ("legends", "festivals")
+    for category, config in CULTURAL_CATEGORIES.items():
+        for keyword in [category] + config.get('keywords', []):
+            entries.append((keyword, 'category', category))
+            entries.append((keyword + 's', 'category', category))
+    
+    for topic in GENERAL_TOPICS:
+        entries.append((topic, 'topic', topic))
+        entries.append((topic + 's', 'topic', topic))
+    
+    return entries
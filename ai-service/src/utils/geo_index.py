@@ -0,0 +1,294 @@
+"""
+Geospatial Index for Narad AI
+KD-tree over monument coordinates for radius and k-nearest queries, with cheap incremental adds
+"""
+
+import math
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points
+    
+    Args:
+        lat1, lon1: First point in degrees
+        lat2, lon2: Second point in degrees
+    
+    Returns:
+        Distance in kilometres
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(lon2 - lon1) / 2
+    a = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def monument_coordinates(monument: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """
+    Coordinates of a monument record
+    
+    Args:
+        monument: Record with 'latitude' and 'longitude' in degrees
+    
+    Returns:
+        (latitude, longitude), or None if missing or out of range
+    """
+    try:
+        latitude = float(monument['latitude'])
+        longitude = float(monument['longitude'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        return None
+    return latitude, longitude
+
+def _unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere; straight-line distance grows monotonically with great-circle distance"""
+    phi = np.radians(latitudes)
+    lam = np.radians(longitudes)
+    return np.column_stack([np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)])
+
+def _chord(km: float) -> float:
+    """Straight-line distance on the unit sphere for a great-circle distance"""
+    return 2.0 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2.0)
+
+def _km(chord: np.ndarray) -> np.ndarray:
+    """Great-circle distance for straight-line distances on the unit sphere"""
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0))
+
+class GeoIndex:
+    """
+    Points by id with radius and k-nearest queries.
+    
+    Coordinates are mapped onto the unit sphere and held in a KD-tree, so
+    queries are logarithmic in catalog size and exact on the sphere (no
+    projection error near the poles or the antimeridian). Points added after
+    a build go to a small delta scanned by brute force; the tree is rebuilt
+    once the delta outgrows rebuild_fraction of the catalog. Removed or
+    replaced points are masked until the next rebuild.
+    """
+    
+    def __init__(self, rebuild_fraction: float = 0.05, min_rebuild: int = 256):
+        """
+        Initialize an empty index
+        
+        Args:
+            rebuild_fraction: Delta size, relative to the catalog, that triggers a rebuild
+            min_rebuild: Delta size always tolerated before a rebuild
+        """
+        self.rebuild_fraction = rebuild_fraction
+        self.min_rebuild = min_rebuild
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._number: Dict[str, int] = {}
+        self._latlon: List[Tuple[float, float]] = []
+        self._xyz = np.zeros((0, 3))
+        self._live = np.zeros(0, dtype=bool)
+        self._tree: Optional[cKDTree] = None
+        self._tree_numbers = np.zeros(0, dtype=np.int64)
+        self._delta: List[int] = []
+        # Points numbered below _tree_limit that were live at the last rebuild are in the tree
+        self._tree_limit = 0
+        self._masked = 0
+    
+    def build(self, points: Iterable[Tuple[str, float, float]]):
+        """
+        Index many points at once
+        
+        Args:
+            points: (id, latitude, longitude) triples
+        """
+        batch = [(point_id, float(latitude), float(longitude)) for point_id, latitude, longitude in points]
+        with self._lock:
+            start = len(self._ids)
+            self._reserve(start + len(batch))
+            for offset, (point_id, latitude, longitude) in enumerate(batch):
+                old = self._number.get(point_id)
+                if old is not None:
+                    self._mask(old)
+                self._ids.append(point_id)
+                self._number[point_id] = start + offset
+                self._latlon.append((latitude, longitude))
+            if batch:
+                coordinates = np.array([(latitude, longitude) for _, latitude, longitude in batch])
+                self._xyz[start:start + len(batch)] = _unit_vectors(coordinates[:, 0], coordinates[:, 1])
+                # A later duplicate within the batch supersedes an earlier one
+                self._live[start:start + len(batch)] = False
+                self._live[[self._number[point_id] for point_id, _, _ in batch]] = True
+            self._rebuild()
+    
+    def add(self, point_id: str, latitude: float, longitude: float):
+        """
+        Add or move a point
+        
+        Args:
+            point_id: Identifier
+            latitude: Degrees north
+            longitude: Degrees east
+        """
+        with self._lock:
+            self._delta.append(self._register(point_id, latitude, longitude))
+            if len(self._delta) > max(self.min_rebuild, self.rebuild_fraction * len(self._number)):
+                self._rebuild()
+    
+    def remove(self, point_id: str):
+        """
+        Drop a point
+        
+        Args:
+            point_id: Identifier
+        """
+        with self._lock:
+            number = self._number.pop(point_id, None)
+            if number is not None:
+                self._mask(number)
+    
+    def within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Points within a distance
+        
+        Args:
+            latitude: Degrees north
+            longitude: Degrees east
+            radius_km: Search radius in kilometres
+            limit: Maximum results
+        
+        Returns:
+            (id, distance_km) pairs, nearest first
+        """
+        query = _unit_vectors(np.array([latitude]), np.array([longitude]))[0]
+        radius = _chord(radius_km)
+        with self._lock:
+            numbers = []
+            if self._tree is not None:
+                numbers.extend(self._tree_numbers[self._tree.query_ball_point(query, radius)])
+            if self._delta:
+                delta = np.array(self._delta)
+                numbers.extend(delta[np.linalg.norm(self._xyz[delta] - query, axis=1) <= radius])
+            return self._ranked(np.array(numbers, dtype=np.int64), query, limit)
+    
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 5,
+        max_km: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        The k nearest points
+        
+        Args:
+            latitude: Degrees north
+            longitude: Degrees east
+            k: Number of points
+            max_km: Optional distance cap in kilometres
+        
+        Returns:
+            (id, distance_km) pairs, nearest first
+        """
+        query = _unit_vectors(np.array([latitude]), np.array([longitude]))[0]
+        bound = _chord(max_km) if max_km is not None else np.inf
+        with self._lock:
+            numbers = []
+            if self._tree is not None and self._tree.n:
+                # Ask for extra neighbours to cover masked (removed) points
+                wanted = min(k + self._masked, self._tree.n)
+                distances, positions = self._tree.query(query, k=wanted, distance_upper_bound=bound)
+                positions = np.atleast_1d(positions)[np.isfinite(np.atleast_1d(distances))]
+                numbers.extend(self._tree_numbers[positions])
+            numbers.extend(self._delta)
+            return self._ranked(np.array(numbers, dtype=np.int64), query, k, bound)
+    
+    def location(self, point_id: str) -> Optional[Tuple[float, float]]:
+        """
+        Stored coordinates of a point
+        
+        Args:
+            point_id: Identifier
+        
+        Returns:
+            (latitude, longitude), or None if the point is not indexed
+        """
+        number = self._number.get(point_id)
+        return None if number is None else self._latlon[number]
+    
+    def __len__(self) -> int:
+        return len(self._number)
+    
+    def get_index_stats(self) -> Dict[str, Any]:
+        """Get index size statistics"""
+        with self._lock:
+            return {
+                'points': len(self._number),
+                'tree_points': 0 if self._tree is None else int(self._tree.n),
+                'delta_points': len(self._delta),
+                'masked_points': self._masked
+            }
+    
+    def _ranked(
+        self,
+        numbers: np.ndarray,
+        query: np.ndarray,
+        limit: Optional[int],
+        bound: float = np.inf
+    ) -> List[Tuple[str, float]]:
+        """Live candidates sorted by distance, ties in insertion order; caller holds the lock"""
+        numbers = numbers[self._live[numbers]] if len(numbers) else numbers
+        chords = np.linalg.norm(self._xyz[numbers] - query, axis=1)
+        keep = chords <= bound
+        numbers, chords = numbers[keep], chords[keep]
+        order = np.lexsort((numbers, chords))
+        if limit is not None:
+            order = order[:limit]
+        return [(self._ids[number], round(float(km), 3)) for number, km in zip(numbers[order], _km(chords[order]))]
+    
+    def _register(self, point_id: str, latitude: float, longitude: float) -> int:
+        """Give a point a new number, masking any earlier one; caller holds the lock"""
+        old = self._number.get(point_id)
+        if old is not None:
+            self._mask(old)
+        number = len(self._ids)
+        self._ids.append(point_id)
+        self._number[point_id] = number
+        self._latlon.append((float(latitude), float(longitude)))
+        self._reserve(number + 1)
+        self._xyz[number] = _unit_vectors(np.array([latitude]), np.array([longitude]))[0]
+        self._live[number] = True
+        return number
+    
+    def _reserve(self, size: int):
+        """Grow the coordinate arrays geometrically to hold size points; caller holds the lock"""
+        if size <= len(self._xyz):
+            return
+        capacity = max(64, size, 2 * len(self._xyz))
+        self._xyz = np.vstack([self._xyz, np.zeros((capacity - len(self._xyz), 3))])
+        self._live = np.concatenate([self._live, np.zeros(capacity - len(self._live), dtype=bool)])
+    
+    def _rebuild(self):
+        """Rebuild the tree over every live point; caller holds the lock"""
+        self._tree_numbers = np.flatnonzero(self._live[:len(self._ids)])
+        self._tree = cKDTree(self._xyz[self._tree_numbers]) if len(self._tree_numbers) else None
+        self._delta = []
+        self._tree_limit = len(self._ids)
+        self._masked = 0
+    
+    def _mask(self, number: int):
+        """Hide a point from results until the next rebuild; caller holds the lock"""
+        if self._live[number] and number < self._tree_limit:
+            self._masked += 1
+        self._live[number] = False
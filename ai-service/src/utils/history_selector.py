@@ -0,0 +1,179 @@
+"""
+History Selector for Narad AI
+Picks the conversation turns most relevant to the current message for the prompt
+"""
+
+import math
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, FrozenSet, Iterable
+
+from .entity_matcher import tokenize as split_words
+
+logger = logging.getLogger(__name__)
+
+# Function words that would make every turn look related
+STOPWORDS = frozenset("""
+a an the and or but if of in on at to for from by with about as is are was were be been
+it its this that these those there here what which who whom whose when where why how
+i me my you your he she they them their we us our can could would should will shall do
+does did tell please more also some any all just than then so very much many
+""".split())
+
+# A turn is (user message or None, ai message or None)
+Turn = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Lowercase content words of a text"""
+    return content_words(split_words(text))
+
+def content_words(tokens: Iterable[str]) -> FrozenSet[str]:
+    """Content words among lowercase word tokens"""
+    return frozenset(token for token in tokens if len(token) > 1 and token not in STOPWORDS)
+
+def pair_turns(messages: List[Dict[str, Any]]) -> List[Turn]:
+    """
+    Group messages into user/ai turns in order
+    
+    Args:
+        messages: Conversation history, oldest first
+    
+    Returns:
+        Turns; a user message without an answer yet has ai None
+    """
+    turns: List[Turn] = []
+    for message in messages:
+        role = message.get('role')
+        if role == 'user':
+            turns.append((message, None))
+        elif role == 'ai':
+            if turns and turns[-1][1] is None and turns[-1][0] is not None:
+                turns[-1] = (turns[-1][0], message)
+            else:
+                turns.append((None, message))
+    return turns
+
+class HistorySelector:
+    """
+    Relevance-ranked selection of past turns.
+    
+    Every retained turn is scored against the current message by IDF-weighted
+    token overlap (IDF computed over the session's own turns). The immediate
+    previous turn is always kept for continuity, then the highest-scoring
+    others fill the remaining slots. Token sets are cached per message, and
+    scoring walks turns newest-first and stops when the time budget runs out,
+    so older turns are simply not considered on an overrun.
+    """
+    
+    def __init__(self, max_turns: int = 3, time_budget_us: int = 500, cache_size: int = 20000):
+        """
+        Initialize the selector
+        
+        Args:
+            max_turns: Turns included in the prompt, including the previous one
+            time_budget_us: Microseconds allowed for scoring a selection
+            cache_size: Messages whose token sets are cached
+        """
+        self.max_turns = max_turns
+        self.time_budget_us = time_budget_us
+        self.cache_size = cache_size
+        self._token_cache: "OrderedDict[Tuple, FrozenSet[str]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        self.stats = {
+            'selections': 0,
+            'budget_exceeded': 0,
+            'cache_hits': 0,
+            'cache_misses': 0
+        }
+    
+    def select(
+        self,
+        messages: List[Dict[str, Any]],
+        current_message: str,
+        tokens: Optional[List[str]] = None
+    ) -> List[Turn]:
+        """
+        Select the turns to include in the prompt
+        
+        Args:
+            messages: Conversation history, oldest first
+            current_message: The message being answered
+            tokens: Lowercase word tokens of the current message, if already computed
+        
+        Returns:
+            Selected turns in chronological order
+        """
+        self.stats['selections'] += 1
+        turns = pair_turns(messages)
+        if len(turns) <= self.max_turns:
+            return turns
+        
+        deadline = time.perf_counter() + self.time_budget_us / 1e6
+        query = tokenize(current_message) if tokens is None else content_words(tokens)
+        
+        # Newest first, so an overrun only drops the oldest candidates
+        candidates: List[Tuple[int, FrozenSet[str]]] = []
+        for index in range(len(turns) - 2, -1, -1):
+            if time.perf_counter() > deadline:
+                self.stats['budget_exceeded'] += 1
+                break
+            candidates.append((index, self._turn_tokens(turns[index])))
+        
+        scored = []
+        if query and candidates:
+            document_frequency: Dict[str, int] = {}
+            for _, tokens in candidates:
+                for token in query & tokens:
+                    document_frequency[token] = document_frequency.get(token, 0) + 1
+            total = len(candidates) + 1
+            for index, tokens in candidates:
+                score = sum(math.log(1 + total / document_frequency[token]) for token in query & tokens)
+                if score > 0:
+                    scored.append((score, index))
+        
+        # Highest score first; ties go to the more recent turn
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        chosen = {len(turns) - 1}
+        chosen.update(index for _, index in scored[:self.max_turns - 1])
+        
+        # Fill unused slots with the most recent turns, as before
+        for index in range(len(turns) - 2, -1, -1):
+            if len(chosen) >= self.max_turns:
+                break
+            chosen.add(index)
+        
+        return [turns[index] for index in sorted(chosen)]
+    
+    def get_selector_stats(self) -> Dict[str, Any]:
+        """Get selection statistics"""
+        return dict(self.stats, cached_messages=len(self._token_cache))
+    
+    def _turn_tokens(self, turn: Turn) -> FrozenSet[str]:
+        """Union of the token sets of a turn's messages"""
+        tokens = frozenset()
+        for message in turn:
+            if message is not None:
+                tokens = tokens | self._message_tokens(message)
+        return tokens
+    
+    def _message_tokens(self, message: Dict[str, Any]) -> FrozenSet[str]:
+        """Token set of a message, cached by timestamp, role and length"""
+        content = message.get('content', '')
+        key = (message.get('timestamp'), message.get('role'), len(content))
+        with self._cache_lock:
+            tokens = self._token_cache.get(key)
+            if tokens is not None:
+                self.stats['cache_hits'] += 1
+                self._token_cache.move_to_end(key)
+                return tokens
+        
+        self.stats['cache_misses'] += 1
+        tokens = tokenize(content)
+        with self._cache_lock:
+            self._token_cache[key] = tokens
+            if len(self._token_cache) > self.cache_size:
+                self._token_cache.popitem(last=False)
+        return tokens
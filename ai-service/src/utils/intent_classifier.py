@@ -0,0 +1,233 @@
+"""
+Intent Classifier for Narad AI
+Hashed word n-gram features with a linear model; batches are scored with one sparse matrix multiply
+"""
+
+import os
+import math
+import zlib
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .entity_matcher import tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'models', 'intent_classifier.npz'
+)
+
+DEFAULT_N_FEATURES = 2 ** 14
+
+def _features(tokens: List[str]) -> List[str]:
+    """Word unigrams and bigrams, character trigrams for misspellings, and a short-message marker"""
+    features = list(tokens)
+    features.extend(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    for token in tokens:
+        padded = f"<{token}>"
+        features.extend(f"#{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    if len(tokens) <= 2:
+        features.append('<short>')
+    return features
+
+def classify_by_keywords(message: str) -> str:
+    """
+    Legacy substring rules, used when no trained model is available
+    
+    Args:
+        message: Raw message
+    
+    Returns:
+        Intent label
+    """
+    message_lower = message.lower()
+    
+    if any(word in message_lower for word in ['hello', 'hi', 'namaste', 'hey']):
+        return 'greeting'
+    elif any(word in message_lower for word in ['story', 'tell', 'myth', 'legend']):
+        return 'story_request'
+    elif any(word in message_lower for word in ['monument', 'place', 'location', 'visit']):
+        return 'location_inquiry'
+    elif any(word in message_lower for word in ['culture', 'tradition', 'festival', 'custom']):
+        return 'cultural_inquiry'
+    elif any(word in message_lower for word in ['how', 'what', 'when', 'where', 'why']):
+        return 'informational'
+    else:
+        return 'general_inquiry'
+
+def _hash_row(message: str, n_features: int, tokens: Optional[List[str]] = None) -> Tuple[List[int], List[float]]:
+    """Hashed feature indices of a message with their L2-normalized log-scaled counts"""
+    counts: Dict[int, int] = {}
+    for feature in _features(tokenize(message) if tokens is None else tokens):
+        index = zlib.crc32(feature.encode('utf-8')) % n_features
+        counts[index] = counts.get(index, 0) + 1
+    row = [1.0 + math.log(count) for count in counts.values()]
+    norm = math.sqrt(sum(value * value for value in row)) or 1.0
+    return list(counts), [value / norm for value in row]
+
+class IntentClassifier:
+    """
+    Linear intent model over hashed, L2-normalized, log-scaled term counts.
+    
+    Feature hashing uses CRC32 so indices are stable across processes and
+    identical between training and serving; the weight matrix, bias and
+    class labels are loaded once from an .npz file.
+    """
+    
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        classes: List[str],
+        n_features: int = DEFAULT_N_FEATURES
+    ):
+        """
+        Initialize the classifier
+        
+        Args:
+            weights: (n_features, n_classes) weight matrix
+            bias: (n_classes,) intercepts
+            classes: Intent label of each column
+            n_features: Size of the hashed feature space
+        """
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.classes = list(classes)
+        self.n_features = n_features
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> 'IntentClassifier':
+        """
+        Load a trained model
+        
+        Args:
+            path: .npz file written by save()
+        
+        Returns:
+            IntentClassifier instance
+        """
+        with np.load(path, allow_pickle=False) as data:
+            model = cls(
+                weights=data['weights'],
+                bias=data['bias'],
+                classes=[str(label) for label in data['classes']],
+                n_features=int(data['n_features'])
+            )
+        logger.info(f"Loaded intent model from {path} with {len(model.classes)} intents")
+        return model
+    
+    def save(self, path: str):
+        """
+        Write the model to an .npz file
+        
+        Args:
+            path: Destination path
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez_compressed(
+            path,
+            weights=self.weights,
+            bias=self.bias,
+            classes=np.array(self.classes),
+            n_features=np.array(self.n_features)
+        )
+    
+    @staticmethod
+    def vectorize(messages: List[str], n_features: int = DEFAULT_N_FEATURES) -> sparse.csr_matrix:
+        """
+        Hash messages into a sparse feature matrix
+        
+        Args:
+            messages: Raw messages
+            n_features: Size of the hashed feature space
+        
+        Returns:
+            (len(messages), n_features) CSR matrix with L2-normalized rows
+        """
+        indptr = [0]
+        indices: List[int] = []
+        values: List[float] = []
+        
+        for message in messages:
+            row_indices, row_values = _hash_row(message, n_features)
+            indices.extend(row_indices)
+            values.extend(row_values)
+            indptr.append(len(indices))
+        
+        return sparse.csr_matrix(
+            (np.array(values, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+            shape=(len(messages), n_features)
+        )
+    
+    def classify_batch(self, messages: List[str]) -> List[Tuple[str, float]]:
+        """
+        Classify many messages with a single matrix multiply
+        
+        Args:
+            messages: Raw messages
+        
+        Returns:
+            (intent, probability) for each message
+        """
+        if not messages:
+            return []
+        scores = self.vectorize(messages, self.n_features) @ self.weights + self.bias
+        scores = np.asarray(scores)
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        return [
+            (self.classes[index], float(probabilities[row, index]))
+            for row, index in enumerate(best)
+        ]
+    
+    def classify(self, message: str, tokens: Optional[List[str]] = None) -> Tuple[str, float]:
+        """
+        Classify one message
+        
+        Args:
+            message: Raw message
+            tokens: Lowercase word tokens of the message, if already computed
+        
+        Returns:
+            Tuple of (intent, probability)
+        """
+        # Gathering the few active weight rows is cheaper than building a sparse matrix
+        indices, values = _hash_row(message, self.n_features, tokens)
+        scores = self.bias.copy()
+        if indices:
+            scores += np.asarray(values, dtype=np.float32) @ self.weights[indices]
+        scores -= scores.max()
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum()
+        index = int(probabilities.argmax())
+        return self.classes[index], float(probabilities[index])
+    
+    def get_model_stats(self) -> Dict[str, Any]:
+        """Get model size statistics"""
+        return {
+            'intents': self.classes,
+            'n_features': self.n_features,
+            'nonzero_weights': int(np.count_nonzero(self.weights))
+        }
+
+def load_intent_classifier(path: Optional[str] = None) -> Optional[IntentClassifier]:
+    """
+    Load the intent model, returning None if it is missing or unreadable
+    
+    Args:
+        path: Optional model path (defaults to models/intent_classifier.npz)
+    
+    Returns:
+        IntentClassifier or None
+    """
+    try:
+        return IntentClassifier.load(path or DEFAULT_MODEL_PATH)
+    except Exception as e:
+        logger.error(f"Error loading intent model, falling back to keyword rules: {e}")
+        return None
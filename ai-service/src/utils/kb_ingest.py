@@ -0,0 +1,199 @@
+"""
+Knowledge Base Ingestion for Narad AI
+Record schemas, stable id assignment and per-record validation for batch ingestion
+"""
+
+import re
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from .period_index import parse_timeframe
+
+logger = logging.getLogger(__name__)
+
+# Field -> (accepted types, required); list fields hold strings unless listed in LIST_ITEM_TYPES
+RECORD_SCHEMAS = {
+    'monument': {
+        'name': (str, True),
+        'location': (str, True),
+        'period': (str, False),
+        'built_year': ((int, str), False),
+        'significance': (str, False),
+        'architecture': (str, False),
+        'stories': (list, False),
+        'myths': (list, False),
+        'cultural_importance': (str, False),
+        'related_figures': (list, False),
+        'aliases': (list, False),
+        'latitude': ((int, float), False),
+        'longitude': ((int, float), False),
+        'events': (list, False)
+    },
+    'story': {
+        'title': (str, True),
+        'type': (str, True),
+        'content': (str, True),
+        'monument': ((str, type(None)), False),
+        'themes': (list, False),
+        'cultural_significance': (str, False),
+        'historical_accuracy': (str, False)
+    }
+}
+LIST_ITEM_TYPES = {('monument', 'events'): dict}
+
+# Field an id is derived from when a record carries none
+ID_SOURCE_FIELDS = {'monument': 'name', 'story': 'title'}
+
+ID_PATTERN = re.compile(r"^[^\s/]{1,200}$")
+
+# What to do with a record whose id is already taken
+CONFLICT_POLICIES = ('error', 'skip', 'replace')
+
+def derive_record_id(record_type: str, record: Dict[str, Any]) -> Optional[str]:
+    """
+    Id of a record: its own 'id', else its name or title lowercased with
+    spaces as underscores, the rule add_monument and add_story use
+    
+    Args:
+        record_type: 'monument' or 'story'
+        record: Incoming record
+    
+    Returns:
+        The id, or None if the record has neither
+    """
+    record_id = record.get('id')
+    if record_id is None:
+        source = record.get(ID_SOURCE_FIELDS[record_type])
+        if not isinstance(source, str) or not source.strip():
+            return None
+        record_id = '_'.join(source.lower().split())
+    return record_id
+
+def validate_record(record_type: str, record: Any) -> List[str]:
+    """
+    Check a record against its schema
+    
+    Unknown fields are kept; known fields must have the right type, and an
+    id derived from the name or title must be a valid id.
+    
+    Args:
+        record_type: 'monument' or 'story'
+        record: Incoming record
+    
+    Returns:
+        Problems found, empty if the record is valid
+    """
+    if not isinstance(record, dict):
+        return [f"{record_type} must be an object"]
+    errors = []
+    record_id = record.get('id')
+    if record_id is not None and (not isinstance(record_id, str) or not ID_PATTERN.match(record_id)):
+        errors.append("id must be a non-empty string without spaces or slashes")
+    for field, (types, required) in RECORD_SCHEMAS[record_type].items():
+        if field not in record:
+            if required:
+                errors.append(f"{field} is required")
+            continue
+        value = record[field]
+        if types is list:
+            item_type = LIST_ITEM_TYPES.get((record_type, field), str)
+            if not isinstance(value, list) or not all(isinstance(item, item_type) for item in value):
+                errors.append(f"{field} must be a list of {'objects' if item_type is dict else 'strings'}")
+        elif not isinstance(value, types) or isinstance(value, bool):
+            errors.append(f"{field} has the wrong type ({type(value).__name__})")
+        elif required and not value.strip():
+            errors.append(f"{field} must not be empty")
+    
+    if record_id is None and not errors:
+        derived = derive_record_id(record_type, record)
+        if derived is not None and not ID_PATTERN.match(derived):
+            errors.append(f"{ID_SOURCE_FIELDS[record_type]} gives the invalid id {derived!r}; give the record an id")
+    if record_type == 'story' and isinstance(record.get('monument'), str) and not record['monument'].strip():
+        errors.append("monument must not be empty (null for no monument)")
+    
+    if record_type == 'monument' and not errors:
+        has_latitude, has_longitude = 'latitude' in record, 'longitude' in record
+        if has_latitude != has_longitude:
+            errors.append("latitude and longitude must be given together")
+        elif has_latitude and not (-90 <= record['latitude'] <= 90 and -180 <= record['longitude'] <= 180):
+            errors.append("latitude or longitude out of range")
+        if isinstance(record.get('built_year'), str) and parse_timeframe(record['built_year']) is None:
+            errors.append(f"built_year {record['built_year']!r} is not a year or year range")
+        for position, event in enumerate(record.get('events', [])):
+            if 'event' not in event or parse_timeframe(event.get('year')) is None:
+                errors.append(f"events[{position}] needs an event and a year")
+    return errors
+
+def prepare_batch(
+    batch: Dict[str, List[Any]],
+    existing: Dict[str, Dict[str, Any]],
+    on_conflict: str = 'error'
+) -> Tuple[Dict[str, List[Tuple[str, Dict[str, Any]]]], Dict[str, Any]]:
+    """
+    Validate a batch and assign ids, without touching the knowledge base
+    
+    Monuments are checked before stories so a story may name a monument
+    from the same batch. An id already in the knowledge base, or used by an
+    earlier record of the batch, is handled by the conflict policy; ids are
+    never silently reused.
+    
+    Args:
+        batch: 'monuments' and/or 'stories' lists of records
+        existing: Record type -> the knowledge base section holding that type
+        on_conflict: 'error' rejects the record, 'skip' leaves the existing
+            one and reports the id, 'replace' overwrites it
+    
+    Returns:
+        (record type -> accepted (id, record) pairs, report with per-position
+        ids, counts and errors)
+    """
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"on_conflict must be one of {', '.join(CONFLICT_POLICIES)}")
+    accepted: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {'monument': [], 'story': []}
+    report: Dict[str, Any] = {
+        'ids': {},
+        'added': {'monument': 0, 'story': 0},
+        'replaced': {'monument': 0, 'story': 0},
+        'skipped': {'monument': 0, 'story': 0},
+        'errors': []
+    }
+    
+    for record_type, key in (('monument', 'monuments'), ('story', 'stories')):
+        records = batch.get(key) or []
+        if not isinstance(records, list):
+            raise ValueError(f"{key} must be a list")
+        section = existing[record_type]
+        batch_monuments = {record_id for record_id, _ in accepted['monument']}
+        seen = set()
+        ids: List[Optional[str]] = []
+        for position, record in enumerate(records):
+            errors = validate_record(record_type, record)
+            record_id = derive_record_id(record_type, record) if isinstance(record, dict) else None
+            if not errors and record_type == 'story' and record.get('monument'):
+                monument_id = record['monument']
+                if monument_id not in existing['monument'] and monument_id not in batch_monuments:
+                    errors.append(f"monument {monument_id!r} does not exist")
+            if not errors and record_id in seen:
+                errors.append(f"id {record_id!r} is used by an earlier record in this batch")
+            if not errors and record_id in section:
+                if on_conflict == 'error':
+                    errors.append(f"id {record_id!r} already exists")
+                elif on_conflict == 'skip':
+                    report['skipped'][record_type] += 1
+                    seen.add(record_id)
+                    ids.append(record_id)
+                    continue
+                else:
+                    report['replaced'][record_type] += 1
+            if errors:
+                report['errors'].append({'type': record_type, 'index': position, 'id': record_id, 'errors': errors})
+                ids.append(None)
+                continue
+            data = {field: value for field, value in record.items() if field != 'id'}
+            seen.add(record_id)
+            ids.append(record_id)
+            accepted[record_type].append((record_id, data))
+            if record_id not in section:
+                report['added'][record_type] += 1
+        report['ids'][key] = ids
+    return accepted, report
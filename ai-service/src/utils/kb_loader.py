@@ -0,0 +1,407 @@
+"""
+Knowledge Base Loader for Narad AI
+Versioned JSON Lines and SQLite knowledge files: metadata loaded eagerly, story bodies on demand
+
+JSON Lines layout: a header line ({"format", "schema_version", "version"}),
+then one {"type", "id", "data"} line per record, then the story bodies as
+{"type": "story_content", "id", "content"} lines. Story records carry
+"content_at", the byte offset of their body line from the start of the body
+section, so loading never reads the bodies. Hand-written files may instead
+keep "content" inside a story's data; such stories are loaded eagerly.
+"""
+
+import os
+import gc
+import json
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from .compact_records import CompactRecords, StringTable, RECORD_LAYOUTS
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = 'narad-kb'
+SCHEMA_VERSION = 1
+
+# Record type in the file -> CulturalKnowledgeBase attribute
+SECTIONS = {
+    'monument': 'monuments_db',
+    'story': 'stories_db',
+    'cultural_context': 'cultural_contexts',
+    'regional_knowledge': 'regional_knowledge',
+    'mythological_figure': 'mythological_figures',
+    'historical_period': 'historical_periods'
+}
+
+# Story fields kept out of the eager load
+LAZY_STORY_FIELD = 'content'
+
+CONTENT_RECORD = 'story_content'
+
+# Lines containing this are parsed to check whether they are body lines
+_CONTENT_MARKER = b'"story_content"'
+
+CONTENT_CACHE_SIZE = 1024
+
+# Records decoded per json.loads call when loading into compact sections
+COMPACT_DECODE_CHUNK = 20000
+
+class ContentStore(ABC):
+    """Fetches story bodies from the knowledge file by the key recorded at load time"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cached = lru_cache(maxsize=CONTENT_CACHE_SIZE)(self._read)
+    
+    def get(self, key: Any) -> Optional[str]:
+        """Story body for a key, or None if the file has none; recent bodies are cached"""
+        return self._cached(key)
+    
+    @abstractmethod
+    def _read(self, key: Any) -> Optional[str]:
+        """Read one story body from the file"""
+    
+    @abstractmethod
+    def close(self):
+        """Release the file handle or connection"""
+
+class JsonlContentStore(ContentStore):
+    """
+    Story bodies read by seeking to their line; keys are offsets into the body section.
+    
+    The handle the file was loaded through stays open, so offsets always
+    refer to the loaded file even if it is replaced on disk. After close()
+    the path is reopened only if its inode, size and modification time
+    still match.
+    """
+    
+    def __init__(self, path: str, handle, base_offset: int = 0):
+        super().__init__()
+        self.path = path
+        self.base_offset = base_offset
+        self._file = handle
+        self._signature = _file_signature(handle)
+    
+    def _read(self, offset: int) -> Optional[str]:
+        with self._lock:
+            if self._file is None:
+                handle = open(self.path, 'rb')
+                if _file_signature(handle) != self._signature:
+                    handle.close()
+                    logger.error(f"{self.path} changed since it was loaded; story bodies are unavailable")
+                    return None
+                self._file = handle
+            self._file.seek(self.base_offset + offset)
+            line = self._file.readline()
+        record = _content_record(line, check_marker=False)
+        return None if record is None else record.get('content')
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class SqliteContentStore(ContentStore):
+    """Story bodies selected from the story_content table; keys are story ids"""
+    
+    def __init__(self, path: str, connection: Optional[sqlite3.Connection] = None):
+        super().__init__()
+        self.path = path
+        self._connection = connection
+    
+    def _read(self, story_id: str) -> Optional[str]:
+        with self._lock:
+            if self._connection is None:
+                self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            row = self._connection.execute(
+                'SELECT content FROM story_content WHERE id = ?', (story_id,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+class LazyStory(dict):
+    """
+    Story record whose body is fetched from the content store on first
+    access through story['content'] or story.get('content'). Bodies are not
+    kept on the record, so memory stays proportional to metadata.
+    """
+    
+    __slots__ = ('story_id', '_content_store', '_content_key')
+    
+    def __init__(self, story_id: str, data: Dict[str, Any], content_store: ContentStore, content_key: Any = None):
+        super().__init__(data)
+        self.story_id = story_id
+        self._content_store = content_store
+        self._content_key = story_id if content_key is None else content_key
+    
+    def __missing__(self, key):
+        if key == LAZY_STORY_FIELD:
+            return self._content_store.get(self._content_key) or ''
+        raise KeyError(key)
+    
+    def __contains__(self, key) -> bool:
+        return key == LAZY_STORY_FIELD or dict.__contains__(self, key)
+    
+    def get(self, key, default=None):
+        if key == LAZY_STORY_FIELD and not dict.__contains__(self, key):
+            content = self._content_store.get(self._content_key)
+            return default if content is None else content
+        return dict.get(self, key, default)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary including the body"""
+        data = dict(self)
+        data[LAZY_STORY_FIELD] = self[LAZY_STORY_FIELD]
+        return data
+
+def load_knowledge_file(path: str, compact: bool = False) -> Dict[str, Any]:
+    """
+    Load a knowledge file (.jsonl, or .sqlite/.db)
+    
+    Args:
+        path: Knowledge file path
+        compact: Store monuments and stories as CompactRecords columns with
+            one string table instead of a dict per record
+    
+    Returns:
+        Dictionary with 'sections' (attribute name -> records), 'version'
+        (dataset version string), 'format' and 'content_store'
+    
+    Raises:
+        ValueError: If the file is not a supported knowledge file
+    """
+    if path.endswith('.jsonl'):
+        return _load_jsonl(path, compact)
+    if path.endswith(('.sqlite', '.db')):
+        return _load_sqlite(path, compact)
+    raise ValueError(f"Unsupported knowledge file: {path}")
+
+def save_knowledge_file(path: str, sections: Dict[str, Dict[str, Any]], version: str):
+    """
+    Write knowledge sections to a .jsonl or .sqlite/.db file
+    
+    Args:
+        path: Destination path; written to a temporary file and renamed into place
+        sections: Attribute name (e.g. 'monuments_db') -> id -> record
+        version: Dataset version recorded in the file
+    """
+    temp_path = path + '.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    if path.endswith('.jsonl'):
+        _save_jsonl(temp_path, sections, version)
+    elif path.endswith(('.sqlite', '.db')):
+        _save_sqlite(temp_path, sections, version)
+    else:
+        raise ValueError(f"Unsupported knowledge file: {path}")
+    os.replace(temp_path, path)
+
+def _file_signature(handle) -> Tuple[int, int, int]:
+    """Inode, size and modification time of an open file"""
+    status = os.fstat(handle.fileno())
+    return status.st_ino, status.st_size, status.st_mtime_ns
+
+def _content_record(line: bytes, check_marker: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    The story body record on a line, or None for any other line
+    
+    Args:
+        line: Raw line from a JSON Lines knowledge file
+        check_marker: Skip parsing lines that cannot name the body record type
+    """
+    if check_marker and _CONTENT_MARKER not in line:
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(record, dict) and record.get('type') == CONTENT_RECORD:
+        return record
+    return None
+
+def _check_header(header: Dict[str, Any], path: str):
+    if header.get('format') != FORMAT_NAME:
+        raise ValueError(f"{path} is not a {FORMAT_NAME} file")
+    if int(header.get('schema_version', 0)) > SCHEMA_VERSION:
+        raise ValueError(f"{path} uses schema version {header['schema_version']}, newer than {SCHEMA_VERSION}")
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspend the cyclic garbage collector while building many container objects"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def _empty_sections(compact: bool = False, content_store: Optional[ContentStore] = None) -> Dict[str, Dict[str, Any]]:
+    sections = {attribute: {} for attribute in SECTIONS.values()}
+    if compact:
+        strings = StringTable()
+        for attribute, layout in RECORD_LAYOUTS.items():
+            sections[attribute] = CompactRecords(layout, strings, content_store)
+    return sections
+
+def _load_jsonl(path: str, compact: bool = False) -> Dict[str, Any]:
+    """Read the header and metadata lines; stop at the body section"""
+    # Body offsets are relative to the body section, whose start is known once the metadata is read
+    f = open(path, 'rb')
+    try:
+        content_store = JsonlContentStore(path, f)
+    except BaseException:
+        f.close()
+        raise
+    sections = _empty_sections(compact, content_store)
+    stories_db = sections['stories_db']
+    lines: List[bytes] = []
+    
+    def decode_lines():
+        # One decode call for many lines is much cheaper than one per line
+        records = json.loads(b'[' + b','.join(lines) + b']')
+        lines.clear()
+        for record in records:
+            record_type, record_id, data = record['type'], record['id'], record['data']
+            if record_type == 'story' and 'content_at' in record:
+                if compact:
+                    stories_db.add(record_id, data, record['content_at'])
+                else:
+                    stories_db[record_id] = LazyStory(record_id, data, content_store, record['content_at'])
+            else:
+                sections[SECTIONS[record_type]][record_id] = data
+    
+    try:
+        with _gc_paused():
+            header = json.loads(f.readline())
+            _check_header(header, path)
+            base_offset = f.tell()
+            for line in f:
+                if _content_record(line) is not None:
+                    break
+                base_offset += len(line)
+                if line.strip():
+                    lines.append(line)
+                    # Compact sections keep no decoded dicts, so decode in chunks to bound the peak
+                    if compact and len(lines) >= COMPACT_DECODE_CHUNK:
+                        decode_lines()
+            decode_lines()
+    except BaseException:
+        content_store.close()
+        raise
+    # The handle stays open in the content store for body reads
+    content_store.base_offset = base_offset
+    
+    return {'sections': sections, 'version': header.get('version'), 'format': 'jsonl', 'content_store': content_store}
+
+def _save_jsonl(path: str, sections: Dict[str, Dict[str, Any]], version: str):
+    """Bodies are encoded first so each story record can carry its body offset"""
+    body_lines: List[bytes] = []
+    content_at: Dict[str, int] = {}
+    offset = 0
+    for story_id, data in sections.get('stories_db', {}).items():
+        line = (json.dumps({'type': CONTENT_RECORD, 'id': story_id, 'content': data.get(LAZY_STORY_FIELD) or ''},
+                           ensure_ascii=False) + '\n').encode('utf-8')
+        content_at[story_id] = offset
+        offset += len(line)
+        body_lines.append(line)
+    
+    with open(path, 'wb') as f:
+        f.write((json.dumps({'format': FORMAT_NAME, 'schema_version': SCHEMA_VERSION, 'version': version}) + '\n').encode('utf-8'))
+        for record_type, attribute in SECTIONS.items():
+            for record_id, data in sections.get(attribute, {}).items():
+                record = {'type': record_type, 'id': record_id}
+                data = _record_data(data)
+                if record_type == 'story':
+                    data.pop(LAZY_STORY_FIELD, None)
+                    record['content_at'] = content_at[record_id]
+                record['data'] = data
+                f.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+        f.writelines(body_lines)
+
+def _record_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Plain copy of a record; lazy stories and compact record views include their body"""
+    return data.to_dict() if hasattr(data, 'to_dict') else dict(data)
+
+def _load_sqlite(path: str, compact: bool = False) -> Dict[str, Any]:
+    """Metadata from the records table; bodies stay in story_content until requested"""
+    if not os.path.exists(path):
+        raise ValueError(f"Knowledge file not found: {path}")
+    # The loading connection is kept for body reads, like the JSON Lines handle
+    connection = sqlite3.connect(path, check_same_thread=False)
+    content_store = SqliteContentStore(path, connection)
+    sections = _empty_sections(compact, content_store)
+    
+    try:
+        header = dict(connection.execute('SELECT key, value FROM meta'))
+        _check_header(header, path)
+        cursor = connection.execute('SELECT type, id, data FROM records ORDER BY rowid')
+        stories_db = sections['stories_db']
+        with _gc_paused():
+            while True:
+                rows = cursor.fetchmany(COMPACT_DECODE_CHUNK) if compact else cursor.fetchall()
+                if not rows:
+                    break
+                # Decode every record of the batch in one call rather than one per row
+                records = json.loads('[' + ','.join(row[2] for row in rows) + ']')
+                for (record_type, record_id, _), data in zip(rows, records):
+                    if record_type == 'story' and compact:
+                        stories_db.add(record_id, data, None)
+                    elif record_type == 'story':
+                        stories_db[record_id] = LazyStory(record_id, data, content_store)
+                    else:
+                        sections[SECTIONS[record_type]][record_id] = data
+    except BaseException:
+        content_store.close()
+        raise
+    
+    return {'sections': sections, 'version': header.get('version'), 'format': 'sqlite', 'content_store': content_store}
+
+def _save_sqlite(path: str, sections: Dict[str, Dict[str, Any]], version: str):
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE records (type TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL, PRIMARY KEY (type, id));
+            CREATE TABLE story_content (id TEXT PRIMARY KEY, content TEXT NOT NULL);
+        """)
+        connection.executemany('INSERT INTO meta VALUES (?, ?)', [
+            ('format', FORMAT_NAME), ('schema_version', str(SCHEMA_VERSION)), ('version', version)
+        ])
+        
+        def records() -> Iterator[Tuple[str, str, str]]:
+            for record_type, attribute in SECTIONS.items():
+                for record_id, data in sections.get(attribute, {}).items():
+                    data = _record_data(data)
+                    if record_type == 'story':
+                        data.pop(LAZY_STORY_FIELD, None)
+                    yield record_type, record_id, json.dumps(data, ensure_ascii=False)
+        
+        def bodies() -> Iterator[Tuple[str, str]]:
+            for story_id, data in sections.get('stories_db', {}).items():
+                yield story_id, data.get(LAZY_STORY_FIELD) or ''
+        
+        connection.executemany('INSERT INTO records VALUES (?, ?, ?)', records())
+        connection.executemany('INSERT INTO story_content VALUES (?, ?)', bodies())
+        connection.commit()
+    finally:
+        connection.close()
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process, or 0 where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
@@ -0,0 +1,249 @@
+"""
+Knowledge Base Reload for Narad AI
+Background rebuild of the cultural knowledge base from a file or watched directory, published by one reference swap
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+from .cultural_knowledge import CulturalKnowledgeBase
+
+logger = logging.getLogger(__name__)
+
+# Knowledge file formats a watched directory is scanned for (see kb_loader)
+KNOWLEDGE_FILE_SUFFIXES = ('.jsonl', '.sqlite', '.db')
+
+_UNCHANGED = object()
+
+def latest_knowledge_file(directory: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Newest knowledge file in a directory
+    
+    Args:
+        directory: Directory holding versioned .jsonl or .sqlite files
+    
+    Returns:
+        (path, mtime_ns, size) of the most recently modified file, or None
+    """
+    newest = None
+    try:
+        entries = list(os.scandir(directory))
+    except OSError as e:
+        logger.error(f"Cannot scan knowledge directory {directory}: {e}")
+        return None
+    for entry in entries:
+        if entry.name.startswith('.') or not entry.name.endswith(KNOWLEDGE_FILE_SUFFIXES) or not entry.is_file():
+            continue
+        stat = entry.stat()
+        signature = (entry.path, stat.st_mtime_ns, stat.st_size)
+        if newest is None or (stat.st_mtime_ns, entry.name) > (newest[1], os.path.basename(newest[0])):
+            newest = signature
+    return newest
+
+class ReloadableKnowledgeBase:
+    """
+    Handle to the live CulturalKnowledgeBase that can be replaced while serving.
+    
+    Attribute and method access is forwarded to the current knowledge base,
+    so the handle can be passed wherever a CulturalKnowledgeBase is expected.
+    A reload builds a complete new knowledge base, including its search and
+    graph indexes, on a background thread, then publishes it by assigning a
+    single reference. Every forwarded call runs against the snapshot that was
+    current when it started; callers making several reads that must agree
+    take snapshot() once and read from it.
+    
+    Records added while a reload is building are applied to the new
+    knowledge base as well before it is published. The published version is
+    always above the previous one, so caches keyed by knowledge base version
+    (entity matcher, suggestion pools) rebuild on their next use.
+    """
+    
+    def __init__(
+        self,
+        data_path: Optional[str] = None,
+        factory: Callable[[Optional[str]], CulturalKnowledgeBase] = CulturalKnowledgeBase,
+        index_timeout: float = 600.0
+    ):
+        """
+        Load the initial knowledge base
+        
+        Args:
+            data_path: Optional .jsonl or .sqlite knowledge file; built-in samples when not given
+            factory: Builds a knowledge base from a path
+            index_timeout: Seconds a reload waits for the new indexes before publishing anyway
+        """
+        self._factory = factory
+        self.index_timeout = index_timeout
+        self.data_path = data_path
+        self._current = factory(data_path)
+        
+        self._write_lock = threading.Lock()
+        self._replay: Optional[List[Tuple[str, tuple, Dict[str, Any]]]] = None
+        self._reload_thread: Optional[threading.Thread] = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+        
+        self.reload_stats: Dict[str, Any] = {
+            'reloads': 0,
+            'failures': 0,
+            'in_progress': False,
+            'last_reload_seconds': None,
+            'last_error': None
+        }
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names the handle itself does not define
+        if name == '_current':
+            raise AttributeError(name)
+        return getattr(self._current, name)
+    
+    def snapshot(self) -> CulturalKnowledgeBase:
+        """Get the current knowledge base; it stays consistent even if a reload publishes a newer one"""
+        return self._current
+    
+    def add_monument(self, monument_data: Dict[str, Any], on_conflict: str = 'error') -> bool:
+        """Add a monument to the current knowledge base and to any reload in progress"""
+        return self._write('add_monument', monument_data, on_conflict=on_conflict)
+    
+    def add_story(self, story_data: Dict[str, Any], on_conflict: str = 'error') -> bool:
+        """Add a story to the current knowledge base and to any reload in progress"""
+        return self._write('add_story', story_data, on_conflict=on_conflict)
+    
+    def ingest(
+        self,
+        monuments: Optional[List[Dict[str, Any]]] = None,
+        stories: Optional[List[Dict[str, Any]]] = None,
+        on_conflict: str = 'error'
+    ) -> Dict[str, Any]:
+        """Ingest a batch into the current knowledge base and into any reload in progress"""
+        return self._write('ingest', monuments, stories, on_conflict=on_conflict)
+    
+    def _write(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Apply a write to the current knowledge base, queueing it for a reload in progress"""
+        with self._write_lock:
+            result = getattr(self._current, method)(*args, **kwargs)
+            if result and self._replay is not None:
+                self._replay.append((method, args, kwargs))
+            return result
+    
+    def reload(self, data_path: Any = _UNCHANGED, wait: bool = False) -> bool:
+        """
+        Rebuild the knowledge base in the background and publish it when ready
+        
+        Args:
+            data_path: Knowledge file to load; defaults to the current source
+                (None loads the built-in samples)
+            wait: Block until the reload has finished
+        
+        Returns:
+            True if a reload was started (and, with wait, published); False if
+            one was already running or, with wait, the reload failed
+        """
+        with self._write_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return False
+            path = self.data_path if data_path is _UNCHANGED else data_path
+            self._replay = []
+            self.reload_stats['in_progress'] = True
+            failures = self.reload_stats['failures']
+            thread = threading.Thread(target=self._reload, args=(path,), name='kb-reload', daemon=True)
+            self._reload_thread = thread
+            thread.start()
+        if wait:
+            thread.join()
+            return self.reload_stats['failures'] == failures
+        return True
+    
+    def _reload(self, data_path: Optional[str]):
+        """Build a knowledge base and swap it in"""
+        start = time.perf_counter()
+        try:
+            fresh = self._factory(data_path)
+            if not fresh.load_stats:
+                raise ValueError(f"could not load {data_path or 'built-in samples'}")
+            if not fresh.wait_for_indexes(self.index_timeout):
+                logger.warning("Publishing reloaded knowledge base before its indexes are ready")
+            
+            with self._write_lock:
+                for method, args, kwargs in self._replay or []:
+                    getattr(fresh, method)(*args, **kwargs)
+                fresh.version = max(fresh.version, self._current.version) + 1
+                # The swap: readers see either the old or the new knowledge base, never a mix
+                self._current = fresh
+                self.data_path = data_path
+                self._replay = None
+                self.reload_stats.update({
+                    'reloads': self.reload_stats['reloads'] + 1,
+                    'in_progress': False,
+                    'last_reload_seconds': round(time.perf_counter() - start, 3),
+                    'last_error': None
+                })
+            logger.info(f"Knowledge base reloaded from {data_path or 'built-in samples'} (version {fresh.version})")
+        except Exception as e:
+            logger.error(f"Error reloading knowledge base: {e}")
+            with self._write_lock:
+                self._replay = None
+                self.reload_stats.update({
+                    'failures': self.reload_stats['failures'] + 1,
+                    'in_progress': False,
+                    'last_error': str(e)
+                })
+    
+    def watch(self, directory: str, interval: float = 5.0):
+        """
+        Reload whenever a newer knowledge file appears in a directory
+        
+        A file is loaded once it has kept the same size and modification time
+        for one polling interval, so a file still being copied is not read
+        half-written; writing to a temporary name and renaming is safer still.
+        
+        Args:
+            directory: Directory holding versioned .jsonl or .sqlite files
+            interval: Seconds between scans
+        """
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch, args=(directory, interval), name='kb-watch', daemon=True
+        )
+        self._watch_thread.start()
+        logger.info(f"Watching {directory} for knowledge base updates")
+    
+    def stop_watching(self):
+        """Stop the directory watcher"""
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
+    
+    def _watch(self, directory: str, interval: float):
+        """Poll a directory and reload from its newest file once that file is stable"""
+        loaded = None
+        if self.data_path:
+            current = latest_knowledge_file(directory)
+            if current is not None and os.path.abspath(current[0]) == os.path.abspath(self.data_path):
+                loaded = current
+        seen = None
+        while not self._watch_stop.is_set():
+            latest = latest_knowledge_file(directory)
+            if latest is not None and latest != loaded:
+                if latest == seen:
+                    # A file that fails to load is not retried until it changes
+                    self.reload(latest[0], wait=True)
+                    loaded = latest
+                seen = latest
+            self._watch_stop.wait(interval)
+    
+    def get_reload_stats(self) -> Dict[str, Any]:
+        """Get reload counters and the version and source being served"""
+        current = self._current
+        return dict(
+            self.reload_stats,
+            version=current.version,
+            dataset_version=current.dataset_version,
+            source=self.data_path or 'built-in samples'
+        )
@@ -0,0 +1,371 @@
+"""
+Language Detector for Narad AI
+Single-pass Unicode script histogram with a small character n-gram model for romanized Indic text
+"""
+
+import math
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANGUAGE = 'en-IN'
+
+# Unicode blocks of the Indic scripts we answer in, and the language each implies
+SCRIPT_BLOCKS = [
+    (0x0900, 0x097F, 'hi-IN'),  # Devanagari (Hindi or Marathi, see below)
+    (0x0980, 0x09FF, 'bn-IN'),  # Bengali
+    (0x0A00, 0x0A7F, 'pa-IN'),  # Gurmukhi
+    (0x0A80, 0x0AFF, 'gu-IN'),  # Gujarati
+    (0x0B00, 0x0B7F, 'or-IN'),  # Odia
+    (0x0B80, 0x0BFF, 'ta-IN'),  # Tamil
+    (0x0C00, 0x0C7F, 'te-IN'),  # Telugu
+    (0x0C80, 0x0CFF, 'kn-IN'),  # Kannada
+    (0x0D00, 0x0D7F, 'ml-IN'),  # Malayalam
+]
+
+LATIN = 'latin'
+
+# Slot 0 of the histogram counts characters that carry no script signal
+_BUCKETS = [None] + [language for _, _, language in SCRIPT_BLOCKS] + [LATIN]
+_LATIN_BUCKET = len(_BUCKETS) - 1
+
+def _build_codepoint_table() -> bytes:
+    """Codepoint -> histogram bucket for everything up to the end of the Malayalam block"""
+    table = bytearray(SCRIPT_BLOCKS[-1][1] + 1)
+    for bucket, (start, end, _) in enumerate(SCRIPT_BLOCKS, start=1):
+        table[start:end + 1] = bytes([bucket]) * (end - start + 1)
+    for ch in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ':
+        table[ord(ch)] = _LATIN_BUCKET
+    return bytes(table)
+
+CODEPOINT_TABLE = _build_codepoint_table()
+_TABLE_SIZE = len(CODEPOINT_TABLE)
+
+# Devanagari words that tell Marathi apart from Hindi
+MARATHI_MARKERS = frozenset([
+    'आहे', 'आहेत', 'आणि', 'काय', 'मला', 'तुम्ही', 'नाही', 'कसे', 'कुठे', 'होते', 'सांगा',
+    'माहिती', 'मध्ये', 'त्याच्या', 'गोष्ट', 'मराठी', 'महाराष्ट्र', 'किल्ला', 'शिवाजी'
+])
+HINDI_MARKERS = frozenset([
+    'है', 'हैं', 'और', 'क्या', 'मुझे', 'नहीं', 'कैसे', 'कहाँ', 'था', 'थी', 'बताइए', 'बताओ',
+    'में', 'के', 'की', 'का', 'कहानी', 'आप', 'हिंदी'
+])
+# LETTER LLA is common in Marathi and practically absent from Hindi
+MARATHI_LETTER = 'ळ'
+
+# Seed sentences for the romanized-text model; kept small and local on purpose
+ROMANIZED_SEED_CORPUS = {
+    'en-IN': [
+        "tell me about the history of the taj mahal",
+        "what is the story behind this temple",
+        "who built the red fort and when was it built",
+        "can you share a story from the ramayana",
+        "which monuments should i visit in delhi",
+        "what is the significance of this festival",
+        "please explain the architecture of hampi",
+        "i would like to know more about lord krishna",
+        "recommend some cultural experiences near me",
+        "how old is the kedarnath temple",
+        "what are the best places to visit in rajasthan",
+        "tell me a scary legend about an old fort",
+        "thank you that was very interesting",
+        "what did the mughal emperors build in agra",
+        "is there a dance form from kerala",
+        "how do people celebrate diwali in india",
+    ],
+    'hi-IN': [
+        "mujhe taj mahal ke baare mein batao",
+        "yeh mandir kisne banaya tha",
+        "kya aap mujhe ek kahani suna sakte ho",
+        "lal qila kab bana tha aur kisne banwaya",
+        "ramayan ki koi kahani sunao na",
+        "delhi mein kaun se smarak dekhne chahiye",
+        "iska itihaas kya hai bhai",
+        "mujhe krishna ji ke bare me jaanna hai",
+        "aapka naam kya hai aur aap kaise ho",
+        "yeh bahut achha tha dhanyavaad",
+        "kedarnath mandir kitna purana hai",
+        "koi darawni kahani batao kisi kile ki",
+        "hampi ke baare me kuch batao yaar",
+        "diwali kaise manate hain log",
+        "mughal badshah ne agra mein kya banwaya",
+        "mujhe samajh nahi aaya phir se batao",
+    ],
+    'ta-IN': [
+        "taj mahal pathi sollunga",
+        "indha kovil yaar kattinaanga",
+        "enakku oru kathai sollunga",
+        "red fort eppo kattinaanga",
+        "ramayanam kathai onnu sollu",
+        "chennai la enna paakalam",
+        "idhoda varalaru enna",
+        "krishnar pathi therinjukanum",
+        "unga peru enna neenga epdi irukeenga",
+        "romba nalla irundhuchu nandri",
+        "kedarnath kovil evlo pazhasu",
+        "oru bayangaramana kathai sollunga",
+        "hampi pathi konjam sollunga",
+        "deepavali epdi kondaduvaanga",
+        "madurai meenakshi kovil pathi sollu",
+        "enakku puriyala innoru thadava sollunga",
+    ],
+}
+
+# Common function words of each romanized language. N-grams of Indic proper
+# nouns ("Bharatanatyam", "Nalanda") look Hindi or Tamil, so a romanized
+# language is only reported when its own function words outnumber English ones
+ROMANIZED_FUNCTION_WORDS = {
+    'en-IN': frozenset([
+        'a', 'an', 'the', 'is', 'are', 'was', 'were', 'of', 'about', 'what', 'who', 'when', 'where', 'why',
+        'how', 'which', 'me', 'tell', 'i', 'you', 'my', 'and', 'in', 'on', 'to', 'for', 'this', 'that', 'it',
+        'can', 'do', 'does', 'please', 'with', 'from', 'meaning', 'love', 'like', 'know', 'more', 'story'
+    ]),
+    'hi-IN': frozenset([
+        'mujhe', 'ke', 'ki', 'ka', 'ko', 'ne', 'se', 'baare', 'bare', 'mein', 'batao', 'sunao', 'kya', 'kisne',
+        'kab', 'tha', 'thi', 'hai', 'hain', 'kaise', 'kaun', 'kitna', 'koi', 'kuch', 'aap', 'aapka', 'nahi',
+        'yeh', 'ye', 'iska', 'aur', 'yaar', 'bhai', 'chahiye', 'sakte', 'phir', 'achha', 'achhi', 'si'
+    ]),
+    'ta-IN': frozenset([
+        'pathi', 'sollunga', 'sollu', 'enakku', 'oru', 'onnu', 'innoru', 'enna', 'indha', 'idhoda', 'eppo',
+        'evlo', 'epdi', 'la', 'unga', 'neenga', 'romba', 'konjam', 'nandri', 'nalla', 'yaar', 'puriyala'
+    ]),
+}
+
+NGRAM_SIZES = (2, 3, 4)
+
+# Words whose n-gram scores are memoized; the cache is reset when full
+WORD_CACHE_SIZE = 50000
+
+class LanguageDetector:
+    """
+    One pass over the text builds a histogram of Unicode script buckets via a
+    precomputed codepoint table; the majority script decides the language
+    and its share of script characters is the confidence. Devanagari is split
+    into Hindi and Marathi by marker words, and text that is mostly Latin is
+    scored by a character n-gram naive Bayes model to catch romanized Hindi
+    (Hinglish) and Tamil (Tanglish).
+    """
+    
+    def __init__(
+        self,
+        seed_corpus: Optional[Dict[str, List[str]]] = None,
+        min_romanized_confidence: float = 0.8,
+        min_romanized_words: int = 3
+    ):
+        """
+        Initialize the detector and train the romanized-text model
+        
+        Args:
+            seed_corpus: Language code -> example sentences for the n-gram model
+            min_romanized_confidence: Posterior needed to report a romanized Indic language
+            min_romanized_words: Words a Latin-script text needs before it can be
+                reported as a romanized Indic language
+        """
+        self.min_romanized_confidence = min_romanized_confidence
+        self.min_romanized_words = min_romanized_words
+        self._train(seed_corpus or ROMANIZED_SEED_CORPUS)
+    
+    def detect(self, text: str) -> Tuple[str, float]:
+        """
+        Detect the language of a text
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Tuple of (language code, confidence in [0, 1])
+        """
+        return self._detect(text, self.script_histogram(text))
+    
+    def detect_message(self, message: Any) -> Tuple[str, float]:
+        """
+        Detect the language of an AnalyzedMessage, reusing its script histogram
+        
+        Args:
+            message: AnalyzedMessage of the user input
+        
+        Returns:
+            Tuple of (language code, confidence in [0, 1])
+        """
+        return self._detect(message.text, message.script_histogram, message.lower)
+    
+    def _detect(self, text: str, histogram: List[int], lowered: Optional[str] = None) -> Tuple[str, float]:
+        """Decide the language from a script histogram; lowered text feeds the romanized model"""
+        total = sum(histogram[1:])
+        if not total:
+            return DEFAULT_LANGUAGE, 0.0
+        
+        bucket = self._majority_bucket(histogram)
+        confidence = histogram[bucket] / total
+        
+        if bucket == _LATIN_BUCKET:
+            language, romanized_confidence = self._classify_romanized(text.lower() if lowered is None else lowered)
+            return language, round(confidence * romanized_confidence, 3)
+        
+        language = _BUCKETS[bucket]
+        if language == 'hi-IN' and self._is_marathi(text):
+            language = 'mr-IN'
+        return language, round(confidence, 3)
+    
+    def detect_language(self, text: str) -> str:
+        """
+        Detect the language code of a text
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Language code such as 'hi-IN'; 'en-IN' when nothing else is likely
+        """
+        return self.detect(text)[0]
+    
+    def is_romanized(self, histogram: List[int]) -> bool:
+        """
+        Whether Latin letters are the majority script, so that any Indic
+        language detected comes from the romanized model rather than a script
+        
+        Args:
+            histogram: Script histogram (see script_histogram)
+        
+        Returns:
+            True for mostly Latin text
+        """
+        return sum(histogram[1:]) > 0 and self._majority_bucket(histogram) == _LATIN_BUCKET
+    
+    @staticmethod
+    def _majority_bucket(histogram: List[int]) -> int:
+        return max(range(1, len(histogram)), key=histogram.__getitem__)
+    
+    @staticmethod
+    def script_histogram(text: str) -> List[int]:
+        """
+        Count characters per script bucket in a single pass
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Counts indexed like the internal bucket list (slot 0: no script)
+        """
+        histogram = [0] * len(_BUCKETS)
+        table, size = CODEPOINT_TABLE, _TABLE_SIZE
+        for ch in text:
+            codepoint = ord(ch)
+            if codepoint < size:
+                histogram[table[codepoint]] += 1
+        return histogram
+    
+    @staticmethod
+    def _is_marathi(text: str) -> bool:
+        """Marathi when its marker words (or LLA) outweigh Hindi marker words"""
+        marathi = text.count(MARATHI_LETTER)
+        hindi = 0
+        for word in text.split():
+            word = word.strip('.,!?।॥"\'()')
+            if word in MARATHI_MARKERS:
+                marathi += 1
+            elif word in HINDI_MARKERS:
+                hindi += 1
+        return marathi > hindi
+    
+    def _train(self, corpus: Dict[str, List[str]]):
+        """Estimate add-one smoothed character n-gram log probabilities per language"""
+        self._languages = list(corpus)
+        counts: Dict[str, Dict[str, int]] = {}
+        vocabulary = set()
+        for language, sentences in corpus.items():
+            language_counts: Dict[str, int] = {}
+            for sentence in sentences:
+                for word in sentence.lower().split():
+                    for gram in self._word_ngrams(word):
+                        language_counts[gram] = language_counts.get(gram, 0) + 1
+                        vocabulary.add(gram)
+            counts[language] = language_counts
+        
+        # One tuple of per-language log probabilities per n-gram
+        vocabulary_size = len(vocabulary) + 1
+        denominators = [sum(counts[language].values()) + vocabulary_size for language in self._languages]
+        self._gram_log_probs: Dict[str, Tuple[float, ...]] = {
+            gram: tuple(
+                math.log((counts[language].get(gram, 0) + 1) / denominator)
+                for language, denominator in zip(self._languages, denominators)
+            )
+            for gram in vocabulary
+        }
+        self._word_cache: Dict[str, Optional[Tuple[float, ...]]] = {}
+    
+    @staticmethod
+    def _word_ngrams(word: str) -> List[str]:
+        """Character n-grams of a lowercase word, padded with word boundaries"""
+        word = ''.join(ch for ch in word if ch.isalpha())
+        if not word:
+            return []
+        padded = f" {word} "
+        return [padded[i:i + n] for n in NGRAM_SIZES for i in range(len(padded) - n + 1)]
+    
+    def _word_log_probs(self, word: str) -> Optional[Tuple[float, ...]]:
+        """Summed per-language log probabilities of a word's known n-grams (cached)"""
+        cached = self._word_cache.get(word, False)
+        if cached is not False:
+            return cached
+        
+        # N-grams never seen in training (mostly proper nouns) carry no evidence
+        rows = [self._gram_log_probs[gram] for gram in self._word_ngrams(word) if gram in self._gram_log_probs]
+        scores = tuple(map(sum, zip(*rows))) if rows else None
+        
+        if len(self._word_cache) >= WORD_CACHE_SIZE:
+            self._word_cache.clear()
+        self._word_cache[word] = scores
+        return scores
+    
+    def _classify_romanized(self, lowered: str) -> Tuple[str, float]:
+        """Naive Bayes over character n-grams of lowercase text; English unless another language is clearly likelier"""
+        totals = [0.0] * len(self._languages)
+        evidence = False
+        words = lowered.split()
+        for word in words:
+            scores = self._word_log_probs(word)
+            if scores is not None:
+                evidence = True
+                totals = [total + score for total, score in zip(totals, scores)]
+        if not evidence:
+            return DEFAULT_LANGUAGE, 1.0
+        
+        best = max(totals)
+        weights = [math.exp(total - best) for total in totals]
+        index = weights.index(1.0)
+        language = self._languages[index]
+        posterior = 1.0 / sum(weights)
+        
+        if language != DEFAULT_LANGUAGE and (
+            posterior < self.min_romanized_confidence or not self._has_function_words(words, language)
+        ):
+            return DEFAULT_LANGUAGE, 1.0 - posterior
+        return language, posterior
+    
+    def _has_function_words(self, words: List[str], language: str) -> bool:
+        """Enough words, and more function words of the language than of English"""
+        if len(words) < self.min_romanized_words:
+            return False
+        function_words = ROMANIZED_FUNCTION_WORDS.get(language)
+        if function_words is None:
+            return True
+        english_words = ROMANIZED_FUNCTION_WORDS[DEFAULT_LANGUAGE]
+        hits = english = 0
+        for word in words:
+            word = word.strip('.,!?"\'()')
+            if word in function_words:
+                hits += 1
+            elif word in english_words:
+                english += 1
+        return hits > english
+    
+    def get_detector_stats(self) -> Dict[str, Any]:
+        """Get model size statistics"""
+        return {
+            'romanized_languages': self._languages,
+            'ngram_vocabulary': len(self._gram_log_probs),
+            'cached_words': len(self._word_cache),
+            'codepoint_table_size': _TABLE_SIZE
+        }
@@ -0,0 +1,64 @@
+"""
+Message Analysis for Narad AI
+Request-scoped analysis of a user message, computed once and shared by every consumer
+"""
+
+import logging
+import unicodedata
+from typing import Dict, List, Optional, Set
+
+from .entity_matcher import Matcher, normalize_text
+from .language_detector import LanguageDetector
+
+logger = logging.getLogger(__name__)
+
+class AnalyzedMessage:
+    """
+    A user message with its derived text forms.
+    
+    Built once per request and handed to intent classification, language
+    detection, session context updates, user memory and recommendations, so
+    the message is normalized, lowercased, tokenized and script-counted a
+    single time. Lexicon entities are matched on first use and cached per
+    entity matcher and version, since the knowledge base may rebuild its
+    matcher or add phrases to it.
+    """
+    
+    __slots__ = ('raw', 'text', 'lower', 'normalized', 'tokens', 'script_histogram', '_matcher', '_matcher_version', '_entities')
+    
+    def __init__(self, message: str):
+        """
+        Analyze a message
+        
+        Args:
+            message: Raw user message
+        """
+        self.raw = message
+        self.text = unicodedata.normalize('NFC', message)
+        self.lower = self.text.lower()
+        self.normalized = normalize_text(self.lower)
+        # normalize_text splits exactly where tokenize does
+        self.tokens: List[str] = self.normalized.split()
+        self.script_histogram: List[int] = LanguageDetector.script_histogram(self.text)
+        self._matcher: Optional[Matcher] = None
+        self._matcher_version = None
+        self._entities: Dict[str, Set[str]] = {}
+    
+    def entities_for(self, matcher: Matcher) -> Dict[str, Set[str]]:
+        """
+        Lexicon entities of the message, matched once per matcher
+        
+        Args:
+            matcher: Entity matcher to scan with
+        
+        Returns:
+            Dictionary of kind -> set of values
+        """
+        if matcher is not self._matcher or matcher.version != self._matcher_version:
+            self._entities = matcher.extract(self.normalized, normalized=True)
+            self._matcher = matcher
+            self._matcher_version = matcher.version
+        return self._entities
+    
+    def __repr__(self) -> str:
+        return f"AnalyzedMessage({self.raw!r})"
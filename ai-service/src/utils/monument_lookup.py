@@ -0,0 +1,318 @@
+"""
+Monument Lookup for Narad AI
+Exact id/name/alias map plus a character-trigram index over phonetic keys, with Indic-script transliteration
+"""
+
+import re
+import logging
+import threading
+import unicodedata
+from array import array
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Set
+
+logger = logging.getLogger(__name__)
+
+# Unicode blocks that share the Devanagari layout (ISCII order), by block start
+INDIC_BLOCKS = (0x0900, 0x0980, 0x0A00, 0x0A80, 0x0B00, 0x0B80, 0x0C00, 0x0C80, 0x0D00)
+
+# Latin spelling of each offset within an Indic block
+INDIC_CONSONANTS = {
+    0x15: 'k', 0x16: 'kh', 0x17: 'g', 0x18: 'gh', 0x19: 'n',
+    0x1A: 'ch', 0x1B: 'chh', 0x1C: 'j', 0x1D: 'jh', 0x1E: 'n',
+    0x1F: 't', 0x20: 'th', 0x21: 'd', 0x22: 'dh', 0x23: 'n',
+    0x24: 't', 0x25: 'th', 0x26: 'd', 0x27: 'dh', 0x28: 'n', 0x29: 'n',
+    0x2A: 'p', 0x2B: 'ph', 0x2C: 'b', 0x2D: 'bh', 0x2E: 'm',
+    0x2F: 'y', 0x30: 'r', 0x31: 'r', 0x32: 'l', 0x33: 'l', 0x34: 'zh', 0x35: 'v',
+    0x36: 'sh', 0x37: 'sh', 0x38: 's', 0x39: 'h',
+    0x58: 'q', 0x59: 'kh', 0x5A: 'g', 0x5B: 'z', 0x5C: 'r', 0x5D: 'rh', 0x5E: 'f', 0x5F: 'y'
+}
+INDIC_VOWELS = {
+    0x05: 'a', 0x06: 'aa', 0x07: 'i', 0x08: 'ii', 0x09: 'u', 0x0A: 'uu', 0x0B: 'ri',
+    0x0E: 'e', 0x0F: 'e', 0x10: 'ai', 0x12: 'o', 0x13: 'o', 0x14: 'au'
+}
+INDIC_VOWEL_SIGNS = {
+    0x3E: 'aa', 0x3F: 'i', 0x40: 'ii', 0x41: 'u', 0x42: 'uu', 0x43: 'ri',
+    0x46: 'e', 0x47: 'e', 0x48: 'ai', 0x4A: 'o', 0x4B: 'o', 0x4C: 'au'
+}
+INDIC_MODIFIERS = {0x01: 'n', 0x02: 'n', 0x03: 'h'}
+INDIC_VIRAMA = 0x4D
+
+INDIC_PATTERN = re.compile('[\u0900-\u0d7f]')
+
+# Spelling variants folded together in phonetic keys, applied in order
+PHONETIC_RULES = [
+    (re.compile(r'ee'), 'i'),
+    (re.compile(r'oo'), 'u'),
+    (re.compile(r'chh'), 'ch'),
+    (re.compile(r'([kgtdpbjs])h'), r'\1'),
+    (re.compile(r'q'), 'k'),
+    (re.compile(r'z'), 'j'),
+    (re.compile(r'w'), 'v'),
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'([a-z])\1+'), r'\1'),
+    # Schwa: "Shiva"/"शिव", "Qila"/"किला"
+    (re.compile(r'(\w{2,})a\b'), r'\1')
+]
+
+def _indic_offset(ch: str) -> Optional[int]:
+    """Offset of a character within its Indic block, or None for other scripts"""
+    code = ord(ch)
+    for start in INDIC_BLOCKS:
+        if start <= code < start + 0x80:
+            return code - start
+    return None
+
+def transliterate(text: str) -> str:
+    """
+    Romanize Indic-script text; other characters pass through
+    
+    Consonants carry an inherent 'a' unless a vowel sign or virama follows.
+    As in Hindi speech, the inherent vowel is dropped at the end of a word
+    and between a vowel and a consonant that has its own vowel sign
+    ("केदारनाथ" -> "kedaarnaath", not "kedaaranaath").
+    
+    Args:
+        text: Text in any script
+    
+    Returns:
+        Latin-script text
+    """
+    out: List[str] = []
+    pending_vowel = False
+    after_vowel = False
+    for i, ch in enumerate(text):
+        offset = _indic_offset(ch)
+        if offset is None:
+            pending_vowel = after_vowel = False
+            out.append(ch)
+            continue
+        if offset in INDIC_CONSONANTS:
+            if pending_vowel:
+                following = _indic_offset(text[i + 1]) if i + 1 < len(text) else None
+                if not (after_vowel and following in INDIC_VOWEL_SIGNS):
+                    out.append('a')
+                after_vowel = True
+            out.append(INDIC_CONSONANTS[offset])
+            pending_vowel = True
+        elif offset in INDIC_VOWEL_SIGNS:
+            out.append(INDIC_VOWEL_SIGNS[offset])
+            pending_vowel = False
+            after_vowel = True
+        elif offset == INDIC_VIRAMA:
+            pending_vowel = after_vowel = False
+        elif offset in INDIC_MODIFIERS:
+            if pending_vowel:
+                out.append('a')
+            out.append(INDIC_MODIFIERS[offset])
+            pending_vowel = after_vowel = False
+        elif offset in INDIC_VOWELS:
+            if pending_vowel:
+                out.append('a')
+            out.append(INDIC_VOWELS[offset])
+            pending_vowel = False
+            after_vowel = True
+        elif 0x66 <= offset <= 0x6F:
+            pending_vowel = after_vowel = False
+            out.append(str(offset - 0x66))
+    return ''.join(out)
+
+def phonetic_key(text: str) -> str:
+    """
+    Spelling-insensitive key of a monument name or query
+    
+    Indic scripts are transliterated, Latin diacritics removed, and common
+    romanization variants (long vowels, aspirates, q/k, z/j, doubled letters,
+    word-final schwa) folded together.
+    
+    Args:
+        text: Name, alias or query
+    
+    Returns:
+        Lowercase key with single spaces between words
+    """
+    text = text.lower()
+    if not text.isascii():
+        if INDIC_PATTERN.search(text):
+            text = transliterate(unicodedata.normalize('NFC', text))
+        text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    text = ' '.join(re.findall(r'[^\W_]+', text))
+    for pattern, replacement in PHONETIC_RULES:
+        text = pattern.sub(replacement, text)
+    return text
+
+def trigrams(key: str) -> Set[str]:
+    """Character trigrams of a key padded with spaces"""
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# Words naming a kind of monument rather than a particular one; their
+# trigrams count for little when scoring, so "Somnath Temple" is not taken
+# for "Badrinath Temple" on the strength of the shared word
+GENERIC_WORDS = (
+    'temple', 'mandir', 'fort', 'qila', 'palace', 'tomb', 'mosque', 'masjid', 'church',
+    'cave', 'caves', 'monument', 'memorial'
+)
+GENERIC_GRAMS = frozenset(gram for word in GENERIC_WORDS for gram in trigrams(phonetic_key(word)))
+GENERIC_GRAM_WEIGHT = 0.2
+
+def _gram_weight(grams: Iterable[str]) -> float:
+    """Summed weight of trigrams, generic-word trigrams counting GENERIC_GRAM_WEIGHT"""
+    return sum(GENERIC_GRAM_WEIGHT if gram in GENERIC_GRAMS else 1.0 for gram in grams)
+
+class MonumentLookup:
+    """
+    Monument resolution by id, name or alias, tolerant of typos and script.
+    
+    Every id, name and alias becomes an entry keyed by its phonetic key. An
+    exact key hit scores 1.0; otherwise candidate entries are gathered from
+    the postings of the query's selective trigrams and the best few are
+    rescored exactly by trigram overlap, with the trigrams of generic words
+    such as "temple" or "fort" weighted down. Trigrams shared by more than
+    max_postings entries are skipped during gathering, so lookup cost depends
+    on how distinctive the query is rather than on catalog size.
+    """
+    
+    def __init__(self, max_postings: int = 2000, rescore: int = 50):
+        """
+        Initialize an empty lookup
+        
+        Args:
+            max_postings: Trigrams with more entries than this are not used to gather candidates
+            rescore: Candidates rescored exactly per query
+        """
+        self.max_postings = max_postings
+        self.rescore = rescore
+        self._lock = threading.Lock()
+        self._exact: Dict[str, List[str]] = {}
+        self._postings: Dict[str, array] = {}
+        self._entry_keys: List[str] = []
+        self._entry_monuments: List[str] = []
+        self._monument_entries: Dict[str, List[int]] = {}
+        self._retired: Set[int] = set()
+    
+    def add(self, monument_id: str, monument: Dict[str, Any]):
+        """
+        Index a monument's id, name and aliases, replacing earlier entries for the id
+        
+        Args:
+            monument_id: Monument identifier
+            monument: Monument record with 'name' and optional 'aliases'
+        """
+        names = [monument_id.replace('_', ' '), monument.get('name', '')] + list(monument.get('aliases', []))
+        keys = []
+        for name in names:
+            key = phonetic_key(name)
+            if key and key not in keys:
+                keys.append(key)
+        
+        with self._lock:
+            self._retire(monument_id)
+            numbers = []
+            for key in keys:
+                number = len(self._entry_keys)
+                self._entry_keys.append(key)
+                self._entry_monuments.append(monument_id)
+                numbers.append(number)
+                self._exact.setdefault(key, []).append(monument_id)
+                for gram in trigrams(key):
+                    postings = self._postings.get(gram)
+                    if postings is None:
+                        postings = self._postings[gram] = array('i')
+                    postings.append(number)
+            self._monument_entries[monument_id] = numbers
+    
+    def add_many(self, monuments: Iterable[Tuple[str, Dict[str, Any]]]):
+        """
+        Index many monuments
+        
+        Args:
+            monuments: (monument_id, monument) pairs
+        """
+        for monument_id, monument in monuments:
+            self.add(monument_id, monument)
+    
+    def remove(self, monument_id: str):
+        """
+        Drop a monument from lookups
+        
+        Args:
+            monument_id: Monument identifier
+        """
+        with self._lock:
+            self._retire(monument_id)
+    
+    def _retire(self, monument_id: str):
+        """Retire a monument's entries; their postings are skipped at query time"""
+        for number in self._monument_entries.pop(monument_id, []):
+            self._retired.add(number)
+            owners = self._exact.get(self._entry_keys[number])
+            if owners and monument_id in owners:
+                owners.remove(monument_id)
+                if not owners:
+                    del self._exact[self._entry_keys[number]]
+    
+    def lookup(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Tuple[str, float]]:
+        """
+        Rank monuments matching a query
+        
+        Args:
+            query: Monument id, name or alias in any spelling or script
+            limit: Maximum candidates
+            min_score: Lowest score returned
+        
+        Returns:
+            (monument_id, score) pairs, best first; exact matches score 1.0
+        """
+        key = phonetic_key(query)
+        if not key:
+            return []
+        query_grams = trigrams(key)
+        query_weight = _gram_weight(query_grams)
+        scores: Dict[str, float] = {}
+        
+        with self._lock:
+            for monument_id in self._exact.get(key, []):
+                scores[monument_id] = 1.0
+            
+            postings = sorted(
+                (self._postings[gram] for gram in query_grams if gram in self._postings), key=len
+            )
+            selective = [entries for entries in postings if len(entries) <= self.max_postings]
+            if not selective and postings:
+                # Only common trigrams: sample the rarest rather than scan them all
+                selective = [postings[0][:self.max_postings]]
+            counts: Counter = Counter()
+            for entries in selective:
+                counts.update(entries)
+            
+            for number, _ in counts.most_common(self.rescore + len(self._retired)):
+                if number in self._retired:
+                    continue
+                entry_grams = trigrams(self._entry_keys[number])
+                common = _gram_weight(query_grams & entry_grams)
+                dice = 2.0 * common / (query_weight + _gram_weight(entry_grams))
+                containment = common / query_weight
+                score = round((dice + containment) / 2.0, 4)
+                monument_id = self._entry_monuments[number]
+                if score > scores.get(monument_id, 0.0):
+                    scores[monument_id] = score
+        
+        ranked = sorted(
+            ((monument_id, score) for monument_id, score in scores.items() if score >= min_score),
+            key=lambda item: (-item[1], item[0])
+        )
+        return ranked[:limit]
+    
+    def __len__(self) -> int:
+        return len(self._monument_entries)
+    
+    def get_lookup_stats(self) -> Dict[str, Any]:
+        """Get index size statistics"""
+        with self._lock:
+            return {
+                'monuments': len(self._monument_entries),
+                'entries': len(self._entry_keys) - len(self._retired),
+                'exact_keys': len(self._exact),
+                'trigrams': len(self._postings)
+            }
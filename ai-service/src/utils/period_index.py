@@ -0,0 +1,281 @@
+"""
+Period Index for Narad AI
+Year-range parsing for period timeframes and an interval index over periods, dynasties, monuments and events
+"""
+
+import re
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Stand-ins for open ends ("Before 1200 CE") inside the index; reported as None
+OPEN_START = -100000
+OPEN_END = 100000
+
+_YEAR = r'(\d{1,4})(?:\s*(st|nd|rd|th)\s+century)?(?:\s*(bce|bc|ce|ad))?'
+_BOUND_PATTERN = re.compile(_YEAR)
+TIMEFRAME_PATTERN = re.compile(
+    r'(?:(before|until|till|up to|after|since|from)\s+)?'
+    rf'(?P<first>{_YEAR})'
+    rf'(?:\s*-\s*(?P<last>{_YEAR}|present|today|now))?'
+    r'(?:\s+(onwards|onward))?'
+)
+_CIRCA_PATTERN = re.compile(r'\b(?:c\.|ca\.|circa|approx\.?|approximately)\s*')
+
+def _span(bound: str, default_era: Optional[str]) -> Tuple[Tuple[int, int], Optional[str]]:
+    """First and last year covered by "1650", "300 BCE" or "12th century", and the era it named"""
+    number, ordinal, era = _BOUND_PATTERN.fullmatch(bound).groups()
+    value = int(number)
+    negative = (era or default_era) in ('bce', 'bc')
+    if ordinal:
+        first, last = value * 100 - 99, value * 100
+        return ((-last, -first) if negative else (first, last)), era
+    return ((-value, -value) if negative else (value, value)), era
+
+def parse_timeframe(text: Any) -> Optional[Tuple[Optional[int], Optional[int]]]:
+    """
+    Parse a period timeframe into an inclusive year range
+    
+    Handles "1526-1857", "1200-1700 CE", "300-200 BCE", "Before 1200 CE",
+    "After 1947", "1858 onwards", "1947-present", "12th century" and single
+    years; BCE years are negative.
+    
+    Args:
+        text: Timeframe string, or a year
+    
+    Returns:
+        (start, end) with None for an open end, or None if not understood
+    """
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return int(text), int(text)
+    if not isinstance(text, str):
+        return None
+    normalized = _CIRCA_PATTERN.sub('', text.lower().replace('–', '-').replace('—', '-'))
+    normalized = re.sub(r'\s+to\s+', '-', normalized).strip()
+    match = TIMEFRAME_PATTERN.fullmatch(normalized)
+    if not match:
+        return None
+    prefix, suffix = match.group(1), match.group(match.re.groups)
+    first, last = match.group('first'), match.group('last')
+    
+    if last and last not in ('present', 'today', 'now'):
+        last_span, last_era = _span(last, None)
+        first_span, _ = _span(first, last_era)
+        start, end = first_span[0], last_span[1]
+    else:
+        first_span, _ = _span(first, None)
+        start, end = first_span
+        if last:
+            end = None
+    
+    if prefix == 'before':
+        start, end = None, first_span[0] - 1
+    elif prefix in ('until', 'till', 'up to'):
+        start = None
+    elif prefix == 'after':
+        start, end = first_span[1] + 1, None
+    elif prefix in ('since', 'from') or suffix:
+        end = None
+    
+    if start is not None and end is not None and start > end:
+        return None
+    return start, end
+
+class PeriodIndex:
+    """
+    Interval index of year ranges by key.
+    
+    Each kind's intervals are kept sorted by start alongside a running
+    maximum of their ends, which never decreases; the intervals overlapping
+    [lo, hi] all lie between the first position whose running maximum
+    reaches lo and the last whose start is at most hi, so a query is two
+    binary searches and one vectorized filter over that window. Kinds are
+    sorted separately so a few open-ended periods do not widen the window
+    over thousands of one-year construction dates. Intervals added after a
+    build go to a small delta scanned directly; removed keys are masked
+    until the next rebuild.
+    """
+    
+    def __init__(self, rebuild_fraction: float = 0.05, min_rebuild: int = 256):
+        """
+        Initialize an empty index
+        
+        Args:
+            rebuild_fraction: Delta size, relative to the index, that triggers a rebuild
+            min_rebuild: Delta size always tolerated before a rebuild
+        """
+        self.rebuild_fraction = rebuild_fraction
+        self.min_rebuild = min_rebuild
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[str, str]] = []
+        self._number: Dict[Tuple[str, str], int] = {}
+        self._kind_codes: Dict[str, int] = {}
+        self._kinds = np.zeros(0, dtype=np.int8)
+        self._starts = np.zeros(0, dtype=np.int32)
+        self._ends = np.zeros(0, dtype=np.int32)
+        self._live = np.zeros(0, dtype=bool)
+        self._size = 0
+        
+        # kind code -> (numbers sorted by start, their starts, running maximum of their ends)
+        self._sorted: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._delta: List[int] = []
+    
+    def build(self, intervals: Iterable[Tuple[str, str, Optional[int], Optional[int]]]):
+        """
+        Index many intervals at once
+        
+        Args:
+            intervals: (kind, id, start, end) tuples; None marks an open end
+        """
+        with self._lock:
+            for kind, record_id, start, end in intervals:
+                self._register(kind, record_id, start, end)
+            self._rebuild()
+    
+    def add(self, kind: str, record_id: str, start: Optional[int], end: Optional[int]):
+        """
+        Add or replace an interval
+        
+        Args:
+            kind: Record family, e.g. 'monument' or 'historical_period'
+            record_id: Record identifier within the kind
+            start: First year, or None if open
+            end: Last year, or None if open
+        """
+        with self._lock:
+            self._delta.append(self._register(kind, record_id, start, end))
+            if len(self._delta) > max(self.min_rebuild, self.rebuild_fraction * len(self._number)):
+                self._rebuild()
+    
+    def remove(self, kind: str, record_id: str):
+        """
+        Drop an interval
+        
+        Args:
+            kind: Record family
+            record_id: Record identifier within the kind
+        """
+        with self._lock:
+            number = self._number.pop((kind, record_id), None)
+            if number is not None:
+                self._live[number] = False
+    
+    def overlapping(
+        self,
+        start: Optional[int],
+        end: Optional[int],
+        kinds: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, str, Optional[int], Optional[int]]]:
+        """
+        Intervals sharing at least one year with a range
+        
+        Args:
+            start: First year of the range, or None for no lower bound
+            end: Last year of the range, or None for no upper bound
+            kinds: Only return these record families
+            limit: Maximum results
+        
+        Returns:
+            (kind, id, start, end) tuples ordered by start, then end, then insertion
+        """
+        lo = OPEN_START if start is None else start
+        hi = OPEN_END if end is None else end
+        with self._lock:
+            if kinds is None:
+                codes = list(self._kind_codes.values())
+            else:
+                codes = [self._kind_codes[kind] for kind in kinds if kind in self._kind_codes]
+            windows = []
+            for code in codes:
+                if code in self._sorted:
+                    order, starts, max_ends = self._sorted[code]
+                    first = int(np.searchsorted(max_ends, lo, side='left'))
+                    last = int(np.searchsorted(starts, hi, side='right'))
+                    windows.append(order[first:last])
+            if self._delta:
+                delta = np.array(self._delta, dtype=np.int64)
+                windows.append(delta[np.isin(self._kinds[delta], codes)])
+            window = np.concatenate(windows) if windows else np.zeros(0, dtype=np.int64)
+            window = window[self._live[window] & (self._ends[window] >= lo) & (self._starts[window] <= hi)]
+            window = window[np.lexsort((window, self._ends[window], self._starts[window]))]
+            if limit is not None:
+                window = window[:limit]
+            return [self._entry(number) for number in window]
+    
+    def at(self, year: int, kinds: Optional[Sequence[str]] = None) -> List[Tuple[str, str, Optional[int], Optional[int]]]:
+        """
+        Intervals containing a year
+        
+        Args:
+            year: Year (negative for BCE)
+            kinds: Only return these record families
+        
+        Returns:
+            (kind, id, start, end) tuples ordered by start
+        """
+        return self.overlapping(year, year, kinds)
+    
+    def get(self, kind: str, record_id: str) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        """
+        Indexed range of a record
+        
+        Returns:
+            (start, end) with None for open ends, or None if not indexed
+        """
+        number = self._number.get((kind, record_id))
+        return None if number is None else self._entry(number)[2:]
+    
+    def __len__(self) -> int:
+        return len(self._number)
+    
+    def get_index_stats(self) -> Dict[str, Any]:
+        """Get index size statistics"""
+        with self._lock:
+            kinds = {kind: 0 for kind in self._kind_codes}
+            for kind, _ in self._number:
+                kinds[kind] += 1
+            return {'intervals': len(self._number), 'delta_intervals': len(self._delta), 'by_kind': kinds}
+    
+    def _entry(self, number: int) -> Tuple[str, str, Optional[int], Optional[int]]:
+        """(kind, id, start, end) of an interval with open ends as None"""
+        kind, record_id = self._keys[number]
+        start, end = int(self._starts[number]), int(self._ends[number])
+        return kind, record_id, None if start <= OPEN_START else start, None if end >= OPEN_END else end
+    
+    def _register(self, kind: str, record_id: str, start: Optional[int], end: Optional[int]) -> int:
+        """Give an interval a new number, masking any earlier one for the key; caller holds the lock"""
+        key = (kind, record_id)
+        old = self._number.get(key)
+        if old is not None:
+            self._live[old] = False
+        code = self._kind_codes.setdefault(kind, len(self._kind_codes))
+        number = self._size
+        if number >= len(self._starts):
+            padding = max(64, len(self._starts))
+            self._kinds = np.concatenate([self._kinds, np.zeros(padding, dtype=np.int8)])
+            self._starts = np.concatenate([self._starts, np.zeros(padding, dtype=np.int32)])
+            self._ends = np.concatenate([self._ends, np.zeros(padding, dtype=np.int32)])
+            self._live = np.concatenate([self._live, np.zeros(padding, dtype=bool)])
+        self._keys.append(key)
+        self._number[key] = number
+        self._kinds[number] = code
+        self._starts[number] = OPEN_START if start is None else start
+        self._ends[number] = OPEN_END if end is None else end
+        self._live[number] = True
+        self._size += 1
+        return number
+    
+    def _rebuild(self):
+        """Sort every live interval of each kind by start; caller holds the lock"""
+        live = np.flatnonzero(self._live[:self._size])
+        live = live[np.lexsort((live, self._starts[live]))]
+        self._sorted = {}
+        for code in np.unique(self._kinds[live]):
+            order = live[self._kinds[live] == code]
+            self._sorted[int(code)] = (order, self._starts[order], np.maximum.accumulate(self._ends[order]))
+        self._delta = []
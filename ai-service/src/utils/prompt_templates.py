@@ -0,0 +1,141 @@
+"""
+Prompt Templates for Narad AI
+System prompts precompiled once per language; requests only splice in the dynamic parts
+"""
+
+import logging
+from typing import Dict, List, Any, Iterable, Mapping
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANGUAGE = 'en-IN'
+
+RESPONSE_INSTRUCTIONS = [
+    "Respond in the same language as the user's input when possible, maintaining Indian cultural context",
+    "For example, if the user writes in Hindi script, respond in Hindi script",
+    "If the user writes in English but with Indian context, respond in English with Indian cultural references",
+    "CRITICAL: If the user writes entirely in English, respond entirely in English without mixing Hindi words",
+    'NEVER use informal terms like "beta", "bro", "dude", "yaar", etc.',
+    "Maintain a professional, respectful, and educational tone at all times",
+    "Use appropriate honorifics when referring to deities and cultural figures",
+    "Avoid slang, colloquialisms, and casual expressions"
+]
+
+# Native script of each Indic reply language, named in its own script for the model
+NATIVE_SCRIPTS = {
+    'hi-IN': 'Devanagari (देवनागरी)',
+    'mr-IN': 'Devanagari (देवनागरी)',
+    'bn-IN': 'Bengali (বাংলা)',
+    'ta-IN': 'Tamil (தமிழ்)',
+    'te-IN': 'Telugu (తెలుగు)',
+    'pa-IN': 'Gurmukhi (ਗੁਰਮੁਖੀ)',
+    'gu-IN': 'Gujarati (ગુજરાતી)',
+    'kn-IN': 'Kannada (ಕನ್ನಡ)',
+    'ml-IN': 'Malayalam (മലയാളം)',
+    'or-IN': 'Odia (ଓଡ଼ିଆ)'
+}
+
+class PromptTemplate:
+    """
+    The prompt for one reply language, split into static segments.
+    
+    Persona, language lines and instructions are rendered once; a request
+    supplies the profile lines, history segments and message, and the whole
+    prompt is produced by a single join over the segment list.
+    """
+    
+    __slots__ = ('language', 'head', 'instructions', 'message_open', 'tail')
+    
+    def __init__(self, persona: str, language: str, language_context: str):
+        """
+        Compile the static segments
+        
+        Args:
+            persona: Persona description placed at the top of the prompt
+            language: Language code (e.g. 'ta-IN')
+            language_context: Human-readable language description from language_mapping
+        """
+        instructions = list(RESPONSE_INSTRUCTIONS)
+        script = NATIVE_SCRIPTS.get(language)
+        if script:
+            instructions.append(
+                f"Write the reply in {language_context} using the {script} script, "
+                f"even if the user typed {language_context} in Latin letters"
+            )
+        
+        self.language = language
+        self.head = (
+            f"\n\n{persona}\n\n"
+            f"Current conversation context:\n"
+            f"- Language: {language_context}\n"
+            f"- User Language Preference: {language}"
+        )
+        self.instructions = (
+            "\n\nIMPORTANT INSTRUCTIONS:\n"
+            + "\n".join(f"{number}. {text}" for number, text in enumerate(instructions, start=1))
+            + "\n\nConversation History:\n"
+        )
+        self.message_open = '\n\n\nUser Message: "'
+        self.tail = '"\n\nNarad\'s Response:\n'
+    
+    def render(self, profile: str, history: Iterable[str], message: str) -> str:
+        """
+        Assemble the full prompt
+        
+        Args:
+            profile: Extra context lines for a returning visitor (may be empty)
+            history: Segments of the formatted conversation history
+            message: The user's message
+        
+        Returns:
+            Prompt text
+        """
+        parts: List[str] = [self.head, profile, self.instructions]
+        parts.extend(history)
+        parts.append(self.message_open)
+        parts.append(message)
+        parts.append(self.tail)
+        return ''.join(parts)
+
+class PromptTemplates:
+    """Compiled prompt templates keyed by language code"""
+    
+    def __init__(self, persona: str, language_mapping: Mapping[str, str]):
+        """
+        Compile a template per supported language
+        
+        Args:
+            persona: Persona description placed at the top of every prompt
+            language_mapping: Language code -> human-readable language description
+        """
+        self._templates: Dict[str, PromptTemplate] = {
+            language: PromptTemplate(persona, language, language_context)
+            for language, language_context in language_mapping.items()
+        }
+        if DEFAULT_LANGUAGE not in self._templates:
+            self._templates[DEFAULT_LANGUAGE] = PromptTemplate(
+                persona, DEFAULT_LANGUAGE, 'English with Indian cultural context'
+            )
+        logger.info(f"Compiled prompt templates for {len(self._templates)} languages")
+    
+    def get(self, language: str) -> PromptTemplate:
+        """
+        Get the template for a language
+        
+        Args:
+            language: Language code
+        
+        Returns:
+            The language's template, or the English one for unsupported codes
+        """
+        return self._templates.get(language) or self._templates[DEFAULT_LANGUAGE]
+    
+    def get_template_stats(self) -> Dict[str, Any]:
+        """Get compiled template statistics"""
+        return {
+            'languages': sorted(self._templates),
+            'static_chars': {
+                language: len(template.head) + len(template.instructions) + len(template.message_open) + len(template.tail)
+                for language, template in self._templates.items()
+            }
+        }
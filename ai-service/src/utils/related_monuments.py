@@ -0,0 +1,362 @@
+"""
+Related Monuments for Narad AI
+Precomputed k-nearest-neighbour graph over monument features (period, state, architecture, figures, themes)
+"""
+
+import math
+import logging
+import threading
+from array import array
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+# Score for each matching categorical feature, as in the original relatedness rule
+CATEGORICAL_WEIGHTS = (('period', 0.5), ('state', 0.3), ('architecture', 0.2))
+
+# Most a monument pair can add for shared related figures and story themes (cosine-scaled)
+FIGURE_WEIGHT = 0.2
+THEME_WEIGHT = 0.1
+
+# Scores are kept to 4 decimals and packed with the monument number into one
+# integer sort key: higher score first, then earlier monument
+SCORE_SCALE = 10000
+NUMBER_BITS = 24
+
+def monument_state(monument: Dict[str, Any]) -> str:
+    """State part of a monument location ("Agra, Uttar Pradesh" -> "Uttar Pradesh")"""
+    return monument.get('location', '').split(',')[-1].strip()
+
+def _sort_keys(scores: np.ndarray, numbers: np.ndarray) -> np.ndarray:
+    """Integer keys ordering (score desc, number asc) as (key desc)"""
+    quantized = np.rint(scores * SCORE_SCALE).astype(np.int64)
+    return (quantized << NUMBER_BITS) | ((1 << NUMBER_BITS) - 1 - numbers.astype(np.int64))
+
+class RelatedMonumentGraph:
+    """
+    The k most related monuments of every monument, precomputed.
+    
+    Relatedness is 0.5 for the same period, 0.3 for the same state and 0.2
+    for the same architecture, plus up to FIGURE_WEIGHT and THEME_WEIGHT for
+    the cosine overlap of related figures and story themes; pairs scoring
+    at or below min_score are not related.
+    
+    The bulk build groups monuments by their (period, state, architecture)
+    signature and scores each group against candidate groups in decreasing
+    order of signature score, stopping once no further group can beat any
+    member's k-th neighbour. Monuments added later are scored against the
+    whole catalog in one vectorized pass and inserted into the neighbour
+    lists they improve. Lookups read a stored row, O(k).
+    """
+    
+    def __init__(self, k: int = 10, min_score: float = 0.3, chunk_size: int = 1024, row_block: int = 256):
+        """
+        Initialize an empty graph
+        
+        Args:
+            k: Neighbours kept per monument
+            min_score: Scores at or below this are not related
+            chunk_size: Candidate monuments scored per block during the bulk build
+            row_block: Monuments whose lists are computed together during the bulk build
+        """
+        self.k = k
+        self.min_score = min_score
+        self.chunk_size = chunk_size
+        self.row_block = row_block
+        self._lock = threading.Lock()
+        # Highest key at min_score: keys above it score more than min_score
+        self._min_key = _sort_keys(np.array([min_score]), np.array([0]))[0]
+        
+        self._ids: List[str] = []
+        self._number: Dict[str, int] = {}
+        self._vocab: List[Dict[str, int]] = [{} for _ in CATEGORICAL_WEIGHTS]
+        self._codes = np.full((0, len(CATEGORICAL_WEIGHTS)), -1, dtype=np.int32)
+        self._live = np.zeros(0, dtype=bool)
+        
+        # Weighted figure/theme features: per monument, and inverted by column
+        self._columns: Dict[str, int] = {}
+        self._features: List[List[Tuple[int, float]]] = []
+        self._postings: Dict[int, Tuple[array, array]] = {}
+        
+        self._neighbours = np.full((0, k), -1, dtype=np.int32)
+        self._keys = np.full((0, k), -1, dtype=np.int64)
+    
+    def build(self, monuments: Iterable[Tuple[str, Dict[str, Any]]], themes: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        Index monuments and compute every neighbour list
+        
+        Args:
+            monuments: (monument_id, monument) pairs
+            themes: Monument id -> themes of its stories
+        """
+        themes = themes or {}
+        with self._lock:
+            rows = [
+                self._register(monument_id, monument, themes.get(monument_id, ()))
+                for monument_id, monument in monuments
+            ]
+            n = len(self._ids)
+            self._codes = np.array(rows, dtype=np.int32).reshape(n, len(CATEGORICAL_WEIGHTS))
+            self._live = np.ones(n, dtype=bool)
+            self._neighbours = np.full((n, self.k), -1, dtype=np.int32)
+            self._keys = np.full((n, self.k), -1, dtype=np.int64)
+            if n:
+                self._build_all()
+    
+    def add(self, monument_id: str, monument: Dict[str, Any], themes: Iterable[str] = ()):
+        """
+        Add or replace a monument and update the neighbour lists it affects
+        
+        Args:
+            monument_id: Monument identifier
+            monument: Monument record
+            themes: Themes of the monument's stories
+        """
+        with self._lock:
+            old = self._number.get(monument_id)
+            number = self._append(monument_id, monument, themes)
+            self._grow_rows(number + 1)
+            if old is not None:
+                self._live[old] = False
+                self._neighbours[old] = -1
+                self._keys[old] = -1
+            
+            scores = self._scores_against_all(number)
+            keys = _sort_keys(scores, np.arange(len(scores)))
+            keys[~self._live[:len(keys)]] = -1
+            keys[number] = -1
+            self._set_row(number, keys)
+            
+            # Rows whose k-th neighbour the new monument beats
+            numbers = np.arange(len(keys), dtype=np.int64)
+            own_keys = _sort_keys(scores, np.full(len(scores), number))
+            floor = np.maximum(self._keys[:len(keys), -1], self._min_key)
+            improved = np.flatnonzero((own_keys > floor) & self._live[:len(keys)] & (numbers != number))
+            if len(improved):
+                candidate_ids = np.hstack([self._neighbours[improved], np.full((len(improved), 1), number, dtype=np.int32)])
+                candidate_keys = np.hstack([self._keys[improved], own_keys[improved, None]])
+                order = np.argsort(-candidate_keys, axis=1, kind='stable')[:, :self.k]
+                self._neighbours[improved] = np.take_along_axis(candidate_ids, order, axis=1)
+                self._keys[improved] = np.take_along_axis(candidate_keys, order, axis=1)
+            
+            if old is not None:
+                # Lists that held the replaced version are recomputed against the current catalog
+                for row in np.flatnonzero((self._neighbours[:len(keys)] == old).any(axis=1)):
+                    row_scores = self._scores_against_all(int(row))
+                    row_keys = _sort_keys(row_scores, np.arange(len(row_scores)))
+                    row_keys[~self._live[:len(row_keys)]] = -1
+                    row_keys[row] = -1
+                    self._set_row(int(row), row_keys)
+    
+    def related(self, monument_id: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Get a monument's most related monuments
+        
+        Args:
+            monument_id: Monument identifier
+            limit: Maximum results (at most k)
+        
+        Returns:
+            (monument_id, score) pairs, most related first
+        """
+        with self._lock:
+            number = self._number.get(monument_id)
+            if number is None or number >= len(self._neighbours):
+                return []
+            return self._row(number, limit)
+    
+    def export(self, limit: Optional[int] = None) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Neighbour lists of every monument
+        
+        Args:
+            limit: Maximum neighbours per monument (defaults to k)
+        
+        Returns:
+            Monument id -> (related monument id, score) pairs
+        """
+        limit = self.k if limit is None else limit
+        with self._lock:
+            return {monument_id: self._row(number, limit) for monument_id, number in self._number.items()}
+    
+    def __len__(self) -> int:
+        return len(self._number)
+    
+    def get_graph_stats(self) -> Dict[str, Any]:
+        """Get graph size statistics"""
+        with self._lock:
+            live = self._live[:len(self._neighbours)]
+            return {
+                'monuments': len(self._number),
+                'k': self.k,
+                'edges': int((self._neighbours[live] >= 0).sum()),
+                'feature_columns': len(self._columns)
+            }
+    
+    def _row(self, number: int, limit: int) -> List[Tuple[str, float]]:
+        """Stored neighbours of a monument; caller holds the lock"""
+        results = []
+        for neighbour, key in zip(self._neighbours[number, :limit], self._keys[number, :limit]):
+            if neighbour < 0:
+                break
+            results.append((self._ids[neighbour], (int(key) >> NUMBER_BITS) / SCORE_SCALE))
+        return results
+    
+    def _append(self, monument_id: str, monument: Dict[str, Any], themes: Iterable[str]) -> int:
+        """Register one monument and store its codes in the growable arrays; caller holds the lock"""
+        codes = self._register(monument_id, monument, themes)
+        number = len(self._ids) - 1
+        if number >= len(self._codes):
+            capacity = max(16, 2 * len(self._codes))
+            self._codes = np.vstack([self._codes, np.full((capacity - len(self._codes), len(codes)), -1, dtype=np.int32)])
+            self._live = np.concatenate([self._live, np.zeros(capacity - len(self._live), dtype=bool)])
+        self._codes[number] = codes
+        self._live[number] = True
+        return number
+    
+    def _register(self, monument_id: str, monument: Dict[str, Any], themes: Iterable[str]) -> List[int]:
+        """Give a monument a new number and record its figure/theme features; returns its categorical codes"""
+        number = len(self._ids)
+        self._ids.append(monument_id)
+        self._number[monument_id] = number
+        
+        values = (monument.get('period'), monument_state(monument), monument.get('architecture'))
+        codes = [
+            vocab.setdefault(value, len(vocab)) if value else -1
+            for vocab, value in zip(self._vocab, values)
+        ]
+        
+        features: List[Tuple[int, float]] = []
+        for prefix, names, weight in (
+            ('figure', set(monument.get('related_figures', [])), FIGURE_WEIGHT),
+            ('theme', set(themes), THEME_WEIGHT)
+        ):
+            if not names:
+                continue
+            # Unit-normalized per group, scaled so a dot product adds weight * cosine
+            value = math.sqrt(weight / len(names))
+            for name in sorted(names):
+                column = self._columns.setdefault(f"{prefix}:{name}", len(self._columns))
+                features.append((column, value))
+        self._features.append(features)
+        for column, value in features:
+            postings = self._postings.get(column)
+            if postings is None:
+                postings = self._postings[column] = (array('i'), array('f'))
+            postings[0].append(number)
+            postings[1].append(value)
+        return codes
+    
+    def _grow_rows(self, size: int):
+        """Extend the neighbour arrays to at least size rows; caller holds the lock"""
+        if size > len(self._neighbours):
+            extra = max(size, 2 * len(self._neighbours), 16) - len(self._neighbours)
+            self._neighbours = np.vstack([self._neighbours, np.full((extra, self.k), -1, dtype=np.int32)])
+            self._keys = np.vstack([self._keys, np.full((extra, self.k), -1, dtype=np.int64)])
+    
+    def _set_row(self, number: int, keys: np.ndarray):
+        """Store the top k of a full key vector as a monument's neighbour list"""
+        keys = np.where(keys > self._min_key, keys, -1)
+        top = np.argpartition(-keys, self.k - 1)[:self.k] if len(keys) > self.k else np.arange(len(keys))
+        top = top[np.argsort(-keys[top], kind='stable')]
+        top = top[keys[top] >= 0]
+        self._neighbours[number] = -1
+        self._keys[number] = -1
+        self._neighbours[number, :len(top)] = top
+        self._keys[number, :len(top)] = keys[top]
+    
+    def _scores_against_all(self, number: int) -> np.ndarray:
+        """Relatedness of one monument to every monument number; caller holds the lock"""
+        n = len(self._ids)
+        codes = self._codes[:n]
+        scores = np.zeros(n, dtype=np.float64)
+        for field, (_, weight) in enumerate(CATEGORICAL_WEIGHTS):
+            code = self._codes[number, field]
+            if code >= 0:
+                scores += weight * (codes[:, field] == code)
+        for column, value in self._features[number]:
+            docs, values = self._postings[column]
+            scores[np.array(docs, dtype=np.int64)] += value * np.array(values, dtype=np.float64)
+        return scores
+    
+    def _build_all(self):
+        """Bulk neighbour lists by signature group; caller holds the lock"""
+        n = len(self._ids)
+        codes = self._codes[:n]
+        live = self._live[:n]
+        
+        rows, columns, values = [], [], []
+        for number, features in enumerate(self._features):
+            for column, value in features:
+                rows.append(number)
+                columns.append(column)
+                values.append(value)
+        matrix = sparse.csr_matrix((values, (rows, columns)), shape=(n, max(len(self._columns), 1)))
+        signatures, group_of = np.unique(codes, axis=0, return_inverse=True)
+        group_of = group_of.reshape(-1)
+        by_group = np.argsort(group_of, kind='stable')
+        bounds = np.searchsorted(group_of[by_group], np.arange(len(signatures) + 1))
+        members = [by_group[bounds[g]:bounds[g + 1]] for g in range(len(signatures))]
+        
+        base = np.zeros((len(signatures), len(signatures)))
+        for field, (_, weight) in enumerate(CATEGORICAL_WEIGHTS):
+            column = signatures[:, field]
+            base += weight * ((column[:, None] == column[None, :]) & (column[:, None] >= 0))
+        
+        for group, group_rows in enumerate(members):
+            group_rows = group_rows[live[group_rows]]
+            order = np.argsort(-base[group], kind='stable')
+            for start in range(0, len(group_rows), self.row_block):
+                rows = group_rows[start:start + self.row_block]
+                self._neighbours[rows], self._keys[rows] = self._build_rows(rows, base[group], order, members, matrix, live)
+    
+    def _build_rows(
+        self,
+        rows: np.ndarray,
+        group_base: np.ndarray,
+        order: np.ndarray,
+        members: List[np.ndarray],
+        matrix: sparse.csr_matrix,
+        live: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Neighbour ids and keys for monuments of one signature group, scanning candidate groups best first"""
+        best_ids = np.full((len(rows), self.k), -1, dtype=np.int32)
+        best_keys = np.full((len(rows), self.k), -1, dtype=np.int64)
+        max_bonus = FIGURE_WEIGHT + THEME_WEIGHT
+        
+        position = 0
+        while position < len(order):
+            # Stop once no remaining group can beat any row's k-th neighbour
+            bound = group_base[order[position]] + max_bonus
+            floor = max(int(best_keys[:, -1].min()), int(self._min_key))
+            if _sort_keys(np.array([bound]), np.array([0]))[0] <= floor:
+                break
+            
+            chunk_groups = []
+            size = 0
+            while position < len(order) and (not chunk_groups or size + len(members[order[position]]) <= self.chunk_size):
+                chunk_groups.append(order[position])
+                size += len(members[order[position]])
+                position += 1
+            candidates = np.concatenate([members[g] for g in chunk_groups])
+            candidate_base = np.concatenate([np.full(len(members[g]), group_base[g]) for g in chunk_groups])
+            
+            scores = candidate_base[None, :] + (matrix[rows] @ matrix[candidates].T).toarray()
+            keys = _sort_keys(scores, np.broadcast_to(candidates, scores.shape))
+            excluded = (rows[:, None] == candidates[None, :]) | ~live[candidates][None, :]
+            keys[excluded | (keys <= self._min_key)] = -1
+            
+            merged_ids = np.hstack([best_ids, np.broadcast_to(candidates.astype(np.int32), scores.shape)])
+            merged_keys = np.hstack([best_keys, keys])
+            top = np.argpartition(-merged_keys, self.k - 1, axis=1)[:, :self.k]
+            merged_ids = np.take_along_axis(merged_ids, top, axis=1)
+            merged_keys = np.take_along_axis(merged_keys, top, axis=1)
+            row_order = np.argsort(-merged_keys, axis=1, kind='stable')
+            best_ids = np.take_along_axis(merged_ids, row_order, axis=1)
+            best_keys = np.take_along_axis(merged_keys, row_order, axis=1)
+        
+        best_ids[best_keys < 0] = -1
+        return best_ids, best_keys
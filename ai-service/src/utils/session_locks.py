@@ -0,0 +1,148 @@
+"""
+Session Locks for Narad AI
+Per-session FIFO serialization of requests with bounded waiting
+"""
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Set
+
+logger = logging.getLogger(__name__)
+
+class SessionBusyError(Exception):
+    """Raised when a request cannot get its turn on a session in time"""
+    
+    def __init__(self, session_id: str, queue_position: int):
+        self.session_id = session_id
+        self.queue_position = queue_position
+        super().__init__(
+            f"Session {session_id} is busy; {queue_position} request(s) ahead"
+        )
+
+class _SessionQueue:
+    """Ticket queue for one session: tickets are served strictly in order"""
+    
+    __slots__ = ('condition', 'next_ticket', 'serving', 'abandoned', 'users')
+    
+    def __init__(self, lock: threading.Lock):
+        self.condition = threading.Condition(lock)
+        self.next_ticket = 0
+        self.serving = 0
+        self.abandoned: Set[int] = set()
+        self.users = 0
+    
+    def ahead_of(self, ticket: int) -> int:
+        """Requests still ahead of a ticket, including the one being served"""
+        return ticket - self.serving - sum(1 for t in self.abandoned if t < ticket)
+
+class SessionLockManager:
+    """
+    Keyed locks that run one request per session at a time, in arrival order.
+    
+    Different sessions never contend beyond a short manager-level critical
+    section. Queues exist only while a session has requests in flight.
+    """
+    
+    def __init__(self, timeout: float = 10.0, max_queue_depth: int = 2):
+        """
+        Initialize the lock manager
+        
+        Args:
+            timeout: Default seconds a request waits for its turn
+            max_queue_depth: Requests allowed to wait behind the running one;
+                further requests are rejected immediately
+        """
+        self.timeout = timeout
+        self.max_queue_depth = max_queue_depth
+        self._lock = threading.Lock()
+        self._queues: Dict[str, _SessionQueue] = {}
+        
+        self.stats = {
+            'acquired': 0,
+            'waited': 0,
+            'timeouts': 0,
+            'rejected': 0
+        }
+    
+    @contextmanager
+    def hold(self, session_id: str, timeout: float = None) -> Iterator[None]:
+        """
+        Run the enclosed block as the only request on a session
+        
+        Args:
+            session_id: Session identifier
+            timeout: Seconds to wait for the turn (defaults to the manager timeout)
+        
+        Raises:
+            SessionBusyError: If the queue is full or the wait times out
+        """
+        timeout = self.timeout if timeout is None else timeout
+        
+        with self._lock:
+            queue = self._queues.get(session_id)
+            if queue is None:
+                queue = self._queues[session_id] = _SessionQueue(self._lock)
+            
+            ticket = queue.next_ticket
+            ahead = queue.ahead_of(ticket)
+            if ahead > self.max_queue_depth:
+                self.stats['rejected'] += 1
+                raise SessionBusyError(session_id, ahead)
+            
+            queue.next_ticket += 1
+            queue.users += 1
+            
+            if queue.serving != ticket:
+                self.stats['waited'] += 1
+                deadline = time.monotonic() + timeout
+                while queue.serving != ticket:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        position = queue.ahead_of(ticket)
+                        queue.abandoned.add(ticket)
+                        queue.users -= 1
+                        self.stats['timeouts'] += 1
+                        logger.warning(f"Timed out waiting for session {session_id}, position {position}")
+                        raise SessionBusyError(session_id, position)
+                    queue.condition.wait(remaining)
+            
+            self.stats['acquired'] += 1
+        
+        try:
+            yield
+        finally:
+            with self._lock:
+                queue.serving += 1
+                while queue.serving in queue.abandoned:
+                    queue.abandoned.discard(queue.serving)
+                    queue.serving += 1
+                queue.users -= 1
+                if queue.users == 0:
+                    del self._queues[session_id]
+                else:
+                    queue.condition.notify_all()
+    
+    def queue_length(self, session_id: str) -> int:
+        """
+        Requests currently running or waiting on a session
+        
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            Number of in-flight requests
+        """
+        with self._lock:
+            queue = self._queues.get(session_id)
+            return queue.users if queue else 0
+    
+    def get_lock_stats(self) -> Dict[str, Any]:
+        """Get serialization statistics"""
+        with self._lock:
+            return dict(
+                self.stats,
+                busy_sessions=len(self._queues),
+                waiting_requests=sum(queue.users - 1 for queue in self._queues.values())
+            )
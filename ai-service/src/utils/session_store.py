@@ -0,0 +1,316 @@
+"""
+Durable Session Store for Narad AI
+Append-only binary event log with periodic compacted snapshots for ConversationMemory
+"""
+
+import os
+import glob
+import time
+import zlib
+import queue
+import pickle
+import struct
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Callable
+
+logger = logging.getLogger(__name__)
+
+# Each log record is framed as <payload length><crc32 of payload><pickled event>
+RECORD_HEADER = struct.Struct('<II')
+
+SEGMENT_PATTERN = 'events.{:08d}.log'
+SNAPSHOT_FILE = 'snapshot.pkl'
+
+# Queue markers understood by the writer thread
+_ROTATE = object()
+_STOP = object()
+
+class SessionStore:
+    """
+    Crash-safe persistence for conversation sessions.
+    
+    Events are appended to numbered log segments by a single writer thread and
+    fsynced in batches, so callers only pay for a queue put. A snapshot covers
+    every segment up to a given number; restore loads the snapshot and replays
+    the newer segments.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        fsync_interval: float = 1.0,
+        fsync_batch_size: int = 512,
+        snapshot_interval: int = 100000
+    ):
+        """
+        Initialize the session store
+        
+        Args:
+            directory: Directory holding log segments and the snapshot
+            fsync_interval: Maximum seconds between fsyncs of the active segment
+            fsync_batch_size: Events written before forcing an fsync
+            snapshot_interval: Events logged before a compaction is triggered
+        """
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.fsync_batch_size = fsync_batch_size
+        self.snapshot_interval = snapshot_interval
+        
+        os.makedirs(directory, exist_ok=True)
+        
+        # Never append to an existing segment: its tail may be torn by a crash
+        existing = self._list_segments()
+        self._segment = (existing[-1] + 1) if existing else 1
+        
+        self._queue: "queue.Queue" = queue.Queue()
+        self._events_since_snapshot = 0
+        self._compaction_callback: Optional[Callable[[], Any]] = None
+        self._compacting = False
+        self._closed = False
+        
+        self.stats = {
+            'events_logged': 0,
+            'fsyncs': 0,
+            'snapshots_written': 0,
+            'events_replayed': 0,
+            'corrupt_records': 0
+        }
+        
+        self._writer = threading.Thread(
+            target=self._run_writer,
+            args=(self._segment,),
+            name='session-store-writer',
+            daemon=True
+        )
+        self._writer.start()
+        
+        logger.info(f"Session store opened at {directory}, active segment: {self._segment}")
+    
+    def set_compaction_callback(self, callback: Callable[[], Any]):
+        """
+        Register the callable that writes a snapshot when compaction is due
+        
+        Args:
+            callback: Usually ConversationMemory.snapshot; runs on its own thread
+        """
+        self._compaction_callback = callback
+    
+    def append(self, event: Tuple) -> None:
+        """
+        Queue an event for the log; never blocks on disk I/O
+        
+        Args:
+            event: Picklable event tuple, first element is the event type
+        """
+        if not self._closed:
+            self._queue.put(event)
+    
+    def rotate(self) -> Tuple[int, threading.Event]:
+        """
+        Close the active segment and start a new one
+        
+        Must be called while the caller blocks new events, so that every event
+        queued before the call lands in the closed segment.
+        
+        Returns:
+            Tuple of (closed segment number, event set once it is fully on disk)
+        """
+        finished = self._segment
+        self._segment += 1
+        done = threading.Event()
+        self._queue.put((_ROTATE, self._segment, done))
+        return finished, done
+    
+    def load(self) -> Tuple[Optional[Dict[str, Any]], Iterator[Tuple]]:
+        """
+        Load the latest snapshot and the events logged after it
+        
+        Returns:
+            Tuple of (snapshot state or None, iterator over newer events)
+        """
+        snapshot = None
+        covered = 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        
+        if os.path.exists(snapshot_path):
+            try:
+                with open(snapshot_path, 'rb') as f:
+                    snapshot = pickle.load(f)
+                covered = snapshot.get('segment', 0)
+            except Exception as e:
+                logger.error(f"Error loading session snapshot, replaying log only: {e}")
+                snapshot = None
+        
+        self._remove_segments_upto(covered)
+        segments = [n for n in self._list_segments() if covered < n < self._segment]
+        
+        return snapshot, self._iter_events(segments)
+    
+    def write_snapshot(self, state: Dict[str, Any], segment: int):
+        """
+        Atomically write a snapshot covering all segments up to `segment`
+        
+        Args:
+            state: Picklable memory state
+            segment: Last segment whose events are included in the state
+        """
+        state = dict(state, segment=segment)
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = snapshot_path + '.tmp'
+        
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, snapshot_path)
+        self._fsync_directory()
+        
+        self._remove_segments_upto(segment)
+        self._events_since_snapshot = 0
+        self.stats['snapshots_written'] += 1
+        
+        logger.info(f"Wrote session snapshot covering segments up to {segment}")
+    
+    def close(self):
+        """Flush pending events, fsync and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        logger.info("Session store closed")
+    
+    def get_store_stats(self) -> Dict[str, Any]:
+        """Get persistence statistics"""
+        return dict(
+            self.stats,
+            active_segment=self._segment,
+            pending_events=self._queue.qsize(),
+            events_since_snapshot=self._events_since_snapshot
+        )
+    
+    def _run_writer(self, segment: int):
+        """Writer thread: append queued events and fsync in batches"""
+        handle = open(self._segment_path(segment), 'ab')
+        unsynced = 0
+        last_sync = time.monotonic()
+        
+        while True:
+            try:
+                item = self._queue.get(timeout=self.fsync_interval)
+            except queue.Empty:
+                item = None
+            
+            if item is _STOP:
+                self._sync(handle)
+                handle.close()
+                return
+            
+            if isinstance(item, tuple) and item and item[0] is _ROTATE:
+                self._sync(handle)
+                handle.close()
+                handle = open(self._segment_path(item[1]), 'ab')
+                unsynced = 0
+                last_sync = time.monotonic()
+                item[2].set()
+                continue
+            
+            if item is not None:
+                try:
+                    payload = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+                    handle.write(RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+                    handle.write(payload)
+                    unsynced += 1
+                    self._events_since_snapshot += 1
+                    self.stats['events_logged'] += 1
+                except Exception as e:
+                    logger.error(f"Error writing session event {item[:2]}: {e}")
+            
+            if unsynced and (
+                unsynced >= self.fsync_batch_size or
+                time.monotonic() - last_sync >= self.fsync_interval
+            ):
+                self._sync(handle)
+                unsynced = 0
+                last_sync = time.monotonic()
+            
+            if self._events_since_snapshot >= self.snapshot_interval:
+                self._start_compaction()
+    
+    def _sync(self, handle):
+        """Flush and fsync a segment file"""
+        handle.flush()
+        os.fsync(handle.fileno())
+        self.stats['fsyncs'] += 1
+    
+    def _start_compaction(self):
+        """Run the compaction callback on its own thread if one is not already running"""
+        if self._compacting or self._compaction_callback is None:
+            return
+        self._compacting = True
+        
+        def run():
+            try:
+                self._compaction_callback()
+            except Exception as e:
+                logger.error(f"Error compacting session store: {e}")
+            finally:
+                self._compacting = False
+        
+        threading.Thread(target=run, name='session-store-compaction', daemon=True).start()
+    
+    def _iter_events(self, segments: List[int]) -> Iterator[Tuple]:
+        """Yield events from the given segments in order, stopping at a torn tail"""
+        for segment in segments:
+            with open(self._segment_path(segment), 'rb') as f:
+                data = f.read()
+            
+            view = memoryview(data)
+            offset = 0
+            while offset < len(data):
+                start = offset + RECORD_HEADER.size
+                if start > len(data):
+                    length, crc = -1, 0
+                else:
+                    length, crc = RECORD_HEADER.unpack_from(data, offset)
+                payload = view[start:start + length] if length >= 0 else b''
+                if length < 0 or len(payload) < length or zlib.crc32(payload) != crc:
+                    self.stats['corrupt_records'] += 1
+                    logger.warning(f"Truncated or corrupt record in segment {segment} at offset {offset}")
+                    break
+                self.stats['events_replayed'] += 1
+                yield pickle.loads(payload)
+                offset = start + length
+    
+    def _list_segments(self) -> List[int]:
+        """Segment numbers present on disk, ascending"""
+        segments = []
+        for path in glob.glob(os.path.join(self.directory, 'events.*.log')):
+            try:
+                segments.append(int(os.path.basename(path).split('.')[1]))
+            except ValueError:
+                continue
+        return sorted(segments)
+    
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, SEGMENT_PATTERN.format(segment))
+    
+    def _remove_segments_upto(self, segment: int):
+        """Delete log segments already covered by a snapshot"""
+        for n in self._list_segments():
+            if n <= segment:
+                os.remove(self._segment_path(n))
+    
+    def _fsync_directory(self):
+        """Persist directory entries after an atomic rename (no-op where unsupported)"""
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
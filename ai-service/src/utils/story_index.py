@@ -0,0 +1,308 @@
+"""
+Story Index for Narad AI
+Inverted index over story titles, themes and content with BM25 ranking and story-type filters
+"""
+
+import math
+import logging
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+import numpy as np
+
+from .entity_matcher import tokenize as split_words
+from .history_selector import STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+# Term-frequency weight of each field (a simple BM25F)
+FIELD_WEIGHTS = {'title': 3.0, 'themes': 2.0, 'content': 1.0}
+
+# Terms found in at least this share of stories are cached as dense vectors
+DENSE_FRACTION = 1 / 32
+
+# Result limits up to which top-k is found by repeated argmax instead of a partition
+TOP_BY_ARGMAX = 16
+
+# Story type families, matched against the intents that ask for them
+TYPE_OTHER, TYPE_MYTHOLOGY, TYPE_HISTORICAL, TYPE_MYSTERY = 0, 1, 2, 3
+INTENT_TYPES = {
+    'mythology_inquiry': TYPE_MYTHOLOGY,
+    'history_inquiry': TYPE_HISTORICAL,
+    'horror_inquiry': TYPE_MYSTERY
+}
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase content words, splitting snake_case themes into words"""
+    return [token for token in split_words(text) if len(token) > 1 and token not in STOPWORDS]
+
+def story_type_code(story_type: str) -> int:
+    """Type family of a story, as in the original intent rules"""
+    if story_type == 'mythology':
+        return TYPE_MYTHOLOGY
+    if 'historical' in story_type:
+        return TYPE_HISTORICAL
+    if story_type == 'mystery':
+        return TYPE_MYSTERY
+    return TYPE_OTHER
+
+class StoryIndex:
+    """
+    BM25-ranked inverted index of stories.
+    
+    Stories get dense integer document numbers; each term's postings are
+    append-only typed arrays of document numbers and field-weighted term
+    frequencies, so adding a story costs O(its length). Per-term BM25 impacts
+    are materialized as numpy arrays on first use and reused until the term
+    gains postings or the average story length drifts; terms found in many
+    stories are kept as dense vectors, so a query is one vector add per term
+    plus a top-k pass. Re-adding a story id retires its old document number.
+    """
+    
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        length_tolerance: float = 0.01,
+        cached_terms: int = 256
+    ):
+        """
+        Initialize an empty index
+        
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            length_tolerance: Relative drift of the average story length
+                after which cached impacts are recomputed
+            cached_terms: Terms whose impacts are kept between queries
+        """
+        self.k1 = k1
+        self.b = b
+        self.length_tolerance = length_tolerance
+        self.cached_terms = cached_terms
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_ids: List[str] = []
+        self._doc_number: Dict[str, int] = {}
+        self._doc_lengths = array('f')
+        self._doc_types = array('b')
+        self._retired: List[int] = []
+        self._total_length = 0.0
+        
+        # term -> (postings length, document numbers or None when dense, impacts)
+        self._impacts: "OrderedDict[str, Tuple[int, Optional[np.ndarray], np.ndarray]]" = OrderedDict()
+        self._impact_average = 0.0
+        self._type_masks: Dict[int, Tuple[int, np.ndarray]] = {}
+    
+    def add(self, story_id: str, story: Dict[str, Any]):
+        """
+        Index a story, replacing any earlier version with the same id
+        
+        Args:
+            story_id: Story identifier
+            story: Story record with title, themes, content and type
+        """
+        weights: Dict[str, float] = {}
+        for field, text in (
+            ('title', story.get('title', '')),
+            ('themes', ' '.join(story.get('themes', []))),
+            ('content', story.get('content', ''))
+        ):
+            field_weight = FIELD_WEIGHTS[field]
+            for token, count in Counter(split_words(text or '')).items():
+                if len(token) > 1 and token not in STOPWORDS:
+                    weights[token] = weights.get(token, 0.0) + field_weight * count
+        length = sum(weights.values())
+        
+        with self._lock:
+            self._retire(story_id)
+            number = len(self._doc_ids)
+            self._doc_ids.append(story_id)
+            self._doc_number[story_id] = number
+            self._doc_lengths.append(length)
+            self._doc_types.append(story_type_code(story.get('type', '')))
+            self._total_length += length
+            for token, weight in weights.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = (array('i'), array('f'))
+                postings[0].append(number)
+                postings[1].append(weight)
+    
+    def add_many(self, stories: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Index many stories
+        
+        Args:
+            stories: (story_id, story) pairs
+        
+        Returns:
+            Number of stories indexed
+        """
+        count = 0
+        for story_id, story in stories:
+            self.add(story_id, story)
+            count += 1
+        return count
+    
+    def remove(self, story_id: str):
+        """
+        Drop a story from results
+        
+        Args:
+            story_id: Story identifier
+        """
+        with self._lock:
+            self._retire(story_id)
+    
+    def _retire(self, story_id: str):
+        """Forget a story's document number; its postings are masked out at query time"""
+        number = self._doc_number.pop(story_id, None)
+        if number is not None:
+            self._retired.append(number)
+            self._total_length -= self._doc_lengths[number]
+    
+    def search(
+        self,
+        query: str,
+        intent: Optional[str] = None,
+        limit: int = 3,
+        intent_boost: float = 1.0
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank stories for a query
+        
+        Args:
+            query: Free-text query
+            intent: Optional intent; stories of the type it asks for are
+                included and get intent_boost, and 'general_inquiry' falls
+                back to any story
+            limit: Maximum results
+            intent_boost: Score added to stories whose type matches the intent
+        
+        Returns:
+            (story_id, score) pairs, best first
+        """
+        terms = set(tokenize(query))
+        type_code = INTENT_TYPES.get(intent)
+        
+        with self._lock:
+            n_docs = len(self._doc_ids)
+            live_count = len(self._doc_number)
+            if not live_count or limit <= 0:
+                return []
+            average_length = self._total_length / live_count or 1.0
+            if abs(average_length - self._impact_average) > self.length_tolerance * average_length:
+                self._impacts.clear()
+                self._impact_average = average_length
+            
+            scores = np.zeros(n_docs, dtype=np.float32)
+            for term in terms:
+                impacts = self._term_impacts(term, live_count, n_docs)
+                if impacts is None:
+                    continue
+                docs, values = impacts
+                if docs is None:
+                    scores[:len(values)] += values
+                else:
+                    scores[docs] += values
+            if type_code is not None:
+                scores += self._type_mask(type_code) * intent_boost
+            if self._retired:
+                scores[self._retired] = -1.0
+            ranked = self._top(scores, limit)
+            
+            if intent == 'general_inquiry' and len(ranked) < limit:
+                # General questions fall back to any story, as the linear scan did
+                chosen = {number for number, _ in ranked}
+                for number in self._doc_number.values():
+                    if len(ranked) >= limit:
+                        break
+                    if number not in chosen:
+                        ranked.append((number, 0.0))
+            
+            return [(self._doc_ids[number], score) for number, score in ranked]
+    
+    @staticmethod
+    def _top(scores: np.ndarray, limit: int) -> List[Tuple[int, float]]:
+        """Positive-scoring (document number, score) pairs, best first, ties in document order"""
+        if limit <= TOP_BY_ARGMAX:
+            # A few argmax passes beat a partition over every story
+            ranked = []
+            for _ in range(limit):
+                number = int(scores.argmax())
+                score = float(scores[number])
+                if score <= 0:
+                    break
+                ranked.append((number, score))
+                scores[number] = -np.inf
+            return ranked
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(int(number), float(scores[number])) for number in candidates]
+    
+    def _term_impacts(
+        self,
+        term: str,
+        live_count: int,
+        n_docs: int
+    ) -> Optional[Tuple[Optional[np.ndarray], np.ndarray]]:
+        """
+        Idf-weighted BM25 contributions of a term, cached; caller holds the lock
+        
+        Returns:
+            (document numbers, impacts), or (None, dense impacts by document
+            number) for common terms; None if the term is not indexed
+        """
+        postings = self._postings.get(term)
+        if postings is None:
+            return None
+        cached = self._impacts.get(term)
+        if cached is not None and cached[0] == len(postings[0]):
+            self._impacts.move_to_end(term)
+            return cached[1], cached[2]
+        
+        # Copies, so the typed arrays are not pinned by buffer exports and can keep growing
+        docs = np.array(postings[0], dtype=np.int32)
+        frequencies = np.array(postings[1], dtype=np.float32)
+        lengths = np.array(self._doc_lengths, dtype=np.float32)[docs]
+        document_frequency = min(len(docs), live_count)
+        idf = math.log(1.0 + (live_count - document_frequency + 0.5) / (document_frequency + 0.5))
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / self._impact_average)
+        impacts = (idf * frequencies * (self.k1 + 1.0) / (frequencies + norm)).astype(np.float32)
+        if len(docs) >= n_docs * DENSE_FRACTION:
+            # Adding a dense vector is far cheaper than scattering into many positions
+            dense = np.zeros(n_docs, dtype=np.float32)
+            dense[docs] = impacts
+            docs, impacts = None, dense
+        
+        self._impacts[term] = (len(postings[0]), docs, impacts)
+        if len(self._impacts) > self.cached_terms:
+            self._impacts.popitem(last=False)
+        return docs, impacts
+    
+    def _type_mask(self, type_code: int) -> np.ndarray:
+        """1.0 for stories of a type family by document number, cached until stories are added"""
+        cached = self._type_masks.get(type_code)
+        if cached is None or cached[0] != len(self._doc_types):
+            types = np.array(self._doc_types, dtype=np.int8)
+            cached = self._type_masks[type_code] = (len(types), (types == type_code).astype(np.float32))
+        return cached[1]
+    
+    def __len__(self) -> int:
+        return len(self._doc_number)
+    
+    def get_index_stats(self) -> Dict[str, Any]:
+        """Get index size statistics"""
+        with self._lock:
+            return {
+                'stories': len(self._doc_number),
+                'retired': len(self._retired),
+                'terms': len(self._postings),
+                'postings': sum(len(docs) for docs, _ in self._postings.values()),
+                'cached_terms': len(self._impacts)
+            }
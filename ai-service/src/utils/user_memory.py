@@ -0,0 +1,213 @@
+"""
+User Memory Index for Narad AI
+Long-term, cross-session interests of returning visitors keyed by user_id
+"""
+
+import shelve
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from typing import Dict, List, Any, Optional
+from datetime import datetime
+
+from .entity_matcher import EntityMatcher, Matcher, build_lexicon_entries
+from .conversation_memory import STORY_TYPE_CATEGORIES
+from .message_analysis import AnalyzedMessage
+
+logger = logging.getLogger(__name__)
+
+class UserMemoryIndex:
+    """
+    Per-user counters of monuments discussed, story types requested and the
+    language last used.
+    
+    Turns are recorded on a single background worker, so the request path
+    only pays for a queue submit; profiles are small capped dictionaries and
+    lookups are a single dict access. With a profile store, only the most
+    recently used profiles stay in memory and the rest are read through the
+    shelve on demand.
+    """
+    
+    def __init__(
+        self,
+        knowledge_base: Optional[Any] = None,
+        max_items_per_field: int = 20,
+        path: Optional[str] = None,
+        max_cached_profiles: int = 10000
+    ):
+        """
+        Initialize the user memory index
+        
+        Args:
+            knowledge_base: Optional CulturalKnowledgeBase whose entity matcher is used
+                to find monuments and story types in user messages
+            max_items_per_field: Entries kept per counter; the least frequent are dropped
+            path: Optional shelve file; profiles are persisted there across restarts
+            max_cached_profiles: Profiles kept in memory when a store is used; without
+                one every profile stays in memory
+        """
+        self.knowledge_base = knowledge_base
+        self.max_items_per_field = max_items_per_field
+        self._fallback_matcher: Optional[EntityMatcher] = None
+        
+        self._lock = threading.Lock()
+        self._store = shelve.open(path) if path else None
+        self.max_cached_profiles = max_cached_profiles
+        # Hot profiles, least recently used first; the store holds all of them
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._user_count = len(self._store) if self._store is not None else 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='user-memory')
+        self._pending: List[Future] = []
+        
+        logger.info(f"User memory index initialized with {self._user_count} profiles")
+    
+    def record_turn(
+        self,
+        user_id: str,
+        message: str,
+        language: Optional[str] = None,
+        analyzed: Optional[AnalyzedMessage] = None
+    ):
+        """
+        Queue a user message for the user's long-term profile
+        
+        Args:
+            user_id: User identifier
+            message: User message text
+            language: Language code used in the turn (e.g. 'hi-IN')
+            analyzed: Optional AnalyzedMessage whose cached entities are reused
+        """
+        if not user_id:
+            return
+        future = self._executor.submit(self._apply_turn, user_id, message, language, analyzed)
+        with self._lock:
+            self._pending = [pending for pending in self._pending if not pending.done()]
+            self._pending.append(future)
+    
+    def get_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's long-term interests, most frequent first
+        
+        Args:
+            user_id: User identifier
+        
+        Returns:
+            Profile with monuments, story_types, language, turns and last_seen, or None
+        """
+        with self._lock:
+            profile = self._load_profile(user_id)
+            if profile is None:
+                return None
+            return {
+                'user_id': user_id,
+                'monuments': self._ranked(profile['monuments']),
+                'story_types': self._ranked(profile['story_types']),
+                'language': profile['language'],
+                'turns': profile['turns'],
+                'last_seen': profile['last_seen']
+            }
+    
+    def wait_for_updates(self, timeout: Optional[float] = None):
+        """
+        Block until all queued turns have been applied
+        
+        Args:
+            timeout: Optional maximum wait in seconds
+        """
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+    
+    def get_index_stats(self) -> Dict[str, Any]:
+        """Get index size statistics"""
+        with self._lock:
+            return {
+                'users': self._user_count,
+                'cached_profiles': len(self._profiles),
+                'pending_updates': sum(1 for future in self._pending if not future.done()),
+                'persistent': self._store is not None
+            }
+    
+    def close(self):
+        """Apply queued turns and release the profile store"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+    
+    def _apply_turn(
+        self,
+        user_id: str,
+        message: str,
+        language: Optional[str],
+        analyzed: Optional[AnalyzedMessage] = None
+    ):
+        """Worker: extract entities and fold them into the profile"""
+        try:
+            matcher = self._get_entity_matcher()
+            entities = analyzed.entities_for(matcher) if analyzed is not None else matcher.extract(message)
+            
+            with self._lock:
+                profile = self._load_profile(user_id)
+                if profile is None:
+                    profile = {'monuments': {}, 'story_types': {}, 'language': None, 'turns': 0, 'last_seen': None}
+                    self._cache_profile(user_id, profile)
+                    self._user_count += 1
+                
+                for monument_id in entities.get('monument', ()):
+                    self._increment(profile['monuments'], monument_id)
+                for category in entities.get('category', ()):
+                    if category in STORY_TYPE_CATEGORIES:
+                        self._increment(profile['story_types'], category)
+                if language:
+                    profile['language'] = language
+                profile['turns'] += 1
+                profile['last_seen'] = datetime.utcnow().isoformat()
+                
+                if self._store is not None:
+                    self._store[user_id] = profile
+        
+        except Exception as e:
+            logger.error(f"Error updating user memory for {user_id}: {e}")
+    
+    def _load_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Profile from the cache, else from the store (then cached); caller holds the lock"""
+        profile = self._profiles.get(user_id)
+        if profile is not None:
+            self._profiles.move_to_end(user_id)
+            return profile
+        if self._store is None:
+            return None
+        profile = self._store.get(user_id)
+        if profile is not None:
+            self._cache_profile(user_id, profile)
+        return profile
+    
+    def _cache_profile(self, user_id: str, profile: Dict[str, Any]):
+        """Keep a profile in memory, dropping the least recently used ones already in the store"""
+        self._profiles[user_id] = profile
+        if self._store is None:
+            return
+        while len(self._profiles) > self.max_cached_profiles:
+            self._profiles.popitem(last=False)
+    
+    def _increment(self, counts: Dict[str, int], key: str):
+        """Count a key, dropping the least frequent entry when the field is full"""
+        if key not in counts and len(counts) >= self.max_items_per_field:
+            del counts[min(counts, key=counts.get)]
+        counts[key] = counts.get(key, 0) + 1
+    
+    @staticmethod
+    def _ranked(counts: Dict[str, int]) -> List[str]:
+        return sorted(counts, key=counts.get, reverse=True)
+    
+    def _get_entity_matcher(self) -> Matcher:
+        """Knowledge base matcher when available, else a category/topic-only matcher"""
+        if self.knowledge_base is not None:
+            return self.knowledge_base.get_entity_matcher()
+        if self._fallback_matcher is None:
+            self._fallback_matcher = EntityMatcher(build_lexicon_entries())
+        return self._fallback_matcher
@@ -0,0 +1,101 @@
+"""
+Synthetic knowledge catalog shared by the knowledge base benchmarks.
+
+Records follow the shape of the built-in samples, drawn from small
+vocabularies so the categorical values repeat as in a real national catalog.
+
+Usage: python synthetic_knowledge.py <output.jsonl|output.sqlite> [monuments] [stories]
+"""
+
+import os
+import sys
+import random
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.kb_loader import save_knowledge_file
+
+STATES = [
+    'Uttar Pradesh', 'Delhi', 'Karnataka', 'Uttarakhand', 'Rajasthan', 'Tamil Nadu', 'Kerala',
+    'Maharashtra', 'Gujarat', 'West Bengal', 'Odisha', 'Madhya Pradesh', 'Bihar', 'Punjab'
+]
+# Approximate (latitude, longitude) of each state; sites are scattered around it
+STATE_CENTRES = {
+    'Uttar Pradesh': (26.85, 80.95), 'Delhi': (28.61, 77.21), 'Karnataka': (15.32, 75.71),
+    'Uttarakhand': (30.07, 79.02), 'Rajasthan': (26.92, 75.79), 'Tamil Nadu': (11.13, 78.66),
+    'Kerala': (10.85, 76.27), 'Maharashtra': (19.75, 75.71), 'Gujarat': (22.26, 71.19),
+    'West Bengal': (22.99, 87.85), 'Odisha': (20.95, 85.10), 'Madhya Pradesh': (22.97, 78.66),
+    'Bihar': (25.10, 85.31), 'Punjab': (31.15, 75.34)
+}
+STATE_SPREAD_DEGREES = 1.5
+PERIODS = ['Mughal', 'Vijayanagara Empire', 'Ancient', 'Chola', 'Rajput', 'Maratha', 'Gupta', 'Colonial']
+ARCHITECTURES = ['Indo-Islamic', 'Mughal', 'Vijayanagara', 'North Indian Nagara style', 'Dravidian', 'Rajput', 'Indo-Saracenic']
+FIGURES = [
+    'Shah Jahan', 'Akbar', 'Krishnadevaraya', 'Adi Shankaracharya', 'Lord Shiva', 'Lord Vishnu',
+    'Rajaraja Chola', 'Shivaji', 'Ashoka', 'Hanuman', 'Rani Lakshmibai', 'Tenali Rama'
+]
+STORY_TYPES = ['mythology', 'historical_romance', 'mystery', 'folklore', 'historical']
+THEMES = [
+    'love', 'devotion', 'architecture', 'mystery', 'history', 'war', 'pilgrimage', 'trade',
+    'ramayana', 'mahabharata', 'courage', 'art', 'dance', 'music', 'royalty', 'curse'
+]
+WORDS = (
+    'the temple fort king queen river battle legend devotion stone carving festival pilgrims '
+    'emperor dynasty garden palace ghost treasure sage mountain forest village goddess'
+).split()
+
+
+def generate(n_monuments: int = 50000, n_stories: int = 50000, seed: int = 7):
+    """
+    Build knowledge sections with synthetic monuments and stories
+
+    Returns:
+        Dictionary of CulturalKnowledgeBase attribute -> id -> record
+    """
+    rng = random.Random(seed)
+    # Coordinates come from their own stream so the other fields match catalogs generated before they existed
+    geo_rng = random.Random(seed + 1)
+    monuments = {}
+    for i in range(n_monuments):
+        state = rng.choice(STATES)
+        monuments[f'site_{i}'] = {
+            'name': f'Site {i} {rng.choice(["Fort", "Temple", "Palace", "Stepwell", "Caves", "Mosque"])}',
+            'location': f'Town {i % 997}, {state}',
+            'latitude': round(STATE_CENTRES[state][0] + geo_rng.uniform(-STATE_SPREAD_DEGREES, STATE_SPREAD_DEGREES), 5),
+            'longitude': round(STATE_CENTRES[state][1] + geo_rng.uniform(-STATE_SPREAD_DEGREES, STATE_SPREAD_DEGREES), 5),
+            'period': rng.choice(PERIODS),
+            'built_year': rng.randint(300, 1900),
+            'significance': 'Regional heritage site',
+            'architecture': rng.choice(ARCHITECTURES),
+            'stories': [],
+            'myths': [],
+            'cultural_importance': 'Part of the national heritage catalog',
+            'related_figures': rng.sample(FIGURES, 2)
+        }
+
+    monument_ids = list(monuments)
+    stories = {}
+    for i in range(n_stories):
+        monument_id = rng.choice(monument_ids) if monument_ids else None
+        story_id = f'story_{i}'
+        stories[story_id] = {
+            'title': f'The {rng.choice(WORDS).title()} of {monuments[monument_id]["name"] if monument_id else "India"}',
+            'type': rng.choice(STORY_TYPES),
+            'monument': monument_id,
+            'content': ' '.join(rng.choice(WORDS) for _ in range(120)),
+            'themes': rng.sample(THEMES, 3),
+            'cultural_significance': 'Told by local guides',
+            'historical_accuracy': rng.choice(['historical', 'folklore', 'mythological'])
+        }
+        if monument_id:
+            monuments[monument_id]['stories'].append(story_id)
+
+    return {'monuments_db': monuments, 'stories_db': stories}
+
+
+if __name__ == "__main__":
+    path = sys.argv[1]
+    counts = [int(arg) for arg in sys.argv[2:4]]
+    save_knowledge_file(path, generate(*counts), version='synthetic')
+    print(f"Wrote {path}")
@@ -0,0 +1,103 @@
+"""
+Test script to verify compression of cold conversation turns.
+"""
+
+import os
+import sys
+import time
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.conversation_memory import ConversationMemory
+
+LONG_ANSWER = (
+    "## The Taj Mahal\n\nThe Taj Mahal was commissioned in 1632 by the Mughal emperor "
+    "Shah Jahan to house the tomb of his favourite wife, Mumtaz Mahal. " * 12
+)
+
+
+def test_turns_outside_hot_window_are_compressed():
+    """Messages leaving the hot window shrink in memory but read back unchanged."""
+    memory = ConversationMemory(hot_window_messages=4)
+    session_id = "cold_session_001"
+
+    for i in range(5):
+        memory.add_message(session_id, "user", f"Question {i}")
+        memory.add_message(session_id, "ai", f"{i}: {LONG_ANSWER}")
+
+    stored = list(memory.sessions[session_id]['message_history'])
+    assert sum('_zcontent' in message for message in stored) == 3  # three long answers left the window
+    assert all('_zcontent' not in message for message in stored[-4:])
+
+    history = memory.get_history(session_id)
+    assert history[1]['content'] == f"0: {LONG_ANSWER}"
+    assert '_zcontent' not in history[1]
+    assert memory.export_session(session_id)['message_history'][3]['content'] == f"1: {LONG_ANSWER}"
+
+    stats = memory.get_memory_stats()
+    print(f"Compression stats: {stats['compression']}")
+    assert stats['compression']['compression_ratio'] > 2
+    assert stats['compression']['decompressions'] >= 2
+    assert stats['bytes_in_memory'] < sum(len(m['content']) for m in history) + 10 * 256
+
+
+def test_idle_sessions_are_compressed_and_summaries_still_fold():
+    """Idle sessions are compressed wholesale; summarization still removes the right turns."""
+    memory = ConversationMemory(cold_after_seconds=60, summary_keep_recent_turns=1)
+    session_id = "cold_session_002"
+
+    for i in range(3):
+        memory.add_message(session_id, "user", f"Question {i}")
+        memory.add_message(session_id, "ai", f"{i}: {LONG_ANSWER}")
+    memory.sessions[session_id]['_last_activity_ts'] = time.time() - 120
+
+    assert memory.compress_idle_sessions() == 1
+    assert memory.compress_idle_sessions() == 0
+    assert all('_zcontent' in m for m in memory.sessions[session_id]['message_history'] if m['role'] == 'ai')
+
+    assert memory.summarize_session(session_id)
+    history = memory.get_history(session_id)
+    assert [m['content'] for m in history] == ["Question 2", f"2: {LONG_ANSWER}"]
+    assert "Mumtaz Mahal" in memory.get_summary(session_id)
+
+
+def test_idle_compression_runs_off_the_stats_path():
+    """Stats never compress; each pass visits only sessions that became idle since the last one."""
+    memory = ConversationMemory(cold_after_seconds=60)
+    for i in range(5):
+        memory.add_message(f"idle_{i}", "ai", f"{i}: {LONG_ANSWER}")
+        memory.sessions[f"idle_{i}"]['_last_activity_ts'] = time.time() - 120
+    memory.add_message("active", "ai", LONG_ANSWER)
+
+    memory.get_memory_stats()
+    assert memory.get_memory_stats()['compression']['messages_compressed'] == 0
+
+    memory.run_maintenance()
+    assert all(memory.sessions[f"idle_{i}"]['_cold'] for i in range(5))
+    assert list(memory._warm) == ["active"]
+
+    # A reply warms a session again; the next pass visits only the warm ones
+    memory.add_message("idle_0", "user", "And the gardens?")
+    memory.clear_session("idle_1")
+    assert list(memory._warm) == ["active", "idle_0"]
+    for session_id in ("active", "idle_0"):
+        memory.sessions[session_id]['_last_activity_ts'] = time.time() - 120
+    assert memory.compress_idle_sessions() == 2
+    assert not memory._warm
+
+    background = ConversationMemory(cold_after_seconds=1, maintenance_interval=0.2)
+    background.add_message("background", "ai", LONG_ANSWER)
+    deadline = time.time() + 5
+    while not background.sessions["background"].get('_cold') and time.time() < deadline:
+        time.sleep(0.1)
+    assert background.sessions["background"]['_cold']
+    background.close()
+    assert not background._maintenance_thread
+
+
+if __name__ == "__main__":
+    test_turns_outside_hot_window_are_compressed()
+    test_idle_sessions_are_compressed_and_summaries_still_fold()
+    test_idle_compression_runs_off_the_stats_path()
+    print("\nTest completed successfully!")
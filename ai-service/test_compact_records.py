@@ -0,0 +1,151 @@
+"""
+Test script to verify compact knowledge storage: interned column records read back as the original dicts.
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.compact_records import CompactRecords, StringTable, RecordView, RECORD_LAYOUTS
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from synthetic_knowledge import generate
+
+
+def test_views_equal_records():
+    """Every record reads back unchanged, including values that do not fit their column."""
+    data = generate(n_monuments=300, n_stories=300)
+    samples = CulturalKnowledgeBase()
+    strings = StringTable()
+    sections = {}
+    for attribute, source in (('monuments_db', samples.monuments_db), ('stories_db', samples.stories_db)):
+        records = dict(data[attribute], **source)
+        section = CompactRecords(RECORD_LAYOUTS[attribute], strings)
+        for record_id, record in records.items():
+            section[record_id] = record
+        sections[attribute] = section
+        assert section == records
+        for record_id, record in records.items():
+            view = section[record_id]
+            assert isinstance(view, RecordView)
+            assert view.to_dict() == record and dict(view) == record
+            assert set(view) == set(record) and len(view) == len(record)
+            for field, value in record.items():
+                assert type(view[field]) is type(value), (record_id, field)
+
+    odd = {
+        'name': 'Odd Fort', 'location': 'Somewhere', 'latitude': 12, 'longitude': 77.5,
+        'built_year': '12th century', 'stories': 'not a list', 'events': [{'event': 'Built', 'year': 1150}]
+    }
+    sections['monuments_db']['odd_fort'] = odd
+    assert sections['monuments_db']['odd_fort'] == odd
+    assert type(sections['monuments_db']['odd_fort']['latitude']) is int
+    sections['stories_db']['orphan'] = {'title': 'Orphan', 'monument': None}
+    assert sections['stories_db']['orphan'] == {'title': 'Orphan', 'monument': None}
+    assert 'content' not in sections['stories_db']['orphan']
+    assert sections['stories_db']['orphan'].get('themes', []) == []
+
+    # Repeated values from either section share one entry of the string table
+    interned = len(strings)
+    for value in ('Mughal', 'devotion', 'mythology', 'Shah Jahan', 'taj_mahal'):
+        strings.code(value)
+    assert len(strings) == interned
+    assert sections['monuments_db'].get_storage_stats()['records'] == len(sections['monuments_db'])
+
+    view = sections['monuments_db']['taj_mahal']
+    try:
+        view['name'] = 'Renamed'
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("views must be read-only")
+    # Replacing a record rewrites its row, and views follow it
+    sections['monuments_db']['taj_mahal'] = dict(view, name='Renamed')
+    assert view['name'] == 'Renamed' and sections['monuments_db']['taj_mahal']['name'] == 'Renamed'
+    del sections['monuments_db']['taj_mahal']
+    assert 'taj_mahal' not in sections['monuments_db']
+
+
+def test_replaced_and_deleted_rows_are_reused():
+    """Replacing or deleting records does not grow the columns without bound."""
+    section = CompactRecords(RECORD_LAYOUTS['monuments_db'])
+    for i in range(100):
+        section[f"site_{i}"] = {'name': f"Site {i}", 'location': 'Agra', 'stories': ['a', 'b', 'c']}
+
+    for round_number in range(50):
+        for i in range(100):
+            stories = [f"story_{round_number}_{j}" for j in range(round_number % 5)]
+            section[f"site_{i}"] = {'name': f"Site {i} v{round_number}", 'stories': stories}
+        section[f"new_{round_number}"] = {'name': f"New {round_number}", 'stories': ['x'] * 6}
+        if round_number:
+            del section[f"new_{round_number - 1}"]
+
+    stats = section.get_storage_stats()
+    print(f"Storage: {stats}")
+    assert stats['records'] == 101 and stats['rows'] == 102 and stats['free_rows'] == 1
+    assert stats['list_codes'] <= 2 * 4096
+    assert section['site_99'] == {'name': 'Site 99 v49', 'stories': [f"story_49_{j}" for j in range(4)]}
+    assert section['new_49'] == {'name': 'New 49', 'stories': ['x'] * 6}
+    assert 'new_48' not in section
+
+    # A freed row is reused without carrying over the deleted record's values
+    section['fresh'] = {'name': 'Fresh', 'location': 'Delhi'}
+    assert section['fresh'] == {'name': 'Fresh', 'location': 'Delhi'}
+    assert section.get_storage_stats()['free_rows'] == 0
+
+
+def test_compact_knowledge_base():
+    """A compact knowledge base answers like a dict-backed one and saves back losslessly."""
+    samples = CulturalKnowledgeBase()
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ('kb.jsonl', 'kb.sqlite'):
+            path = os.path.join(directory, name)
+            samples.save(path, version='2024.06')
+            plain = CulturalKnowledgeBase(path)
+            compact = CulturalKnowledgeBase(path, compact=True)
+            assert plain.wait_for_indexes(30) and compact.wait_for_indexes(30)
+            assert isinstance(compact.monuments_db, CompactRecords) and compact.get_load_stats()['compact']
+            assert compact.monuments_db.strings is compact.stories_db.strings
+
+            assert compact.monuments_db == samples.monuments_db
+            assert compact.stories_db == samples.stories_db
+            assert compact.stories_db['hanuman_birthplace']['content'] == samples.stories_db['hanuman_birthplace']['content']
+            info = compact.get_monument_info('Taj Mahal')
+            assert type(info) is dict and info == samples.monuments_db['taj_mahal']
+
+            assert compact.find_monuments('taj mahel') == plain.find_monuments('taj mahel')
+            assert compact.search_stories('Hanuman birth', 'mythology_inquiry') == \
+                plain.search_stories('Hanuman birth', 'mythology_inquiry')
+            assert compact.get_related_monuments('hampi') == plain.get_related_monuments('hampi')
+            assert compact.find_nearby_monuments(27.17, 78.04, radius_km=50) == \
+                plain.find_nearby_monuments(27.17, 78.04, radius_km=50)
+            assert compact.find_connected_stories(monument='hampi') == plain.find_connected_stories(monument='hampi')
+            assert compact.get_cultural_timeline('taj_mahal') == plain.get_cultural_timeline('taj_mahal')
+
+            report = compact.ingest(
+                monuments=[{'name': 'Virupaksha Temple', 'location': 'Hampi, Karnataka', 'period': 'Vijayanagara Empire'}],
+                stories=[{'title': 'Pampa', 'type': 'mythology', 'monument': 'virupaksha_temple', 'content': 'Penance.'}]
+            )
+            assert report['errors'] == []
+            assert compact.stories_db['pampa']['content'] == 'Penance.'
+            assert compact.find_connected_stories(monument='Virupaksha Temple')[0]['id'] == 'pampa'
+
+            copy_path = os.path.join(directory, 'copy_' + name)
+            compact.save(copy_path)
+            reloaded = CulturalKnowledgeBase(copy_path, compact=True)
+            assert reloaded.monuments_db == compact.monuments_db
+            assert reloaded.stories_db['pampa'] == {
+                'title': 'Pampa', 'type': 'mythology', 'monument': 'virupaksha_temple', 'content': 'Penance.'
+            }
+            for knowledge_base in (plain, compact, reloaded):
+                knowledge_base.wait_for_indexes(30)
+                knowledge_base._content_store.close()
+
+
+if __name__ == "__main__":
+    test_views_equal_records()
+    test_replaced_and_deleted_rows_are_reused()
+    test_compact_knowledge_base()
+    print("\nTest completed successfully!")
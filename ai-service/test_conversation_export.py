@@ -0,0 +1,109 @@
+"""
+Test script to verify columnar bulk export of conversations.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.conversation_memory import ConversationMemory
+
+
+def _populate(memory, sessions, turns):
+    for s in range(sessions):
+        session_id = f"export_session_{s:03d}"
+        for t in range(turns):
+            memory.add_message(session_id, "user", f"Tell me about the Taj Mahal ({t})", metadata={'intent': 'monument_info'})
+            memory.add_message(session_id, "ai", f"The Taj Mahal was built by Shah Jahan ({t}).")
+
+
+def test_parquet_export_streams_in_batches():
+    """All sessions and messages land in Parquet files written batch by batch."""
+    output_dir = tempfile.mkdtemp()
+    memory = ConversationMemory()
+    _populate(memory, sessions=5, turns=4)
+
+    try:
+        result = memory.export_all(output_dir, batch_size=7).result(timeout=30)
+        print(f"Export result: {result}")
+
+        assert result['sessions_exported'] == 5
+        assert result['messages_exported'] == 40
+        assert result['batches_written'] == 1 + 6  # 40 messages in batches of 7
+
+        messages = pq.read_table(result['files']['messages'])
+        sessions = pq.read_table(result['files']['sessions'])
+        assert messages.num_rows == 40
+        assert sessions.num_rows == 5
+        assert messages.column('intent').to_pylist().count('monument_info') == 20
+        assert pa.types.is_timestamp(messages.schema.field('timestamp').type)
+        assert sessions.column('message_count').to_pylist() == [8] * 5
+    finally:
+        memory.close()
+        shutil.rmtree(output_dir)
+
+
+def test_arrow_export_filters_time_range():
+    """A time range keeps only messages inside it and the sessions that have them."""
+    output_dir = tempfile.mkdtemp()
+    memory = ConversationMemory()
+    _populate(memory, sessions=2, turns=1)
+
+    cutoff = memory.get_history("export_session_001")[-1]['timestamp']
+    for message in memory.sessions["export_session_000"]['message_history']:
+        message['timestamp'] = "2020-01-01T00:00:00"
+
+    try:
+        result = memory.export_all(output_dir, export_format='arrow', start="2021-01-01T00:00:00").result(timeout=30)
+        with pa.OSFile(result['files']['messages'], 'rb') as source:
+            messages = pa.ipc.open_file(source).read_all()
+
+        assert result['sessions_exported'] == 1
+        assert messages.num_rows == 2
+        assert set(messages.column('session_id').to_pylist()) == {"export_session_001"}
+        assert cutoff >= "2021-01-01T00:00:00"
+    finally:
+        memory.close()
+        shutil.rmtree(output_dir)
+
+
+def test_time_bounds_are_parsed():
+    """Bounds with a UTC offset are converted; bounds that are not ISO 8601 are rejected up front."""
+    output_dir = tempfile.mkdtemp()
+    memory = ConversationMemory(hot_window_messages=1)
+    memory.add_message("export_session_000", "user", "Tell me everything about Kedarnath. " * 10)
+    _populate(memory, sessions=1, turns=2)
+    for position, message in enumerate(memory.sessions["export_session_000"]['message_history']):
+        message['timestamp'] = f"2025-01-01T0{position}:00:00"
+    assert memory.get_compression_stats()['messages_compressed'] == 1
+
+    try:
+        # 07:30 at +05:30 is 02:00 UTC
+        result = memory.export_all(output_dir, start="2025-01-01T07:30:00+05:30", end="2025-01-01T03:00:00").result(timeout=30)
+        assert result['messages_exported'] == 1
+        # Exports inflate cold messages without counting as read-path decompressions
+        assert memory.get_compression_stats()['decompressions'] == 0
+
+        for bad in ("yesterday", "2025-13-01"):
+            try:
+                memory.export_all(output_dir, start=bad)
+            except ValueError:
+                continue
+            raise AssertionError(f"{bad!r} should be rejected")
+    finally:
+        memory.close()
+        shutil.rmtree(output_dir)
+
+
+if __name__ == "__main__":
+    test_parquet_export_streams_in_batches()
+    test_arrow_export_filters_time_range()
+    test_time_bounds_are_parsed()
+    print("\nTest completed successfully!")
@@ -0,0 +1,65 @@
+"""
+Test script to verify rolling summarization of older conversation turns.
+"""
+
+import os
+import sys
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.conversation_memory import ConversationMemory
+
+
+def _add_turns(memory, session_id, count):
+    for i in range(count):
+        memory.add_message(session_id, "user", f"Question {i} about Hampi? Please explain in detail.")
+        memory.add_message(session_id, "ai", f"Answer {i}. Hampi was the capital of the Vijayanagara Empire.")
+
+
+def test_older_turns_are_condensed_in_background():
+    """Crossing the turn threshold folds older turns into the rolling summary."""
+    memory = ConversationMemory(summary_turn_threshold=4, summary_keep_recent_turns=2)
+    session_id = "summary_session_001"
+
+    _add_turns(memory, session_id, 4)
+    memory.wait_for_summaries(timeout=5)
+
+    history = memory.get_history(session_id)
+    summary = memory.get_summary(session_id)
+    print(f"Summary: {summary}")
+    print(f"History has {len(history)} messages")
+
+    assert len(history) == 4
+    assert history[0]['content'].startswith("Question 2")
+    assert "Question 0" in summary
+    assert memory.get_memory_stats()['summaries_generated'] == 1
+
+    memory.close()
+
+
+def test_injected_summarizer_receives_previous_summary():
+    """A custom summarizer gets the running summary followed by the older turns."""
+    calls = []
+
+    def summarizer(text):
+        calls.append(text)
+        return f"summary #{len(calls)}"
+
+    memory = ConversationMemory(summary_keep_recent_turns=1, summarizer=summarizer)
+    session_id = "summary_session_002"
+
+    _add_turns(memory, session_id, 3)
+    assert memory.summarize_session(session_id)
+    _add_turns(memory, session_id, 2)
+    assert memory.summarize_session(session_id)
+
+    assert calls[1].startswith("summary #1\nUser: Question 2")
+    assert memory.get_summary(session_id) == "summary #2"
+    assert len(memory.get_history(session_id)) == 2
+
+
+if __name__ == "__main__":
+    test_older_turns_are_condensed_in_background()
+    test_injected_summarizer_receives_previous_summary()
+    print("\nTest completed successfully!")
@@ -0,0 +1,116 @@
+"""
+Test script to verify the entity graph and its traversal queries.
+"""
+
+import os
+import sys
+import random
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.entity_graph import EntityGraph, figure_key, period_key
+from synthetic_knowledge import generate
+
+
+def test_keys():
+    """Figure titles and period suffixes are dropped so references from different sections meet."""
+    assert figure_key('Lord Shiva') == figure_key('shiva') == 'shiva'
+    assert figure_key('Shah Jahan') == 'shah jahan'
+    assert figure_key('Lord') == 'lord'
+    assert period_key('Vijayanagara Empire') == period_key('vijayanagara_period') == 'vijayanagara'
+
+
+def test_sample_graph():
+    """The built-in samples link Hanuman to Hampi and report the story ids nobody wrote."""
+    knowledge_base = CulturalKnowledgeBase()
+    dangling = knowledge_base.get_dangling_references()
+    assert knowledge_base.load_stats['dangling_references'] == len(dangling)
+    assert {
+        'source_type': 'figure', 'source_id': 'hanuman', 'field': 'stories',
+        'missing_type': 'story', 'missing_id': 'meeting_rama'
+    } in dangling
+    assert all(entry['missing_id'] not in knowledge_base.stories_db for entry in dangling)
+
+    assert knowledge_base.find_connected_stories(figure='Hanuman', state='Karnataka') == [{
+        'id': 'hanuman_birthplace', 'title': "Hanuman's Birthplace in Hampi", 'type': 'mythology', 'monument': 'hampi'
+    }]
+    assert knowledge_base.find_connected_stories(figure='Hanuman', state='Delhi') == []
+    assert knowledge_base.find_connected_stories(figure='Nobody') == []
+    assert [story['id'] for story in knowledge_base.find_connected_stories(monument='Lal Qila')] == ['red_fort_mysteries']
+    assert {story['monument'] for story in knowledge_base.find_connected_stories(period='Mughal')} == {'taj_mahal', 'red_fort'}
+
+    shiva = knowledge_base.get_connected_entities('figure', 'Lord Shiva', node_type='monument')
+    assert [entity['id'] for entity in shiva] == ['kedarnath']
+    hanuman = knowledge_base.get_connected_entities('figure', 'hanuman', relation='worship_place')
+    assert {(entity['type'], entity['id']) for entity in hanuman} == {
+        ('monument', 'hampi'), ('place', 'varanasi'), ('place', 'ayodhya')
+    }
+
+
+def test_knowledge_base_updates():
+    """Added stories resolve dangling references; replaced records drop their old links."""
+    knowledge_base = CulturalKnowledgeBase()
+    before = len(knowledge_base.get_dangling_references())
+    knowledge_base.add_story({
+        'title': 'Meeting Rama', 'type': 'mythology', 'monument': 'hampi', 'content': 'At Rishyamukha hill...', 'themes': ['devotion']
+    })
+    assert len(knowledge_base.get_dangling_references()) == before - 1
+    assert [story['id'] for story in knowledge_base.find_connected_stories(figure='Rama', state='Karnataka')] == ['meeting_rama']
+    assert 'meeting_rama' in [story['id'] for story in knowledge_base.find_connected_stories(figure='Hanuman')]
+
+    knowledge_base.add_story({
+        'title': 'Meeting Rama', 'type': 'mythology', 'monument': 'taj_mahal', 'content': '...', 'themes': []
+    }, on_conflict='replace')
+    assert knowledge_base.find_connected_stories(figure='Rama', state='Karnataka') == []
+    assert 'meeting_rama' in [story['id'] for story in knowledge_base.find_connected_stories(monument='taj_mahal')]
+
+    knowledge_base.add_monument({
+        'name': 'Virupaksha Temple', 'location': 'Hampi, Karnataka', 'period': 'Vijayanagara Empire',
+        'stories': ['pampa_devi'], 'related_figures': ['Lord Shiva']
+    })
+    assert {
+        'source_type': 'monument', 'source_id': 'virupaksha_temple', 'field': 'stories',
+        'missing_type': 'story', 'missing_id': 'pampa_devi'
+    } in knowledge_base.get_dangling_references()
+    monuments = knowledge_base.get_connected_entities('figure', 'Shiva', node_type='monument')
+    assert {entity['id'] for entity in monuments} == {'kedarnath', 'virupaksha_temple'}
+    knowledge_base.add_monument({'name': 'Virupaksha Temple', 'location': 'Hampi, Karnataka'}, on_conflict='replace')
+    assert not any(entry['source_id'] == 'virupaksha_temple' for entry in knowledge_base.get_dangling_references())
+    assert [entity['id'] for entity in knowledge_base.get_connected_entities('figure', 'Shiva', node_type='monument')] == ['kedarnath']
+
+
+def test_traversal_matches_brute_force():
+    """Multi-hop queries on a synthetic catalog agree with filtering the records directly, across rebuilds."""
+    data = generate(n_monuments=2000, n_stories=3000)
+    monuments, stories = data['monuments_db'], data['stories_db']
+    graph = EntityGraph(min_rebuild=500)
+    graph.build([('monument', key, record) for key, record in monuments.items()] +
+                [('story', key, record) for key, record in list(stories.items())[:2000]])
+    for key, record in list(stories.items())[2000:]:
+        graph.add('story', key, record)
+    rng = random.Random(3)
+    for key in rng.sample(list(stories), 300):
+        stories[key] = dict(stories[key], monument=rng.choice(list(monuments)))
+        graph.add('story', key, stories[key])
+    assert graph.get_graph_stats()['dangling_references'] == 0
+
+    for state, figure in (('Karnataka', 'Hanuman'), ('Delhi', 'Akbar'), ('Kerala', 'Lord Shiva')):
+        sites = graph.traverse([graph.node_id('figure', figure)], [('figure', 'monument')])
+        in_state = graph.traverse([graph.node_id('state', state)], [('state', 'monument')])
+        found = {graph.describe(int(node))['id'] for node in graph.expand(set(sites) & set(in_state), 'story', 'site')}
+        expected = {
+            key for key, story in stories.items()
+            if monuments[story['monument']]['location'].endswith(state)
+            and figure in monuments[story['monument']]['related_figures']
+        }
+        assert found == expected, (state, figure)
+
+
+if __name__ == "__main__":
+    test_keys()
+    test_sample_graph()
+    test_knowledge_base_updates()
+    test_traversal_matches_brute_force()
+    print("\nTest completed successfully!")
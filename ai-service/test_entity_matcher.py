@@ -0,0 +1,113 @@
+"""
+Test script to verify word-boundary entity extraction for session context.
+"""
+
+import os
+import sys
+import time
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase, MATCHER_REBUILD_PHRASES
+from src.utils.conversation_memory import ConversationMemory
+from src.utils.entity_matcher import EntityMatcher, LayeredEntityMatcher, PhraseTrie, build_lexicon_entries
+from synthetic_knowledge import generate
+
+
+def test_matches_respect_word_boundaries():
+    """'art' must not match inside 'start', overlapping phrases are all reported."""
+    matcher = EntityMatcher([
+        ('art', 'topic', 'art'),
+        ('red fort', 'monument', 'red_fort'),
+        ('fort', 'topic', 'forts'),
+    ])
+
+    assert matcher.extract("Let's start the tour") == {}
+    assert matcher.extract("Indian ART and the Red-Fort!") == {
+        'topic': {'art', 'forts'},
+        'monument': {'red_fort'}
+    }
+
+
+def test_session_context_uses_knowledge_base_lexicon():
+    """Monuments, figures and category keywords come from the knowledge base and settings."""
+    knowledge_base = CulturalKnowledgeBase()
+    memory = ConversationMemory(knowledge_base=knowledge_base)
+    session_id = "entity_session_001"
+
+    memory.add_message(session_id, "user", "Any ghost legends at Badrinath Temple about Lord Vishnu?")
+    context = memory.get_context(session_id)
+    print(f"Context: {context}")
+
+    assert context['monuments_discussed'] == ['badrinath']
+    assert context['figures_discussed'] == ['Lord Vishnu']
+    assert set(context['story_types_requested']) == {'horror', 'mythology'}
+
+
+def test_matcher_is_rebuilt_when_knowledge_base_changes():
+    """Monuments added to the knowledge base are recognised without restarting."""
+    knowledge_base = CulturalKnowledgeBase()
+    memory = ConversationMemory(knowledge_base=knowledge_base)
+    session_id = "entity_session_002"
+
+    knowledge_base.add_monument({'name': 'Qutub Minar', 'location': 'Delhi', 'aliases': ['Qutb Minar']})
+    memory.add_message(session_id, "user", "Who built the Qutb Minar?")
+
+    assert memory.get_context(session_id)['monuments_discussed'] == ['qutub_minar']
+
+
+def test_matcher_never_compiled_on_request():
+    """Adds layer their phrases over the compiled lexicon; large additions are folded in by a background rebuild."""
+    knowledge_base = CulturalKnowledgeBase()
+    base = knowledge_base.get_entity_matcher()
+    knowledge_base.add_story({'title': 'A Tale', 'type': 'folklore', 'content': 'Once upon a time'})
+    assert knowledge_base.get_entity_matcher() is base
+
+    knowledge_base.add_monument({'name': 'Qutub Minar', 'location': 'Delhi'})
+    layered = knowledge_base.get_entity_matcher()
+    assert isinstance(layered, LayeredEntityMatcher) and layered.base is base
+    assert layered.extract("Who built the qutub minar for Lord Vishnu?") == {
+        'monument': {'qutub_minar'}, 'figure': {'Lord Vishnu'}
+    }
+
+    # Later adds extend the same layer in place
+    knowledge_base.add_monument({'name': 'Charminar', 'location': 'Hyderabad', 'aliases': ['Char Minar']})
+    assert knowledge_base.get_entity_matcher() is layered
+    assert layered.extract("char minar or qutub minar?") == {'monument': {'charminar', 'qutub_minar'}}
+    assert layered.get_matcher_stats()['added_phrases'] == 3
+
+    catalog = generate(n_monuments=MATCHER_REBUILD_PHRASES, n_stories=0)['monuments_db']
+    monuments = [dict(record, id=record_id) for record_id, record in catalog.items()]
+    knowledge_base.ingest(monuments=monuments)
+    deadline = time.monotonic() + 30
+    while isinstance(knowledge_base.get_entity_matcher(), LayeredEntityMatcher) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    rebuilt = knowledge_base.get_entity_matcher()
+    assert not isinstance(rebuilt, LayeredEntityMatcher) and rebuilt is not base
+    assert rebuilt.extract("qutub minar and site 7") == {'monument': {'qutub_minar', 'site_7'}}
+
+
+def test_phrase_trie_matches_like_the_automaton():
+    """The added-phrase trie reports the same whole-word matches as the compiled automaton."""
+    entries = build_lexicon_entries(CulturalKnowledgeBase()) + [('ताज महल', 'monument', 'taj_mahal')]
+    matcher = EntityMatcher(entries)
+    trie = PhraseTrie(entries)
+    assert len(trie) == matcher.get_matcher_stats()['phrases']
+    for text in (
+        "Any ghost legends at Badrinath Temple about Lord Vishnu?",
+        "Let's start the tour of the Red-Fort, then festivals and art",
+        "ताज महल के बारे में बताइए",
+        ""
+    ):
+        key = lambda match: (match['start'], match['end'], match['kind'], match['value'])
+        assert sorted(map(key, trie.find(text))) == sorted(map(key, matcher.find(text)))
+
+
+if __name__ == "__main__":
+    test_matches_respect_word_boundaries()
+    test_session_context_uses_knowledge_base_lexicon()
+    test_matcher_is_rebuilt_when_knowledge_base_changes()
+    test_matcher_never_compiled_on_request()
+    test_phrase_trie_matches_like_the_automaton()
+    print("\nTest completed successfully!")
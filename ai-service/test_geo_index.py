@@ -0,0 +1,110 @@
+"""
+Test script to verify the geospatial monument index.
+"""
+
+import os
+import sys
+import random
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.geo_index import GeoIndex, haversine_km, monument_coordinates
+from synthetic_knowledge import generate
+
+
+def _brute_force(points, latitude, longitude):
+    """Every point with its haversine distance, nearest first."""
+    distances = [(round(haversine_km(latitude, longitude, lat, lon), 3), point_id) for point_id, (lat, lon) in points.items()]
+    return [(point_id, km) for km, point_id in sorted(distances)]
+
+
+def test_queries_match_brute_force():
+    """Radius and k-nearest answers equal a haversine scan, through adds, moves and removals."""
+    monuments = generate(n_monuments=2000, n_stories=0, seed=5)['monuments_db']
+    points = {monument_id: monument_coordinates(monument) for monument_id, monument in monuments.items()}
+    index = GeoIndex(min_rebuild=50)
+    index.build((point_id, lat, lon) for point_id, (lat, lon) in list(points.items())[:1500])
+    for point_id, (lat, lon) in list(points.items())[1500:]:
+        index.add(point_id, lat, lon)
+
+    rng = random.Random(11)
+    for point_id in rng.sample(list(points), 100):
+        index.remove(point_id)
+        del points[point_id]
+    for point_id in rng.sample(list(points), 100):
+        points[point_id] = (points[point_id][0] + 0.5, points[point_id][1] - 0.5)
+        index.add(point_id, *points[point_id])
+    assert len(index) == len(points)
+
+    for _ in range(30):
+        latitude, longitude = rng.uniform(10, 32), rng.uniform(70, 90)
+        expected = _brute_force(points, latitude, longitude)
+        nearest = index.nearest(latitude, longitude, k=7)
+        assert [km for _, km in nearest] == [km for _, km in expected[:7]]
+        within = index.within(latitude, longitude, radius_km=120)
+        assert set(within) == {(point_id, km) for point_id, km in expected if km <= 120}
+        assert [km for _, km in within] == sorted(km for _, km in within)
+        capped = index.nearest(latitude, longitude, k=7, max_km=60)
+        assert all(km <= 60 for _, km in capped)
+
+
+def test_great_circle_distances():
+    """Distances are on the sphere, across the antimeridian too."""
+    assert abs(haversine_km(27.1751, 78.0421, 28.6562, 77.2410) - 182.5) < 1.0
+    index = GeoIndex()
+    index.build([('east', 0.0, 179.9), ('west', 0.0, -179.9), ('far', 0.0, 0.0)])
+    assert [point_id for point_id, _ in index.nearest(0.0, 179.95, k=2)] == ['east', 'west']
+    assert index.within(0.0, 179.95, radius_km=20)[1][0] == 'west'
+    assert monument_coordinates({'latitude': '95', 'longitude': 10}) is None
+    assert monument_coordinates({'name': 'No coordinates'}) is None
+
+
+def test_knowledge_base_locations():
+    """Nearby queries and get_location_culture aggregate real monuments, and follow add_monument."""
+    knowledge_base = CulturalKnowledgeBase()
+    nearest = knowledge_base.find_nearest_monuments(28.6, 77.2, k=2)
+    assert [monument['id'] for monument in nearest] == ['red_fort', 'taj_mahal']
+    assert [monument['id'] for monument in knowledge_base.find_nearby_monuments(30.7, 79.2, radius_km=50)] == ['kedarnath', 'badrinath']
+
+    culture = knowledge_base.get_location_culture('Uttarakhand')
+    print(f"Uttarakhand: {culture}")
+    assert set(culture['famous_sites']) == {'Kedarnath Temple', 'Badrinath Temple'}
+    assert culture['historical_periods'] == ['Ancient']
+    assert 'Adi Shankaracharya' in culture['related_figures']
+
+    agra = knowledge_base.get_location_culture('Agra', radius_km=250)
+    assert agra['famous_sites'] == ['Taj Mahal', 'Red Fort']
+    assert 'court culture' in agra['cultural_aspects']
+    assert knowledge_base.get_location_culture('Lal Qila')['famous_sites'] == ['Red Fort']
+    assert knowledge_base.get_location_culture('Atlantis')['famous_sites'] == []
+
+    knowledge_base.regional_knowledge['karnataka'] = {'cultural_practices': ['Yakshagana', 'Dasara']}
+    knowledge_base.add_monument({
+        'name': 'Virupaksha Temple',
+        'location': 'Hampi, Karnataka',
+        'latitude': 15.3350,
+        'longitude': 76.4588,
+        'period': 'Vijayanagara Empire',
+        'architecture': 'Dravidian'
+    })
+    hampi = knowledge_base.get_location_culture('Hampi')
+    assert hampi['nearby_monuments'][0]['id'] == 'virupaksha_temple'
+    assert hampi['cultural_practices'] == ['Yakshagana', 'Dasara']
+    assert 'virupaksha_temple' in [monument['id'] for monument in knowledge_base.find_nearby_monuments(15.33, 76.46, 5)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'kb.jsonl')
+        knowledge_base.save(path)
+        loaded = CulturalKnowledgeBase(path)
+        assert loaded.wait_for_indexes(timeout=30)
+        assert loaded.find_nearest_monuments(15.33, 76.46, k=2) == knowledge_base.find_nearest_monuments(15.33, 76.46, k=2)
+
+
+if __name__ == "__main__":
+    test_queries_match_brute_force()
+    test_great_circle_distances()
+    test_knowledge_base_locations()
+    print("\nTest completed successfully!")
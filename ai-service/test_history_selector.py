@@ -0,0 +1,73 @@
+"""
+Test script to verify relevance-ranked history selection.
+"""
+
+import os
+import sys
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.history_selector import HistorySelector, pair_turns
+from src.utils.message_analysis import AnalyzedMessage
+
+
+def _history(topics):
+    messages = []
+    for i, (question, answer) in enumerate(topics):
+        messages.append({'role': 'user', 'content': question, 'timestamp': f"2026-01-01T00:00:{i:02d}"})
+        messages.append({'role': 'ai', 'content': answer, 'timestamp': f"2026-01-01T00:00:{i:02d}.5"})
+    return messages
+
+
+TOPICS = [
+    ("Tell me about the Taj Mahal", "The Taj Mahal is a marble mausoleum built by Shah Jahan in Agra."),
+    ("Who was Hanuman?", "Hanuman is the devoted companion of Lord Rama in the Ramayana."),
+    ("What is Kedarnath known for?", "Kedarnath is a Himalayan temple dedicated to Lord Shiva."),
+    ("Describe the Red Fort", "The Red Fort in Delhi was the residence of the Mughal emperors."),
+    ("What food should I try in Delhi?", "Try chaat and parathas in Chandni Chowk."),
+]
+
+
+def test_relevant_turn_and_previous_turn_are_selected():
+    """An old but relevant turn is packed with the immediate previous turn."""
+    selector = HistorySelector(max_turns=2)
+    turns = selector.select(_history(TOPICS), "Why did Shah Jahan build the Taj Mahal in marble?")
+
+    questions = [user['content'] for user, _ in turns]
+    print(f"Selected: {questions}")
+    assert questions == ["Tell me about the Taj Mahal", "What food should I try in Delhi?"]
+
+
+    # Tokens of the shared analysed message give the same selection without retokenizing
+    message = AnalyzedMessage("Why did Shah Jahan build the Taj Mahal in marble?")
+    assert selector.select(_history(TOPICS), message.raw, message.tokens) == turns
+
+    hindi = [("ताज महल किसने बनवाया?", "शाहजहाँ ने ताज महल बनवाया।")] + TOPICS
+    turns = selector.select(_history(hindi), "ताज महल कब बना?", AnalyzedMessage("ताज महल कब बना?").tokens)
+    assert turns[0][0]['content'] == "ताज महल किसने बनवाया?"
+
+
+def test_unrelated_message_falls_back_to_recent_turns():
+    """With no overlap the most recent turns are used, in chronological order."""
+    selector = HistorySelector(max_turns=3)
+    turns = selector.select(_history(TOPICS), "Namaste!")
+    assert [user['content'] for user, _ in turns] == [q for q, _ in TOPICS[-3:]]
+
+
+def test_budget_and_pairing():
+    """A zero budget degrades to recency; an unanswered question pairs with no answer."""
+    selector = HistorySelector(max_turns=2, time_budget_us=0)
+    turns = selector.select(_history(TOPICS), "Taj Mahal marble")
+    assert [user['content'] for user, _ in turns] == [q for q, _ in TOPICS[-2:]]
+    assert selector.get_selector_stats()['budget_exceeded'] == 1
+
+    messages = _history(TOPICS[:1]) + [{'role': 'user', 'content': "And the gardens?", 'timestamp': "x"}]
+    assert pair_turns(messages)[-1][1] is None
+
+
+if __name__ == "__main__":
+    test_relevant_turn_and_previous_turn_are_selected()
+    test_unrelated_message_falls_back_to_recent_turns()
+    test_budget_and_pairing()
+    print("\nTest completed successfully!")
@@ -0,0 +1,71 @@
+"""
+Test script to verify the trained intent classifier and its keyword-rule fallback.
+"""
+
+import os
+import sys
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.intent_classifier import IntentClassifier, load_intent_classifier, classify_by_keywords
+
+
+def test_model_fixes_keyword_misfires():
+    """Substring rules call 'history' a greeting ('hi'); the model does not."""
+    classifier = IntentClassifier.load()
+    message = "What is the history of the Taj Mahal?"
+
+    assert classify_by_keywords(message) == 'greeting'
+    intent, probability = classifier.classify(message)
+    print(f"{message!r} -> {intent} ({probability:.2f})")
+    assert intent != 'greeting'
+    assert 0.0 < probability <= 1.0
+    assert classifier.classify("Namaste!")[0] == 'greeting'
+
+
+def test_native_script_messages():
+    """Greetings and monument questions in Indic scripts are not lumped into general_inquiry."""
+    classifier = IntentClassifier.load()
+    assert classifier.classify("नमस्ते")[0] == 'greeting'
+    assert classifier.classify("ताज महल के बारे में बताइए")[0] == 'informational'
+    assert classifier.classify("लाल किला किसने बनवाया?")[0] == 'informational'
+    assert classifier.classify("வணக்கம்")[0] == 'greeting'
+    assert classifier.classify("কোনো গল্প বলুন")[0] == 'story_request'
+
+
+def test_batch_matches_single():
+    """Batch scoring gives the same labels and probabilities as one-by-one scoring."""
+    classifier = IntentClassifier.load()
+    messages = [
+        "Tell me a legend about Hampi",
+        "Which festivals are celebrated in Kerala?",
+        "hey there",
+        "",
+    ]
+    batch = classifier.classify_batch(messages)
+    for message, (intent, probability) in zip(messages, batch):
+        single_intent, single_probability = classifier.classify(message)
+        assert intent == single_intent
+        assert abs(probability - single_probability) < 1e-4
+    assert classifier.classify_batch([]) == []
+
+
+def test_missing_model_falls_back():
+    """A missing model file yields None, and NaradAI then uses the keyword rules."""
+    assert load_intent_classifier('/nonexistent/intent_classifier.npz') is None
+
+    from src.services.narad_ai import NaradAI
+    narad = NaradAI()
+    narad.intent_classifier = None
+    assert narad._classify_intent("Tell me a story") == 'story_request'
+    narad.conversation_memory.close()
+    narad.user_memory.close()
+
+
+if __name__ == "__main__":
+    test_model_fixes_keyword_misfires()
+    test_native_script_messages()
+    test_batch_matches_single()
+    test_missing_model_falls_back()
+    print("\nTest completed successfully!")
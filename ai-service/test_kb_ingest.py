@@ -0,0 +1,183 @@
+"""
+Test script to verify batch ingestion: validation, stable ids and index maintenance.
+"""
+
+import os
+import sys
+import time
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase, INGEST_RELATED_REBUILD
+from src.utils.kb_ingest import derive_record_id, validate_record
+from src.utils.kb_reload import ReloadableKnowledgeBase
+from synthetic_knowledge import generate
+
+VIRUPAKSHA = {
+    'name': 'Virupaksha Temple',
+    'location': 'Hampi, Karnataka',
+    'latitude': 15.3350,
+    'longitude': 76.4600,
+    'period': 'Vijayanagara Empire',
+    'built_year': '7th century',
+    'architecture': 'Dravidian',
+    'related_figures': ['Lord Shiva']
+}
+PAMPA = {
+    'title': 'Pampa and Virupaksha',
+    'type': 'mythology',
+    'monument': 'virupaksha_temple',
+    'content': 'Pampa, daughter of Brahma, won Shiva as her consort by her penance on Hemakuta hill.',
+    'themes': ['devotion', 'love']
+}
+
+
+def test_validation():
+    """Missing, mistyped and out-of-range fields are reported; unknown fields are kept."""
+    assert validate_record('monument', VIRUPAKSHA) == []
+    assert validate_record('story', dict(PAMPA, narrator='local priest')) == []
+    assert validate_record('story', {'title': 'x'}) == ['type is required', 'content is required']
+    assert validate_record('monument', {'name': 'X', 'location': 'Y', 'stories': 'one'}) == [
+        'stories must be a list of strings'
+    ]
+    assert validate_record('monument', {'name': 'X', 'location': 'Y', 'latitude': 12.0}) == [
+        'latitude and longitude must be given together'
+    ]
+    assert validate_record('monument', {'name': 'X', 'location': 'Y', 'built_year': 'long ago'}) == [
+        "built_year 'long ago' is not a year or year range"
+    ]
+    assert validate_record('story', ['not', 'a', 'record']) == ['story must be an object']
+    assert validate_record('monument', {'name': 'Foo/Bar Fort', 'location': 'Y'}) == [
+        "name gives the invalid id 'foo/bar_fort'; give the record an id"
+    ]
+    assert validate_record('monument', {'id': 'foo_bar_fort', 'name': 'Foo/Bar Fort', 'location': 'Y'}) == []
+    assert validate_record('story', dict(PAMPA, monument='')) == ['monument must not be empty (null for no monument)']
+    assert validate_record('story', dict(PAMPA, monument=None)) == []
+    assert derive_record_id('monument', VIRUPAKSHA) == 'virupaksha_temple'
+    assert derive_record_id('story', dict(PAMPA, id='pampa')) == 'pampa'
+
+
+def test_ids_and_conflicts():
+    """Ids are never silently reused: conflicts follow the policy and duplicates in a batch are rejected."""
+    knowledge_base = CulturalKnowledgeBase()
+    version = knowledge_base.version
+    report = knowledge_base.ingest(
+        monuments=[VIRUPAKSHA, {'name': 'Taj Mahal', 'location': 'Agra'}, {'location': 'Nowhere'}],
+        stories=[PAMPA, dict(PAMPA, content='Again'), dict(PAMPA, title='Lost Tale', monument='atlantis')]
+    )
+    assert report['ids'] == {
+        'monuments': ['virupaksha_temple', None, None],
+        'stories': ['pampa_and_virupaksha', None, None]
+    }
+    assert report['added'] == {'monument': 1, 'story': 1}
+    assert [(error['type'], error['index']) for error in report['errors']] == [
+        ('monument', 1), ('monument', 2), ('story', 1), ('story', 2)
+    ]
+    assert report['errors'][0]['errors'] == ["id 'taj_mahal' already exists"]
+    assert knowledge_base.monuments_db['taj_mahal']['location'] == 'Agra, Uttar Pradesh'
+    assert knowledge_base.version == version + 1
+
+    report = knowledge_base.ingest(monuments=[{'name': 'Taj Mahal', 'location': 'Agra'}], on_conflict='skip')
+    assert report['skipped']['monument'] == 1 and report['ids']['monuments'] == ['taj_mahal']
+    assert knowledge_base.monuments_db['taj_mahal']['location'] == 'Agra, Uttar Pradesh'
+
+    report = knowledge_base.ingest(monuments=[{'name': 'Taj Mahal', 'location': 'Agra'}], on_conflict='replace')
+    assert report['replaced']['monument'] == 1
+    assert knowledge_base.monuments_db['taj_mahal']['location'] == 'Agra'
+
+    for bad in ({'monuments': {'name': 'x'}}, {'on_conflict': 'merge'}):
+        try:
+            knowledge_base.ingest(**bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad} should be rejected")
+
+
+def test_indexes_updated():
+    """Every derived index sees an ingested batch."""
+    knowledge_base = CulturalKnowledgeBase()
+    knowledge_base.find_monuments('hampi')
+    knowledge_base.ingest(monuments=[VIRUPAKSHA], stories=[PAMPA])
+
+    assert {site['id'] for site in knowledge_base.find_nearby_monuments(15.3350, 76.4600, radius_km=1)} == {
+        'hampi', 'virupaksha_temple'
+    }
+    assert 'virupaksha_temple' in [entry['id'] for entry in knowledge_base.find_by_year(650, kinds=['monument'])]
+    assert knowledge_base.find_monuments('Virupaksha Temple')[0]['id'] == 'virupaksha_temple'
+    assert knowledge_base.search_stories('Pampa penance', 'mythology_inquiry')[0]['id'] == 'pampa_and_virupaksha'
+    assert [story['id'] for story in knowledge_base.find_connected_stories(figure='Shiva', state='Karnataka')] == []
+    assert [story['id'] for story in knowledge_base.find_connected_stories(monument='Virupaksha Temple')] == [
+        'pampa_and_virupaksha'
+    ]
+    assert 'hampi' in [related['id'] for related in knowledge_base.get_related_monuments('virupaksha_temple')]
+
+
+def test_large_batch_rebuilds_related_graph():
+    """A batch above the threshold rebuilds related monuments in the background with the same answers."""
+    data = generate(n_monuments=INGEST_RELATED_REBUILD * 2, n_stories=500)
+    monuments = [dict(record, id=record_id) for record_id, record in data['monuments_db'].items()]
+    stories = [dict(record, id=record_id) for record_id, record in data['stories_db'].items()]
+    knowledge_base = CulturalKnowledgeBase()
+    report = knowledge_base.ingest(monuments=monuments, stories=stories)
+    assert report['errors'] == [] and report['added'] == {'monument': len(monuments), 'story': len(stories)}
+
+    assert knowledge_base._pending_monuments is not None
+    assert len(knowledge_base.get_related_monuments('site_0')) == 5
+    # Queued while the graph is rebuilt, applied when it is published
+    knowledge_base.ingest(monuments=[VIRUPAKSHA])
+    deadline = time.monotonic() + 30
+    while knowledge_base._pending_monuments is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert knowledge_base._pending_monuments is None
+    assert len(knowledge_base.related_graph) == len(knowledge_base.monuments_db)
+    assert 'hampi' in [related['id'] for related in knowledge_base.get_related_monuments('virupaksha_temple')]
+
+    rebuilt = CulturalKnowledgeBase()
+    rebuilt.monuments_db, rebuilt.stories_db = knowledge_base.monuments_db, knowledge_base.stories_db
+    rebuilt._build_related_graph()
+    for monument_id in ('site_0', 'site_100', 'hampi'):
+        # Equal scores may be ordered differently by the two paths
+        assert [related['relatedness_score'] for related in knowledge_base.get_related_monuments(monument_id)] == [
+            related['relatedness_score'] for related in rebuilt.get_related_monuments(monument_id)
+        ], monument_id
+
+
+def test_single_adds_are_validated():
+    """add_monument and add_story apply ingest's schema, id rules and conflict policy."""
+    knowledge_base = CulturalKnowledgeBase()
+    version = knowledge_base.version
+
+    assert knowledge_base.add_monument({'name': 'Gol  Gumbaz', 'location': 'Vijayapura'})
+    assert knowledge_base.monuments_db['gol_gumbaz']['location'] == 'Vijayapura'
+    assert knowledge_base.find_monuments('Gol Gumbaz')[0]['id'] == 'gol_gumbaz'
+
+    # Invalid records and taken ids are rejected instead of silently overwriting
+    assert not knowledge_base.add_monument({'name': 'No Location'})
+    assert not knowledge_base.add_monument({'name': 'Taj Mahal', 'location': 'Elsewhere'})
+    assert knowledge_base.monuments_db['taj_mahal']['location'] != 'Elsewhere'
+    assert not knowledge_base.add_story({'title': 'Lost', 'type': 'folklore', 'content': '...', 'monument': 'atlantis'})
+    assert 'lost' not in knowledge_base.stories_db
+    assert knowledge_base.version == version + 1
+
+    assert knowledge_base.add_monument({'name': 'Gol Gumbaz', 'location': 'Bijapur'}, on_conflict='replace')
+    assert knowledge_base.monuments_db['gol_gumbaz']['location'] == 'Bijapur'
+    assert not knowledge_base.add_monument({'name': 'Gol Gumbaz', 'location': 'X'}, on_conflict='skip')
+
+
+def test_reloadable_ingest():
+    """Batches ingested through the reload handle reach the served knowledge base."""
+    handle = ReloadableKnowledgeBase()
+    report = handle.ingest(monuments=[VIRUPAKSHA], stories=[PAMPA])
+    assert report['added'] == {'monument': 1, 'story': 1}
+    assert 'pampa_and_virupaksha' in handle.snapshot().stories_db
+
+
+if __name__ == "__main__":
+    test_validation()
+    test_ids_and_conflicts()
+    test_indexes_updated()
+    test_large_batch_rebuilds_related_graph()
+    test_single_adds_are_validated()
+    test_reloadable_ingest()
+    print("\nTest completed successfully!")
@@ -0,0 +1,113 @@
+"""
+Test script to verify loading the knowledge base from versioned JSON Lines and SQLite files.
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.kb_loader import ContentStore, LazyStory, load_knowledge_file
+
+
+def test_round_trip_with_lazy_bodies():
+    """Saved samples load back identically, with story bodies fetched on demand."""
+    samples = CulturalKnowledgeBase()
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ('kb.jsonl', 'kb.sqlite'):
+            path = os.path.join(directory, name)
+            samples.save(path, version='2024.06')
+
+            loaded = CulturalKnowledgeBase(path)
+            print(f"{name}: {loaded.get_load_stats()}")
+            assert loaded.dataset_version == '2024.06'
+            assert loaded.get_knowledge_summary() == samples.get_knowledge_summary()
+            assert loaded.monuments_db == samples.monuments_db
+            assert loaded.mythological_figures == samples.mythological_figures
+
+            story = loaded.stories_db['hanuman_birthplace']
+            assert isinstance(story, LazyStory)
+            assert dict.__contains__(story, 'content') is False
+            assert 'content' in story
+            expected = samples.stories_db['hanuman_birthplace']['content']
+            assert story['content'] == expected
+            assert story.get('content') == expected
+            assert story.to_dict() == samples.stories_db['hanuman_birthplace']
+
+            # Loaded (lazy) stories can be saved again
+            copy_path = os.path.join(directory, 'copy_' + name)
+            loaded.save(copy_path)
+            assert CulturalKnowledgeBase(copy_path).stories_db['badri_tree_legend']['content'] == \
+                samples.stories_db['badri_tree_legend']['content']
+            loaded._content_store.close()
+
+
+def test_inline_content_and_bad_files():
+    """Hand-written records with inline bodies load eagerly; unknown schemas are refused."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'handmade.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'format': 'narad-kb', 'schema_version': 1, 'version': 'v1'}) + '\n')
+            f.write(json.dumps({'type': 'story', 'id': 'tale', 'data': {'title': 'A Tale', 'content': 'Once upon a time'}}) + '\n')
+        data = load_knowledge_file(path)
+        assert data['sections']['stories_db']['tale'] == {'title': 'A Tale', 'content': 'Once upon a time'}
+
+        future = os.path.join(directory, 'future.jsonl')
+        with open(future, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'format': 'narad-kb', 'schema_version': 99, 'version': 'v9'}) + '\n')
+        try:
+            load_knowledge_file(future)
+            assert False, "newer schema should be refused"
+        except ValueError:
+            pass
+
+        # The knowledge base degrades to empty rather than failing to start
+        assert CulturalKnowledgeBase(future).get_knowledge_summary()['monuments'] == 0
+
+
+def test_body_lines_and_replaced_files():
+    """Body lines are found by their type field; loaded bodies survive the file being replaced."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'reordered.jsonl')
+        body = json.dumps({'id': 'tale', 'content': 'Once upon a time', 'type': 'story_content'}) + '\n'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'format': 'narad-kb', 'schema_version': 1, 'version': 'v1'}) + '\n')
+            f.write(json.dumps({'type': 'story', 'id': 'tale', 'content_at': 0,
+                                'data': {'title': 'A Tale', 'themes': ['story_content']}}) + '\n')
+            f.write(body)
+        data = load_knowledge_file(path)
+        assert data['sections']['stories_db']['tale']['content'] == 'Once upon a time'
+        data['content_store'].close()
+
+        samples = CulturalKnowledgeBase()
+        path = os.path.join(directory, 'kb.jsonl')
+        samples.save(path, version='v1')
+        data = load_knowledge_file(path)
+        stories = data['sections']['stories_db']
+        expected = samples.stories_db['hanuman_birthplace']['content']
+
+        # Saving over the loaded file must not shift the offsets the old load reads at
+        samples.stories_db['badri_tree_legend']['content'] = 'x' * 5000
+        samples.save(path, version='v2')
+        assert stories['hanuman_birthplace']['content'] == expected
+
+        # Once closed, a changed file is not reopened at stale offsets
+        data['content_store'].close()
+        assert stories['kedarnath_pandavas'].get('content') is None
+
+    try:
+        ContentStore()
+        assert False, "ContentStore is abstract"
+    except TypeError:
+        pass
+
+
+if __name__ == "__main__":
+    test_round_trip_with_lazy_bodies()
+    test_inline_content_and_bad_files()
+    test_body_lines_and_replaced_files()
+    print("\nTest completed successfully!")
@@ -0,0 +1,151 @@
+"""
+Test script to verify atomic knowledge base reloads.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.kb_reload import ReloadableKnowledgeBase, latest_knowledge_file
+from src.services.suggestion_engine import SuggestionEngine
+
+
+def _write_knowledge_file(path, extra_monument=None):
+    """Save the sample knowledge base, optionally with one more monument."""
+    knowledge_base = CulturalKnowledgeBase()
+    if extra_monument:
+        knowledge_base.add_monument(extra_monument)
+    knowledge_base.save(path, version=os.path.basename(path))
+
+
+def test_reload_swaps_snapshot():
+    """A reload publishes new data and indexes at once; earlier snapshots stay intact."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'kb-2.jsonl')
+        _write_knowledge_file(path, {'name': 'Qutub Minar', 'location': 'Delhi', 'period': 'Delhi Sultanate',
+                                     'built_year': 1220, 'latitude': 28.5245, 'longitude': 77.1855})
+
+        knowledge_base = ReloadableKnowledgeBase()
+        engine = SuggestionEngine(knowledge_base)
+        engine.suggest('general_inquiry')
+        before = knowledge_base.snapshot()
+        old_version = knowledge_base.version
+        assert knowledge_base.get_monument_info('qutub_minar') is None
+
+        assert knowledge_base.reload(path, wait=True)
+        stats = knowledge_base.get_reload_stats()
+        print(f"Reload stats: {stats}")
+        assert stats['reloads'] == 1 and stats['dataset_version'] == 'kb-2.jsonl'
+        assert knowledge_base.version > old_version
+        assert knowledge_base.get_monument_info('Qutub Minar')['built_year'] == 1220
+        assert knowledge_base.find_nearest_monuments(28.52, 77.18, k=1)[0]['id'] == 'qutub_minar'
+        assert knowledge_base.search_stories('Shah Jahan love', 'history_inquiry')
+
+        # Readers that took a snapshot keep reading the old data
+        assert 'qutub_minar' not in before.monuments_db
+        # Version-keyed caches rebuild
+        engine.suggest('general_inquiry')
+        assert engine.get_engine_stats()['invalidations'] == 1
+
+
+def test_writes_during_reload_are_kept():
+    """Records added while a reload builds reach both the old and the new knowledge base."""
+    release = threading.Event()
+
+    def slow_factory(path):
+        knowledge_base = CulturalKnowledgeBase(path)
+        # The first build is the initial load; later ones wait to be released
+        if built:
+            release.wait(10)
+        built.append(path)
+        return knowledge_base
+
+    built = []
+    knowledge_base = ReloadableKnowledgeBase(factory=slow_factory)
+    assert knowledge_base.reload()
+    assert not knowledge_base.reload()
+    knowledge_base.add_story({'title': 'Hampi Chariot', 'type': 'historical', 'content': 'The stone chariot of Vittala.'})
+    assert 'hampi_chariot' in knowledge_base.stories_db
+    release.set()
+    knowledge_base._reload_thread.join(10)
+    assert knowledge_base.get_reload_stats()['reloads'] == 1
+    assert 'hampi_chariot' in knowledge_base.stories_db
+    assert knowledge_base.search_stories('stone chariot', 'history_inquiry')[0]['title'] == 'Hampi Chariot'
+
+
+def test_failed_reload_keeps_serving():
+    """A file that cannot be loaded leaves the current knowledge base in place."""
+    knowledge_base = ReloadableKnowledgeBase()
+    version = knowledge_base.version
+    assert not knowledge_base.reload('/nonexistent/kb.jsonl', wait=True)
+    stats = knowledge_base.get_reload_stats()
+    assert stats['failures'] == 1 and stats['last_error']
+    assert knowledge_base.version == version
+    assert knowledge_base.get_monument_info('taj_mahal') is not None
+
+
+def test_reads_during_reloads():
+    """Concurrent readers never see a half-built knowledge base."""
+    knowledge_base = ReloadableKnowledgeBase()
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            snapshot = knowledge_base.snapshot()
+            try:
+                assert snapshot.get_related_monuments('kedarnath')[0]['id'] == 'badrinath'
+                assert knowledge_base.get_monument_info('taj_mahal')['name'] == 'Taj Mahal'
+            except Exception as e:
+                errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(5):
+        assert knowledge_base.reload(wait=True)
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assert not errors, errors[:3]
+    assert knowledge_base.get_reload_stats()['reloads'] == 5
+
+
+def test_watched_directory():
+    """The watcher loads the newest knowledge file once it is stable."""
+    with tempfile.TemporaryDirectory() as directory:
+        first = os.path.join(directory, 'kb-1.sqlite')
+        _write_knowledge_file(first)
+        assert latest_knowledge_file(directory)[0] == first
+
+        knowledge_base = ReloadableKnowledgeBase(first)
+        knowledge_base.watch(directory, interval=0.05)
+        try:
+            time.sleep(0.3)
+            assert knowledge_base.get_reload_stats()['reloads'] == 0
+
+            second = os.path.join(directory, 'kb-2.jsonl')
+            _write_knowledge_file(second, {'name': 'Konark Sun Temple', 'location': 'Konark, Odisha', 'built_year': 1250})
+            os.utime(second, ns=(time.time_ns() + 10 ** 9, time.time_ns() + 10 ** 9))
+            deadline = time.time() + 10
+            while knowledge_base.get_reload_stats()['reloads'] < 1 and time.time() < deadline:
+                time.sleep(0.05)
+            assert knowledge_base.get_reload_stats()['source'] == second
+            assert 'konark_sun_temple' in knowledge_base.monuments_db
+        finally:
+            knowledge_base.stop_watching()
+
+
+if __name__ == "__main__":
+    test_reload_swaps_snapshot()
+    test_writes_during_reload_are_kept()
+    test_failed_reload_keeps_serving()
+    test_reads_during_reloads()
+    test_watched_directory()
+    print("\nTest completed successfully!")
@@ -0,0 +1,85 @@
+"""
+Test script to verify the script-histogram language detector against the labelled corpus.
+"""
+
+import os
+import sys
+import json
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.language_detector import LanguageDetector
+from src.services.narad_ai import NaradAI
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'language_corpus.jsonl')
+
+
+def _load_corpus():
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_labelled_corpus_accuracy():
+    """Native scripts, Marathi, Hinglish and Tanglish in the corpus are labelled correctly."""
+    detector = LanguageDetector()
+    corpus = _load_corpus()
+
+    misses = [(row, detector.detect(row['text'])) for row in corpus if detector.detect_language(row['text']) != row['language']]
+    accuracy = 1 - len(misses) / len(corpus)
+    print(f"Accuracy: {accuracy:.3f} over {len(corpus)} samples, misses: {misses}")
+    assert accuracy >= 0.95
+
+
+def test_marathi_and_mixed_script():
+    """Marathi is no longer shadowed by Hindi, and the majority script wins mixed text."""
+    detector = LanguageDetector()
+    assert detector.detect_language("शिवाजी महाराजांचा किल्ला कुठे आहे?") == 'mr-IN'
+    assert detector.detect_language("लाल किला किसने बनवाया था?") == 'hi-IN'
+
+    language, confidence = detector.detect("Meenakshi கோவில் பற்றி சொல்லுங்கள்")
+    assert language == 'ta-IN'
+    assert 0.5 < confidence < 1.0
+    assert detector.detect("தாஜ்மஹால்")[1] == 1.0
+
+
+def test_english_with_indian_names_stays_english():
+    """Proper nouns alone do not make an English sentence romanized Hindi."""
+    detector = LanguageDetector()
+    assert detector.detect_language("Tell me about Hanuman, Krishna and Kedarnath") == 'en-IN'
+    assert detector.detect("") == ('en-IN', 0.0)
+
+
+def test_indic_proper_nouns_in_english():
+    """English sentences built around Indic names are not mistaken for Hinglish or Tanglish."""
+    detector = LanguageDetector()
+    for text in ("I love Bharatanatyam", "Nalanda university", "Kathakali makeup meaning",
+                 "Jai Shri Ram", "What is Bharatanatyam", "Thiruvananthapuram Padmanabhaswamy temple history"):
+        assert detector.detect_language(text) == 'en-IN', text
+    assert detector.detect_language("mujhe taj mahal ki kahani sunao") == 'hi-IN'
+    assert detector.detect_language("hampi pathi konjam sollunga") == 'ta-IN'
+
+
+def test_romanized_guess_keeps_chosen_language():
+    """A romanized guess never overrides the user's chosen language; native script still does."""
+    narad = NaradAI()
+    turns = [
+        ("visitor_en", "mujhe taj mahal ki kahani sunao", {'preferences': {'language': 'en'}}, 'en-IN'),
+        ("visitor_guess", "mujhe taj mahal ki kahani sunao", None, 'hi-IN'),
+        ("visitor_english", "I love Bharatanatyam", None, 'en-IN'),
+        ("visitor_script", "ताज महल की कहानी सुनाइए", {'preferences': {'language': 'en'}}, 'hi-IN'),
+    ]
+    for user_id, message, context, language in turns:
+        narad.process_message(message, f"session_{user_id}", context, user_id=user_id)
+    narad.user_memory.wait_for_updates(timeout=5)
+    for user_id, _, _, language in turns:
+        assert narad.user_memory.get_profile(user_id)['language'] == language, user_id
+
+
+if __name__ == "__main__":
+    test_labelled_corpus_accuracy()
+    test_marathi_and_mixed_script()
+    test_english_with_indian_names_stays_english()
+    test_indic_proper_nouns_in_english()
+    test_romanized_guess_keeps_chosen_language()
+    print("\nTest completed successfully!")
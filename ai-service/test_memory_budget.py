@@ -0,0 +1,98 @@
+"""
+Test script to verify the global conversation memory budget and LRU eviction.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.conversation_memory import ConversationMemory
+
+
+def test_message_budget_evicts_least_recent_session():
+    """Sessions are evicted in order of last activity once the message budget is exceeded."""
+    memory = ConversationMemory(max_total_messages=4)
+
+    memory.add_message("session_a", "user", "Tell me about Hampi")
+    memory.add_message("session_b", "user", "Tell me about the Taj Mahal")
+    memory.add_message("session_a", "ai", "Hampi was the capital of the Vijayanagara Empire.")
+    memory.add_message("session_c", "user", "Tell me about the Red Fort")
+
+    # session_b is now the least recently active one and should go first
+    memory.add_message("session_c", "ai", "The Red Fort was built by Shah Jahan.")
+
+    stats = memory.get_memory_stats()
+    print(f"Memory stats: {stats}")
+
+    assert memory.get_session("session_b") is None
+    assert memory.get_session("session_a") is not None
+    assert stats['messages_in_memory'] <= 4
+    assert stats['evicted_sessions'] == 1
+
+
+def test_byte_budget_never_evicts_current_session():
+    """The session being written to survives even if it alone exceeds the budget."""
+    memory = ConversationMemory(max_total_bytes=1)
+
+    memory.add_message("session_a", "user", "Namaste")
+    memory.add_message("session_b", "user", "Namaste again")
+
+    assert memory.get_session("session_a") is None
+    assert memory.get_history("session_b")[0]['content'] == "Namaste again"
+
+
+def test_spilled_sessions_are_restored():
+    """With a spill path, evicted sessions come back from disk on next access."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        memory = ConversationMemory(
+            max_total_messages=2,
+            spill_path=os.path.join(tmp_dir, 'spill')
+        )
+
+        memory.add_message("session_a", "user", "Tell me about Kedarnath")
+        memory.add_message("session_a", "ai", "Kedarnath is one of the twelve Jyotirlingas.")
+        memory.add_message("session_b", "user", "Tell me about Badrinath")
+
+        history = memory.get_history("session_a")
+        stats = memory.get_memory_stats()
+        print(f"Memory stats after restore: {stats}")
+
+        assert [msg['content'] for msg in history] == [
+            "Tell me about Kedarnath",
+            "Kedarnath is one of the twelve Jyotirlingas."
+        ]
+        assert stats['spilled_sessions'] >= 1
+        assert stats['restored_sessions'] == 1
+
+        memory.close()
+
+
+def test_spilled_sessions_expire():
+    """Spilled sessions past the timeout are deleted by cleanup, including ones spilled by an earlier process."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        spill_path = os.path.join(tmp_dir, 'spill')
+        memory = ConversationMemory(max_total_messages=1, session_timeout=1, spill_path=spill_path)
+        memory.add_message("session_a", "user", "Tell me about Kedarnath")
+        memory.add_message("session_b", "user", "Tell me about Badrinath")
+        assert list(memory._spill_store.keys()) == ["session_a"]
+        memory.close()
+
+        memory = ConversationMemory(max_total_messages=1, session_timeout=1, spill_path=spill_path)
+        assert "session_a" in memory._spilled
+        time.sleep(1.1)
+        memory.cleanup_expired_sessions()
+        assert len(memory._spill_store) == 0 and not memory._spilled
+        assert memory.get_session("session_a") is None
+        memory.close()
+
+
+if __name__ == "__main__":
+    test_message_budget_evicts_least_recent_session()
+    test_byte_budget_never_evicts_current_session()
+    test_spilled_sessions_are_restored()
+    test_spilled_sessions_expire()
+    print("\nTest completed successfully!")
@@ -0,0 +1,63 @@
+"""
+Test script to verify running conversation memory statistics.
+"""
+
+import os
+import sys
+import time
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.conversation_memory import ConversationMemory
+
+
+def test_running_counters_track_mutations():
+    """Counters follow adds, history truncation, ratings and session clears."""
+    memory = ConversationMemory(max_history_per_session=3)
+
+    memory.add_message("stats_001", "user", "Tell me about the Taj Mahal", metadata={'intent': 'monument_info'})
+    memory.add_message("stats_001", "ai", "The Taj Mahal is in Agra.", metadata={'user_rating': 4})
+    memory.add_message("stats_001", "user", "Share a story", metadata={'intent': 'storytelling'})
+    memory.add_message("stats_001", "ai", "Once upon a time...", metadata={'user_rating': 5})
+    memory.add_message("stats_002", "user", "Another story", metadata={'intent': 'storytelling'})
+
+    stats = memory.get_memory_stats()
+    print(f"Stats: {stats}")
+
+    assert stats['active_sessions'] == 2
+    assert stats['total_messages_processed'] == 5
+    assert stats['messages_in_memory'] == 4  # stats_001 keeps only 3
+    assert stats['intent_totals'] == {'monument_info': 1, 'storytelling': 2}
+    assert stats['ratings_count'] == 2
+    assert stats['average_rating'] == 4.5
+
+    memory.clear_session("stats_001")
+    stats = memory.get_memory_stats()
+    assert stats['active_sessions'] == 1
+    assert stats['messages_in_memory'] == 1
+
+    session_stats = memory.get_session_stats("stats_002")
+    assert session_stats['message_count'] == 1
+    assert session_stats['intent_distribution'] == {'storytelling': 1}
+    assert session_stats['duration_minutes'] >= 0
+
+
+def test_cleanup_stops_at_first_live_session():
+    """Expired sessions at the front of the activity order are removed, live ones kept."""
+    memory = ConversationMemory(session_timeout=60)
+
+    memory.add_message("old_session", "user", "Hello")
+    memory.add_message("live_session", "user", "Hello again")
+    memory.sessions["old_session"]['_last_activity_ts'] = time.time() - 120
+
+    stats = memory.get_memory_stats()
+    assert stats['active_sessions'] == 1
+    assert memory.get_session("old_session") is None
+    assert memory.get_session("live_session") is not None
+
+
+if __name__ == "__main__":
+    test_running_counters_track_mutations()
+    test_cleanup_stops_at_first_live_session()
+    print("\nTest completed successfully!")
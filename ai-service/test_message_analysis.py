@@ -0,0 +1,78 @@
+"""
+Test script to verify the shared analysed-message object gives every consumer the same results as raw text.
+"""
+
+import os
+import sys
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.message_analysis import AnalyzedMessage
+from src.utils.entity_matcher import EntityMatcher, build_lexicon_entries, tokenize
+from src.utils.language_detector import LanguageDetector
+from src.utils.intent_classifier import IntentClassifier
+from src.utils.conversation_memory import ConversationMemory
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+
+
+def test_derived_forms():
+    """NFC normalization, lowercase, tokens and script histogram are computed up front."""
+    analyzed = AnalyzedMessage("Café near the RED FORT, लाल किला!")
+    assert analyzed.text.startswith("Café")
+    assert analyzed.lower == analyzed.text.lower()
+    assert analyzed.tokens[:4] == ['café', 'near', 'the', 'red']
+    assert analyzed.normalized.startswith(' café near the red fort ')
+    assert analyzed.script_histogram == LanguageDetector.script_histogram(analyzed.text)
+
+
+def test_indic_tokens_keep_vowel_signs():
+    """Vowel signs and viramas stay inside their words, as in the entity matcher."""
+    assert AnalyzedMessage('ताज महल के बारे में बताइए').tokens == ['ताज', 'महल', 'के', 'बारे', 'में', 'बताइए']
+    assert AnalyzedMessage('தஞ்சாவூர் கோவில் பற்றி').tokens == ['தஞ்சாவூர்', 'கோவில்', 'பற்றி']
+    for message in ('शिवाजी महाराजांचा किल्ला कुठे आहे?', 'Red Fort / लाल किला, snake_case'):
+        analyzed = AnalyzedMessage(message)
+        assert analyzed.tokens == tokenize(message) == analyzed.normalized.split()
+
+
+def test_entities_cached_per_matcher():
+    """Entities are matched once per matcher and recomputed for a different matcher."""
+    knowledge_base = CulturalKnowledgeBase()
+    matcher = knowledge_base.get_entity_matcher()
+    analyzed = AnalyzedMessage("Tell me a legend about the Red Fort")
+
+    entities = analyzed.entities_for(matcher)
+    assert entities == matcher.extract(analyzed.raw)
+    assert analyzed.entities_for(matcher) is entities
+    assert 'red_fort' in entities['monument']
+
+    categories_only = EntityMatcher(build_lexicon_entries())
+    assert 'monument' not in analyzed.entities_for(categories_only)
+
+
+def test_consumers_match_raw_text():
+    """Intent, language and session context agree with the string-based paths."""
+    classifier = IntentClassifier.load()
+    detector = LanguageDetector()
+    knowledge_base = CulturalKnowledgeBase()
+
+    for message in ["What is the history of the Taj Mahal?", "mujhe ek kahani sunao", "ராமாயணம் கதை சொல்லுங்கள்"]:
+        analyzed = AnalyzedMessage(message)
+        assert classifier.classify(message, analyzed.tokens) == classifier.classify(message)
+        assert detector.detect_message(analyzed) == detector.detect(message)
+
+    memory = ConversationMemory(knowledge_base=knowledge_base)
+    message = "Tell me a legend about the Taj Mahal"
+    memory.add_message('raw', 'user', message)
+    memory.add_message('shared', 'user', message, analyzed=AnalyzedMessage(message))
+    assert memory.get_context('raw') == memory.get_context('shared')
+    assert 'taj_mahal' in memory.get_context('shared')['monuments_discussed']
+    memory.close()
+
+
+if __name__ == "__main__":
+    test_derived_forms()
+    test_indic_tokens_keep_vowel_signs()
+    test_entities_cached_per_matcher()
+    test_consumers_match_raw_text()
+    print("\nTest completed successfully!")
@@ -0,0 +1,81 @@
+"""
+Test script to verify monument lookup by alias, typo and Indic script.
+"""
+
+import os
+import sys
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.monument_lookup import MonumentLookup, phonetic_key, transliterate
+
+
+def test_phonetic_keys():
+    """Transliterations and romanization variants share a key."""
+    assert transliterate('ताज महल') == 'taaj mahal'
+    assert transliterate('केदारनाथ') == 'kedaarnaath'
+    assert phonetic_key('ताज महल') == phonetic_key('Taj Mahal')
+    assert phonetic_key('लाल किला') == phonetic_key('Lal Qila')
+    assert phonetic_key('क़ुतुब मीनार') == phonetic_key('Qutub Minar')
+    assert phonetic_key('बद्रीनाथ') == phonetic_key('Badrinath')
+    assert phonetic_key('Site 777') == 'site 777'
+
+
+def test_get_monument_info_variants():
+    """Ids, names, aliases, typos and native scripts resolve to the same monument."""
+    knowledge_base = CulturalKnowledgeBase()
+    taj = knowledge_base.monuments_db['taj_mahal']
+    for query in ('taj_mahal', 'Taj Mahal', 'taj mahel', 'ताज महल', 'Taj'):
+        assert knowledge_base.get_monument_info(query) == taj, query
+
+    # The result is a copy: changing it leaves the knowledge base alone
+    info = knowledge_base.get_monument_info('Taj Mahal')
+    info['name'] = 'Changed'
+    info['related_figures'].append('Someone')
+    assert taj['name'] == 'Taj Mahal' and 'Someone' not in taj['related_figures']
+    for query in ('Lal Qila', 'लाल किला', 'red fort'):
+        assert knowledge_base.get_monument_info(query)['name'] == 'Red Fort', query
+    assert knowledge_base.get_monument_info('हम्पी')['name'] == 'Hampi'
+    assert knowledge_base.get_monument_info('no such place') is None
+
+    candidates = knowledge_base.find_monuments('temple')
+    print(f"temple: {candidates}")
+    assert {candidate['id'] for candidate in candidates} == {'kedarnath', 'badrinath'}
+    assert knowledge_base.find_monuments('Lal Qila')[0] == {'id': 'red_fort', 'name': 'Red Fort', 'score': 1.0}
+
+
+def test_generic_words_do_not_match():
+    """Sharing "Temple" or "Fort" with a monument is not enough to resolve to it."""
+    knowledge_base = CulturalKnowledgeBase()
+    for query in ('Somnath Temple', 'Jagannath Temple', 'Golden Temple', 'Agra Fort', 'Mysore Palace'):
+        assert knowledge_base.get_monument_info(query) is None, query
+    assert knowledge_base.get_related_monuments('Somnath Temple') == []
+    assert knowledge_base.get_monument_info('Badrinath temple')['name'] == 'Badrinath Temple'
+    assert knowledge_base.get_monument_info('kedarnat mandir')['name'] == 'Kedarnath Temple'
+
+
+def test_incremental_updates():
+    """add_monument updates a built index; replaced names stop matching."""
+    knowledge_base = CulturalKnowledgeBase()
+    knowledge_base.add_monument({'name': 'Konark Sun Temple', 'aliases': ['कोणार्क सूर्य मंदिर'], 'location': 'Odisha'})
+    assert knowledge_base.get_monument_info('konark sun templ')['location'] == 'Odisha'
+    assert knowledge_base.get_monument_info('कोणार्क सूर्य मंदिर')['name'] == 'Konark Sun Temple'
+    assert 'monument_lookup_seconds' in knowledge_base.get_load_stats()
+
+    lookup = MonumentLookup()
+    lookup.add('gate', {'name': 'India Gate'})
+    lookup.add('gate', {'name': 'Gateway of India'})
+    assert lookup.lookup('India Gate', min_score=0.9) == []
+    assert lookup.lookup('gateway of india')[0] == ('gate', 1.0)
+    lookup.remove('gate')
+    assert lookup.lookup('gateway of india') == []
+
+
+if __name__ == "__main__":
+    test_phonetic_keys()
+    test_get_monument_info_variants()
+    test_generic_words_do_not_match()
+    test_incremental_updates()
+    print("\nTest completed successfully!")
@@ -0,0 +1,119 @@
+"""
+Test script to verify timeframe parsing and the period interval index.
+"""
+
+import os
+import sys
+import random
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.period_index import PeriodIndex, parse_timeframe
+
+
+def test_parse_timeframe():
+    """Timeframe strings become inclusive year ranges; BCE is negative and open ends are None."""
+    cases = {
+        '1526-1857': (1526, 1857),
+        '1200-1700 CE': (1200, 1700),
+        'Before 1200 CE': (None, 1199),
+        'After 1947': (1948, None),
+        '1858 onwards': (1858, None),
+        '1947-present': (1947, None),
+        '300-200 BCE': (-300, -200),
+        '200 BCE - 300 CE': (-200, 300),
+        '12th century': (1101, 1200),
+        '3rd century BCE': (-300, -201),
+        'c. 1650': (1650, 1650),
+        '1336–1646': (1336, 1646),
+        '1800 to 1900': (1800, 1900),
+        1653: (1653, 1653)
+    }
+    for text, expected in cases.items():
+        assert parse_timeframe(text) == expected, text
+    for text in ('Ancient', '', None, '1900-1800'):
+        assert parse_timeframe(text) is None, text
+
+
+def test_queries_match_brute_force():
+    """Point and range queries equal a direct overlap scan, through adds, replacements and removals."""
+    rng = random.Random(4)
+    intervals = {}
+    for i in range(3000):
+        if i % 3:
+            year = rng.randint(300, 1900)
+            intervals[('monument', str(i))] = (year, year)
+        else:
+            start = rng.choice([None, rng.randint(-500, 1800)])
+            end = rng.choice([None, (start or -500) + rng.randint(0, 400)])
+            intervals[('period', str(i))] = (start, end)
+    index = PeriodIndex(min_rebuild=40)
+    items = list(intervals.items())
+    index.build((kind, record_id, start, end) for (kind, record_id), (start, end) in items[:2000])
+    for (kind, record_id), (start, end) in items[2000:]:
+        index.add(kind, record_id, start, end)
+    for key in rng.sample(list(intervals), 200):
+        index.remove(*key)
+        del intervals[key]
+    for key in rng.sample(list(intervals), 200):
+        year = rng.randint(300, 1900)
+        intervals[key] = (year, year + 5)
+        index.add(key[0], key[1], year, year + 5)
+    assert len(index) == len(intervals)
+
+    def expected(lo, hi, kinds=None):
+        return sorted(
+            (kind, record_id, start, end) for (kind, record_id), (start, end) in intervals.items()
+            if (start is None or start <= hi) and (end is None or end >= lo) and (kinds is None or kind in kinds)
+        )
+
+    for _ in range(100):
+        lo = rng.randint(-600, 2000)
+        hi = lo + rng.choice([0, 0, 10, 150])
+        assert sorted(index.overlapping(lo, hi)) == expected(lo, hi)
+        assert sorted(index.overlapping(lo, hi, ['monument'])) == expected(lo, hi, ['monument'])
+    found = index.at(1650)
+    starts = [-10 ** 9 if start is None else start for _, _, start, _ in found]
+    assert starts == sorted(starts)
+
+
+def test_knowledge_base_timeline():
+    """Timelines come from recorded events, enclosing periods and contemporary monuments."""
+    knowledge_base = CulturalKnowledgeBase()
+    assert knowledge_base.load_stats['unparsed_timeframes'] == 0
+    assert [entry['id'] for entry in knowledge_base.find_by_year(1650)] == ['medieval', 'mughal_period']
+    assert [entry['id'] for entry in knowledge_base.find_by_year(1640, 1660, kinds=['monument'])] == ['red_fort', 'taj_mahal']
+    assert knowledge_base.find_by_year(900, kinds=['historical_period'])[0]['start'] is None
+
+    timeline = knowledge_base.get_cultural_timeline('Lal Qila')
+    print(f"Red Fort timeline: {timeline}")
+    events = [(entry['year'], entry['type']) for entry in timeline]
+    assert events == sorted(events, key=lambda event: event[0])
+    assert (1648, 'construction') in events
+    assert (1857, 'event') in events
+    assert (1526, 'cultural_context') in events
+    assert (1653, 'contemporary') in events
+    assert all(entry['year'] != 1658 for entry in timeline)
+    assert knowledge_base.get_cultural_timeline('Atlantis') == []
+
+    knowledge_base.add_monument({
+        'name': 'Jama Masjid',
+        'location': 'Delhi',
+        'built_year': 1656,
+        'events': [{'year': '1650', 'event': 'Foundation laid', 'significance': 'Largest mosque of its time'}]
+    })
+    assert 'jama_masjid' in [entry['id'] for entry in knowledge_base.find_by_year(1656, kinds=['monument'])]
+    assert [entry['name'] for entry in knowledge_base.find_by_year(1650, kinds=['event'])] == ['Foundation laid']
+    assert 'Jama Masjid built' in [entry['event'] for entry in knowledge_base.get_cultural_timeline('red_fort')]
+
+    knowledge_base.add_monument({'name': 'Jama Masjid', 'location': 'Delhi', 'built_year': 1656}, on_conflict='replace')
+    assert knowledge_base.find_by_year(1650, kinds=['event']) == []
+
+
+if __name__ == "__main__":
+    test_parse_timeframe()
+    test_queries_match_brute_force()
+    test_knowledge_base_timeline()
+    print("\nTest completed successfully!")
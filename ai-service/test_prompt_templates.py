@@ -0,0 +1,71 @@
+"""
+Test script to verify precompiled per-language prompt templates.
+"""
+
+import os
+import sys
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.prompt_templates import PromptTemplates, RESPONSE_INSTRUCTIONS
+
+LANGUAGE_MAPPING = {
+    'en-IN': 'English with Indian cultural context',
+    'hi-IN': 'Hindi',
+    'ta-IN': 'Tamil'
+}
+
+
+def test_render_splices_dynamic_parts():
+    """Static segments surround the profile, history and message in prompt order."""
+    templates = PromptTemplates("You are Narad.", LANGUAGE_MAPPING)
+    prompt = templates.get('en-IN').render(
+        "\n- Returning visitor, previously explored: Hampi",
+        ["User: ", "Who built Hampi?", "\n", "Narad: ", "The Sangama dynasty.", ""],
+        "And the Red Fort?"
+    )
+    print(prompt)
+
+    assert prompt.startswith("\n\nYou are Narad.\n\nCurrent conversation context:\n- Language: English with Indian cultural context")
+    assert prompt.index("previously explored: Hampi") < prompt.index("IMPORTANT INSTRUCTIONS") < prompt.index("User: Who built Hampi?")
+    assert f"8. {RESPONSE_INSTRUCTIONS[-1]}" in prompt
+    assert "9." not in prompt
+    assert prompt.endswith('Narad: The Sangama dynasty.\n\n\nUser Message: "And the Red Fort?"\n\nNarad\'s Response:\n')
+
+
+def test_language_tuning_and_fallback():
+    """Indic templates ask for native script; unknown codes use the English template."""
+    templates = PromptTemplates("You are Narad.", LANGUAGE_MAPPING)
+    tamil = templates.get('ta-IN').render("", ["No previous conversation"], "kovil pathi sollunga")
+
+    assert "- User Language Preference: ta-IN" in tamil
+    assert "9. Write the reply in Tamil using the Tamil (தமிழ்) script" in tamil
+    assert templates.get('xx-IN') is templates.get('en-IN')
+    assert templates.get_template_stats()['languages'] == ['en-IN', 'hi-IN', 'ta-IN']
+
+
+def test_narad_prompt_history_segments():
+    """NaradAI's history segments join to the formatted history."""
+    from src.services.narad_ai import NaradAI
+    narad = NaradAI()
+    history = [
+        {'role': 'user', 'content': 'Tell me about the Taj Mahal', 'timestamp': '2024-01-01T00:00:00'},
+        {'role': 'ai', 'content': 'It was built by Shah Jahan.', 'timestamp': '2024-01-01T00:00:01'}
+    ]
+    segments = narad._history_segments(history, 'Earlier: greetings.')
+    assert ''.join(segments) == narad._format_conversation_history(history, 'Earlier: greetings.')
+    assert ''.join(segments) == (
+        "Summary of earlier conversation: Earlier: greetings.\n"
+        "User: Tell me about the Taj Mahal\nNarad: It was built by Shah Jahan."
+    )
+    assert narad._history_segments([]) == ["No previous conversation"]
+    narad.conversation_memory.close()
+    narad.user_memory.close()
+
+
+if __name__ == "__main__":
+    test_render_splices_dynamic_parts()
+    test_language_tuning_and_fallback()
+    test_narad_prompt_history_segments()
+    print("\nTest completed successfully!")
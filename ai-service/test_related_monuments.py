@@ -0,0 +1,108 @@
+"""
+Test script to verify the precomputed related-monument graph.
+"""
+
+import os
+import sys
+import math
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.related_monuments import RelatedMonumentGraph, monument_state
+from synthetic_knowledge import generate
+
+
+def _brute_force(monuments, themes, monument_id, k=10):
+    """Score every pair directly, ordered by score then catalog order."""
+    def cosine(first, second, weight):
+        return weight * len(first & second) / math.sqrt(len(first) * len(second)) if first and second else 0.0
+
+    current = monuments[monument_id]
+    scored = []
+    for position, (other_id, other) in enumerate(monuments.items()):
+        if other_id == monument_id:
+            continue
+        score = (
+            0.5 * (other['period'] == current['period']) +
+            0.3 * (monument_state(other) == monument_state(current)) +
+            0.2 * (other['architecture'] == current['architecture']) +
+            cosine(set(current['related_figures']), set(other['related_figures']), 0.2) +
+            cosine(themes.get(monument_id, set()), themes.get(other_id, set()), 0.1)
+        )
+        if round(score, 4) > 0.3:
+            scored.append((-round(score, 4), position, other_id))
+    return [(other_id, -score) for score, _, other_id in sorted(scored)[:k]]
+
+
+def test_bulk_build_matches_brute_force():
+    """The pruned group-by-group build finds exactly the top k of every monument."""
+    sections = generate(n_monuments=600, n_stories=600, seed=3)
+    monuments = sections['monuments_db']
+    themes = {}
+    for story in sections['stories_db'].values():
+        themes.setdefault(story['monument'], set()).update(story['themes'])
+
+    graph = RelatedMonumentGraph(chunk_size=64, row_block=8)
+    graph.build(monuments.items(), themes)
+    for monument_id in list(monuments)[:40]:
+        assert graph.related(monument_id, limit=10) == _brute_force(monuments, themes, monument_id), monument_id
+
+    # Adding one at a time gives the same graph
+    incremental = RelatedMonumentGraph()
+    for monument_id, monument in monuments.items():
+        incremental.add(monument_id, monument, themes.get(monument_id, ()))
+    assert incremental.export() == graph.export()
+
+
+def test_replacing_a_monument():
+    """A re-added monument leaves lists it no longer belongs in."""
+    graph = RelatedMonumentGraph()
+    graph.build([
+        ('a', {'period': 'Mughal', 'location': 'Agra, Uttar Pradesh', 'architecture': 'Mughal'}),
+        ('b', {'period': 'Mughal', 'location': 'Delhi', 'architecture': 'Mughal'}),
+        ('c', {'period': 'Chola', 'location': 'Thanjavur, Tamil Nadu', 'architecture': 'Dravidian'})
+    ])
+    assert graph.related('a') == [('b', 0.7)]
+    graph.add('b', {'period': 'Chola', 'location': 'Madurai, Tamil Nadu', 'architecture': 'Dravidian'})
+    assert graph.related('a') == []
+    assert graph.related('c') == [('b', 1.0)]
+    assert len(graph) == 3
+
+
+def test_knowledge_base_integration():
+    """get_related_monuments reads the graph, which add_monument keeps current."""
+    knowledge_base = CulturalKnowledgeBase()
+    related = knowledge_base.get_related_monuments('kedarnath')
+    print(f"kedarnath: {related}")
+    assert [monument['id'] for monument in related] == ['badrinath']
+    assert related[0]['relatedness_score'] > 1.0
+
+    knowledge_base.add_monument({
+        'name': 'Tungnath Temple',
+        'location': 'Uttarakhand',
+        'period': 'Ancient',
+        'architecture': 'North Indian Nagara style',
+        'related_figures': ['Lord Shiva', 'Pandavas']
+    })
+    related = knowledge_base.get_related_monuments('kedarnath')
+    assert related[0]['id'] == 'tungnath_temple'
+    assert 'tungnath_temple' in [monument['id'] for monument in knowledge_base.get_related_monuments('badrinath')]
+    assert knowledge_base.export_related_monuments()['tungnath_temple'][0]['id'] == 'kedarnath'
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'kb.sqlite')
+        knowledge_base.save(path)
+        loaded = CulturalKnowledgeBase(path)
+        assert loaded.wait_for_indexes(timeout=30)
+        assert loaded.export_related_monuments() == knowledge_base.export_related_monuments()
+        loaded._content_store.close()
+
+
+if __name__ == "__main__":
+    test_bulk_build_matches_brute_force()
+    test_replacing_a_monument()
+    test_knowledge_base_integration()
+    print("\nTest completed successfully!")
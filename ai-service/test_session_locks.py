@@ -0,0 +1,167 @@
+"""
+Test script to verify per-session request serialization.
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.session_locks import SessionLockManager, SessionBusyError
+from src.utils.conversation_memory import ConversationMemory
+
+
+def test_same_session_turns_do_not_interleave():
+    """Concurrent turns on one session keep user/ai pairs together, in arrival order."""
+    locks = SessionLockManager(timeout=5, max_queue_depth=10)
+    memory = ConversationMemory()
+    session_id = "locked_session_001"
+
+    def turn(i):
+        with locks.hold(session_id):
+            memory.add_message(session_id, "user", f"Question {i}")
+            time.sleep(0.01)
+            memory.add_message(session_id, "ai", f"Answer {i}")
+
+    threads = []
+    for i in range(6):
+        threads.append(threading.Thread(target=turn, args=(i,)))
+        threads[-1].start()
+        time.sleep(0.002)
+    for thread in threads:
+        thread.join()
+
+    history = memory.get_history(session_id)
+    pairs = [(history[i]['content'], history[i + 1]['content']) for i in range(0, len(history), 2)]
+    print(f"Pairs: {pairs}")
+    assert all(q.split()[1] == a.split()[1] for q, a in pairs)
+    assert [q for q, _ in pairs] == [f"Question {i}" for i in range(6)]
+    assert locks.get_lock_stats()['busy_sessions'] == 0
+
+
+def test_other_sessions_stay_parallel():
+    """A long turn on one session does not delay another session."""
+    locks = SessionLockManager(timeout=5)
+    started = threading.Event()
+
+    def slow_turn():
+        with locks.hold("slow_session"):
+            started.set()
+            time.sleep(0.3)
+
+    thread = threading.Thread(target=slow_turn)
+    thread.start()
+    started.wait()
+
+    begin = time.monotonic()
+    with locks.hold("fast_session"):
+        pass
+    assert time.monotonic() - begin < 0.1
+    thread.join()
+
+
+def test_bounded_wait_reports_queue_position():
+    """Waiting past the timeout or beyond the queue depth raises SessionBusyError."""
+    locks = SessionLockManager(timeout=0.05, max_queue_depth=1)
+    release = threading.Event()
+    started = threading.Event()
+    waiter_errors = []
+
+    def holder():
+        with locks.hold("busy_session"):
+            started.set()
+            release.wait()
+
+    def waiter():
+        try:
+            with locks.hold("busy_session", timeout=2):
+                pass
+        except SessionBusyError as e:
+            waiter_errors.append(e)
+
+    holder_thread = threading.Thread(target=holder)
+    holder_thread.start()
+    started.wait()
+    waiter_thread = threading.Thread(target=waiter)
+    waiter_thread.start()
+    while locks.queue_length("busy_session") < 2:
+        time.sleep(0.001)
+
+    # Queue full: one running, one waiting
+    try:
+        with locks.hold("busy_session"):
+            assert False, "expected SessionBusyError"
+    except SessionBusyError as e:
+        assert e.queue_position == 2
+
+    release.set()
+    holder_thread.join()
+    waiter_thread.join()
+    assert not waiter_errors
+
+    # Timed-out waiter is skipped and does not block later requests
+    release.clear()
+    started.clear()
+    holder_thread = threading.Thread(target=holder)
+    holder_thread.start()
+    started.wait()
+    try:
+        with locks.hold("busy_session"):
+            assert False, "expected SessionBusyError"
+    except SessionBusyError as e:
+        assert e.queue_position == 1
+    release.set()
+    holder_thread.join()
+    with locks.hold("busy_session", timeout=0.5):
+        pass
+    assert locks.get_lock_stats()['timeouts'] == 1
+
+
+def test_readers_run_alongside_writers():
+    """Context, stats and export reads never see a session mid-update."""
+    memory = ConversationMemory()
+    session_id = "read_lock_session"
+    memory.add_message(session_id, "user", "Tell me about the Taj Mahal")
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            memory.update_context(session_id, {'topics': [f"topic_{i}"], 'monuments_discussed': [f"site_{i}"]})
+            memory.add_message(session_id, "user", f"Question {i}")
+            i += 1
+
+    def reader():
+        try:
+            while not stop.is_set():
+                memory.get_context(session_id)
+                memory.get_session_stats(session_id)
+                memory.export_session(session_id)
+                memory.get_memory_stats()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    context = memory.get_context(session_id)
+    context['user_preferences']['language'] = 'hi'
+    assert memory.get_context(session_id)['user_preferences'] == {}
+
+
+if __name__ == "__main__":
+    test_same_session_turns_do_not_interleave()
+    test_other_sessions_stay_parallel()
+    test_bounded_wait_reports_queue_position()
+    test_readers_run_alongside_writers()
+    print("\nTest completed successfully!")
@@ -0,0 +1,106 @@
+"""
+Test script to verify crash-safe conversation persistence with log replay and snapshots.
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.conversation_memory import ConversationMemory
+from src.utils.session_store import SessionStore
+
+
+def test_sessions_survive_restart_via_log_replay():
+    """Messages and context updates are replayed from the event log on startup."""
+    with tempfile.TemporaryDirectory() as store_dir:
+        memory = ConversationMemory(store=SessionStore(store_dir, fsync_interval=0.01))
+        memory.add_message("session_a", "user", "Tell me about the Taj Mahal")
+        memory.add_message("session_a", "ai", "The Taj Mahal was built by Shah Jahan.")
+        memory.update_context("session_a", {'current_monument': 'taj_mahal', 'topics': ['love']})
+        memory.add_message("session_b", "user", "Tell me about Hampi")
+        memory.clear_session("session_b")
+        memory.close()
+
+        restored = ConversationMemory(store=SessionStore(store_dir))
+        history = restored.get_history("session_a")
+        context = restored.get_context("session_a")
+        print(f"Restored history: {history}")
+
+        assert [msg['content'] for msg in history] == [
+            "Tell me about the Taj Mahal",
+            "The Taj Mahal was built by Shah Jahan."
+        ]
+        assert context['current_monument'] == 'taj_mahal'
+        assert 'love' in context['topics']
+        assert restored.get_session("session_b") is None
+        restored.close()
+
+
+def test_snapshot_compacts_log_and_restores():
+    """A snapshot covers older segments, which are deleted; newer events still replay."""
+    with tempfile.TemporaryDirectory() as store_dir:
+        memory = ConversationMemory(store=SessionStore(store_dir))
+        memory.add_message("session_a", "user", "Tell me about Kedarnath")
+        assert memory.snapshot()
+        memory.add_message("session_a", "ai", "Kedarnath is one of the twelve Jyotirlingas.")
+        memory.close()
+
+        segments = sorted(name for name in os.listdir(store_dir) if name.endswith('.log'))
+        print(f"Segments after snapshot: {segments}")
+        assert 'events.00000001.log' not in segments
+
+        restored = ConversationMemory(store=SessionStore(store_dir))
+        assert len(restored.get_history("session_a")) == 2
+        assert restored.get_memory_stats()['total_messages_processed'] == 2
+        restored.close()
+
+
+def test_torn_tail_record_is_ignored():
+    """A partially written record at the end of a segment does not break restore."""
+    with tempfile.TemporaryDirectory() as store_dir:
+        memory = ConversationMemory(store=SessionStore(store_dir))
+        memory.add_message("session_a", "user", "Tell me about Badrinath")
+        memory.close()
+
+        with open(os.path.join(store_dir, 'events.00000001.log'), 'ab') as f:
+            f.write(b'\x40\x00\x00\x00\x01\x02')
+
+        store = SessionStore(store_dir)
+        restored = ConversationMemory(store=store)
+        assert len(restored.get_history("session_a")) == 1
+        assert store.get_store_stats()['corrupt_records'] == 1
+        restored.close()
+
+
+def test_replayed_clear_all_resets_counters():
+    """Replaying a clear_all leaves the same running statistics as the live clear."""
+    with tempfile.TemporaryDirectory() as store_dir:
+        memory = ConversationMemory(store=SessionStore(store_dir))
+        memory.add_message("session_a", "user", "Tell me a story", metadata={'intent': 'story_request'})
+        memory.add_message("session_a", "ai", "Once upon a time...", metadata={'user_rating': 5})
+        assert memory.snapshot()
+        memory.add_message("session_b", "user", "Hello", metadata={'intent': 'greeting'})
+        memory.clear_all_sessions()
+        memory.add_message("session_c", "user", "Tell me about Hampi", metadata={'intent': 'informational'})
+        expected = memory.get_memory_stats()
+        memory.close()
+
+        restored = ConversationMemory(store=SessionStore(store_dir))
+        stats = restored.get_memory_stats()
+        print(f"Restored stats: {stats}")
+        assert stats['intent_totals'] == expected['intent_totals'] == {'informational': 1}
+        assert stats['ratings_count'] == 0 and stats['average_rating'] is None
+        for key in ('active_sessions', 'messages_in_memory', 'bytes_in_memory'):
+            assert stats[key] == expected[key]
+        restored.close()
+
+
+if __name__ == "__main__":
+    test_sessions_survive_restart_via_log_replay()
+    test_snapshot_compacts_log_and_restores()
+    test_torn_tail_record_is_ignored()
+    test_replayed_clear_all_resets_counters()
+    print("\nTest completed successfully!")
@@ -0,0 +1,110 @@
+"""
+Test script to verify BM25 story search and its incremental index updates.
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.story_index import StoryIndex, tokenize
+
+
+def test_ranking_and_intent_filter():
+    """Title and theme matches rank first; the intent pulls in stories of its type."""
+    knowledge_base = CulturalKnowledgeBase()
+
+    results = knowledge_base.search_stories('Where was Hanuman born?', 'mythology_inquiry')
+    print(f"Hanuman: {results}")
+    assert results[0]['id'] == 'hanuman_birthplace'
+    assert all(result['type'] == 'mythology' for result in results)
+    assert results[0]['relevance_score'] > results[1]['relevance_score']
+
+    # A mystery question about the Red Fort ranks the matching story first
+    results = knowledge_base.search_stories('secrets of the red fort', 'horror_inquiry')
+    assert results[0]['id'] == 'red_fort_mysteries'
+
+    # No query match and no intent type: nothing, as with the linear scan
+    assert knowledge_base.search_stories('quantum chromodynamics', 'story_request') == []
+    assert len(knowledge_base.search_stories('quantum chromodynamics', 'general_inquiry')) == 3
+
+    # Results are no longer capped at three
+    assert len(knowledge_base.search_stories('devotion', 'mythology_inquiry', limit=10)) == 6
+
+
+def test_hindi_stories():
+    """Devanagari words keep their vowel signs, so Hindi queries match Hindi stories."""
+    assert tokenize('शाहजहाँ ने ताज महल बनवाया।') == ['शाहजहाँ', 'ने', 'ताज', 'महल', 'बनवाया']
+
+    index = StoryIndex()
+    index.add('taj_hi', {
+        'title': 'ताज महल की कहानी',
+        'content': 'शाहजहाँ ने मुमताज़ की याद में ताज महल बनवाया।',
+        'type': 'historical'
+    })
+    index.add('hanuman_hi', {
+        'title': 'हनुमान का जन्म',
+        'content': 'हनुमान अंजनेरी पर्वत पर जन्मे थे।',
+        'type': 'mythology'
+    })
+
+    results = index.search('ताज महल किसने बनवाया?')
+    print(f"Hindi: {results}")
+    assert [story_id for story_id, _ in results] == ['taj_hi']
+    assert index.search('हनुमान कहाँ जन्मे?')[0][0] == 'hanuman_hi'
+    assert index.search('शाहजहाँ')[0][0] == 'taj_hi'
+    assert 'बनवाया' in index._postings and 'जन्मे' in index._postings
+
+
+def test_incremental_updates():
+    """Added and replaced stories are searchable immediately; retired versions are not."""
+    knowledge_base = CulturalKnowledgeBase()
+    knowledge_base.add_story({
+        'title': 'The Weavers of Chanderi',
+        'type': 'folklore',
+        'content': 'Handloom weavers spin silk saris in the old town.',
+        'themes': ['craft', 'textiles']
+    })
+    results = knowledge_base.search_stories('chanderi saris', 'story_request')
+    assert [result['id'] for result in results] == ['the_weavers_of_chanderi']
+
+    knowledge_base.add_story({
+        'title': 'The Weavers of Chanderi',
+        'type': 'folklore',
+        'content': 'Cotton looms clatter through the night.',
+        'themes': ['craft']
+    }, on_conflict='replace')
+    assert knowledge_base.search_stories('saris', 'story_request') == []
+    assert knowledge_base.search_stories('looms', 'story_request')[0]['id'] == 'the_weavers_of_chanderi'
+    assert knowledge_base.story_index.get_index_stats()['retired'] == 1
+
+    index = StoryIndex()
+    index.add('a', {'title': 'Temple bells', 'type': 'mythology', 'content': 'bells ring', 'themes': []})
+    index.add('b', {'title': 'Fort walls', 'type': 'historical', 'content': 'bells ring', 'themes': []})
+    index.remove('a')
+    assert [story_id for story_id, _ in index.search('bells')] == ['b']
+    assert len(index) == 1
+
+
+def test_background_index_for_knowledge_files():
+    """File-backed knowledge bases index in the background and agree with the in-memory index."""
+    samples = CulturalKnowledgeBase()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'kb.jsonl')
+        samples.save(path)
+        loaded = CulturalKnowledgeBase(path)
+        assert loaded.wait_for_indexes(timeout=30)
+        for query, intent in (('shiva bull', 'mythology_inquiry'), ('love', 'general_inquiry')):
+            assert loaded.search_stories(query, intent) == samples.search_stories(query, intent)
+        loaded._content_store.close()
+
+
+if __name__ == "__main__":
+    test_ranking_and_intent_filter()
+    test_hindi_stories()
+    test_incremental_updates()
+    test_background_index_for_knowledge_files()
+    print("\nTest completed successfully!")
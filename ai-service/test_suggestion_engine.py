@@ -0,0 +1,109 @@
+"""
+Test script to verify personalized, cached follow-up suggestions.
+"""
+
+import os
+import sys
+import time
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.services.content_recommender import ContentRecommender
+from src.services.suggestion_engine import SuggestionEngine, SUGGESTION_PHRASES, DEFAULT_LANGUAGE
+
+
+def test_monument_specific_and_localized():
+    """Suggestions follow the monument and are phrased in the reply language."""
+    engine = SuggestionEngine(CulturalKnowledgeBase(), recommender=ContentRecommender())
+
+    hampi = engine.suggest('story_request', 'hampi', 'en-IN')
+    print(f"Hampi: {hampi}")
+    assert len(hampi) == 3
+    assert all('Taj Mahal' not in suggestion for suggestion in hampi)
+    assert any('Hampi' in suggestion or 'Krishnadevaraya' in suggestion for suggestion in hampi)
+
+    hindi = engine.suggest('story_request', 'hampi', 'hi-IN')
+    print(f"Hindi: {hindi}")
+    assert hindi != hampi
+    assert any('कहानी' in suggestion or 'कौन' in suggestion for suggestion in hindi)
+
+    # Unsupported languages fall back to English phrasing
+    assert engine.suggest('story_request', 'hampi', 'xx-IN') == hampi
+
+    # Every reply language has its own template for every kind
+    reply_languages = ['en-IN', 'hi-IN', 'bn-IN', 'ta-IN', 'te-IN', 'pa-IN', 'mr-IN', 'gu-IN', 'kn-IN', 'ml-IN', 'or-IN']
+    assert sorted(SUGGESTION_PHRASES) == sorted(reply_languages)
+    english = SUGGESTION_PHRASES[DEFAULT_LANGUAGE]
+    for language in reply_languages[1:]:
+        phrases = SUGGESTION_PHRASES[language]
+        assert set(phrases) == set(english), language
+        assert all('{name}' in phrases[kind] and phrases[kind] != english[kind] for kind in phrases), language
+        localized = engine.suggest('story_request', 'hampi', language)
+        assert localized != hampi and len(localized) == 3, language
+
+
+def test_interests_reorder_cached_pool():
+    """Interests reorder the cached candidates without rebuilding them."""
+    engine = SuggestionEngine(CulturalKnowledgeBase(), recommender=ContentRecommender())
+    default = engine.suggest('location_inquiry', 'taj_mahal', 'en-IN', limit=8)
+    personalized = engine.suggest('location_inquiry', 'taj_mahal', 'en-IN', interests={'Mumtaz Mahal'}, limit=8)
+
+    assert sorted(default) == sorted(personalized)
+    assert personalized[0] == 'Who was Mumtaz Mahal?'
+    assert engine.get_engine_stats()['cache_misses'] == 1
+
+
+def test_cache_hits_and_invalidation():
+    """Pools are served from cache until the knowledge base changes."""
+    knowledge_base = CulturalKnowledgeBase()
+    engine = SuggestionEngine(knowledge_base)
+    engine.precompute(languages=['en-IN'])
+    misses = engine.get_engine_stats()['cache_misses']
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        engine.suggest('story_request', 'kedarnath', 'en-IN', interests={'mythology'})
+    print(f"Cached suggest: {(time.perf_counter() - start) * 1e3:.1f} us per call")
+    assert engine.get_engine_stats()['cache_misses'] == misses
+
+    knowledge_base.add_story({
+        'title': 'The Kedarnath Floods',
+        'type': 'historical',
+        'monument': 'kedarnath',
+        'content': 'How the temple survived the floods of 2013...',
+        'themes': ['resilience']
+    })
+    stories = engine.suggest('story_request', 'kedarnath', 'en-IN', interests={'history'})
+    assert 'Tell me the story "The Kedarnath Floods"' in stories
+    stats = engine.get_engine_stats()
+    assert stats['invalidations'] == 1
+    assert stats['cached_pools'] == 1
+
+
+def test_pools_refresh_when_indexes_publish():
+    """Before the indexes are built, pools come without waiting and are rebuilt once they publish."""
+    knowledge_base = CulturalKnowledgeBase()
+    # As while a file knowledge base is still indexing in the background
+    knowledge_base._indexes_ready.clear()
+    knowledge_base._entity_graph_ready.clear()
+    engine = SuggestionEngine(knowledge_base)
+
+    start = time.perf_counter()
+    early = engine.suggest('story_request', 'hampi', 'en-IN', limit=8)
+    assert time.perf_counter() - start < 1.0
+    assert early
+
+    knowledge_base._build_indexes()
+    assert engine.suggest('story_request', 'hampi', 'en-IN', limit=8)
+    stats = engine.get_engine_stats()
+    assert stats['invalidations'] == 1 and stats['cache_misses'] == 2
+
+
+if __name__ == "__main__":
+    test_monument_specific_and_localized()
+    test_interests_reorder_cached_pool()
+    test_cache_hits_and_invalidation()
+    test_pools_refresh_when_indexes_publish()
+    print("\nTest completed successfully!")
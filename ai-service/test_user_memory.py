@@ -0,0 +1,96 @@
+"""
+Test script to verify the cross-session long-term user memory index.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils.cultural_knowledge import CulturalKnowledgeBase
+from src.utils.user_memory import UserMemoryIndex
+from src.services.narad_ai import NaradAI
+
+
+def test_profile_accumulates_across_turns_and_persists():
+    """Monuments and story types are counted per user and survive a restart."""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'users')
+    knowledge_base = CulturalKnowledgeBase()
+
+    index = UserMemoryIndex(knowledge_base=knowledge_base, path=path)
+    index.record_turn("visitor_1", "Tell me a mythology story about the Taj Mahal", 'en-IN')
+    index.record_turn("visitor_1", "What about the Red Fort and the Taj Mahal?", 'hi-IN')
+    index.record_turn("visitor_2", "Tell me about Hampi", 'en-IN')
+    index.wait_for_updates(timeout=5)
+
+    profile = index.get_profile("visitor_1")
+    print(f"Profile: {profile}")
+    assert profile['monuments'] == ['taj_mahal', 'red_fort']
+    assert profile['story_types'] == ['mythology']
+    assert profile['language'] == 'hi-IN'
+    assert profile['turns'] == 2
+    assert index.get_profile("unknown_visitor") is None
+    index.close()
+
+    try:
+        reopened = UserMemoryIndex(knowledge_base=knowledge_base, path=path)
+        assert reopened.get_profile("visitor_2")['monuments'] == ['hampi']
+        reopened.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_profiles_read_through_a_bounded_cache():
+    """With a store, only the most recently used profiles stay in memory."""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'users')
+    knowledge_base = CulturalKnowledgeBase()
+    try:
+        index = UserMemoryIndex(knowledge_base=knowledge_base, path=path, max_cached_profiles=2)
+        for i in range(5):
+            index.record_turn(f"visitor_{i}", "Tell me about Hampi", 'en-IN')
+        index.record_turn("visitor_0", "And the Taj Mahal?", 'en-IN')
+        index.wait_for_updates(timeout=5)
+        stats = index.get_index_stats()
+        assert stats['users'] == 5 and stats['cached_profiles'] == 2
+        assert index.get_profile("visitor_0")['monuments'] == ['hampi', 'taj_mahal']
+        index.close()
+
+        reopened = UserMemoryIndex(knowledge_base=knowledge_base, path=path, max_cached_profiles=2)
+        assert reopened.get_index_stats() == {'users': 5, 'cached_profiles': 0, 'pending_updates': 0, 'persistent': True}
+        assert all(reopened.get_profile(f"visitor_{i}")['turns'] >= 1 for i in range(5))
+        assert reopened.get_index_stats()['cached_profiles'] == 2
+        reopened.record_turn("visitor_1", "Tell me a mythology story", 'hi-IN')
+        reopened.wait_for_updates(timeout=5)
+        assert reopened.get_profile("visitor_1")['turns'] == 2
+        assert reopened.get_index_stats()['users'] == 5
+        reopened.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_returning_visitor_context_in_prompt():
+    """A new session for a known user gets the profile merged into the prompt context."""
+    narad = NaradAI()
+    narad.user_memory.record_turn("visitor_3", "Share a folklore tale about Hampi", 'en-IN')
+    narad.user_memory.wait_for_updates(timeout=5)
+
+    profile_block = narad._format_user_profile(narad.user_memory.get_profile("visitor_3"))
+    assert "Hampi" in profile_block
+    assert "folklore" in profile_block
+
+    narad.process_message("Which monument should I see next?", "fresh_session_001", {}, user_id="visitor_3")
+    assert narad.conversation_memory.get_session("fresh_session_001")['user_id'] == "visitor_3"
+    narad.user_memory.wait_for_updates(timeout=5)
+    assert narad.user_memory.get_profile("visitor_3")['turns'] == 2
+
+
+if __name__ == "__main__":
+    test_profile_accumulates_across_turns_and_persists()
+    test_profiles_read_through_a_bounded_cache()
+    test_returning_visitor_context_in_prompt()
+    print("\nTest completed successfully!")
@@ -0,0 +1,66 @@
+"""
+Train the intent classifier on data/intent_dataset.jsonl and write
+models/intent_classifier.npz.
+
+Features are the same hashed word n-grams used at serving time; the linear
+model is a multinomial logistic regression from scikit-learn. Only the train
+split is used for fitting, so benchmark_intent_classifier.py can report
+honest accuracy on the held-out split.
+
+Usage: python train_intent_classifier.py [dataset_path] [model_path]
+"""
+
+import os
+import sys
+import json
+import logging
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import classification_report
+
+from src.utils.intent_classifier import IntentClassifier, DEFAULT_MODEL_PATH, DEFAULT_N_FEATURES
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), 'data', 'intent_dataset.jsonl')
+
+
+def load_dataset(path: str = DATASET_PATH):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def fit(rows, n_features: int = DEFAULT_N_FEATURES) -> IntentClassifier:
+    features = IntentClassifier.vectorize([row['text'] for row in rows], n_features)
+    labels = [row['intent'] for row in rows]
+    model = LogisticRegression(C=10.0, class_weight='balanced', max_iter=2000)
+    model.fit(features, labels)
+    return IntentClassifier(
+        weights=model.coef_.T,
+        bias=model.intercept_,
+        classes=list(model.classes_),
+        n_features=n_features
+    )
+
+
+def train(dataset_path: str = DATASET_PATH, model_path: str = DEFAULT_MODEL_PATH):
+    rows = load_dataset(dataset_path)
+    train_rows = [row for row in rows if row['split'] == 'train']
+    test_rows = [row for row in rows if row['split'] == 'test']
+
+    classifier = fit(train_rows)
+    predicted = [intent for intent, _ in classifier.classify_batch([row['text'] for row in test_rows])]
+    expected = [row['intent'] for row in test_rows]
+    accuracy = float(np.mean([p == e for p, e in zip(predicted, expected)]))
+    print(f"Held-out accuracy: {accuracy:.3f} on {len(test_rows)} messages")
+    print(classification_report(expected, predicted, zero_division=0))
+
+    classifier.save(model_path)
+    print(f"Saved model trained on {len(train_rows)} messages to {model_path}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    train(*sys.argv[1:3])